@@ -63,22 +63,22 @@ Development of a Software Pipeline. Proteins 59, 687 - 696.
       the second index is 0 for x and 1 for y
 */
 
-// define a global object(cheating for the minute)
-static PyObject *gl_object_list;
-static int numIndices = 0;
-static int numVertices = 0;
-static int numColours = 0;
-static int indexCount = 0;
-static int vertexCount = 0;
-static int colourCount = 0;
-static int lastIndex = 0;
-static int lastVertex = 0;
-static PyArrayObject *indexing;
-static PyArrayObject *vertices;
-static PyArrayObject *colours;
-static unsigned int *indexPTR;
-static float32 *vertexPTR;
-static float32 *colourPTR;
+/*
+  The contours are calculated without holding the GIL (see calculate_contours), so that
+  other (e.g. gui) threads can run while contouring; there is hence no global state,
+  the state of a call is held in the structures below
+*/
+
+/* the arrays of a glList being filled, see fillContours */
+typedef struct _GL_arrays {
+    unsigned int *indexPTR;
+    float32 *vertexPTR;
+    float32 *colourPTR;
+    int indexCount;
+    int vertexCount;
+    int colourCount;
+    int lastIndex;
+} GL_arrays;
 
 #define CONTOUR_NALLOC 50 /* allocate vertices in this size bunch */
 
@@ -702,8 +702,9 @@ static CcpnStatus find_vertices(Contour_vertices contour_vertices, float level,
     CcpnBool b_old, b_new;
     float d_old, d_old0, d_old1, d_new, d_new0, d_new1;
     Contour_vertex *v_row, v_col;
-    static New_edge_func *new_edge, edge_func;
-    static New_edge_func new_edge_func[N][N] = {{no_edge00, new_edge01, new_edge02, new_edge03},
+    const New_edge_func *new_edge;
+    New_edge_func edge_func;
+    static const New_edge_func new_edge_func[N][N] = {{no_edge00, new_edge01, new_edge02, new_edge03},
                                                 {new_edge10, new_edge11, new_edge12, new_edge13},
                                                 {new_edge20, new_edge21, new_edge22, new_edge23},
                                                 {new_edge30, new_edge31, new_edge32, no_edge33}};
@@ -792,7 +793,29 @@ static CcpnStatus find_vertices(Contour_vertices contour_vertices, float level,
     return CCPN_OK;
 }
 
-static CcpnStatus process_chain(PyObject *contours, Contour_vertex v) {
+/* true if any of the data in the range examined for the current level is beyond level;
+   i.e. above level for increasing levels, below level for decreasing levels */
+static CcpnBool is_data_beyond_level(Contour_vertices contour_vertices, float level, PyArrayObject *data) {
+    int r, c, i0, i1, j1;
+    float d;
+    int npoints1 = PyArray_DIM(data, 0);
+
+    for (r = 0; r < contour_vertices->nrows_old; r++) {
+        i1 = contour_vertices->row_old[r];
+        for (j1 = i1; j1 <= i1 + 1 && j1 < npoints1; j1++) {
+            for (c = 0; c < contour_vertices->ncol_ranges_old[r]; c++) {
+                for (i0 = contour_vertices->col_start_old[r][c]; i0 < contour_vertices->col_end_old[r][c]; i0++) {
+                    d = GET_DATA(i0, j1);
+                    if (contour_vertices->are_levels_increasing ? (d > level) : (d <= level)) return CCPN_TRUE;
+                }
+            }
+        }
+    }
+
+    return CCPN_FALSE;
+}
+
+static CcpnStatus process_chain(PyObject *contours, Contour_vertex v, int *total_vertices) {
     int i, k, nvertices, typenum = NPY_FLOAT;
     npy_intp dims[2];
     Contour_vertex vv;
@@ -833,14 +856,13 @@ static CcpnStatus process_chain(PyObject *contours, Contour_vertex v) {
         *((float *)(PyArray_GETPTR1(polyline, k++))) = v->x[1];
     }
 
-    // ejb - keep a count of the number of indices/vertices
-    numIndices += 2 * nvertices;
-    numVertices += nvertices;
+    // ejb - keep a count of the number of vertices; there are 2 indices per vertex
+    *total_vertices += nvertices;
 
     return CCPN_OK;
 }
 
-static CcpnStatus process_chains(PyObject *contours, Contour_vertices contour_vertices) {
+static CcpnStatus process_chains(PyObject *contours, Contour_vertices contour_vertices, int *total_vertices) {
     int i;
     int nvertices = contour_vertices->nvertices;
     int nalloc = contour_vertices->nalloc;
@@ -857,13 +879,18 @@ static CcpnStatus process_chains(PyObject *contours, Contour_vertices contour_ve
 
         if (v->visited) continue;
 
-        CHECK_STATUS(process_chain(contours, v));
+        CHECK_STATUS(process_chain(contours, v, total_vertices));
     }
 
     return CCPN_OK;
 }
 
-static void fillContours(PyArrayObject *contours, PyArrayObject *lineColour) {
+/* a contour line ending on the edges of the data is open; other lines are closed loops */
+static CcpnBool isOnEdge(float32 *vertex, float32 xMax, float32 yMax) {
+    return (vertex[0] <= 0 || vertex[1] <= 0 || vertex[0] >= xMax || vertex[1] >= yMax);
+}
+
+static void fillContours(PyObject *contours, PyArrayObject *lineColour, GL_arrays *gl, float32 xMax, float32 yMax) {
     int i, col, z, k, l, contCount = PyList_GET_SIZE(contours);
     int lineCount, fromSize, endIndex, contourCount;
     PyObject *this_contour_list;
@@ -884,29 +911,35 @@ static void fillContours(PyArrayObject *contours, PyArrayObject *lineColour) {
             //            // duh - used lineCount in wrong place
             //            indexPTR[indexCount++] = lineCount;
 
-            endIndex = lastIndex;
+            endIndex = gl->lastIndex;
             for (i = 0, z = 0; i < (int)(lineCount / 2); i++) {
-                indexPTR[indexCount++] = lastIndex++;
-                indexPTR[indexCount++] = lastIndex;
-                vertexPTR[vertexCount++] = fromArray[z++];
-                vertexPTR[vertexCount++] = fromArray[z++];
+                gl->indexPTR[gl->indexCount++] = gl->lastIndex++;
+                gl->indexPTR[gl->indexCount++] = gl->lastIndex;
+                gl->vertexPTR[gl->vertexCount++] = fromArray[z++];
+                gl->vertexPTR[gl->vertexCount++] = fromArray[z++];
 
                 // copy the colour across
                 for (col = 0; col < 4; col++) {
-                    colourPTR[colourCount + col] = fromColour[col];
+                    gl->colourPTR[gl->colourCount + col] = fromColour[col];
                 }
-                colourCount += 4;
+                gl->colourCount += 4;
+            }
+            if (lineCount >= 4 && isOnEdge(fromArray, xMax, yMax) && isOnEdge(fromArray + lineCount - 2, xMax, yMax)) {
+                // open line, e.g. at the edge of a tile; the last segment is degenerate rather than closing the line
+                gl->indexPTR[gl->indexCount - 1] = gl->lastIndex - 1;
+            } else {
+                gl->indexPTR[gl->indexCount - 1] = endIndex;
             }
-            indexPTR[indexCount - 1] = endIndex;
         }
         fromColour += 4;
     }
 }
 
-static PyObject *calculate_contours(PyArrayObject *data, PyArrayObject *levels) {
+static PyObject *calculate_contours(PyArrayObject *data, PyArrayObject *levels, int *total_vertices) {
     int l, nlevels = PyArray_DIM(levels, 0), npoints1 = PyArray_DIM(data, 0);
     float level, prev_level;
     CcpnBool more_levels, are_levels_increasing;
+    CcpnStatus status;
     PyObject *contours_list, *contourlevel_list;
     Contour_vertices contour_vertices;
 
@@ -956,15 +989,31 @@ static PyObject *calculate_contours(PyArrayObject *data, PyArrayObject *levels)
         level = *((float32 *)PyArray_GETPTR1(levels, l));
         contour_vertices->nvertices = 0;
 
-        if (find_vertices(contour_vertices, level, data, more_levels) == CCPN_ERROR) {
+        // the vertices are found in plain C, without Python objects; release the GIL meanwhile
+        Py_BEGIN_ALLOW_THREADS
+        status = find_vertices(contour_vertices, level, data, more_levels);
+        Py_END_ALLOW_THREADS
+
+        if (status == CCPN_ERROR) {
             Py_DECREF(contours_list);
             delete_contour_vertices(contour_vertices, nlevels, npoints1);
             RETURN_OBJ_ERROR("allocating vertex memory");
         }
 
-        if (contour_vertices->nvertices == 0) break;
+        if (contour_vertices->nvertices == 0) {
+            // no contours at this level; the next levels only have contours if the data are beyond this level,
+            // e.g. in a tile within a peak, where all the data are above the lowest level
+            Py_BEGIN_ALLOW_THREADS
+            more_levels = more_levels && is_data_beyond_level(contour_vertices, level, data);
+            Py_END_ALLOW_THREADS
+
+            if (!more_levels) break;
+            // the range examined for this level remains valid for the next level
+            contour_vertices->nrows_new = 0;
+            continue;
+        }
 
-        if (process_chains(contourlevel_list, contour_vertices) == CCPN_ERROR) {
+        if (process_chains(contourlevel_list, contour_vertices, total_vertices) == CCPN_ERROR) {
             Py_DECREF(contours_list);
             delete_contour_vertices(contour_vertices, nlevels, npoints1);
             RETURN_OBJ_ERROR("processing contourlevel_list");
@@ -981,6 +1030,7 @@ static PyObject *calculate_contours(PyArrayObject *data, PyArrayObject *levels)
 static PyObject *contourer(PyObject *self, PyObject *args) {
     PyArrayObject *data_obj, *levels_obj;
     PyObject *contours;
+    int total_vertices = 0;
 
     if (!PyArg_ParseTuple(args, "O!O!", &PyArray_Type, &data_obj, &PyArray_Type, &levels_obj))
         RETURN_OBJ_ERROR("need arguments: dataArray, levels ]");
@@ -993,12 +1043,12 @@ static PyObject *contourer(PyObject *self, PyObject *args) {
 
     if (PyArray_NDIM(levels_obj) != 1) RETURN_OBJ_ERROR("levelsArray needs to be NumPy array with ndim 1");
 
-    contours = calculate_contours(data_obj, levels_obj);
+    contours = calculate_contours(data_obj, levels_obj, &total_vertices);
 
     return contours;
 }
 
-static PyObject *newList(size) {
+static PyObject *newList(int size) {
     PyObject *list = PyList_New(size);
     if (!list) {
         RETURN_OBJ_ERROR("allocating list memory");
@@ -1027,14 +1077,13 @@ static PyObject *contourerGLList(PyObject *self, PyObject *args) {
     PyObject *dataArrays;
     PyArrayObject *dataArray, *posLevels, *posColour;
     PyArrayObject *negLevels, *negColour;
-    PyObject *contours_list;
-    //    PyObject *pos_cont_list, *neg_cont_list;
+    PyArrayObject *indexing, *vertices, *colours;
+    PyObject *gl_object_list;
     int arr, flatten = 0;
-
-    //    PyArrayObject *colours;
-
-    // define an empty array to pass out
-    contours_list = newList(1);
+    int numVertices = 0;
+    float32 xMax, yMax;
+    CcpnStatus status = CCPN_OK;
+    GL_arrays gl;
 
     // assumes that the parameters are all numpy arrays
     if (!PyArg_ParseTuple(args, "O!O!O!O!O!|i", &PyTuple_Type, &dataArrays, &PyArray_Type, &posLevels, &PyArray_Type,
@@ -1067,106 +1116,95 @@ static PyObject *contourerGLList(PyObject *self, PyObject *args) {
 
     if (flatten != 0 && flatten != 1) RETURN_OBJ_ERROR("flatten must be True/False");
 
-    //    npy_intp dims[1] = {24};
-    //    colours = (PyArrayObject *) PyArray_SimpleNew(1, dims, NPY_FLOAT32);
-    //    if (!colours)
-    //    	return CCPN_ERROR;
-
-    // initialise the index/vertex count
-    numIndices = 0;
-    numVertices = 0;
-    numColours = 0;
-
-    indexCount = 0;
-    vertexCount = 0;
-    colourCount = 0;
-
     int numArrays = PyTuple_GET_SIZE(dataArrays);
-    // PyObject *pos_cont_list[numArrays], *neg_cont_list[numArrays];
 
-    PyObject *pos_cont_list, *neg_cont_list;
-    PyArrayObject *posCont, *negCont;
-    pos_cont_list = newList(0);
-    neg_cont_list = newList(0);
+    PyObject *pos_cont_list, *neg_cont_list, *contours = NULL;
+    if (!(pos_cont_list = newList(0))) return NULL;
+    if (!(neg_cont_list = newList(0))) {
+        Py_DECREF(pos_cont_list);
+        return NULL;
+    }
 
     if ((numArrays > 1) && (flatten)) {
+        // overlay the planes; plain C on the numpy data
+        Py_BEGIN_ALLOW_THREADS
         for (int ii = 1; ii < numArrays; ii++)
             update_bounds((PyArrayObject *)PyTuple_GET_ITEM(dataArrays, 0), (PyArrayObject *)PyTuple_GET_ITEM(dataArrays, ii));
+        Py_END_ALLOW_THREADS
         numArrays = 1;
     }
 
-    for (arr = 0; arr < numArrays; arr++) {
+    for (arr = 0; arr < numArrays && status == CCPN_OK; arr++) {
         dataArray = (PyArrayObject *)PyTuple_GET_ITEM(dataArrays, arr);
 
-        // get the positive contours_list
-        // pos_cont_list[arr] = calculate_contours(dataArray, posLevels);
-        // neg_cont_list[arr] = calculate_contours(dataArray, negLevels);
+        // get the positive/negative contours_list
+        if (!(contours = calculate_contours(dataArray, posLevels, &numVertices)) ||
+            PyList_Append(pos_cont_list, contours) != 0)
+            status = CCPN_ERROR;
+        Py_CLEAR(contours);
+        if (status == CCPN_OK && (!(contours = calculate_contours(dataArray, negLevels, &numVertices)) ||
+                                  PyList_Append(neg_cont_list, contours) != 0))
+            status = CCPN_ERROR;
+        Py_CLEAR(contours);
+    }
 
-        PyList_Append(pos_cont_list, calculate_contours(dataArray, posLevels));
-        PyList_Append(neg_cont_list, calculate_contours(dataArray, negLevels));
+    if (status == CCPN_ERROR) {
+        Py_DECREF(pos_cont_list);
+        Py_DECREF(neg_cont_list);
+        if (!PyErr_Occurred()) PyErr_SetString(ErrorObject, "calculating contours");
+        return NULL;
     }
 
-    npy_intp dims[1] = {numIndices};
+    // 2 indices per vertex
+    npy_intp dims[1] = {2 * numVertices};
     indexing = (PyArrayObject *)PyArray_SimpleNew(1, dims, NPY_UINT32);
-    if (!indexing) RETURN_OBJ_ERROR("Cannot create index array");
 
     dims[0] = 2 * numVertices;
     vertices = (PyArrayObject *)PyArray_SimpleNew(1, dims, NPY_FLOAT32);
-    if (!vertices) RETURN_OBJ_ERROR("Cannot create vertex array");
 
     dims[0] = 4 * numVertices;
     colours = (PyArrayObject *)PyArray_SimpleNew(1, dims, NPY_FLOAT32);
-    if (!colours) RETURN_OBJ_ERROR("Cannot create colour array");
 
-    indexPTR = PyArray_GETPTR1(indexing, 0);
-    vertexPTR = PyArray_GETPTR1(vertices, 0);
-    colourPTR = PyArray_GETPTR1(colours, 0);
-    lastIndex = 0;
-    lastVertex = 0;
+    gl_object_list = newList(5);
 
-    for (arr = 0; arr < numArrays; arr++) {
-        // fill the new arrays
-        // fillContours(pos_cont_list[arr], posColour);
-        // fillContours(neg_cont_list[arr], negColour);
+    if (!indexing || !vertices || !colours || !gl_object_list) {
+        Py_XDECREF(indexing);
+        Py_XDECREF(vertices);
+        Py_XDECREF(colours);
+        Py_XDECREF(gl_object_list);
+        Py_DECREF(pos_cont_list);
+        Py_DECREF(neg_cont_list);
+        RETURN_OBJ_ERROR("Cannot create glList arrays");
+    }
 
-        posCont = (PyArrayObject *)PyList_GET_ITEM(pos_cont_list, arr);
-        negCont = (PyArrayObject *)PyList_GET_ITEM(neg_cont_list, arr);
+    gl.indexPTR = PyArray_GETPTR1(indexing, 0);
+    gl.vertexPTR = PyArray_GETPTR1(vertices, 0);
+    gl.colourPTR = PyArray_GETPTR1(colours, 0);
+    gl.indexCount = 0;
+    gl.vertexCount = 0;
+    gl.colourCount = 0;
+    gl.lastIndex = 0;
 
-        fillContours(posCont, posColour);
-        fillContours(negCont, negColour);
+    for (arr = 0; arr < numArrays; arr++) {
+        // fill the new arrays; the vertices are (x, y) within the (y, x) shape of the data
+        dataArray = (PyArrayObject *)PyTuple_GET_ITEM(dataArrays, arr);
+        xMax = (float32)(PyArray_DIM(dataArray, 1) - 1);
+        yMax = (float32)(PyArray_DIM(dataArray, 0) - 1);
+        fillContours(PyList_GET_ITEM(pos_cont_list, arr), posColour, &gl, xMax, yMax);
+        fillContours(PyList_GET_ITEM(neg_cont_list, arr), negColour, &gl, xMax, yMax);
     }
 
-    PyObject *ind = PyLong_FromDouble(numIndices);
-    PyObject *vect = PyLong_FromDouble(numVertices);
+    // the polylines have been copied into the glList arrays
+    Py_DECREF(pos_cont_list);
+    Py_DECREF(neg_cont_list);
 
-    gl_object_list = newList(5);
-    PyList_SET_ITEM(gl_object_list, 0, ind);
-    PyList_SET_ITEM(gl_object_list, 1, vect);
+    PyList_SET_ITEM(gl_object_list, 0, PyLong_FromLong(2 * numVertices));
+    PyList_SET_ITEM(gl_object_list, 1, PyLong_FromLong(numVertices));
     PyList_SET_ITEM(gl_object_list, 2, (PyObject *)indexing);
     PyList_SET_ITEM(gl_object_list, 3, (PyObject *)vertices);
     PyList_SET_ITEM(gl_object_list, 4, (PyObject *)colours);
 
     return gl_object_list;
-
-    //    // get the start/size of the numpy array
-    //    float32 *levelPTR = PyArray_GETPTR1(colours,0);
-    //    int sizeColours = (float32 *) PyArray_SIZE(colours);
-    //
-    ////    for (int i=0; i < sizeColours; i++, levelPTR++)
-    ////    {
-    ////        // fast memory accessing :)
-    ////        *levelPTR = i+32;
-    ////    }
-    //
-    //    for (int i=0; i < sizeColours; i++)
-    //    {
-    //        // fast memory accessing :)
-    //        levelPTR[i] = i+15.765;
-    //    }
-    //
-    //    PyList_SET_ITEM(contours_list, 0, colours);
-    //
-    //    return contours_list;
 }
 
 static char contourer_doc[] = "Create 2D contours for spectral data";
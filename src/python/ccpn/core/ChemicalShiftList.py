@@ -82,6 +82,10 @@ CS_TABLECOLUMNS = (CS_UNIQUEID, CS_ISDELETED, CS_PID,
                    CS_ALLPEAKS, CS_SHIFTLISTPEAKSCOUNT, CS_ALLPEAKSCOUNT,
                    CS_COMMENT, CS_OBJECT)
 
+# columns that cannot be set by _setColumns; the nmrAtom and its derived columns are set by the
+# nmrAtom property of the chemicalShift, as they require the lookup-indexes to be updated
+_CS_READONLYCOLUMNS = (CS_UNIQUEID, CS_NMRATOM, CS_CHAINCODE, CS_SEQUENCECODE, CS_RESIDUETYPE, CS_ATOMNAME)
+
 # NOTE:ED - these currently match the original V3 classNames - not ChemShift
 #   it is the name used in the dataframe and in project._getNextUniqueIdValue
 CS_CLASSNAME = 'ChemicalShift'
@@ -150,6 +154,13 @@ class ChemicalShiftList(AbstractWrapperObject):
         self._shifts = []
         self._deletedShifts = []
 
+        # lookup indexes for the dataframe/shifts - built when first required, see _getIndexes/_getShiftByUniqueId
+        self._indexedData = None
+        self._indexedLength = 0
+        self._nmrAtomIndex = {}
+        self._rowIndex = {}
+        self._shiftIndex = None
+
         super().__init__(project, wrappedData)
 
     #=========================================================================================
@@ -373,58 +384,31 @@ class ChemicalShiftList(AbstractWrapperObject):
         if nmrAtom and uniqueId:
             raise ValueError(f'{self.className}.getChemicalShift: use either nmrAtom or uniqueId')
 
-        _data = self._wrappedData.data
-        if _data is None:
+        if self._wrappedData.data is None:
             return
 
-        rows = None
+        nmrAtomIndex, rowIndex = self._getIndexes()
         if nmrAtom:
             # get shift by nmrAtom
             nmrAtom = self.project.getByPid(nmrAtom) if isinstance(nmrAtom, str) else nmrAtom
             if not isinstance(nmrAtom, (NmrAtom, type(None))):
                 raise ValueError(f'{self.className}.getChemicalShift: nmrAtom must be of type NmrAtom or str')
-            if nmrAtom:
-                # search dataframe
-                rows = _data[_data[CS_NMRATOM] == nmrAtom.pid]
+            if not nmrAtom or (uniqueId := nmrAtomIndex.get(nmrAtom.pid)) is None:
+                return
 
         elif uniqueId is not None:
             # get shift by uniqueId
             if not isinstance(uniqueId, int):
                 raise ValueError(f'{self.className}.getChemicalShift: uniqueId must be an int')
+            if uniqueId not in rowIndex:
+                return
 
-            # search dataframe
-            rows = _data[_data[CS_UNIQUEID] == uniqueId]
-
-        if rows is not None:
-            if len(rows) > 1:
-                raise RuntimeError(f'{self.className}.getChemicalShift: bad number of shifts in list')
-            if len(rows) == 1:
-                uniqueId = rows.iloc[0].uniqueId
-                _shs = [sh for sh in self._shifts if sh._uniqueId == uniqueId]
-                if _shs and len(_shs) == 1:
-                    return _shs[0]
-
-                if _includeDeleted:
-                    _shs = [sh for sh in self._deletedShifts if sh._uniqueId == uniqueId]
-                    if _shs and len(_shs) == 1:
-                        return _shs[0]
-
-                raise ValueError(f'{self.className}.getChemicalShift: shift not found')
-
-                # # this is marginally quicker
-                # _s, _e = 0, len(self._shifts) - 1
-                # _sh = None
-                # while _s <= _e:
-                #     _m = (_s + _e) // 2
-                #     _sh = self._shifts[_m]
-                #     if _sh._uniqueId == uniqueId:
-                #         return _sh
-                #     if _sh._uniqueId > uniqueId:
-                #         _e = _m - 1
-                #     else:
-                #         _s = _m + 1
-                #
-                # raise ValueError(f'{self.className}.getChemicalShift: shift not found')
+        else:
+            return
+
+        if (shift := self._getShiftByUniqueId(uniqueId, includeDeleted=_includeDeleted)) is None:
+            raise ValueError(f'{self.className}.getChemicalShift: shift not found')
+        return shift
 
     #=========================================================================================
     # property STUBS: hot-fixed later
@@ -496,6 +480,8 @@ class ChemicalShiftList(AbstractWrapperObject):
             # add the shift to the nmrAtom
             shift._updateNmrAtomShifts()
 
+        # uniqueIds have been changed in-place
+        ncsl._resetIndexes()
         ncsl.autoUpdate = autoUpdate
         for att in ['unit', 'isSimulated', 'comment']:
             setattr(ncsl, att, getattr(self, att, None))
@@ -544,7 +530,10 @@ class ChemicalShiftList(AbstractWrapperObject):
         """Set the attribute of the chemicalShift with the supplied uniqueId
         """
         try:
+            if name == CS_NMRATOM:
+                self._updateNmrAtomIndex(uniqueId, value)
             self._data.at[uniqueId, name] = value
+            self._setModified()
         except Exception as es:
             raise ValueError(
                 f'{self.className}._setAttribute: error setting attribute {name} in {self}  -  {es}') from None
@@ -568,17 +557,151 @@ class ChemicalShiftList(AbstractWrapperObject):
         """Set the attributes of the chemicalShift with the supplied uniqueId
         """
         try:
+            oldPid = self._data.at[uniqueId, CS_NMRATOM]
             self._data.loc[uniqueId, startName:endName] = value
+            # read back the nmrAtom in case it is included in the range
+            self._updateNmrAtomIndex(uniqueId, self._data.at[uniqueId, CS_NMRATOM], oldPid=oldPid)
+            self._setModified()
         except Exception as es:
             raise ValueError(
                 f'{self.className}._setAttributes: error setting attributes {startName}|{endName} in {self}  -  {es}') from None
 
+    def _getColumns(self, names, uniqueIds=None):
+        """Get the named columns for the chemicalShifts with the supplied uniqueIds, or all rows if None,
+        as a new dataframe
+        CCPN Internal - bulk alternative to _getAttribute
+        """
+        if (_data := self._data) is None:
+            return None
+
+        try:
+            if uniqueIds is None:
+                return _data.loc[:, list(names)]
+
+            _nmrAtomIndex, rowIndex = self._getIndexes()
+            return _data.iloc[[rowIndex[uid] for uid in uniqueIds], [_data.columns.get_loc(name) for name in names]]
+        except Exception as es:
+            raise ValueError(
+                f'{self.className}._getColumns: error getting columns {names} in {self}  -  {es}') from None
+
+    def _setColumns(self, names, values, uniqueIds=None):
+        """Set the named columns for the chemicalShifts with the supplied uniqueIds, or all rows if None.
+        values must be a dataframe or array-like of shape (rows, len(names))
+        CCPN Internal - bulk alternative to _setAttribute; undoable, no notifiers are called
+        The uniqueId, nmrAtom and derived (chainCode, sequenceCode, residueType, atomName) columns
+        cannot be set; use the nmrAtom property of the chemicalShifts
+        """
+        if self._data is None:
+            return
+        if (_invalid := [name for name in names if name in _CS_READONLYCOLUMNS]):
+            raise ValueError(f'{self.className}._setColumns: cannot set column(s) {_invalid}')
+
+        names = list(names)
+        uniqueIds = None if uniqueIds is None else list(uniqueIds)
+        if not isinstance(values, pd.DataFrame):
+            # infer the dtype of each column separately
+            values = pd.DataFrame(values)
+        # use the values by position, not aligned by label; copy to keep for redo
+        columns = [values.iloc[:, col].to_numpy(copy=True) for col in range(values.shape[1])]
+        _oldValues = self._getColumns(names, uniqueIds)
+        _oldColumns = [_oldValues.iloc[:, col].to_numpy() for col in range(len(names))]
+
+        self._writeColumns(names, columns, uniqueIds)
+
+        # add an undo/redo item to recover the values
+        with undoStackBlocking() as addUndoItem:
+            addUndoItem(undo=partial(self._writeColumns, names, _oldColumns, uniqueIds),
+                        redo=partial(self._writeColumns, names, columns, uniqueIds))
+
+    def _writeColumns(self, names, columns, uniqueIds):
+        """Write the list of column-values into the named columns for the chemicalShifts with the supplied
+        uniqueIds, or all rows if None
+        """
+        _data = self._data
+        try:
+            if len(columns) != len(names):
+                raise ValueError(f'expected {len(names)} columns, got {len(columns)}')
+
+            _nmrAtomIndex, rowIndex = self._getIndexes()
+            rows = slice(None) if uniqueIds is None else [rowIndex[uid] for uid in uniqueIds]
+            for name, column in zip(names, columns):
+                _data.iloc[rows, _data.columns.get_loc(name)] = column
+            self._setModified()
+        except Exception as es:
+            raise ValueError(
+                f'{self.className}._setColumns: error setting columns {names} in {self}  -  {es}') from None
+
+    def _setModified(self):
+        """Flag the shiftList and its topObject as modified after changing the dataframe in-place;
+        these changes are not seen by the api
+        """
+        self._wrappedData.__dict__['isModified'] = True
+        self._wrappedData.topObject.__dict__['isModified'] = True
+
+    def _getIndexes(self):
+        """Return the (nmrAtom-pid: uniqueId, uniqueId: row) dicts for the dataframe.
+        Rebuilt when the dataframe has been replaced, e.g., by a new shift or undo/redo
+        CCPN Internal
+        """
+        if (_data := self._wrappedData.data) is None:
+            return {}, {}
+
+        if not self._isIndexed(_data):
+            uniqueIds = [int(uid) for uid in _data[CS_UNIQUEID]]
+            self._rowIndex = {uid: row for row, uid in enumerate(uniqueIds)}
+            self._nmrAtomIndex = {pid: uid for pid, uid in zip(_data[CS_NMRATOM], uniqueIds) if isinstance(pid, str)}
+            self._indexedData, self._indexedLength = _data, len(_data)
+
+        return self._nmrAtomIndex, self._rowIndex
+
+    def _isIndexed(self, data):
+        """Return True if the indexes are valid for data
+        """
+        return data is not None and self._indexedData is data and self._indexedLength == len(data)
+
+    def _resetIndexes(self):
+        """Clear the indexes, e.g., after modifying the dataframe in-place
+        """
+        self._indexedData = None
+        self._indexedLength = 0
+        self._nmrAtomIndex = {}
+        self._rowIndex = {}
+        self._shiftIndex = None
+
+    def _updateNmrAtomIndex(self, uniqueId, pid, oldPid=None):
+        """Update the nmrAtom index for a change of nmrAtom of the shift with the supplied uniqueId;
+        oldPid is read from the dataframe if not supplied
+        """
+        if not self._isIndexed(_data := self._data):
+            # will be rebuilt when required
+            return
+
+        if oldPid is None:
+            oldPid = _data.at[uniqueId, CS_NMRATOM]
+        if isinstance(oldPid, str) and self._nmrAtomIndex.get(oldPid) == uniqueId:
+            del self._nmrAtomIndex[oldPid]
+        if isinstance(pid, str):
+            self._nmrAtomIndex[pid] = int(uniqueId)
+
+    def _getShiftByUniqueId(self, uniqueId, includeDeleted=False):
+        """Return the shift with the supplied uniqueId, or None if not found
+        CCPN Internal
+        """
+        if self._shiftIndex is None:
+            self._shiftIndex = {sh._uniqueId: sh for sh in self._shifts}
+
+        if (shift := self._shiftIndex.get(uniqueId)) is not None:
+            return shift
+        if includeDeleted:
+            return next((sh for sh in self._deletedShifts if sh._uniqueId == uniqueId), None)
+
     def _undoRedoShifts(self, shifts):
         """update the shifts after undo/redo
         shifts should be a simple, non-nested dict of int:<shift> pairs
         """
         # keep the same shift list
         self._shifts[:] = shifts
+        self._shiftIndex = None
 
     def _undoRedoDeletedShifts(self, deletedShifts):
         """update to deleted shifts after undo/redo
@@ -609,7 +732,7 @@ class ChemicalShiftList(AbstractWrapperObject):
         if nmrAtom and uniqueId:
             raise ValueError(f'{self.className}._searchChemicalShifts: use either nmrAtom or uniqueId')
 
-        if (_data := self._wrappedData.data) is None:
+        if self._wrappedData.data is None:
             return
 
         if nmrAtom:
@@ -618,16 +741,16 @@ class ChemicalShiftList(AbstractWrapperObject):
             if not isinstance(nmrAtom, NmrAtom):
                 raise ValueError(f'{self.className}._searchChemicalShifts: nmrAtom must be of type NmrAtom, str')
 
-            # search dataframe for single element
-            return nmrAtom.pid in set(_data[CS_NMRATOM])
+            nmrAtomIndex, _rowIndex = self._getIndexes()
+            return nmrAtom.pid in nmrAtomIndex
 
         elif uniqueId is not None:
             # get shift by uniqueId
             if not isinstance(uniqueId, int):
                 raise ValueError(f'{self.className}._searchChemicalShifts: uniqueId must be an int - {uniqueId}')
 
-            # search dataframe for single element
-            return uniqueId in set(_data[CS_UNIQUEID])
+            _nmrAtomIndex, rowIndex = self._getIndexes()
+            return uniqueId in rowIndex
 
     def delete(self):
         """Delete the chemicalShiftList and associated chemicalShifts
@@ -643,6 +766,7 @@ class ChemicalShiftList(AbstractWrapperObject):
 
                 self._shifts.remove(sh)
                 self._deletedShifts.append(sh)  # not sorted - sort?
+                self._removeFromShiftIndex(sh)
 
                 _newShifts = self._shifts[:]
                 _newDeletedShifts = self._deletedShifts[:]
@@ -766,14 +890,7 @@ class ChemicalShiftList(AbstractWrapperObject):
         """
 
         data = self._wrappedData.data
-        if nmrAtom is not None:
-            _nmrAtom = self.project.getByPid(nmrAtom) if isinstance(nmrAtom, str) else nmrAtom
-            if _nmrAtom is None:
-                raise ValueError(f'{self.className}.newChemicalShift: nmrAtom {_nmrAtom} not found')
-            nmrAtom = _nmrAtom
-
-        if data is not None and nmrAtom and nmrAtom.pid in list(data[CS_NMRATOM]):
-            raise ValueError(f'{self.className}.newChemicalShift: nmrAtom {nmrAtom} already exists')
+        nmrAtom = self._checkNewNmrAtom(data, nmrAtom)
 
         return self._newChemicalShiftObject(data=data,
                                             value=value, valueError=valueError, figureOfMerit=figureOfMerit,
@@ -783,47 +900,117 @@ class ChemicalShiftList(AbstractWrapperObject):
                                             atomName=atomName,
                                             comment=comment)
 
-    @newV3Object()
-    def _newChemicalShiftObject(self, data, value, valueError, figureOfMerit, static,
-                                nmrAtom, chainCode, sequenceCode, residueType, atomName, comment):
-        """Create a new pure V3 ChemicalShift object
-        Method is wrapped with create/delete notifier
+    def _newChemicalShifts(self, shiftParameters) -> list:
+        """Create new chemicalShifts from a list of dicts with the parameters of newChemicalShift.
+        The rows are added to the dataframe in a single concat, rather than one concat per shift;
+        all parameters are checked before any shift is created.
+        CCPN Internal - bulk alternative to newChemicalShift, e.g., for loading nef-files
+        :return: a list of the new chemicalShifts
+        """
+        shiftParameters = [dict(parameters) for parameters in shiftParameters]
+        if not shiftParameters:
+            return []
+
+        data = self._wrappedData.data
+        newPids = set()
+        for parameters in shiftParameters:
+            nmrAtom = parameters['nmrAtom'] = self._checkNewNmrAtom(data, parameters.get('nmrAtom'))
+            if nmrAtom is not None:
+                if nmrAtom.pid in newPids:
+                    raise ValueError(f'{self.className}._newChemicalShifts: nmrAtom {nmrAtom} is repeated')
+                newPids.add(nmrAtom.pid)
+        _rows = self._getShiftRows(shiftParameters)
+
+        with undoBlock():
+            # add an undo/redo item to recover shifts; added first, so that the shifts are recovered
+            # after the deletion, or before the creation, of the shift objects
+            _oldShifts, _newShifts = self._shifts[:], []
+            with undoStackBlocking() as addUndoItem:
+                addUndoItem(undo=partial(self._undoRedoShifts, _oldShifts),
+                            redo=partial(self._undoRedoShifts, _newShifts))
+
+            uniqueIds = self._appendShiftRows(data, _rows)
+            shifts = [self._newChemicalShiftFromRow(uniqueId, parameters['nmrAtom'])
+                      for uniqueId, parameters in zip(uniqueIds, shiftParameters)]
+            _newShifts[:] = self._shifts
+
+        return shifts
+
+    def _checkNewNmrAtom(self, data, nmrAtom):
+        """Check that nmrAtom (core object, Pid or pid string) can be assigned to a new chemicalShift
+        :return: the nmrAtom object or None
+        """
+        if nmrAtom is not None:
+            _nmrAtom = self.project.getByPid(nmrAtom) if isinstance(nmrAtom, str) else nmrAtom
+            if _nmrAtom is None:
+                raise ValueError(f'{self.className}.newChemicalShift: nmrAtom {_nmrAtom} not found')
+            nmrAtom = _nmrAtom
+
+        if data is not None and nmrAtom and nmrAtom.pid in self._getIndexes()[0]:
+            raise ValueError(f'{self.className}.newChemicalShift: nmrAtom {nmrAtom} already exists')
+        return nmrAtom
+
+    def _getShiftRows(self, shiftParameters) -> list:
+        """Make the dataframe row for each dict of newChemicalShift parameters, with a new uniqueId;
+        the nmrAtoms are not set
+        :return: a list of row-tuples
+        """
+        from ccpn.core.ChemicalShift import _getByTuple
+
+        # make new tuples - verifies contents
+        _rows = []
+        for parameters in shiftParameters:
+            _rows.append(_getByTuple(chemicalShiftList=self,
+                                     uniqueId=self.project._getNextUniqueIdValue(CS_CLASSNAME),
+                                     isDeleted=False,
+                                     static=parameters.get('static', False),
+                                     value=parameters.get('value'), valueError=parameters.get('valueError'),
+                                     figureOfMerit=parameters.get('figureOfMerit', 1.0),
+                                     nmrAtom=None,  # MUST be None here and set later
+                                     chainCode=parameters.get('chainCode'),
+                                     sequenceCode=parameters.get('sequenceCode'),
+                                     residueType=parameters.get('residueType'),
+                                     atomName=parameters.get('atomName'),
+                                     comment=parameters.get('comment')))
+        return _rows
+
+    def _appendShiftRows(self, data, _rows) -> list:
+        """Add the rows (see _getShiftRows) to the dataframe in a single concat
+        :return: a list of the uniqueIds of the new rows
         """
-        from ccpn.core.ChemicalShift import _getByTuple, _newChemicalShift as _newShift
-
-        # make new tuple - verifies contents
-        _nextUniqueId = self.project._getNextUniqueIdValue(CS_CLASSNAME)
-        _row = _getByTuple(chemicalShiftList=self,
-                           uniqueId=_nextUniqueId,
-                           isDeleted=False,
-                           static=static,
-                           value=value, valueError=valueError, figureOfMerit=figureOfMerit,
-                           nmrAtom=None,  # MUST be None here and set later
-                           chainCode=chainCode, sequenceCode=sequenceCode,
-                           residueType=residueType, atomName=atomName,
-                           comment=comment)
         # add to dataframe - this is in undo stack and marked as modified
-        # Note the "additional" tuple around _row; needed to match the shape as one row, 12 columns
-        _dfRow = pd.DataFrame(data=(_row,), columns=CS_COLUMNS)
+        _dfRows = pd.DataFrame(data=_rows, columns=CS_COLUMNS)
+        _indexed = self._isIndexed(data)
 
         if data is None or data.empty:
             # set as the new subclassed DataFrameABC
-            _data = self._wrappedData.data = _dfRow  # _ChemicalShiftListFrame(_dfRow)
+            _data = self._wrappedData.data = _dfRows  # _ChemicalShiftListFrame(_dfRows)
         else:
-            # not particularly fast, but no alternative for now
-            # _data = self._wrappedData.data = self._wrappedData.data.append(_dfRow)  # deprecated
-            _data = self._wrappedData.data = pd.concat([self._wrappedData.data, _dfRow], axis=0, ignore_index=True)
+            _data = self._wrappedData.data = pd.concat([data, _dfRows], axis=0, ignore_index=True)
         _data.set_index(_data[CS_UNIQUEID], inplace=True, )
 
-        # create new shift object
-        # new Shift only needs chemicalShiftList and uniqueId - properties are linked to dataframe
-        shift = _newShift(self.project, self, _uniqueId=int(_nextUniqueId))
-        if nmrAtom:
-            # None above should ensure recalculation of shift values from assignments
-            shift.nmrAtom = nmrAtom
+        uniqueIds = [int(_row[0]) for _row in _rows]
+        if _indexed:
+            # extend the indexes rather than rebuild for the new dataframe; nmrAtoms are set later
+            _start = len(_data) - len(uniqueIds)
+            self._rowIndex.update((uniqueId, _start + ii) for ii, uniqueId in enumerate(uniqueIds))
+            self._indexedData, self._indexedLength = _data, len(_data)
+        return uniqueIds
 
+    @newV3Object()
+    def _newChemicalShiftObject(self, data, value, valueError, figureOfMerit, static,
+                                nmrAtom, chainCode, sequenceCode, residueType, atomName, comment):
+        """Create a new pure V3 ChemicalShift object
+        Method is wrapped with create/delete notifier
+        """
+        _rows = self._getShiftRows([dict(value=value, valueError=valueError, figureOfMerit=figureOfMerit,
+                                         static=static,
+                                         chainCode=chainCode, sequenceCode=sequenceCode,
+                                         residueType=residueType, atomName=atomName,
+                                         comment=comment)])
+        (uniqueId,) = self._appendShiftRows(data, _rows)
         _oldShifts = self._shifts[:]
-        self._shifts.append(shift)
+        shift = self._makeChemicalShift(uniqueId, nmrAtom)
         _newShifts = self._shifts[:]
 
         # add an undo/redo item to recover shifts
@@ -833,6 +1020,31 @@ class ChemicalShiftList(AbstractWrapperObject):
 
         return shift
 
+    @newV3Object()
+    def _newChemicalShiftFromRow(self, uniqueId, nmrAtom):
+        """Create a new pure V3 ChemicalShift object for the existing row uniqueId;
+        the undo-item to recover the shifts is added by the caller
+        Method is wrapped with create/delete notifier
+        """
+        return self._makeChemicalShift(uniqueId, nmrAtom)
+
+    def _makeChemicalShift(self, uniqueId, nmrAtom):
+        """Create the shift object for row uniqueId, and add to the shifts
+        """
+        from ccpn.core.ChemicalShift import _newChemicalShift as _newShift
+
+        # create new shift object
+        # new Shift only needs chemicalShiftList and uniqueId - properties are linked to dataframe
+        shift = _newShift(self.project, self, _uniqueId=int(uniqueId))
+        if nmrAtom:
+            # None above should ensure recalculation of shift values from assignments
+            shift.nmrAtom = nmrAtom
+
+        self._shifts.append(shift)
+        if self._shiftIndex is not None:
+            self._shiftIndex[shift._uniqueId] = shift
+        return shift
+
     @logCommand(get='self')
     def deleteChemicalShift(self, nmrAtom: Union[None, NmrAtom, str] = None, uniqueId: int = None):
         """Delete a chemicalShift by nmrAtom or uniqueId
@@ -843,18 +1055,14 @@ class ChemicalShiftList(AbstractWrapperObject):
         if self._wrappedData.data is None:
             return
 
+        nmrAtomIndex, rowIndex = self._getIndexes()
         if nmrAtom:
             # get shift by nmrAtom
             nmrAtom = self.project.getByPid(nmrAtom) if isinstance(nmrAtom, str) else nmrAtom
             if not isinstance(nmrAtom, NmrAtom):
                 raise ValueError(f'{self.className}.deleteChemicalShift: nmrAtom must be of type NmrAtom, str')
 
-            # search dataframe for single element
-            _data = self._wrappedData.data
-            rows = _data[_data[CS_NMRATOM] == nmrAtom.pid]
-            if len(rows) > 1:
-                raise RuntimeError(f'{self.className}.deleteChemicalShift: bad number of shifts in list')
-            elif len(rows) == 0:
+            if (uniqueId := nmrAtomIndex.get(nmrAtom.pid)) is None:
                 raise ValueError(f'{self.className}.deleteChemicalShift: nmrAtom {nmrAtom.pid} not found')
 
         elif uniqueId is not None:
@@ -862,44 +1070,40 @@ class ChemicalShiftList(AbstractWrapperObject):
             if not isinstance(uniqueId, int):
                 raise ValueError(f'{self.className}.deleteChemicalShift: uniqueId must be an int')
 
-            # search dataframe for single element
-            _data = self._wrappedData.data
-            rows = _data[_data[CS_UNIQUEID] == uniqueId]
-            if len(rows) > 1:
-                raise RuntimeError(f'{self.className}.deleteChemicalShift: bad number of shifts in list')
-            elif len(rows) == 0:
+            if uniqueId not in rowIndex:
                 raise ValueError(f'{self.className}.deleteChemicalShift: uniqueId {uniqueId} not found')
 
         else:
             return
 
-        uniqueId = rows.iloc[0].uniqueId
-        if (_shs := [sh for sh in self._shifts if sh._uniqueId == uniqueId]):
+        if (_val := self._getShiftByUniqueId(uniqueId)) is not None:
             # raise an error if there are any assigned peaks
-            _val = _shs[0]
             if _val.assignedPeaks:
                 raise ValueError(
                     f'{self.className}.deleteChemicalShift: cannot delete chemicalShift with assigned peaks')
 
-            self._deleteChemicalShiftObject(rows)
+            self._deleteChemicalShiftObject(_val)
 
-    def _deleteChemicalShiftObject(self, rows):
+    def _deleteChemicalShiftObject(self, shift):
         """Update the dataframe and handle notifiers
         """
         _oldShifts = self._shifts[:]
         _oldDeletedShifts = self._deletedShifts[:]
 
-        uniqueId = rows.iloc[0].uniqueId
-        _shs = [sh for sh in self._shifts if sh._uniqueId == uniqueId]
-        _val = _shs[0]
-
-        self._shifts.remove(_val)
-        self._deletedShifts.append(_val)  # not sorted - sort?
+        self._shifts.remove(shift)
+        self._deletedShifts.append(shift)  # not sorted - sort?
+        self._removeFromShiftIndex(shift)
 
         _newShifts = self._shifts[:]
         _newDeletedShifts = self._deletedShifts[:]
 
-        _val._deleteWrapper(self, _newDeletedShifts, _newShifts, _oldDeletedShifts, _oldShifts)
+        shift._deleteWrapper(self, _newDeletedShifts, _newShifts, _oldDeletedShifts, _oldShifts)
+
+    def _removeFromShiftIndex(self, shift):
+        """Remove the shift from the uniqueId index after removing from the shifts
+        """
+        if self._shiftIndex is not None and self._shiftIndex.get(shift._uniqueId) is shift:
+            del self._shiftIndex[shift._uniqueId]
 
 
 #=========================================================================================
@@ -1079,6 +1079,10 @@ class Peak(AbstractWrapperObject):
     def _finaliseAction(self, action: str, **actionKwds):
         """Subclassed to handle associated multiplets
         """
+        # keep the spatial index of the peakList up to date, irrespective of notification blanking
+        if action in {'change', 'create', 'delete'} and (peakIndex := self._parent._peakIndex) is not None:
+            peakIndex.updatePeak(self, action)
+
         if not super()._finaliseAction(action, **actionKwds):
             return
 
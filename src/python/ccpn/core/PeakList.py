@@ -66,6 +66,9 @@ class PeakList(PMIListABC):
     # Qualified name of matching API class
     _apiClassQualifiedName = ApiPeakList._metaclass.qualifiedName()
 
+    # spatial index of the peaks; see _getPeakIndex
+    _peakIndex = None
+
     #=========================================================================================
     # CCPN properties
     #=========================================================================================
@@ -186,7 +189,7 @@ class PeakList(PMIListABC):
 
     @logCommand(get='self')
     def copyTo(self, targetSpectrum: Spectrum, targetPeakList=None, includeAllPeakProperties=True,
-               **kwargs) -> 'PeakList':
+               skipExisting=False, **kwargs) -> 'PeakList':
         """
         Copy the origin PeakList peaks to a targetSpectrum.
         If targetPeakList is given, peaks will be added to it, otherwise a new PeakList is created (default behaviour).
@@ -194,6 +197,8 @@ class PeakList(PMIListABC):
 
         :param targetSpectrum:  object: Core.Spectrum or Str: Pid
         :param targetPeakList:  object: Core.PeakList or Str: Pid
+        :param skipExisting:    do not copy peaks that have a peak in targetPeakList within the
+                                assignmentTolerances of targetSpectrum
         :param kwargs:          any extra PeakList attributes for newly created peakLists.
                                 Not used if it is given a targetPeakList
         """
@@ -242,7 +247,14 @@ class PeakList(PMIListABC):
             if not targetPeakList:
                 targetPeakList = targetSpectrum.newPeakList(**params)
 
+            if skipExisting:
+                peakIndex = targetPeakList._getPeakIndex()
+                tolerances = targetSpectrum.assignmentTolerances
+                dimensions = self.spectrum.getByAxisCodes('dimensions', targetSpectrum.axisCodes, exactMatch=False)
+
             for peak in self.peaks:
+                if skipExisting and peakIndex.peaksNear(peak.getByDimensions('ppmPositions', dimensions), tolerances):
+                    continue
                 peak.copyTo(targetPeakList, includeAllProperties=includeAllPeakProperties)
 
         return targetPeakList
@@ -254,15 +266,6 @@ class PeakList(PMIListABC):
         and puts those in a new peakList3.  Assumes a common spectrum for now.
         """
 
-        def _havePeakNearPosition(values, tolerances, peaks) -> Optional['Peak']:
-
-            for peak in peaks:
-                for i, position in enumerate(peak.position):
-                    if abs(position - values[i]) > tolerances[i]:
-                        break
-                else:
-                    return peak
-
         peakList = self.project.getByPid(peakList) if isinstance(peakList, str) else peakList
         if not peakList:
             raise TypeError('peakList not defined')
@@ -281,12 +284,11 @@ class PeakList(PMIListABC):
             # dataDims = spectrum.sortedDataDims()
             tolerances = self.spectrum.assignmentTolerances
 
-            peaks2 = peakList.peaks
+            peakIndex2 = peakList._getPeakIndex()
             peakList3 = spectrum.newPeakList()
 
             for peak1 in self.peaks:
-                values1 = [peak1.position[dim] for dim in range(len(peak1.position))]
-                if not _havePeakNearPosition(values1, tolerances, peaks2):
+                if not peakIndex2.peaksNear(peak1.position, tolerances):
                     peakList3.newPeak(height=peak1.height, volume=peak1.volume, figureOfMerit=peak1.figureOfMerit,
                                       annotation=peak1.annotation, ppmPositions=peak1.position,
                                       pointPositions=peak1.pointPositions)
@@ -391,14 +393,15 @@ class PeakList(PMIListABC):
     @logCommand(get='self')
     def calculateClusterIds(self, tolerances=None, clustererName=None):
         """
-        Calculate clusterIDs for peaks using the in Depth-First-Search (DFS) algorithm.
+        Calculate clusterIDs for peaks using the clusterer defined by clustererName
+        (see PeakClustering.PeakClusterers); defaults to the KD-tree/union-find algorithm.
         """
-        from ccpn.core.lib.PeakClustering import PeakClusterers, DFSPeakClusterer
+        from ccpn.core.lib.PeakClustering import PeakClusterers, KDTreePeakClusterer
 
         if tolerances is None:
             defaultTolerancePoints = 8
             tolerances = [defaultTolerancePoints] * self.spectrum.dimensionCount
-        clusterer = PeakClusterers.get(clustererName, DFSPeakClusterer)
+        clusterer = PeakClusterers.get(clustererName, KDTreePeakClusterer)
         peakClusterer = clusterer(self.peaks, tolerances)
         clusters = peakClusterer.findClusters()
         peakClusterer.setClusterIdToPeaks(clusters)
@@ -505,6 +508,25 @@ class PeakList(PMIListABC):
                                    axis, isotope in axisIso]
                         peak.assignDimensions(axisCodes=peak.axisCodes, values=newNmrs)
 
+    def peaksNear(self, ppmPositions: Sequence[float], tolerances: Sequence[float] = None) -> list['Peak']:
+        """Get the peaks within tolerances of ppmPositions along all dimensions
+
+        :param ppmPositions: position (ppm) in dimension order
+        :param tolerances: tolerances (ppm) in dimension order; defaults to spectrum.assignmentTolerances
+        :return: a list of peaks
+        """
+        if tolerances is None:
+            tolerances = self.spectrum.assignmentTolerances
+        return self._getPeakIndex().peaksNear(ppmPositions, tolerances)
+
+    def peaksInRegion(self, region: Sequence[Sequence[float]]) -> list['Peak']:
+        """Get the peaks within region
+
+        :param region: a (minPpm, maxPpm) tuple for each dimension, in dimension order
+        :return: a list of peaks
+        """
+        return self._getPeakIndex().peaksInRegion(region)
+
     #=========================================================================================
     # Implementation methods
     #=========================================================================================
@@ -515,6 +537,16 @@ class PeakList(PMIListABC):
         # call the delete method from the parent class
         self._parent._deletePeakList(self)
 
+    def _getPeakIndex(self):
+        """:return the spatial index of the peaks; created on first use, kept up to date by
+        Peak._finaliseAction
+        """
+        from ccpn.core.lib.PeakIndex import PeakIndex
+
+        if self._peakIndex is None:
+            self._peakIndex = PeakIndex(self)
+        return self._peakIndex
+
     @classmethod
     def _getAllWrappedData(cls, parent: Spectrum) -> list:
         """get wrappedData (PeakLists) for all PeakList children of parent Spectrum"""
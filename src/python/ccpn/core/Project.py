@@ -46,11 +46,12 @@ from ccpn.core._implementation.Updater import UPDATE_POST_PROJECT_INITIALISATION
 from ccpn.core._implementation.V3CoreObjectABC import V3CoreObjectABC
 
 from ccpn.core.lib import Pid
+from ccpn.core.lib.PidIndex import PidDict
 from ccpn.core.lib import Undo
 from ccpn.core.lib.ProjectSaveHistory import getProjectSaveHistory, newProjectSaveHistory
 from ccpn.core.lib.ProjectLib import createLogger
 from ccpn.core.lib.ContextManagers import notificationBlanking, undoBlock, undoBlockWithoutSideBar, \
-    inactivity, logCommandManager, ccpNmrV3CoreUndoBlock
+    inactivity, logCommandManager, ccpNmrV3CoreUndoBlock, notificationSuspend
 
 from ccpn.util import Logging
 from ccpn.util.ExcelReader import ExcelReader
@@ -983,9 +984,11 @@ class Project(AbstractWrapperObject):
         # Active notifiers - saved for later cleanup. CORE APPLICATION ONLY
         self._activeNotifiers = []
 
-        # list or None. When set used to accumulate pending notifiers
-        # Optional list. Elements are (func, onceOnly, wrapperObject, optional oldPid)
+        # Accumulated notifications during notification suspension (see suspendNotification)
+        # Elements are (notifier, wrapperObject, action, args, actionKwds); args is (oldPid,) for 'rename'
         self._pendingNotifications = []
+        # Notifiers that receive suspended notifications as a list of objects per action
+        self._batchNotifiers = set()
 
         # Notification suspension level - to allow for nested notification suspension
         self._notificationSuspension = 0
@@ -1440,7 +1443,8 @@ class Project(AbstractWrapperObject):
                 # should be redundant now
                 self._xmlLoader.backupUserData(updateIsModified=False)
             else:
-                self._xmlLoader.saveUserData(keepFallBack=True)
+                self._xmlLoader.saveUserData(keepFallBack=True,
+                                             incremental=self.application.preferences.general.incrementalSave)
 
             self._checkProjectSubDirectories()
             self._saveHistory.addSaveRecord(comment=f'{self.name}: {comment}')
@@ -1538,9 +1542,10 @@ class Project(AbstractWrapperObject):
         objs = [getByPid(x) if isinstance(x, str) else x for x in objs]
 
         with undoBlockWithoutSideBar():
-            for obj in objs:
-                if obj and not obj.isDeleted:
-                    obj.delete()
+            with notificationSuspend(application=self.application):
+                for obj in objs:
+                    if obj and not obj.isDeleted:
+                        obj.delete()
 
     @property
     def readOnly(self):
@@ -1812,7 +1817,8 @@ class Project(AbstractWrapperObject):
     #===========================================================================================
 
     def registerNotifier(self, className: str, target: str, func: typing.Callable[..., None],
-                         parameterDict: dict = {}, onceOnly: bool = False) -> typing.Callable[..., None]:
+                         parameterDict: dict = {}, onceOnly: bool = False,
+                         batch: bool = False) -> typing.Callable[..., None]:
         """
         Register notifiers to be triggered when data change
 
@@ -1856,6 +1862,13 @@ class Project(AbstractWrapperObject):
         :param bool onceOnly: If True, only one of multiple copies is executed
 
           when notifiers are resumed after a suspension.
+          NB: suspended notifications are now always de-duplicated (see resumeNotification).
+
+        :param bool batch: If True, notifications accumulated during a suspension are delivered as
+
+          one call per action, with the list of objects as the first parameter (and the list of
+          oldPids as the second parameter for action 'rename'). Outside a suspension the list holds
+          a single object. Not used for crosslink (second className) targets.
 
         :return The registered notifier (which can be passed to removeNotifier or duplicateNotifier)
 
@@ -1878,6 +1891,8 @@ class Project(AbstractWrapperObject):
         else:
             raise TypeError("Coding error - notifier %s set twice for %s,%s "
                             % (notifier, className, target))
+        if batch:
+            self._batchNotifiers.add(notifier)
         #
         return notifier
 
@@ -1893,6 +1908,8 @@ class Project(AbstractWrapperObject):
             if hasattr(self, '_context2Notifiers'):
                 od = self._context2Notifiers.get((tt), {})
                 del od[notifier]
+                if not any(notifier in _od for _od in self._context2Notifiers.values()):
+                    self._batchNotifiers.discard(notifier)
         except KeyError:
             self._logger.warning("Attempt to unregister unknown notifier %s for %s" % (notifier, (className, target)))
 
@@ -1903,6 +1920,7 @@ class Project(AbstractWrapperObject):
             if notifier in od:
                 del od[notifier]
                 found = True
+        self._batchNotifiers.discard(notifier)
         if not found:
             self._logger.warning("Attempt to remove unknown notifier: %s" % notifier)
 
@@ -1919,63 +1937,92 @@ class Project(AbstractWrapperObject):
         if self._notificationBlanking < 0:
             raise TypeError("Code Error: _notificationBlanking below zero!")
 
-    def suspendNotification(self):
-        """Suspend notifier execution and accumulate notifiers for later execution"""
+    def suspendNotification(self, queueNotifiers: bool = False):
+        """Suspend notifier execution and accumulate notifiers for later execution
+
+        :param queueNotifiers: If True, the 'create', 'change' and 'rename' notifications are queued
+            until the matching resumeNotification(queueNotifiers=True); otherwise only the progress
+            signals are emitted (e.g. for the undoBlock context managers).
+            Use the notificationSuspend context manager to ensure that the calls are paired.
+        """
         if self.application.hasGui:
             self.application.ui.qtApp.progressAboutToChangeSignal.emit(self._progressSuspension)
         self._progressSuspension += 1
 
-        return
-        # # TODO suspension temporarily disabled
-        # self._notificationSuspension += 1
+        if queueNotifiers:
+            self._notificationSuspension += 1
 
-    def resumeNotification(self):
-        """Execute accumulated notifiers and resume immediate notifier execution"""
+    def resumeNotification(self, queueNotifiers: bool = False):
+        """Execute accumulated notifiers and resume immediate notifier execution
+
+        :param queueNotifiers: must match the corresponding suspendNotification call;
+            the queued notifications are executed when the outermost suspension is resumed.
+        """
         self._progressSuspension -= 1
         if self._progressSuspension < 0:
             raise RuntimeError("Code Error: _progressSuspension below zero")
-        if self.application.hasGui:
-            self.application.ui.qtApp.progressChangedSignal.emit(self._progressSuspension)
 
-        return
+        try:
+            if queueNotifiers:
+                if self._notificationSuspension > 1:
+                    self._notificationSuspension -= 1
+                else:
+                    # Should not be necessary, but in this way we never get below 0 no matter what errors happen
+                    self._notificationSuspension = 0
+                    self._executePendingNotifications()
 
-        # TODO suspension temporarily disabled
-        # This was broken at one point, and we never found time to fix it
-        # It is a time-saving measure, allowing you to e.g. execute a
-        # peak-created notifier only once when creating hundreds of peaks in one operation
+        finally:
+            if self.application.hasGui:
+                self.application.ui.qtApp.progressChangedSignal.emit(self._progressSuspension)
 
-        # if self._notificationSuspension > 1:
-        #     self._notificationSuspension -= 1
-        # else:
-        #     # Should not be necessary, but in this way we never get below 0 no matter what errors happen
-        #     self._notificationSuspension = 0
-        #
-        #     scheduledNotifiers = set()
-        #
-        #     executeNotifications = []
-        #     pendingNotifications = self._pendingNotifications
-        #     while pendingNotifications:
-        #         notification = pendingNotifications.pop()
-        #         notifier = notification[0]
-        #         onceOnly = notification[1]
-        #         if onceOnly:
-        #
-        #             # check whether the match pair, (function, object) is in the found set
-        #             matchNotifier = (notifier, notification[2])
-        #             if matchNotifier not in scheduledNotifiers:
-        #                 scheduledNotifiers.add(matchNotifier)
-        #
-        #                 # append the function call (function, object, *params)
-        #                 executeNotifications.append((notifier, notification[2:]))
-        #
-        #             # if notifier not in scheduledNotifiers:
-        #             #     scheduledNotifiers.add(notifier)
-        #             #     executeNotifications.append((notifier, notification[2:]))
-        #         else:
-        #             executeNotifications.append((notifier, notification[2:]))
-        #     #
-        #     for notifier, params in reversed(executeNotifications):
-        #         notifier(*params)
+    def _executePendingNotifications(self):
+        """Execute the notifications accumulated during suspension; duplicates are removed
+        and batch notifiers are called once per action (see Notifiers._collapseNotifications)
+        All notifications are executed; the first exception from a notifier is then re-raised
+        """
+        from ccpn.core.lib.Notifiers import _collapseNotifications
+
+        pendingNotifications, self._pendingNotifications = self._pendingNotifications, []
+        error = None
+        for notifier, args, kwds in _collapseNotifications(pendingNotifications, self._batchNotifiers):
+            try:
+                notifier(*args, **kwds)
+            except Exception as es:
+                # a failing notifier must not prevent the execution of the others;
+                # the first error is raised afterwards, as for the immediate notifiers
+                if error is None:
+                    error = es
+
+        if error is not None:
+            raise error
+
+    def _callNotifiers(self, obj, action: str, *args, **actionKwds):
+        """Call the notifiers registered for obj and action ('create', 'delete', 'change' or 'rename');
+        args is (oldPid,) for 'rename'.
+        During notification suspension, the notifications are queued, except for 'delete', as these
+        are to be executed before the object is deleted; pending notifications of a deleted object
+        are discarded.
+        RESTRICTED. Use in core classes ONLY
+        """
+        # NB 'AbstractWrapperObject' not currently in use (Sep 2016), but kept for future needs
+        notifiers = [notifier
+                     for name in (obj.className, 'AbstractWrapperObject')
+                     for notifier in tuple(self._context2Notifiers.setdefault((name, action), OrderedDict()))]
+
+        if self._notificationSuspension and action == 'delete':
+            self._pendingNotifications = [notification for notification in self._pendingNotifications
+                                          if notification[1] is not obj]
+
+        elif self._notificationSuspension:
+            self._pendingNotifications.extend((notifier, obj, action, args, actionKwds) for notifier in notifiers)
+            return
+
+        batchNotifiers = self._batchNotifiers
+        for notifier in notifiers:
+            if notifier in batchNotifiers:
+                notifier([obj], *([arg] for arg in args))
+            else:
+                notifier(obj, *args, **actionKwds)
 
     # Standard notified functions.
     # RESTRICTED. Use in core classes ONLY
@@ -2136,7 +2183,7 @@ class Project(AbstractWrapperObject):
         """New/Delete object to the general dict for v3 pids
         """
         # update pid:object mapping dictionary
-        dd = self._pid2Obj.setdefault(obj.className, self._pid2Obj.setdefault(obj.shortClassName, {}))
+        dd = self._pid2Obj.setdefault(obj.className, self._pid2Obj.setdefault(obj.shortClassName, PidDict()))
         # set/delete on action
         if action == 'create':
             dd[obj.id] = obj
@@ -2513,7 +2560,10 @@ class Project(AbstractWrapperObject):
         if dd:
             # NB the _pid2Obj entry is set in the object init.
             # The relevant dictionary may therefore be missing if no object has yet been created
-            result = [tt[1] for tt in dd.items() if tt[0].startswith(idStartsWith)]
+            if isinstance(dd, PidDict):
+                result = dd.getValuesByPrefix(idStartsWith)
+            else:
+                result = [tt[1] for tt in dd.items() if tt[0].startswith(idStartsWith)]
         else:
             result = None
         #
@@ -2529,7 +2579,7 @@ class Project(AbstractWrapperObject):
         if dd:
             # NB the _pid2Obj entry is set in the object init.
             # The relevant dictionary may therefore be missing if no object has yet been created
-            result = [tt[1] for tt in dd.items() if tt[0] == id]
+            result = [obj] if (obj := dd.get(id)) is not None else []
         else:
             result = None
         #
@@ -2374,10 +2374,14 @@ class Spectrum(AbstractWrapperObject):
 
         result = self._getInternalParameter(self._NOISESD)
         if result is None and self.noiseLevel:
-            # We have the noiseLevel, we can backcalculate the noise sd
-            from ccpn.core.lib.SpectrumLib import  _estimateNoiseSDforSpectrumNoiseLevel
+            # We have the noiseLevel; use the (robust) noise sd of the data statistics,
+            # or backcalculate it from all data
+            from ccpn.core.lib.SpectrumLib import getDataStatistics, _estimateNoiseSDforSpectrumNoiseLevel
 
-            result = _estimateNoiseSDforSpectrumNoiseLevel(self)
+            if (statistics := getDataStatistics(self)) is not None and statistics['noiseSD']:
+                result = statistics['noiseSD']
+            else:
+                result = _estimateNoiseSDforSpectrumNoiseLevel(self)
             self._setInternalParameter(self._NOISESD, result) #ensure we don't go out of sync with the NoiseLevel.
         return result
 
@@ -2488,7 +2492,8 @@ class Spectrum(AbstractWrapperObject):
         #     aliasing.append((pp - 1) // np)
 
         aliasingFlags = [1] * self.dimensionCount
-        value = self.dataSource.getPointValue(pointPositions, aliasingFlags=aliasingFlags)
+        with self.dataSource._readLock:
+            value = self.dataSource.getPointValue(pointPositions, aliasingFlags=aliasingFlags)
         return value * self.scale
 
     @logCommand(get='self')
@@ -2514,7 +2519,8 @@ class Spectrum(AbstractWrapperObject):
         else:
             try:
                 position = self.dataSource.checkForValidSlice(position, sliceDim)
-                data = self.dataSource.getSliceData(position=position, sliceDim=sliceDim)
+                with self.dataSource._readLock:
+                    data = self.dataSource.getSliceData(position=position, sliceDim=sliceDim)
                 data = data.copy(order='K') * self.scale
 
             except (RuntimeError, ValueError) as es:
@@ -2554,7 +2560,12 @@ class Spectrum(AbstractWrapperObject):
             getLogger().error('invalid arguments: %s' % es)
             raise es
 
-        self.dataSource.setSliceData(data=data, position=position, sliceDim=sliceDim)
+        with self.dataSource._readLock:
+            self.dataSource.setSliceData(data=data, position=position, sliceDim=sliceDim)
+            self.dataSource.clearPyramid()
+            self.dataSource.clearProjections()
+            self.dataSource.clearStatistics()
+            self.dataSource._dataVersion += 1
 
     def getAllRegionData(self):
         """ Get  all region data. """
@@ -2608,6 +2619,12 @@ class Spectrum(AbstractWrapperObject):
 
         NB: use getPlane() method for axisCode based access
         """
+        return self._getPlaneData(position=position, xDim=xDim, yDim=yDim)
+
+    def _getPlaneData(self, position=None, xDim: int = 1, yDim: int = 2) -> PlaneData:
+        """
+        Keep this routine without a logCommand; e.g. for reading the planes in a background thread.
+        """
         if self.dimensionCount < 2:
             raise RuntimeError("Spectrum.getPlaneData: dimensionality < 2")
 
@@ -2624,7 +2641,8 @@ class Spectrum(AbstractWrapperObject):
             getLogger().error('invalid arguments: %s' % es)
             raise es
 
-        data = self.dataSource.getPlaneData(position=position, xDim=xDim, yDim=yDim)
+        with self.dataSource._readLock:
+            data = self.dataSource.getPlaneData(position=position, xDim=xDim, yDim=yDim)
         # Make a copy in order to preserve the original data and apply scaling
         data = data.copy(order='K') * self.scale
 
@@ -2637,6 +2655,87 @@ class Spectrum(AbstractWrapperObject):
 
         return data
 
+    def getPlaneDataAtResolution(self, position=None, xDim: int = 1, yDim: int = 2,
+                                 xPointsPerPixel: float = 1.0, yPointsPerPixel: float = 1.0) -> tuple:
+        """Get a plane defined by by xDim and yDim ('1'-based), and a position vector ('1'-based)
+        at the coarsest resolution that still has at least one point per screen pixel.
+        Coarser resolutions are obtained from a multi-resolution store, decimating the plane by
+        factors 2, 4, 8, ... and retaining the signed maximum absolute value of each block.
+        Dimensionality must be >= 2
+
+        :param position: A list/tuple of point-positions (1-based)
+        :param xDim: Dimension of the first axis (1-based)
+        :param yDim: Dimension of the second axis (1-based)
+        :param xPointsPerPixel: Number of (full-resolution) points per screen pixel along xDim
+        :param yPointsPerPixel: Number of (full-resolution) points per screen pixel along yDim
+
+        :return: a (PlaneData, factor) tuple; point (i, j) of PlaneData covers the points
+                 [i*factor, (i+1)*factor) x [j*factor, (j+1)*factor) of the full-resolution plane
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.PlanePyramid import getDecimationFactor
+
+        if self.dimensionCount < 2:
+            raise RuntimeError("Spectrum.getPlaneDataAtResolution: dimensionality < 2")
+
+        if self.dataSource is None:
+            return self._getPlaneData(position=position, xDim=xDim, yDim=yDim), 1
+
+        factor = getDecimationFactor(xPointsPerPixel, yPointsPerPixel,
+                                     self.dataSource.getMaxDecimationFactor(xDim=xDim, yDim=yDim))
+        if factor == 1:
+            return self._getPlaneData(position=position, xDim=xDim, yDim=yDim), 1
+
+        try:
+            position = self.dataSource.checkForValidPlane(position, xDim=xDim, yDim=yDim)
+        except (RuntimeError, ValueError) as es:
+            getLogger().error('invalid arguments: %s' % es)
+            raise es
+
+        with self.dataSource._readLock:
+            data = self.dataSource.getDecimatedPlaneData(position=position, xDim=xDim, yDim=yDim, factor=factor)
+        data *= self.scale
+        return data, factor
+
+    def getPlaneRegionData(self, position=None, xDim: int = 1, yDim: int = 2,
+                           xLimits: tuple = None, yLimits: tuple = None) -> np.ndarray:
+        """Get the region (xLimits, yLimits) of the plane defined by xDim and yDim ('1'-based), and a
+        position vector ('1'-based); i.e. read only the part of the plane rather than the whole plane.
+        Dimensionality must be >= 2
+
+        :param position: A list/tuple of point-positions (1-based)
+        :param xDim: Dimension of the first axis (1-based)
+        :param yDim: Dimension of the second axis (1-based)
+        :param xLimits: (start, stop) tuple of points along xDim (1-based, stop inclusive); defaults to all points
+        :param yLimits: (start, stop) tuple of points along yDim (1-based, stop inclusive); defaults to all points
+
+        :return: a 2D np.ndarray in order (yDim, xDim)
+        """
+        if self.dimensionCount < 2:
+            raise RuntimeError("Spectrum.getPlaneRegionData: dimensionality < 2")
+
+        if self.dataSource is None:
+            raise RuntimeError('No proper (filePath, dataFormat) set for %s; unable to get region' % self)
+
+        try:
+            position = self.dataSource.checkForValidPlane(position, xDim=xDim, yDim=yDim)
+        except (RuntimeError, ValueError) as es:
+            getLogger().error('invalid arguments: %s' % es)
+            raise es
+
+        sliceTuples = [(p, p) for p in position]
+        sliceTuples[xDim - 1] = tuple(xLimits) if xLimits is not None else (1, self.pointCounts[xDim - 1])
+        sliceTuples[yDim - 1] = tuple(yLimits) if yLimits is not None else (1, self.pointCounts[yDim - 1])
+        with self.dataSource._readLock:
+            data = self.dataSource.getRegionData(sliceTuples)
+
+        # region data are [..z][y][x] ordered; reduce to (yDim, xDim)
+        yStart, yStop = sliceTuples[yDim - 1]
+        xStart, xStop = sliceTuples[xDim - 1]
+        data = np.asarray(data).reshape([stop - start + 1 for start, stop in reversed(sliceTuples)])
+        data = np.moveaxis(data, (self.dimensionCount - yDim, self.dimensionCount - xDim), (0, 1))
+        data = data.reshape((yStop - yStart + 1, xStop - xStart + 1))
+        return data * self.scale
+
     @logCommand(get='self')
     def getPlane(self, axisCodes, position=None) -> PlaneData:
         """Get a plane defined by axisCodes and position as a a PlaneData object
@@ -2677,7 +2776,12 @@ class Spectrum(AbstractWrapperObject):
             getLogger().error('invalid arguments: %s' % es)
             raise es
 
-        self.dataSource.setPlaneData(data=data, position=position, xDim=xDim, yDim=yDim)
+        with self.dataSource._readLock:
+            self.dataSource.setPlaneData(data=data, position=position, xDim=xDim, yDim=yDim)
+            self.dataSource.clearPyramid()
+            self.dataSource.clearProjections()
+            self.dataSource.clearStatistics()
+            self.dataSource._dataVersion += 1
 
     @logCommand(get='self')
     def extractPlaneToFile(self, axisCodes: (tuple, list), position=None, path=None, dataFormat='Hdf5'):
@@ -2712,17 +2816,22 @@ class Spectrum(AbstractWrapperObject):
         return newSpectrum
 
     @logCommand(get='self')
-    def getProjection(self, axisCodes: (tuple, list), method: str = 'max', threshold=None) -> PlaneData:
+    def getProjection(self, axisCodes: (tuple, list), method: str = 'max', threshold=None,
+                      callback=None) -> PlaneData:
         """Get projected plane defined by two axisCodes, using method and an optional threshold
+        Projections are calculated in parallel from slabs of the data, and cached
 
         :param axisCodes: tuple/list of two axisCodes; expand if exactMatch=False
         :param method: 'max', 'max above threshold', 'min', 'min below threshold',
                        'sum', 'sum above threshold', 'sum below threshold'
         :param threshold: threshold value for relevant method
+        :param callback: optional function called as callback(planesDone, totalPlanes, partialProjection)
+                         while the projection is calculated; e.g. to show progress
 
         :return: projected spectrum data as a PlaneData object (i.e. a 2D np.ndarray in order (yDim, xDim))
         """
-        projectedData = _getProjection(self, axisCodes=axisCodes, method=method, threshold=threshold)
+        projectedData = _getProjection(self, axisCodes=axisCodes, method=method, threshold=threshold,
+                                       callback=callback)
         return projectedData
 
     @logCommand(get='self')
@@ -2887,7 +2996,8 @@ class Spectrum(AbstractWrapperObject):
             getLogger().error(text)
             raise RuntimeError(text)
         sliceTuples = self._axisDictToSliceTuples(axisDict)
-        return self.dataSource.getRegionData(sliceTuples, aliasingFlags=[1] * self.dimensionCount)
+        with self.dataSource._readLock:
+            return self.dataSource.getRegionData(sliceTuples, aliasingFlags=[1] * self.dimensionCount)
 
     @logCommand(get='self')
     def createPeak(self, peakList=None, height=None, **ppmPositions) -> Optional['Peak']:
@@ -3479,8 +3589,10 @@ class Spectrum(AbstractWrapperObject):
         """
         self._deleteSpectrumMetaData()
         self._validateStringValue('name', value, filePathChars=True)
+        _statisticsPath = self._statisticsPath
         result = self._rename(value)
         self._saveSpectrumMetaData()
+        self._moveStatistics(_statisticsPath)
         return result
 
     @property
@@ -3555,9 +3667,61 @@ class Spectrum(AbstractWrapperObject):
         if _path.exists():
             _path.removeFile()
 
+    @property
+    def _statisticsPath(self):
+        """Return the path to the file with the statistics of the data (see SpectrumDataSourceABC.getStatistics);
+        stored with the metadata in project/state/spectra
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import STATISTICS_DIRECTORY
+
+        return self._metaDataPath.parent / STATISTICS_DIRECTORY / self.name + '.json'
+
+    def _fetchStatisticsPath(self):
+        """Return the path to the statistics file
+        Create the folder as required; None if the project is read-only or the folder cannot be created
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import STATISTICS_DIRECTORY
+
+        if self.project.readOnly:
+            return None
+
+        try:
+            self._fetchMetaDataPath().parent.fetchDir(STATISTICS_DIRECTORY)
+
+        except (PermissionError, FileNotFoundError, ValueError):
+            getLogger().info('Folder may be read-only')
+            return None
+
+        return self._statisticsPath
+
+    def _moveStatistics(self, oldPath):
+        """Move the statistics file from oldPath, e.g. after a rename
+        """
+        newPath = self._statisticsPath
+        if oldPath == newPath or not oldPath.exists() or self.project.readOnly:
+            return
+        try:
+            oldPath.rename(newPath)
+        except (PermissionError, FileNotFoundError, OSError):
+            getLogger().info(f'{self}: Unable to move statistics to {newPath}')
+
+    def _deleteStatistics(self):
+        """Delete the statistics file in the project/state/spectra
+        """
+        _path = self._statisticsPath
+        if _path.exists() and not self.project.readOnly:
+            _path.removeFile()
+
     def _finaliseAction(self, action: str, **actionKwds):
         """Subclassed to handle associated spectrumViews instances
         """
+        if action == 'change':
+            # the ppm positions of the peaks depend on the referencing; re-index the peaks on next use,
+            # irrespective of notification blanking
+            for peakList in self.peakLists:
+                if peakList._peakIndex is not None:
+                    peakList._peakIndex.invalidate()
+
         if not super()._finaliseAction(action, **actionKwds):
             return
 
@@ -3568,6 +3732,7 @@ class Spectrum(AbstractWrapperObject):
 
         if action == 'delete':
             self._deleteSpectrumMetaData()
+            self._deleteStatistics()
 
         # notify peak/integral/multiplet list
         if action in {'create', 'delete'}:
@@ -3644,6 +3809,7 @@ class Spectrum(AbstractWrapperObject):
         """
         self._clearCache()
         if self.dataSource is not None:
+            self._spectrumTraits.dataSource.closePyramid()
             self._spectrumTraits.dataSource.closeFile()
             self._spectrumTraits.dataSource = None
             # if self._wrappedData.isModified:
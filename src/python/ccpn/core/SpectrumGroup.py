@@ -403,6 +403,8 @@ class SpectrumGroup(AbstractWrapperObject):
     def _getPeakLists4Collections(self, sourcePeakList, createNewTargetPeakList=False, pickPeaks=False,
                                   useSliceColour=True, **pickerKwargs):
         """INTERNAL. Get the needed peakList based on the options of PeakCollection methods """
+        from ccpn.core.lib.SpectrumLib import getPeakPickingThresholds
+
         with undoBlockWithoutSideBar():
             with notificationEchoBlocking():
                 peakLists = []
@@ -419,7 +421,9 @@ class SpectrumGroup(AbstractWrapperObject):
                     if pickPeaks:
                         # **pickerKwargs
                         ppmRegions = dict(zip(spectrum.axisCodes, spectrum.spectrumLimits))  #could be restricted picking
-                        spectrum.pickPeaks(peakList=targetPeakList, positiveThreshold=spectrum.positiveContourBase,
+                        # the whole spectrum; threshold from the noise statistics, so that noise is not picked
+                        positiveThreshold, _ = getPeakPickingThresholds(spectrum)
+                        spectrum.pickPeaks(peakList=targetPeakList, positiveThreshold=positiveThreshold,
                                            **ppmRegions)
                     peakLists.append(targetPeakList)
         return peakLists
@@ -46,6 +46,7 @@ from ccpn.core.lib import Pid
 from ccpn.core.lib.ContextManagers import deleteObject, notificationBlanking, \
     apiNotificationBlanking, ccpNmrV3CoreSetter
 from ccpn.core.lib.Notifiers import NotifierBase
+from ccpn.core.lib.PidIndex import PidDict
 from ccpn.framework.Version import VersionString
 from ccpn.framework.Application import getApplication
 from ccpn.util import Common as commonUtil
@@ -244,7 +245,7 @@ class AbstractWrapperObject(CoreModel, NotifierBase):
         # update pid:object mapping dictionary
         dd = project._pid2Obj.get(className)
         if dd is None:
-            dd = {}
+            dd = PidDict()
             project._pid2Obj[className] = dd
             project._pid2Obj[self.shortClassName] = dd
         # assert oldId is not None
@@ -596,8 +597,9 @@ class AbstractWrapperObject(CoreModel, NotifierBase):
             raise RuntimeError("data cannot contain xml tags '{}' at pos {}".format(pos.group(), pos.span()))
         space = self._ccpnInternalData.setdefault(namespace, {})
         space[parameterName] = value
-        # Explicit flag assignment to enforce saving
+        # Explicit flag assignment to enforce saving; the topObject flag is used by incremental save
         self._wrappedData.__dict__['isModified'] = True
+        self._wrappedData.topObject.__dict__['isModified'] = True
 
     def getParameter(self, namespace: str, parameterName: str):
         """:returns value of parameterName for namespace or None if not present
@@ -626,8 +628,9 @@ class AbstractWrapperObject(CoreModel, NotifierBase):
         space.pop(parameterName, None)
         if not space:
             data.pop(namespace, None)
-        # Explicit flag assignment to enforce saving
+        # Explicit flag assignment to enforce saving; the topObject flag is used by incremental save
         self._wrappedData.__dict__['isModified'] = True
+        self._wrappedData.topObject.__dict__['isModified'] = True
 
     def _setNonApiAttributes(self, attribs):
         """Set the non-api attributes that are stored in ccpnInternal
@@ -1506,24 +1509,16 @@ class AbstractWrapperObject(CoreModel, NotifierBase):
         #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # no blanking
 
-        className = self.className
-        # NB 'AbstractWrapperObject' not currently in use (Sep 2016), but kept for future needs
-        iterator = (project._context2Notifiers.setdefault((name, action), OrderedDict())
-                    for name in (className, 'AbstractWrapperObject'))
-
+        # call (or queue, during notification suspension) the notifiers
         if action == 'rename':
-            for dd in iterator:
-                for notifier in tuple(dd):
-                    notifier(self, oldPid, **actionKwds)
+            project._callNotifiers(self, action, oldPid, **actionKwds)
 
             for obj in self._getDirectChildren():
                 obj._finaliseAction('rename')
 
         else:
             # Normal case - just call notifiers
-            for dd in iterator:
-                for notifier in tuple(dd):
-                    notifier(self, **actionKwds)
+            project._callNotifiers(self, action, **actionKwds)
 
         # print(f'  {self} ACTIONS   {self._finaliseChildren}')
         # propagate the action to explicitly associated (generally child) instances
@@ -201,6 +201,7 @@ class CollectionList():
         try:
             # use 'at' to put into single element as may be a list
             self._data.at[uniqueId, name] = value
+            self._setModified()
         except Exception:
             raise ValueError(f'{self.className}._setAttribute: error setting attribute {name} in collection {self}') from None
 
@@ -223,9 +224,16 @@ class CollectionList():
 
         try:
             self._data.loc[uniqueId, startName:endName] = value
+            self._setModified()
         except Exception:
             raise ValueError(f'{self.className}._setAttributes: error setting attribute {startName}|{endName} in collection {self}') from None
 
+    def _setModified(self):
+        """Flag the project topObject as modified after changing the dataframe in-place;
+        these changes are not seen by the api
+        """
+        self._project._wrappedData.topObject.__dict__['isModified'] = True
+
     def _undoRedoObjects(self, collections):
         """update to collections after undo/redo
         collections should be a simple, non-nested dict of int:<collection> pairs
@@ -29,13 +29,13 @@ __date__ = "$Date: 2022-01-12 15:18:54 +0100 (Wed, January 12, 2022) $"
 
 from sys import _getframe
 from typing import Optional
-from collections import OrderedDict
 from functools import partial
 
 from ccpn.core._implementation.CoreModel import CoreModel
 from ccpn.core.lib.ContextManagers import renameObject, ccpNmrV3CoreSetter, deleteV3Object, undoStackBlocking
 from ccpn.core.lib.Pid import Pid, altCharacter
 from ccpn.core.lib.Notifiers import NotifierBase
+from ccpn.core.lib.PidIndex import PidDict
 from ccpn.util.decorators import logCommand
 from ccpn.framework.Version import VersionString
 
@@ -343,7 +343,7 @@ class V3CoreObjectABC(CoreModel, NotifierBase):
         # update pid:object mapping dictionary
         dd = project._pid2Obj.get(className)
         if dd is None:
-            dd = {}
+            dd = PidDict()
             project._pid2Obj[className] = dd
             project._pid2Obj[self.shortClassName] = dd
         # assert oldId is not None
@@ -406,21 +406,12 @@ class V3CoreObjectABC(CoreModel, NotifierBase):
         # no blanking
 
         # notify any external objects - these should NOT modify any objects/structures
-        className = self.className
-        # NB 'AbstractWrapperObject' not currently in use (Sep 2016), but kept for future needs
-        iterator = (project._context2Notifiers.setdefault((name, action), OrderedDict())
-                    for name in (className, 'AbstractWrapperObject'))
-
         if action == 'rename':
-            for dd in iterator:
-                for notifier in tuple(dd):
-                    notifier(self, oldPid, **actionKwds)
+            project._callNotifiers(self, action, oldPid, **actionKwds)
 
         else:
             # Normal case - just call notifiers - as per AbstractWrapperObject
-            for dd in iterator:
-                for notifier in tuple(dd):
-                    notifier(self, **actionKwds)
+            project._callNotifiers(self, action, **actionKwds)
 
         # print(f'  {self} ACTIONS   {self._finaliseChildren}')
         # propagate the action to explicitly associated (generally child) instances
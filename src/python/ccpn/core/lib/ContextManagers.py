@@ -300,6 +300,8 @@ def sidebarBlocking(application=None, blockSidebarOnly=False):
 def notificationSuspend(application=None):
     """
     Suspend notifiers until the end of the current function block.
+    The 'create', 'change' and 'rename' notifications are queued and executed once at the end of
+    the (outermost) block, with duplicates removed (see Project.resumeNotification).
     """
     # get the application
     if not application:
@@ -307,7 +309,7 @@ def notificationSuspend(application=None):
     if application is None:
         raise RuntimeError('Error getting application')
 
-    application.project.suspendNotification()
+    application.project.suspendNotification(queueNotifiers=True)
     try:
         # transfer control to the calling function
         yield
@@ -317,7 +319,7 @@ def notificationSuspend(application=None):
 
     finally:
         # clean up after suspending notifications
-        application.project.resumeNotification()
+        application.project.resumeNotification(queueNotifiers=True)
 
 
 @contextmanager
@@ -240,6 +240,7 @@ class Notifier(NotifierABC):
                  callback: Callable[..., Optional[str]],
                  setterObject=None,
                  onceOnly=False,
+                 batch=False,
                  debug=False,
                  **kwargs):
         """
@@ -251,6 +252,9 @@ class Notifier(NotifierABC):
         :param targetName: valid className, attributeName or ANY
         :param callback: callback function with signature: callback(callbackDict, **kwargs])
         :param setterObject: Object that was setting the Notifier
+        :param batch: receive the notifications accumulated during a notification suspension as one callback per
+                      trigger, with callbackDict[OBJECT] the list of objects (and callbackDict[OLDPID] the list
+                      of oldPids for RENAME); not for the OBSERVE and CURRENT triggers
         :param debug: set debug
         :param **kwargs: optional keyword,value arguments to callback
         """
@@ -302,6 +306,9 @@ class Notifier(NotifierABC):
             raise RuntimeError('Notifier.__init__: trigger "%s" only to be used in isolation' % Notifier.CURRENT)
         if triggers[0] == Notifier.CURRENT and not self._isCurrent:
             raise RuntimeError('Notifier.__init__: invalid object "%s" for trigger "%s"' % (theObject, triggers[0]))
+        if batch and triggers[0] in (Notifier.OBSERVE, Notifier.CURRENT):
+            raise RuntimeError('Notifier.__init__: batch not allowed for trigger "%s"' % triggers[0])
+        self._batch = batch
 
         if targetName is None:
             raise ValueError('Invalid None targetName')
@@ -359,7 +366,8 @@ class Notifier(NotifierABC):
                 func = _project.registerNotifier(className=targetName,
                                                  target=trigger,
                                                  func=partial(self, notifier=notifier),
-                                                 onceOnly=onceOnly)
+                                                 onceOnly=onceOnly,
+                                                 batch=batch)
                 self._unregister.append((targetName, trigger, func))
                 self._isRegistered = True
 
@@ -464,6 +472,18 @@ class Notifier(NotifierABC):
                 notifierFired = True
                 self._previousValue = value
 
+        # batch delivery; obj is a list of objects, parameter2 the list of oldPids for RENAME
+        elif self._batch:
+            _oldPids = parameter2 or [None] * len(obj)
+            _items = [(ob, oldPid) for ob, oldPid in zip(obj, _oldPids)
+                      if self._isProject or ob._parent.pid == self._theObject.pid]
+            if _items:
+                callbackDict[self.OBJECT] = [ob for ob, _oldPid in _items]
+                if trigger == self.RENAME:
+                    callbackDict[self.OLDPID] = [oldPid for _ob, oldPid in _items]
+                self._callback(callbackDict, **self._kwargs)
+                notifierFired = True
+
         # check if the trigger applies for all other cases
         elif self._isProject or obj._parent.pid == self._theObject.pid:
             if trigger == self.RENAME and parameter2 is not None:
@@ -724,3 +744,42 @@ def _removeDuplicatedNotifiers(notifierQueue):
             executeQueue.append((func, data))
 
     return list(reversed(executeQueue))
+
+
+def _collapseNotifications(notificationQueue, batchNotifiers=()):
+    """Collapse the notifications accumulated during a notification suspension (see Project.suspendNotification)
+
+    notificationQueue is a list of (notifier, obj, action, args, actionKwds) tuples.
+    As for _removeDuplicatedNotifiers, notifications are filtered on (notifier, obj, action, args), retaining
+    the last occurrence, in order.
+    Notifiers in batchNotifiers are called once per action, at the position of their first notification,
+    with the list of objects (and the list of oldPids for 'rename'); actionKwds are not passed.
+
+    Return the list of (notifier, args, kwds) calls to execute
+    """
+    executeQueue = []
+    scheduledQueue = set()
+
+    # iterate through the queue in reverse order
+    for notifier, obj, action, args, actionKwds in reversed(notificationQueue):
+        match = (notifier, id(obj), action, args)
+        if match not in scheduledQueue:
+            scheduledQueue.add(match)
+            executeQueue.append((notifier, obj, action, args, actionKwds))
+    executeQueue.reverse()
+
+    calls = []
+    batches = {}  # ((notifier, action), (objects, oldPids)) pairs
+    for notifier, obj, action, args, actionKwds in executeQueue:
+        if notifier not in batchNotifiers:
+            calls.append((notifier, (obj,) + args, actionKwds))
+
+        elif (batch := batches.get((notifier, action))) is None:
+            batches[(notifier, action)] = batch = ([obj], [arg for arg in args])
+            calls.append((notifier, batch if action == Notifier.RENAME else batch[:1], {}))
+
+        else:
+            batch[0].append(obj)
+            batch[1].extend(args)
+
+    return calls
@@ -35,6 +35,7 @@ from ccpn.core.lib.ContextManagers import undoBlockWithoutSideBar
 from ccpn.util.Logging import getLogger
 
 DFS_PeakClusterer = 'DFS_PeakClusterer'
+KDTree_PeakClusterer = 'KDTree_PeakClusterer'
 
 class PeakClustererABC(object):
     """
@@ -156,7 +157,55 @@ class DFSPeakClusterer(PeakClustererABC):
         return path
 
 
+class KDTreePeakClusterer(PeakClustererABC):
+
+    name = KDTree_PeakClusterer
+    info = 'KD-tree neighbour search and union-find algorithm for peak clustering by pointPositions'
+
+    def findClusters(self, *args, **kwargs):
+        """
+        Find clusters as the connected components of the graph of adjacent peaks (see _getOverlapPairsByPositions).
+        Adjacent pairs are found by a KD-tree query in tolerance-scaled coordinates; components by union-find.
+        Clusters are ordered by their first peak; peaks within a cluster are in the order of self.peaks.
+        Peaks with undefined pointPositions form a cluster of their own.
+        """
+        from scipy.spatial import cKDTree
+
+        peaks = list(self.peaks)
+        if not peaks:
+            return ()
+
+        positions = np.array([[np.nan if p is None else p for p in pk.pointPositions] for pk in peaks], dtype=float)
+        tolerances = np.array(self.tolerances, dtype=float)
+        parents = list(range(len(peaks)))
+
+        def _find(ii):
+            # find the root of ii, halving the path
+            while parents[ii] != ii:
+                parents[ii] = parents[parents[ii]]
+                ii = parents[ii]
+            return ii
+
+        valid = np.flatnonzero(np.all(np.isfinite(positions), axis=1))
+        if len(valid) > 1:
+            # Chebyshev distance <= 1 in tolerance-scaled coordinates; then the strict check as DFS
+            tree = cKDTree(positions[valid] / tolerances)
+            pairs = valid[tree.query_pairs(r=1.0, p=np.inf, output_type='ndarray')]
+            if len(pairs):
+                deltas = np.abs(positions[pairs[:, 0]] - positions[pairs[:, 1]])
+                pairs = pairs[np.all(deltas < tolerances, axis=1)]
+            for ii, jj in pairs.tolist():
+                rootI, rootJ = _find(ii), _find(jj)
+                if rootI != rootJ:
+                    parents[max(rootI, rootJ)] = min(rootI, rootJ)
+
+        clusters = {}
+        for ii, peak in enumerate(peaks):
+            clusters.setdefault(_find(ii), []).append(peak)
+        return tuple(tuple(cluster) for cluster in clusters.values())
+
 
 PeakClusterers = {
-                 DFSPeakClusterer.name: DFSPeakClusterer
+                 DFSPeakClusterer.name: DFSPeakClusterer,
+                 KDTreePeakClusterer.name: KDTreePeakClusterer,
                  }
@@ -0,0 +1,244 @@
+"""
+This file contains the spatial index of the peaks of a PeakList
+
+The index hashes the peaks into the cells of a grid, over their ppm positions as well as their
+point positions, so that the peaks near a position or within a region are found by visiting
+only the cells overlapping the search box, rather than all peaks of the PeakList.
+
+The index is created on first use (PeakList._getPeakIndex) and kept up to date incrementally
+by Peak._finaliseAction on create, delete and change (e.g. move) of a peak. A change of the
+spectrum (e.g. its referencing) moves the ppm positions of all peaks; Spectrum._finaliseAction
+then invalidates the index, which is rebuilt on the next query.
+
+Typical usage:
+
+    peaks = peakList.peaksNear(ppmPositions=(8.2, 120.5), tolerances=(0.02, 0.2))
+    peaks = peakList.peaksInRegion(region=((7.5, 9.0), (110.0, 125.0)))
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import math
+from itertools import product
+from typing import Sequence
+
+from ccpn.util.Logging import getLogger
+
+
+DEFAULT_PPM_CELL_SIZE = 0.1
+DEFAULT_POINT_CELL_SIZE = 4.0
+
+
+class GridHash(object):
+    """
+    Hash of items at n-dimensional positions into the cells of a regular grid
+    """
+
+    def __init__(self, cellSizes: Sequence[float]):
+        """
+        :param cellSizes: the size of the cells along each dimension
+        """
+        self.cellSizes = tuple(float(c) if c and c > 0 else 1.0 for c in cellSizes)
+        self._cells = {}  # cellKey: {item: position}; dicts maintain insertion order
+        self._items = {}  # item: (cellKey, position)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _getCellKey(self, position) -> tuple:
+        return tuple(math.floor(p / c) for p, c in zip(position, self.cellSizes))
+
+    def add(self, item, position):
+        """Add item at position; replaces a previous position of item
+        """
+        self.remove(item)
+        position = tuple(position)
+        cellKey = self._getCellKey(position)
+        self._cells.setdefault(cellKey, {})[item] = position
+        self._items[item] = (cellKey, position)
+
+    def remove(self, item):
+        """Remove item; ignored if item is not present
+        """
+        if (value := self._items.pop(item, None)) is None:
+            return
+        cellKey = value[0]
+        cell = self._cells[cellKey]
+        del cell[item]
+        if not cell:
+            del self._cells[cellKey]
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+
+    def _iterateBox(self, minPosition, maxPosition):
+        """An iterator over the (item, position) tuples of the cells covering the box (minPosition, maxPosition);
+        scans all items if that requires visiting fewer entries
+        """
+        minKey = self._getCellKey(minPosition)
+        maxKey = self._getCellKey(maxPosition)
+        nCells = 1
+        for mn, mx in zip(minKey, maxKey):
+            nCells *= (mx - mn + 1)
+
+        if nCells > len(self._items):
+            for item, (_cellKey, position) in self._items.items():
+                yield item, position
+            return
+
+        for cellKey in product(*(range(mn, mx + 1) for mn, mx in zip(minKey, maxKey))):
+            if (cell := self._cells.get(cellKey)) is not None:
+                yield from cell.items()
+
+    def itemsInBox(self, minPosition, maxPosition) -> list:
+        """:return a list of the items with minPosition <= position <= maxPosition along all dimensions
+        """
+        return [item for item, position in self._iterateBox(minPosition, maxPosition)
+                if all(mn <= p <= mx for p, mn, mx in zip(position, minPosition, maxPosition))]
+
+    def itemsNear(self, position, tolerances) -> list:
+        """:return a list of the items within tolerances of position along all dimensions
+        """
+        minPosition = [p - t for p, t in zip(position, tolerances)]
+        maxPosition = [p + t for p, t in zip(position, tolerances)]
+        return self.itemsInBox(minPosition, maxPosition)
+
+
+class PeakIndex(object):
+    """
+    Spatial index of the peaks of a PeakList, over ppm and point positions.
+
+    - Peaks with undefined (None) positions are not indexed in the relevant space
+    - Kept up to date by updatePeak(); rebuilt on the next query after invalidate()
+    """
+
+    def __init__(self, peakList):
+        """
+        :param peakList: the PeakList instance to index
+        """
+        self.peakList = peakList
+        dimensionCount = peakList.spectrum.dimensionCount
+        tolerances = peakList.spectrum.assignmentTolerances or [None] * dimensionCount
+        self._ppmHash = GridHash([tol or DEFAULT_PPM_CELL_SIZE for tol in tolerances])
+        self._pointHash = GridHash([DEFAULT_POINT_CELL_SIZE] * dimensionCount)
+        self._pointKeys = {}  # integer point position: {peak: None}
+        self._peaks = {}  # peak: integer point position, or None
+        self._isValid = False
+        self.rebuild()
+
+    def __len__(self):
+        return len(self._peaks)
+
+    def rebuild(self):
+        """Rebuild the index from all peaks of the PeakList
+        """
+        self._ppmHash.clear()
+        self._pointHash.clear()
+        self._pointKeys.clear()
+        self._peaks.clear()
+        for peak in self.peakList.peaks:
+            self._addPeak(peak)
+        self._isValid = True
+        getLogger().debug2('PeakIndex: indexed %d peaks of %s' % (len(self._peaks), self.peakList))
+
+    def _addPeak(self, peak):
+        ppmPositions = peak.ppmPositions
+        if None not in ppmPositions:
+            self._ppmHash.add(peak, ppmPositions)
+
+        pointKey = None
+        pointPositions = peak.pointPositions
+        if None not in pointPositions:
+            self._pointHash.add(peak, pointPositions)
+            pointKey = tuple(int(p) for p in pointPositions)
+            self._pointKeys.setdefault(pointKey, {})[peak] = None
+        self._peaks[peak] = pointKey
+
+    def _removePeak(self, peak):
+        if peak not in self._peaks:
+            return
+        pointKey = self._peaks.pop(peak)
+        self._ppmHash.remove(peak)
+        self._pointHash.remove(peak)
+        if pointKey is not None:
+            peaks = self._pointKeys[pointKey]
+            del peaks[peak]
+            if not peaks:
+                del self._pointKeys[pointKey]
+
+    def updatePeak(self, peak, action):
+        """Update the index for action ('create', 'delete', 'change') of peak
+        """
+        self._removePeak(peak)
+        if action != 'delete' and not peak.isDeleted:
+            self._addPeak(peak)
+
+    def invalidate(self):
+        """Mark the index as out of sync with the PeakList (e.g. after a change of the referencing
+        of the spectrum); rebuilt on the next query
+        """
+        self._isValid = False
+
+    def _check(self):
+        """Rebuild if the index has been invalidated
+        """
+        if not self._isValid:
+            self.rebuild()
+
+    #=========================================================================================
+    # Queries
+    #=========================================================================================
+
+    def peaksNear(self, ppmPositions: Sequence[float], tolerances: Sequence[float]) -> list:
+        """:return a list of the peaks within tolerances (ppm) of ppmPositions along all dimensions
+        """
+        self._check()
+        return self._ppmHash.itemsNear(ppmPositions, tolerances)
+
+    def peaksInRegion(self, region: Sequence[Sequence[float]]) -> list:
+        """:return a list of the peaks within region, a (minPpm, maxPpm) tuple for each dimension
+        """
+        self._check()
+        limits = [sorted(lims) for lims in region]
+        return self._ppmHash.itemsInBox([mn for mn, _mx in limits], [mx for _mn, mx in limits])
+
+    def peaksNearPoint(self, pointPositions: Sequence[float], tolerances: Sequence[float]) -> list:
+        """:return a list of the peaks within tolerances (points) of pointPositions along all dimensions
+        """
+        self._check()
+        return self._pointHash.itemsNear(pointPositions, tolerances)
+
+    def peaksAtPoint(self, pointPositions: Sequence[int]) -> list:
+        """:return a list of the peaks with integer point positions equal to pointPositions
+        """
+        self._check()
+        return list(self._pointKeys.get(tuple(int(p) for p in pointPositions), ()))
+
+    def __str__(self):
+        return '<PeakIndex: %s, %d peaks>' % (self.peakList, len(self._peaks))
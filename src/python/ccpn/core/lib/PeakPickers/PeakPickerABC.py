@@ -31,6 +31,8 @@ __date__ = "$Date: 2021-01-13 10:28:41 +0000 (Wed, Jan 13, 2021) $"
 
 from json import loads
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
 import numpy as np
 from ccpn.util.traits.CcpNmrJson import CcpNmrJson
 from ccpn.util.traits.CcpNmrTraits import CFloat, CInt, CBool, CString
@@ -117,6 +119,9 @@ class PeakPickerABC(CcpNmrJson):
     defaultPointExtension = 1  # points to extend the region to pick on either side
     onlyFor1D = False
 
+    maxTilePoints = 4 * 1024 * 1024  # regions with more points are picked in (overlapping) tiles
+    tileReaderThreads = 1  # threads reading tiles ahead of findPeaks; dataSources read sequentially
+
     #=========================================================================================
     # data formats
     #=========================================================================================
@@ -193,6 +198,7 @@ class PeakPickerABC(CcpNmrJson):
         # attributes not required to be persistent between load/save
         self.lastPickedPeaks = None
         self.sliceTuples = None
+        self._tileCheckpoint = None  # state of an interrupted tiled pick; used to resume
         self._excludePpmRegions = defaultdict(list)
         # {axisCode:[[start,stop],...]]} regions to be excluded when picking, e.g.: solvents
         # attribute needed for 1D when manually picking within a SpectrumDisplay box
@@ -324,11 +330,19 @@ class PeakPickerABC(CcpNmrJson):
                 (sLeft + self.defaultPointExtension, sRight - self.defaultPointExtension)
                 for sLeft, sRight in self.sliceTuples]
 
-        # TODO: use Spectrum aliasing definitions once defined
-        data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
-                                                      aliasingFlags=[1] * self.spectrum.dimensionCount)
-        data = data.copy(order='K') * self.spectrum.scale
-        peaks = self.findPeaks(data)
+        if self._useTiles(self.sliceTuples):
+            if (peaks := self._findPeaksTiled()) is None:
+                # cancelled; the state is retained in _tileCheckpoint, so that calling again resumes
+                getLogger().info('%s.pickPeaks: cancelled; picking the same region again resumes' %
+                                 self.__class__.__name__)
+                return []
+        else:
+            # TODO: use Spectrum aliasing definitions once defined
+            with self.spectrum.dataSource._readLock:
+                data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
+                                                              aliasingFlags=[1] * self.spectrum.dimensionCount)
+            data = data.copy(order='K') * self.spectrum.scale
+            peaks = self.findPeaks(data)
         getLogger().debug('%s.pickPeaks: found %d peaks in spectrum %s; sliceTuples = %r' %
                           (self.__class__.__name__, len(peaks), self.spectrum, self.sliceTuples))
 
@@ -340,6 +354,121 @@ class PeakPickerABC(CcpNmrJson):
         self._storeAttributes()
         return corePeaks
 
+    #=========================================================================================
+    # Tiled picking
+    #=========================================================================================
+
+    def _getTileOverlap(self) -> int:
+        """:return the number of points by which tiles overlap on either side;
+        subclasses requiring a larger neighbourhood around a maximum should extend
+        """
+        return max(1, self.defaultPointExtension)
+
+    def _useTiles(self, sliceTuples) -> bool:
+        """:return True if the region defined by sliceTuples is to be picked in tiles
+        """
+        if self.dimensionCount < 2 or any(start > stop for start, stop in sliceTuples):
+            return False
+        return np.prod([stop - start + 1 for start, stop in sliceTuples], dtype=np.int64) > self.maxTilePoints
+
+    def _getTiles(self, sliceTuples, overlap) -> list:
+        """Divide the region defined by sliceTuples into tiles of at most maxTilePoints (including overlap)
+
+        :return list of (coreSliceTuples, readSliceTuples) tuples; the cores of the tiles partition the region,
+                the read-regions extend the cores by overlap (clipped to the region) on either side
+        """
+        counts = [stop - start + 1 for start, stop in sliceTuples]
+        cores = list(counts)
+        while np.prod([c + 2 * overlap for c in cores], dtype=np.int64) > self.maxTilePoints:
+            idx = int(np.argmax(cores))
+            if cores[idx] <= max(1, overlap):
+                break
+            cores[idx] = (cores[idx] + 1) // 2
+
+        tiles = []
+        ranges = [range(start, stop + 1, core) for (start, stop), core in zip(sliceTuples, cores)]
+        for starts in product(*ranges):
+            coreTuples = [(cStart, min(cStart + core - 1, stop))
+                          for cStart, core, (start, stop) in zip(starts, cores, sliceTuples)]
+            readTuples = [(max(start, cStart - overlap), min(stop, cStop + overlap))
+                          for (cStart, cStop), (start, stop) in zip(coreTuples, sliceTuples)]
+            tiles.append((coreTuples, readTuples))
+        return tiles
+
+    def _readTile(self, readTuples) -> np.ndarray:
+        """:return the scaled data of the tile defined by readTuples
+        """
+        with self.spectrum.dataSource._readLock:
+            data = self.spectrum.dataSource.getRegionData(readTuples, aliasingFlags=[1] * self.spectrum.dimensionCount)
+        return data.copy(order='K') * self.spectrum.scale
+
+    def _findPeaksTiled(self):
+        """Find the peaks in the region defined by self.sliceTuples tile-by-tile; tiles are read ahead by
+        a pool of tileReaderThreads threads, so that only a few tiles are in memory.
+        Peaks are retained if they are in the core of a tile, which removes the duplicates from the overlaps.
+        Progress is kept in _tileCheckpoint, so that a cancelled pick of the same region can resume.
+
+        :return list of SimplePeak instances, with points relative to self.sliceTuples, or None if cancelled
+        """
+        from ccpn.core.lib.ContextManagers import progressHandler
+
+        sliceTuples = [tuple(st) for st in self.sliceTuples]
+        overlap = self._getTileOverlap()
+        tiles = self._getTiles(sliceTuples, overlap)
+
+        key = (tuple(sliceTuples), self.positiveThreshold, self.negativeThreshold, overlap, self.maxTilePoints)
+        if self._tileCheckpoint is None or self._tileCheckpoint['key'] != key:
+            self._tileCheckpoint = {'key': key, 'done': set(), 'peaks': OrderedDict()}
+        checkpoint = self._tileCheckpoint
+        todo = [idx for idx in range(len(tiles)) if idx not in checkpoint['done']]
+
+        getLogger().debug('%s._findPeaksTiled: %d tiles (%d to do), overlap %d; sliceTuples = %r' %
+                          (self.__class__.__name__, len(tiles), len(todo), overlap, sliceTuples))
+
+        with progressHandler(text=f'Picking peaks in {self.spectrum.pid}', maximum=len(tiles),
+                             raiseErrors=True) as progress:
+            progress.setValue(len(checkpoint['done']))
+
+            with ThreadPoolExecutor(max_workers=self.tileReaderThreads, thread_name_prefix='PeakPickerTile') as pool:
+                futures = OrderedDict()
+                try:
+                    for idx in todo:
+                        # keep tileReaderThreads + 1 tiles in flight
+                        futures[idx] = pool.submit(self._readTile, tiles[idx][1])
+                        while len(futures) > self.tileReaderThreads or (idx == todo[-1] and futures):
+                            tileIdx, future = futures.popitem(last=False)
+                            progress.checkCancel()
+                            self._findPeaksInTile(tileIdx, tiles[tileIdx], future.result(), sliceTuples)
+                            progress.increment(1)
+                finally:
+                    for future in futures.values():
+                        future.cancel()
+                    self.sliceTuples = sliceTuples
+
+        if len(checkpoint['done']) < len(tiles):
+            return None
+
+        self._tileCheckpoint = None
+        return list(checkpoint['peaks'].values())
+
+    def _findPeaksInTile(self, tileIdx, tile, data, sliceTuples):
+        """Find the peaks in data of tile; add the peaks in the core of the tile to the checkpoint
+        """
+        coreTuples, readTuples = tile
+        # findPeaks implementations may use self.sliceTuples as the region of data
+        self.sliceTuples = readTuples
+        peaks = self.findPeaks(data)
+
+        checkpoint = self._tileCheckpoint
+        for pk in peaks:
+            # points are z,y,x ordered and relative to the tile
+            points = [p + readStart for p, (readStart, _tmp) in zip(pk.points[::-1], readTuples)]
+            if not all(cStart <= int(round(p)) <= cStop for p, (cStart, cStop) in zip(points, coreTuples)):
+                continue
+            pk.points = tuple(p - start for p, (start, _tmp) in zip(points, sliceTuples))[::-1]
+            checkpoint['peaks'].setdefault(tuple(int(round(p)) for p in points), pk)
+        checkpoint['done'].add(tileIdx)
+
     def _createCorePeaks(self, peaks, peakList) -> list:
         """
         Create core.Peak instances
@@ -377,7 +506,8 @@ class PeakPickerABC(CcpNmrJson):
 
                 if pk.height is None:
                     # height was not defined; get the interpolated value from the data
-                    pk.height = self.spectrum.dataSource.getPointValue(pointPositions)
+                    with self.spectrum.dataSource._readLock:
+                        pk.height = self.spectrum.dataSource.getPointValue(pointPositions)
 
                 if cc == len(newPeaks) - 1:
                     # clear the flag on the last iteration, so only stores update to current once
@@ -403,10 +533,12 @@ class PeakPickerABC(CcpNmrJson):
         return corePeaks
 
     def _checkValidPositions(self, peakList, peaks):
-        pointToPeak = OrderedDict((str([int(pp) for pp in pk.pointPositions]), (None, None))
-                                  for pk in peakList.peaks if None not in pk.pointPositions)
+        """Check the peaks against the existing peaks of peakList (using its spatial index) and each other
+        :return: a list of (peak, pointPositions) tuples of the peaks at new (integer) point positions
+        """
+        peakIndex = peakList._getPeakIndex()
         pointCounts = self.spectrum.pointCounts
-        newStart = len(pointToPeak)
+        newPeaks = OrderedDict()
         for pk in peaks:
             # check within the limits of the defaultPointExtension
             dpe = 0  # self.defaultPointExtension
@@ -419,12 +551,12 @@ class PeakPickerABC(CcpNmrJson):
                 continue
             # correct the peak.points for "offset" (the slice-positions taken) and ordering (i.e. inverse)
             pointPositions = [float(p) + float(self.sliceTuples[idx][0]) for idx, p in enumerate(pk.points[::-1])]
-            hashPositions = str([int((pos - 1) % pCount) + 1 for pos, pCount in
-                                 zip(pointPositions, pointCounts)])  # API position starts at 1
-            if hashPositions not in pointToPeak:
-                pointToPeak[hashPositions] = (pk, pointPositions)
+            intPositions = tuple(int((pos - 1) % pCount) + 1 for pos, pCount in
+                                 zip(pointPositions, pointCounts))  # API position starts at 1
+            if intPositions not in newPeaks and not peakIndex.peaksAtPoint(intPositions):
+                newPeaks[intPositions] = (pk, pointPositions)
 
-        return list(pointToPeak.values())[newStart:]
+        return list(newPeaks.values())
 
     def _validatePointPeak(self, pointPositions, peakList):
         """
@@ -435,10 +567,8 @@ class PeakPickerABC(CcpNmrJson):
         """
         intPositions = [int((pos - 1) % pCount) + 1 for pos, pCount in
                         zip(pointPositions, self.spectrum.pointCounts)]  # API position starts at 1
-        existingPositions = [[int(pp) for pp in pk.pointPositions] for pk in peakList.peaks if
-                             None not in pk.pointPositions]
 
-        return intPositions not in existingPositions
+        return not peakList._getPeakIndex().peaksAtPoint(intPositions)
 
     def fitExistingPeaks(self, peaks):
 
@@ -421,6 +421,12 @@ class PeakPickerNd(PeakPickerABC):
         return super().pickPeaks(sliceTuples=sliceTuples, peakList=peakList,
                                  positiveThreshold=positiveThreshold, negativeThreshold=negativeThreshold)
 
+    def _getTileOverlap(self) -> int:
+        """:return the number of points by which tiles overlap on either side;
+        extended by the box used to define the region around each maximum
+        """
+        return super()._getTileOverlap() + (self.halfBoxFindPeaksWidth or 0) + 1
+
     def _returnSimplePeaks(self, foundPeaks):
         """Return a list of SimplePeak objects from the height/point/lineWidth foundPeaks list
         """
@@ -488,8 +494,9 @@ class PeakPickerNd(PeakPickerABC):
 
         self.sliceTuples = [(int(pos - bWidth), int(pos + bWidth + 1))
                             for pos, bWidth in zip(pointPositions, boxWidths)]
-        data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
-                                                      aliasingFlags=[1] * self.spectrum.dimensionCount)
+        with self.spectrum.dataSource._readLock:
+            data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
+                                                          aliasingFlags=[1] * self.spectrum.dimensionCount)
 
         # get the height of the current peak (to stop peak flipping)
         height = spectrum.getPointValue(peak.pointPositions)
@@ -646,8 +653,9 @@ class PeakPickerNd(PeakPickerABC):
             return
 
         self.sliceTuples = [(fst, lst) for fst, lst in zip(firstArray, lastArray)]
-        data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
-                                                      aliasingFlags=[1] * self.spectrum.dimensionCount)
+        with self.spectrum.dataSource._readLock:
+            data = self.spectrum.dataSource.getRegionData(self.sliceTuples,
+                                                          aliasingFlags=[1] * self.spectrum.dimensionCount)
 
         # update positions relative to the corner of the data array
         #   - maps all regions to (0, 0)
@@ -0,0 +1,148 @@
+"""
+This file contains the dict of (id, object) pairs of a core class, as used by Project._pid2Obj
+
+Besides the usual dict behaviour, PidDict maintains an index of its ids sorted in lexical order,
+so that the ids (and objects) starting with a given prefix are found by bisection instead of by a
+scan over all entries; e.g. the NmrResidues of an NmrChain, or the NmrAtoms of an NmrResidue.
+The index is maintained on any change of the dict, so it does not depend on the code paths
+(create, delete, rename, undo) that modify Project._pid2Obj.
+
+    dd = PidDict()
+    dd['A.1.ALA'] = nmrResidue
+    dd.getKeysByPrefix('A.1.')  -->  ['A.1.ALA']
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+from bisect import bisect_left
+
+
+MAX_PENDING_IDS = 256  # number of added ids kept outside the sorted index
+
+
+class PidDict(dict):
+    """
+    A dict of (id, object) pairs with an index for the lookup of ids by prefix.
+
+    - Added ids are collected and merged into the sorted index in batches
+    - Removed ids are retained in the sorted index (and skipped on lookup) until the index is compacted
+    - Lookups return the ids in insertion order, i.e. the order of iterating over the dict
+    """
+
+    def __init__(self, *args, **kwds):
+        super().__init__()
+        self._sortedIds = []  # sorted ids; may contain ids that have since been removed
+        self._indexedIds = set()  # the ids in _sortedIds
+        self._pendingIds = set()  # ids added since the last merge
+        self._insertionOrder = {}  # (id, counter) pairs
+        self._counter = 0
+        self.update(*args, **kwds)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._counter += 1
+            self._insertionOrder[key] = self._counter
+            if key not in self._indexedIds:
+                self._pendingIds.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._insertionOrder.pop(key, None)
+        self._pendingIds.discard(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._insertionOrder.pop(key, None)
+        self._pendingIds.discard(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwds):
+        for key, value in dict(*args, **kwds).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._sortedIds = []
+        self._indexedIds = set()
+        self._pendingIds = set()
+        self._insertionOrder = {}
+
+    def copy(self):
+        return self.__class__(self)
+
+    def _updateIndex(self):
+        """Merge the pending ids into the sorted index; rebuild the index if it holds too many removed ids
+        """
+        staleCount = len(self._sortedIds) - (len(self) - len(self._pendingIds))
+        if staleCount > len(self._sortedIds) // 2 + MAX_PENDING_IDS:
+            self._sortedIds = sorted(self)
+            self._indexedIds = set(self._sortedIds)
+
+        elif self._pendingIds:
+            # sort is a merge of two sorted runs here
+            self._sortedIds.extend(sorted(self._pendingIds))
+            self._sortedIds.sort()
+            self._indexedIds.update(self._pendingIds)
+
+        self._pendingIds.clear()
+
+    def getKeysByPrefix(self, prefix: str) -> list:
+        """:return a list with the ids starting with prefix, in insertion order
+        """
+        if len(self._pendingIds) > MAX_PENDING_IDS:
+            self._updateIndex()
+
+        sortedIds = self._sortedIds
+        result = []
+        idx = bisect_left(sortedIds, prefix)
+        while idx < len(sortedIds) and sortedIds[idx].startswith(prefix):
+            if sortedIds[idx] in self:
+                result.append(sortedIds[idx])
+            idx += 1
+        result.extend(key for key in self._pendingIds if key.startswith(prefix))
+
+        result.sort(key=self._insertionOrder.__getitem__)
+        return result
+
+    def getValuesByPrefix(self, prefix: str) -> list:
+        """:return a list with the objects whose id starts with prefix, in insertion order
+        """
+        return [self[key] for key in self.getKeysByPrefix(prefix)]
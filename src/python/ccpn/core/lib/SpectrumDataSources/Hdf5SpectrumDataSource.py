@@ -36,15 +36,20 @@ __date__ = "$Date: 2020-11-20 10:28:48 +0000 (Fri, November 20, 2020) $"
 # Start of code
 #=========================================================================================
 
+import os
 from typing import Sequence, Tuple
+import numpy
 import h5py
 
 from ccpn.util.Logging import getLogger
+from ccpn.util.Path import aPath
 from ccpn.util.Common import isIterable
 from ccpn.util.traits.CcpNmrTraits import CString
 from ccpn.framework.Version import VersionString
 
 from ccpn.core.lib.SpectrumDataSources.SpectrumDataSourceABC import SpectrumDataSourceABC
+from ccpn.core.lib.SpectrumDataSources.lib.Hdf5Chunking import CHUNK_LAYOUT_AUTO, CHUNK_LAYOUT_CUBE, CHUNK_LAYOUTS, \
+    COMPRESSION_MODES, getChunkShape, getChunkCacheSize, getCompressionKwds, hasHdf5Plugin
 from ccpn.core._implementation.SpectrumData import SliceData, PlaneData, RegionData
 
 
@@ -58,6 +63,12 @@ HDF5_VERSION_KEY = 'HDF5_Version'
 HDF5_TYPE_KEY = 'HDF5_DataType'
 HDF5_DATASET_KEY = 'HDF5_DatasetName'
 HDF5_KEYS = (HDF5_VERSION_KEY, HDF5_TYPE_KEY, HDF5_DATASET_KEY)
+HDF5_BUFFER_SIGNATURE_KEY = 'HDF5_BufferSignature'  # identifies the source of a (persistent) hdf5 buffer
+HDF5_BUFFER_INCOMPLETE = 'incomplete'  # signature of a (persistent) hdf5 buffer that is not (yet) filled
+
+# importing hdf5plugin (if available) registers its compression filters; required for reading
+# datasets written with these filters
+hasHdf5Plugin()
 
 NONE_STR = '__NONE__'
 
@@ -104,10 +115,17 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
     _HDF5dataType = 'SpectrumData'
     _HDF5dataSetName = 'spectrumData'
 
-    # lzf compression seems not to yield any improvement, but rather a increase in file size;
-    # gzip compression about 30% reductions, albeit at a great cost-penalty
-    compressionModes = ('lzf', 'gzip')  # 'szip' not in conda distribution
-    defaultCompressionMode = None  # hdf5 compression modes
+    # Without byte-shuffling, lzf compression did not yield any improvement, but rather an increase
+    # in file size; gzip compression about 30% reductions, albeit at a great cost-penalty.
+    # See lib/Hdf5Chunking for the compression modes and chunk layouts; optimise() applies them to
+    # an existing file
+    compressionModes = COMPRESSION_MODES
+    defaultCompressionMode = None  # hdf5 compression mode of new files
+    chunkLayouts = CHUNK_LAYOUTS
+    defaultChunkLayout = CHUNK_LAYOUT_AUTO  # chunk layout of new files
+
+    chunkCacheSlots = 9973  # large 'enough' prime number
+    chunkCachePreemption = 0.25  # most-often will read
 
     _NONE = bytes(NONE_STR, 'utf8')
 
@@ -122,14 +140,50 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
         :param dimensionCount: limit instance to dimensionCount dimensions
         """
         self._hdf5Metadata = Hdf5Metadata()
+        self._dataset = None  # the spectrumData dataset; opened with a chunk cache matching its layout
+        self.chunkLayout = self.defaultChunkLayout
+        self.compressionMode = self.defaultCompressionMode
         super().__init__(path=path, spectrum=spectrum, dimensionCount=dimensionCount)
 
     @property
     def spectrumData(self):
         if not self.hasOpenFile():
             raise RuntimeError('File "%s" is not open' % self.path)
+        if self._dataset is None or not self._dataset.id.valid:
+            self._dataset = self._openDataset()
+        return self._dataset
+
+    def _openDataset(self):
+        """Open the spectrumData dataset with a chunk cache that can hold a plane in any orientation
+        :return h5py Dataset instance
+        """
         data = self.fp[self._HDF5dataSetName]
-        return data
+        if data.chunks is None:
+            return data
+
+        wordSize = data.dtype.itemsize
+        cacheSize = getChunkCacheSize(data.shape[::-1], data.chunks[::-1], wordSize=wordSize)
+        dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+        dapl.set_chunk_cache(self.chunkCacheSlots, cacheSize, self.chunkCachePreemption)
+        return h5py.Dataset(h5py.h5d.open(self.fp.id, self._HDF5dataSetName.encode(), dapl=dapl))
+
+    def setStorageLayout(self, chunkLayout=None, compressionMode=None):
+        """Set the chunk layout and compression mode used when creating a new file
+        :param chunkLayout: one of chunkLayouts, or None for defaultChunkLayout
+        :param compressionMode: None or one of compressionModes
+        :return self
+        """
+        if chunkLayout is None:
+            chunkLayout = self.defaultChunkLayout
+        if chunkLayout not in self.chunkLayouts:
+            raise ValueError('%s.setStorageLayout: invalid chunkLayout "%s"; should be one of %s' %
+                             (self.__class__.__name__, chunkLayout, self.chunkLayouts))
+        if compressionMode is not None and compressionMode not in self.compressionModes:
+            raise ValueError('%s.setStorageLayout: invalid compressionMode "%s"; should be one of %s' %
+                             (self.__class__.__name__, compressionMode, self.compressionModes))
+        self.chunkLayout = chunkLayout
+        self.compressionMode = compressionMode
+        return self
 
     @property
     def spectrumParameters(self):
@@ -227,10 +281,11 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
 
         try:
             self.disableCache()  # Hdf has its own caching
-            # Adjust hdf chunk caching parameters
+            # Adjust hdf chunk caching parameters; the spectrumData dataset gets its own
+            # chunk cache matching its layout (see _openDataset)
             kwds.setdefault('rdcc_nbytes', self.maxCacheSize)
-            kwds.setdefault('rdcc_nslots', 9973)  # large 'enough' prime number
-            kwds.setdefault('rdcc_w0', 0.25)  # most-often will read
+            kwds.setdefault('rdcc_nslots', self.chunkCacheSlots)
+            kwds.setdefault('rdcc_w0', self.chunkCachePreemption)
 
             self.fp = self.openMethod(str(self.path), mode, **kwds)
             self.mode = mode
@@ -254,19 +309,7 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
             self._hdf5Metadata.saveToHdf5(self.fp)
 
             # create the spectrum dataset
-            dataSetKwds = {}
-            dataSetKwds.setdefault('fletcher32', True)
-            dataSetKwds.setdefault('fillvalue', 0.0)
-            if self.defaultCompressionMode is not None and self.defaultCompressionMode in self.compressionModes:
-                dataSetKwds.setdefault('compression', self.defaultCompressionMode)
-                dataSetKwds.setdefault('fletcher32', False)
-
-            self.fp.create_dataset(self._HDF5dataSetName,
-                                   self.pointCounts[::-1],  # data are organised numpy style z, y, x
-                                   dtype=self._dtype,
-                                   chunks=True,
-                                   track_times=False,  # to assure same hash after opening/storing
-                                   **dataSetKwds)
+            self._createDataset(self.fp, chunkLayout=self.chunkLayout, compressionMode=self.compressionMode)
             self.blockSizes = tuple(self.spectrumData.chunks[::-1])
 
             self.writeParameters()
@@ -276,6 +319,82 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
 
         return self.fp
 
+    def _createDataset(self, fp, chunkLayout, compressionMode):
+        """Create the (empty) spectrumData dataset in fp, using chunkLayout and compressionMode
+        :return h5py Dataset instance
+        """
+        dataSetKwds = getCompressionKwds(compressionMode)
+        dataSetKwds.setdefault('fletcher32', compressionMode is None)  # checksum only uncompressed data
+        dataSetKwds.setdefault('fillvalue', 0.0)
+
+        chunks = getChunkShape(self.pointCounts, chunkLayout, wordSize=self.wordSize)
+        if chunks is not True:
+            chunks = chunks[::-1]  # chunks are organised numpy style z, y, x
+
+        return fp.create_dataset(self._HDF5dataSetName,
+                                 self.pointCounts[::-1],  # data are organised numpy style z, y, x
+                                 dtype=self._dtype,
+                                 chunks=chunks,
+                                 track_times=False,  # to assure same hash after opening/storing
+                                 **dataSetKwds)
+
+    def optimise(self, chunkLayout=CHUNK_LAYOUT_CUBE, compressionMode=None):
+        """Rewrite the file using chunkLayout and compressionMode; e.g. to optimise an existing file for
+        a particular access pattern (see lib/Hdf5Chunking).
+        The data are copied into a temporary file next to self.path, which then replaces the original.
+
+        :param chunkLayout: one of chunkLayouts
+        :param compressionMode: None or one of compressionModes
+        :return self
+        """
+        self.setStorageLayout(chunkLayout=chunkLayout, compressionMode=compressionMode)
+
+        if not self.path.exists():
+            raise RuntimeError('%s.optimise: path "%s" does not exist' % (self.__class__.__name__, self.path))
+
+        _mode = self.mode
+        if self.hasOpenFile():
+            self.closeFile()
+
+        tmpPath = aPath(str(self.path) + '.optimising')
+        getLogger().debug('optimise: rewriting %s with chunkLayout=%r, compressionMode=%r' %
+                          (self, chunkLayout, compressionMode))
+        try:
+            with h5py.File(str(self.path), self.defaultOpenReadMode) as source, \
+                    h5py.File(str(tmpPath), self.defaultOpenWriteMode) as destination:
+
+                for key, value in source.attrs.items():
+                    destination.attrs[key] = value
+
+                sourceData = source[self._HDF5dataSetName]
+                destinationData = self._createDataset(destination, chunkLayout=chunkLayout,
+                                                      compressionMode=compressionMode)
+                for key, value in sourceData.attrs.items():
+                    destinationData.attrs[key] = value
+
+                # copy the data in slabs that are aligned to the new chunks along the slowest axis
+                step = destinationData.chunks[0]
+                for start in range(0, sourceData.shape[0], step):
+                    slab = slice(start, min(start + step, sourceData.shape[0]))
+                    destinationData[slab] = sourceData[slab]
+
+        except Exception as es:
+            if tmpPath.exists():
+                tmpPath.removeFile()
+            text = '%s.optimise: %s' % (self.__class__.__name__, str(es))
+            getLogger().warning(text)
+            raise RuntimeError(text) from es
+
+        os.replace(tmpPath, self.path)
+
+        # reopen as before; a write mode would truncate (or fail on) the now existing file
+        if _mode is None:
+            _mode = self.defaultOpenReadMode
+        elif _mode[0] in 'wxa':
+            _mode = self.defaultOpenReadWriteMode
+        self.openFile(mode=_mode)
+        return self
+
     def readParameters(self):
         """Read the parameter values from the hdf5 data structure
         :return self
@@ -620,11 +739,57 @@ class Hdf5SpectrumDataSource(SpectrumDataSourceABC):
             regionData[:] = dataset[slices[::-1]]  # data are ..,z,y,x ordered
             regionData *= self.dataScale
         else:
-            # fall back on the slice-based extraction
-            regionData = super()._getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+            # aliased region: read the folded region in one pass and unfold
+            regionData = self._getRegionDataNative(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
 
         return regionData
 
+    def _readRegion(self, ranges):
+        """Read the (folded) hyper-rectangle defined by ranges in one pass
+        :param ranges: list of (start, stop) tuples (0-based, stop exclusive) for all dimensions
+        :return scaled numpy array (..,z,y,x ordered)
+        """
+        if not self.hasOpenFile():
+            self.openFile(mode=self.defaultOpenReadMode)
+
+        slices = tuple(slice(start, stop) for start, stop in ranges)
+        data = numpy.array(self.spectrumData[slices[::-1]], dtype=self._dtype)  # data are ..,z,y,x ordered
+        data *= self.dataScale
+        return data
+
+    def _writeRegion(self, data, ranges):
+        """Write data into the hyper-rectangle defined by ranges in one pass;
+        i.e. the counterpart of _readRegion
+        :param data: numpy array (..,z,y,x ordered)
+        :param ranges: list of (start, stop) tuples (0-based, stop exclusive) for all dimensions
+        """
+        if self.hasOpenFile() and self.mode == self.defaultOpenReadMode:
+            # File was opened read-only; close it so it can be re-opened 'r+'
+            self.closeFile()
+            self.openFile(mode=self.defaultOpenReadWriteMode)
+
+        if not self.hasOpenFile():
+            self.openFile(mode=self.defaultAppendMode)
+
+        slices = tuple(slice(start, stop) for start, stop in ranges)
+        shape = tuple(stop - start for start, stop in ranges)
+        self.spectrumData[slices[::-1]] = data.reshape(shape[::-1])  # dataset and data are ..,z,y,x ordered
+
+    def _readBufferSignature(self):
+        """:return the signature of the source of a hdf5 buffer, or None if not defined
+        """
+        if not self.hasOpenFile():
+            self.openFile(mode=self.defaultOpenReadMode)
+        _signature = self.fp.attrs.get(HDF5_BUFFER_SIGNATURE_KEY)
+        return None if _signature is None else str(_signature)
+
+    def _writeBufferSignature(self, signature):
+        """Store signature of the source of a hdf5 buffer; marks the buffer as complete
+        """
+        if not self.hasOpenFile() or self.mode == self.defaultOpenReadMode:
+            raise RuntimeError('%s._writeBufferSignature: file not opened for writing' % self.__class__.__name__)
+        self.fp.attrs[HDF5_BUFFER_SIGNATURE_KEY] = str(signature)
+
 # Register this format
 Hdf5SpectrumDataSource._registerFormat()
 
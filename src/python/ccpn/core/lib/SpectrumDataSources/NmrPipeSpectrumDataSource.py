@@ -5,7 +5,9 @@ it serves as an interface between the V3 Spectrum class and the actual spectral
 See SpectrumDataSourceABC for a description of the methods
 
 The NmrPipe data access completely relies on the Hdf5buffer option: the NmrPipe file
-is fully read into the temporary buffer at the moment of first data access
+is fully read into the temporary buffer at the moment of first data access.
+The xy-planes of multi-file nD's are read in parallel (see fillHdf5Buffer); optionally, the buffer
+is kept next to the NmrPipe files (preferences: general.keepNmrPipeBuffers) and reused in later sessions
 """
 #=========================================================================================
 # Licence, Reference and Credits
@@ -32,12 +34,15 @@ __date__ = "$Date: 2020-11-20 10:28:48 +0000 (Fri, November 20, 2020) $"
 # Start of code
 #=========================================================================================
 
+import os
 import sys, re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence
 import numpy
 
 from ccpn.util.Path import aPath, Path
 from ccpn.util.Logging import getLogger
+from ccpn.core.lib.ContextManagers import progressHandler
 
 from ccpn.util.traits.CcpNmrTraits import CList, CInt, Int, CString, Bool
 
@@ -118,6 +123,8 @@ class NmrPipeSpectrumDataSource(SpectrumDataSourceABC):
     isFloatData = True
     MAXDIM = 4          # Explicitly overide as NmrPipe can only handle upto 4 dimensions
 
+    bufferReaderThreads = min(8, os.cpu_count() or 1)  # Number of threads reading the planes in fillHdf5Buffer
+
     suffixes = ['.pipe', '.fid', '.ft', '.ft1', '.ft2', '.ft3', '.ft4', '.dat']
     allowDirectory = True
     openMethod = open
@@ -143,14 +150,18 @@ class NmrPipeSpectrumDataSource(SpectrumDataSourceABC):
 
     #=========================================================================================
 
-    def __init__(self, path=None, spectrum=None, temporaryBuffer=True, bufferPath=None):
+    def __init__(self, path=None, spectrum=None, temporaryBuffer=None, bufferPath=None):
         """Initialise; optionally set path or extract from spectrum
 
         :param path: optional input path
         :param spectrum: associate instance with spectrum and import spectrum's parameters
-        :param temporaryBuffer: used temporary file to buffer the data
+        :param temporaryBuffer: used temporary file to buffer the data;
+                                None: use preferences (general.keepNmrPipeBuffers) to decide
         :param bufferPath: (optionally) use path to generate buffer file (implies temporaryBuffer=False)
         """
+        if temporaryBuffer is None:
+            temporaryBuffer = not _keepBuffersFromPreferences()
+
         super().__init__(path=path, spectrum=spectrum)
 
         self.header = None  # NmrPipeHeader instance
@@ -496,8 +507,122 @@ class NmrPipeSpectrumDataSource(SpectrumDataSourceABC):
         return True
 
 
-    def fillHdf5Buffer(self):
-        """Fill hdf5buffer with data from self
+    def _isComplexTimeAxis(self, axis) -> bool:
+        """:return True if axis (0-based) is a complex time-domain axis
+        """
+        return self.isComplex[axis] and self.dimensionTypes[axis] == DIMENSION_TIME
+
+    def _toBufferIndex(self, axis, index) -> int:
+        """Convert index (0-based) along axis from the NmrPipe nRI ordering
+        into the nRnI ordering of the hdf5 buffer
+        """
+        if axis >= self.dimensionCount or not self._isComplexTimeAxis(axis):
+            return index
+        if index % 2:
+            # imaginary point
+            return index // 2 + self.realPointCounts[axis]
+        # real point
+        return index // 2
+
+    def _toPipeIndex(self, axis, index) -> int:
+        """Convert index (0-based) along axis from the nRnI ordering of the hdf5 buffer
+        into the NmrPipe nRI ordering; i.e. the inverse of _toBufferIndex
+        """
+        if axis >= self.dimensionCount or not self._isComplexTimeAxis(axis):
+            return index
+        realCount = self.realPointCounts[axis]
+        if index < realCount:
+            # real point
+            return 2 * index
+        # imaginary point
+        return 2 * (index - realCount) + 1
+
+    def _readPipePlane(self, position) -> numpy.ndarray:
+        """Read the xy-plane at position (1-based, NmrPipe ordering) and sort the points of
+        a complex time-domain Y-axis in nRnI order.
+        Thread-safe: each call uses its own file handle
+        :return numpy array of shape (yPoints, xPoints)
+        """
+        xAxis = specLib.X_DIM_INDEX
+        yAxis = specLib.Y_DIM_INDEX
+        planeSize = self.pointCounts[xAxis] * self.pointCounts[yAxis]
+
+        path, offset = self._getPathAndOffset(position)
+        with open(path, 'rb') as fp:
+            fp.seek(offset, 0)
+            data = numpy.fromfile(file=fp, dtype=self.dtype, count=planeSize)
+        data.resize( (self.pointCounts[yAxis], self.pointCounts[xAxis]))
+
+        # In a NmrPipe 2D xy plane:
+        # - A complex X-axis has n real points followed by n imaginary points (nRnI)
+        # - A complex Y-axis has n alternating real, imag points (nRI)
+        if self._isComplexTimeAxis(yAxis):
+            # sort the n-RI data point into nRnI data points
+            realSize = self.realPointCounts[yAxis]
+            writeData = numpy.empty(shape=data.shape, dtype=data.dtype)
+            writeData[0:realSize, :] = data[0::2, :]  # The real points
+            writeData[realSize:, :] = data[1::2, :]  # The imag points
+            data = writeData
+
+        return data
+
+    def _getFillBatches(self, batchSize) -> list:
+        """:return a list of (aIndex, zStart, zStop) tuples (0-based, buffer ordering) of
+        consecutive batches of xy-planes covering the nD; zStart, zStop are aligned to batchSize
+        """
+        zCount = self.pointCounts[specLib.Z_DIM_INDEX]
+        aCount = self.pointCounts[specLib.A_DIM_INDEX] if self.dimensionCount >= 4 else 1
+        return [(aIndex, zStart, min(zStart + batchSize, zCount))
+                for aIndex in range(aCount)
+                for zStart in range(0, zCount, batchSize)]
+
+    def _getBatchPositions(self, batch) -> list:
+        """:return a list of the (1-based, NmrPipe ordering) xy-plane positions of batch
+        """
+        aIndex, zStart, zStop = batch
+        aPipe = self._toPipeIndex(specLib.A_DIM_INDEX, aIndex)
+        result = []
+        for zIndex in range(zStart, zStop):
+            position = [1, 1, self._toPipeIndex(specLib.Z_DIM_INDEX, zIndex) + 1, aPipe + 1]
+            result.append(position[:self.dimensionCount])
+        return result
+
+    def _checkBuffer(self):
+        """Create (if needed) and fill Hdf5 buffer;
+        a multi-file nD is filled while showing a (cancellable) progress dialog
+        """
+        from ccpn.framework.Application import getApplication
+
+        if self.hdf5buffer is None:
+            # Buffer has not been created
+            self.initialiseHdf5Buffer()
+        if self._bufferFilled:
+            return
+
+        if self.nFiles <= 1 or getApplication() is None:
+            self.fillHdf5Buffer()
+            return
+
+        nPlanes = int(numpy.prod(self.pointCounts[specLib.Z_DIM_INDEX:]))
+        with progressHandler(title='Buffering data', text='Reading %d files of %s' % (self.nFiles, self.nameFromPath()),
+                             minimum=0, maximum=nPlanes) as progress:
+            self.fillHdf5Buffer(progress=progress)
+
+        if not self._bufferFilled:
+            getLogger().warning('%s: buffering cancelled; data are incomplete' % self)
+
+    def fillHdf5Buffer(self, progress=None):
+        """Fill hdf5buffer with data from self.
+
+        For nD's, a pool of (bufferReaderThreads) threads reads and decodes the xy-planes in parallel,
+        while the calling thread writes them into the hdf5buffer in batches that are aligned to the
+        chunks of the hdf5 dataset along the Z-axis.
+
+        :param progress: optional progress instance (e.g. as obtained from the progressHandler context
+                         manager); it is incremented by the number of xy-planes written and its
+                         checkCancel() method is called for each batch.
+                         Raising StopIteration from checkCancel() cancels the filling; the buffer
+                         remains unfilled and StopIteration is re-raised.
         """
         if not self.isBuffered:
             raise RuntimeError('fillHdf5Buffer: no hdf5Buffer defined')
@@ -514,76 +639,73 @@ class NmrPipeSpectrumDataSource(SpectrumDataSourceABC):
             # 1D
             position = [1]
             path, offset = self._getPathAndOffset(position)
-            with open(path, 'r') as fp:
+            with open(path, 'rb') as fp:
                 fp.seek(offset, 0)
                 data = numpy.fromfile(file=fp, dtype=self.dtype, count=self.pointCounts[xAxis])
             self.hdf5buffer.setSliceData(data, position=position, sliceDim=xDim)
 
+        elif self.dimensionCount == 2:
+            # 2D: just a single plane
+            position = [1, 1]
+            self.hdf5buffer.setPlaneData(self._readPipePlane(position), position=position, xDim=xDim, yDim=yDim)
+
         else:
             # nD's: fill the buffer, reading x,y planes from the nmrPipe files into the hdf5 buffer
-            planeSize = self.pointCounts[xAxis] * self.pointCounts[yAxis]
-            sliceTuples = [(1, p) for p in self.pointCounts]
-            realPointCounts = self.realPointCounts
-
-            # loop over all the xy-planes
-            for position, aliased in self._selectedPointsIterator(sliceTuples, excludeDimensions=(xDim, yDim)):
-                path, offset = self._getPathAndOffset(position)
-                with open(path, 'r') as fp:
-                    fp.seek(offset, 0)
-                    data = numpy.fromfile(file=fp, dtype=self.dtype, count=planeSize)
-                    data.resize( (self.pointCounts[yAxis], self.pointCounts[xAxis]))
-
-                writePosition = [p for p in position]
-                writeData = data
-
-                # For the Z,A dimensions:
-                # - the complex time Z,A-axes have n alternating real, imag points (nRI)
-                if self.dimensionCount >= 3 and self.isComplex[specLib.Z_AXIS] and \
-                   self.dimensionTypes[specLib.Z_AXIS] == DIMENSION_TIME:
-                    # adjust the Z-position to nRnI ordering
-                    zP = writePosition[specLib.Z_AXIS] - 1  # convert to zero-based
-                    if zP % 2:
-                        # imaginary point
-                        zP = zP // 2 + realPointCounts[specLib.Z_AXIS]
-                    else:
-                        # real point
-                        zP = zP // 2
-                    writePosition[specLib.Z_AXIS] = zP + 1 # convert to one-based
-
-                if self.dimensionCount >= 4 and self.isComplex[specLib.A_AXIS] and \
-                   self.dimensionTypes[specLib.A_AXIS] == DIMENSION_TIME:
-                    # adjust the A-position to nRnI ordering
-                    aP = writePosition[specLib.A_AXIS] - 1  # convert to zero-based
-                    if aP % 2:
-                        # imaginary point
-                        aP = aP // 2 + realPointCounts[specLib.A_AXIS]
-                    else:
-                        # real point
-                        aP = aP // 2
-                    writePosition[specLib.A_AXIS] = aP + 1 # convert to one-based
-
-                # In a NmrPipe 2D xy plane:
-                # - A complex X-axis has n real points followed by n imaginary points (nRnI)
-                # - A complex Y-axis has n alternating real, imag points (nRI)
-                if self.isComplex[specLib.Y_AXIS] and \
-                   self.dimensionTypes[specLib.Y_AXIS] == DIMENSION_TIME:
-                    # sort the n-RI data point into nRnI data points
-                    totalSize = self.pointCounts[specLib.Y_AXIS]
-                    realSize = realPointCounts[specLib.Y_AXIS]
-                    writeData = numpy.empty(shape=data.shape)
-                    _realData = data[0::2,:]  # The real points
-                    _imagData = data[1::2,:]  # The imag points
-                    writeData[0:realSize, :] = _realData
-                    writeData[realSize:totalSize, :] = _imagData
-
-                self.hdf5buffer.setPlaneData(writeData, position=writePosition, xDim=xDim, yDim=yDim)
-
-        self._bufferFilled = True
+            nThreads = max(1, self.bufferReaderThreads)
+            # batches of complete hdf5 chunks along Z, comprising at least nThreads planes
+            chunkSize = self.hdf5buffer.blockSizes[specLib.Z_DIM_INDEX]
+            batchSize = chunkSize * max(1, -(-nThreads // chunkSize))
+            batches = self._getFillBatches(batchSize)
+
+            with ThreadPoolExecutor(max_workers=nThreads, thread_name_prefix='NmrPipeReader') as pool:
+
+                def _submit(batch):
+                    return [pool.submit(self._readPipePlane, position) for position in self._getBatchPositions(batch)]
+
+                # pipeline: the planes of the next batch are read while the current batch is written
+                pending = _submit(batches[0])
+                try:
+                    for idx, (aIndex, zStart, zStop) in enumerate(batches):
+                        if progress is not None:
+                            progress.checkCancel()
+                        futures = pending
+                        pending = _submit(batches[idx + 1]) if idx + 1 < len(batches) else []
+
+                        data = numpy.stack([future.result() for future in futures])
+                        ranges = [(0, self.pointCounts[xAxis]), (0, self.pointCounts[yAxis]), (zStart, zStop),
+                                  (aIndex, aIndex + 1)][:self.dimensionCount]
+                        self.hdf5buffer._writeRegion(data, ranges)
+
+                        if progress is not None:
+                            progress.increment(zStop - zStart)
+
+                except Exception:
+                    # cancelled or error; do not continue reading
+                    for future in pending:
+                        future.cancel()
+                    getLogger().debug('fillHdf5Buffer: filling %s aborted' % self.hdf5buffer)
+                    raise
+
+        self._setBufferFilled()
 
 # Register this format
 NmrPipeSpectrumDataSource._registerFormat()
 
 
+def _keepBuffersFromPreferences() -> bool:
+    """:return True if the hdf5 buffers are to be kept next to the NmrPipe files, as defined
+    in the preferences (general.keepNmrPipeBuffers); False if undefined
+    """
+    from ccpn.framework.Application import getApplication
+
+    try:
+        if (app := getApplication()) is not None and app.preferences is not None:
+            return bool(app.preferences.general.get('keepNmrPipeBuffers', False))
+    except Exception:
+        pass
+    return False
+
+
 class NmrPipeInputStreamDataSource(NmrPipeSpectrumDataSource):
     """
     NmrPipe spectral storage, reading from an stdinp stream
@@ -31,6 +31,8 @@ setSliceData()              set 1D slice (to be subclassed; specific formats onl
 
 getPlaneData()              get 2D plane (to be subclassed)
 setPlaneData()              set 2D plane (to be subclassed; specific formats only)
+getDecimatedPlaneData()     get 2D plane, decimated by a factor 2, 4, 8, ... (multi-resolution store)
+getProjectionData()         get 2D projection along all other dimensions (parallel, cached)
 
 getPointData()              Get value defined by position (1-based, integer values)
 getPointValue()             Get interpolated value defined by position (1-based, float values)
@@ -49,6 +51,8 @@ allPlanes()                 yields a (position, planeData) tuple iterator over a
 allSlices()                 yields a (position, sliceData) tuple iterator over all slices
 allPoints()                 yields a (position, point) tuple iterator over all points
 
+setMemoryMapping()          enable/disable the memory-mapped (numpy.memmap) reading of blocked data (default: enabled)
+
 
 Example 1 (No Spectrum instance used):
 
@@ -105,11 +109,13 @@ __date__ = "$Date: 2020-11-20 10:28:48 +0000 (Fri, November 20, 2020) $"
 # Start of code
 #=========================================================================================
 
+import os
 import sys
 from typing import Sequence
 from contextlib import contextmanager
 from collections import OrderedDict, defaultdict
 from itertools import product
+from threading import RLock
 
 import tempfile
 import numpy
@@ -118,7 +124,8 @@ import numpy as np
 import ccpn.core.lib.SpectrumLib as specLib
 from ccpn.core._implementation.SpectrumData import SliceData, PlaneData, RegionData
 from ccpn.core.lib.ContextManagers import notificationEchoBlocking
-from ccpn.core.lib.Cache import cached, Cache
+from ccpn.core.lib.SpectrumDataSources.lib.BlockCache import getBlockCache, newBlockCacheId, \
+    BlockCache, BlockCacheStatistics
 
 from ccpn.util.Common import isIterable
 from ccpn.util.Path import aPath
@@ -133,8 +140,6 @@ from ccpn.util.traits.CcpNmrJson import CcpNmrJson
 from ccpn.framework.constants import CCPNMR_PREFIX, NO_SUFFIX, ANY_SUFFIX
 
 
-_BLOCK_CACHE = CCPNMR_PREFIX + 'block_cache'
-# _BLOCK_CACHE_MAXITEMS = 128
 MB = 1024 * 1024
 
 
@@ -240,8 +245,9 @@ class SpectrumDataSourceABC(CcpNmrJson):
     alternateDataFormatNames = []  # list with optional alternate names; e.g. for NmrView->NMRView
 
     isBlocked = False  # flag defining if data are blocked
-    hasBlockCached = True  # Flag indicating if block data are cached
-    maxCacheSize = 64 * MB  # Max cache size in Bytes
+    hasBlockCached = True  # Flag indicating if block data are cached (in the process-wide BlockCache)
+    hasMemoryMapping = True  # Flag indicating if blocked data can be read through a numpy.memmap
+    maxCacheSize = 64 * MB  # Max (format specific) cache size in Bytes; e.g. used by Hdf5
 
     wordSize = 4
     headerSize = 0
@@ -646,6 +652,14 @@ class SpectrumDataSourceABC(CcpNmrJson):
         self.fp = None  # File pointer; None indicates closed
         self.mode = None  # Open mode
 
+        # initiate the access to the (process-wide) block cache
+        self._initBlockCache()
+        self._memoryMap = None  # numpy.memmap block-view of the binary data; created on demand
+        # serialises the access to the data (file, memory map, hdf5 buffer); held by the Spectrum data
+        # methods and the background readers (e.g. the prefetching of traces, the building of contours)
+        self._readLock = RLock()
+        self._useMemoryMapping = self.hasMemoryMapping
+
         # hdf5Buffer related attributes
         self._isBuffered = False  # Flag to indicate the spectrumDataSource object to have buffered read/writes;
         self.hdf5buffer = None  # Hdf5SpectrumBuffer instance; None indicates no Hdf5 buffer used
@@ -653,6 +667,10 @@ class SpectrumDataSourceABC(CcpNmrJson):
         self._bufferIsTemporary = True
         self._bufferPath = None
 
+        self._pyramid = None  # PlanePyramid instance; created on first request of a decimated plane
+        self._statisticsCache = None  # StatisticsCache instance; created on first request
+        self._dataVersion = 0  # incremented upon changes of the data; identifies derived data (e.g. contours)
+
         self.spectrum = None  # Spectrum instance
 
         self.setDefaultParameters()
@@ -664,11 +682,6 @@ class SpectrumDataSourceABC(CcpNmrJson):
         if dimensionCount is not None:
             self.setDimensionCount(dimensionCount)
 
-        # initiate the block cache
-        self._initBlockCache()  # This wil initiate the cache instance
-        # if not self.hasBlockCached:
-        #     self.disableCache()
-
         self.checkValid()
 
     def setDefaultParameters(self, nDim=MAXDIM):
@@ -1031,32 +1044,38 @@ class SpectrumDataSourceABC(CcpNmrJson):
     #=========================================================================================
 
     def _initBlockCache(self):
-        """Intialise the cache"""
-        cache = Cache(maxItems=0, name=_BLOCK_CACHE)
-        setattr(self, _BLOCK_CACHE, cache)
+        """Intialise the access to the (process-wide) block cache"""
+        self._blockCacheId = newBlockCacheId()  # integer key into the shared block cache
+        self._blockCacheEnabled = False  # enabled after reading the parameters (see readParameters)
 
     @property
-    def cache(self):
-        """Returns the Block cache instance"""
-        if not hasattr(self, _BLOCK_CACHE):
-            self._initBlockCache()
-        cache = getattr(self, _BLOCK_CACHE)
-        return cache
+    def cache(self) -> BlockCache:
+        """Returns the (process-wide) Block cache instance"""
+        return getBlockCache()
+
+    @property
+    def cacheStatistics(self) -> BlockCacheStatistics:
+        """Returns the block cache hit/miss statistics of self"""
+        return self.cache.getStatistics(self._blockCacheId)
 
     def disableCache(self):
         """Disable the caching of blockdata"""
-        self.cache.resize(0)
+        self._blockCacheEnabled = False
+        self.clearCache()
+
+    def enableCache(self):
+        """Enable the caching of blockdata"""
+        self._blockCacheEnabled = self.isBlocked and self.hasBlockCached
 
     def clearCache(self):
-        """Clear the cache"""
-        self.cache.clear()
+        """Clear the cached blocks (and memory map) of self"""
+        self.cache.clear(self._blockCacheId)
+        self._closeMemoryMap()
 
     def _setMaxCacheSize(self, sizeInBytes):
-        """Set the maximum cache size (in Bytes) over all cached blocks
+        """Set the maximum cache size (in Bytes) over all cached blocks of all dataSources
         """
-        blockSizeInBytes = self._totalBlockSize * self.wordSize
-        maxItems = int(sizeInBytes / blockSizeInBytes)
-        self.cache.resize(maxItems)
+        self.cache.resize(sizeInBytes)
 
     #=========================================================================================
     # blocked access related functions
@@ -1125,18 +1144,27 @@ class SpectrumDataSourceABC(CcpNmrJson):
         """return the numpy dtype string based on settings"""
         return '%s%s%s' % (self.isBigEndian and '>' or '<', self.isFloatData and 'f' or 'i', self.wordSize)
 
-    @cached(_BLOCK_CACHE, debug=False, doSignatureExpansion=False)
     def _readBlockFromFile(self, absoluteBlockIndex):
-        """Read block at absoluteBlockIndex; separate routine for caching reasons
+        """Read block at absoluteBlockIndex; check the (process-wide) block cache first
         Return NumPy array
         """
+        if self._blockCacheEnabled:
+            key = (self._blockCacheId, absoluteBlockIndex)
+            if (blockdata := self.cache.get(key)) is not None:
+                return blockdata
+
         offset = (self.headerSize +
                   self._totalBlockSize * absoluteBlockIndex
                   ) * self.wordSize  # offset in bytes
-        self.fp.seek(offset, 0)
-        # dtype = '%s%s%s' % (self.isBigEndian and '>' or '<', self.isFloatData and 'f' or 'i', self.wordSize)
-        blockdata = numpy.fromfile(file=self.fp, dtype=self.dtype, count=self._totalBlockSize)
-        return self._convertBlockData(blockdata)
+        with self._readLock:
+            self.fp.seek(offset, 0)
+            blockdata = numpy.fromfile(file=self.fp, dtype=self.dtype, count=self._totalBlockSize)
+        blockdata = self._convertBlockData(blockdata)
+
+        if self._blockCacheEnabled:
+            self.cache.add(key, blockdata)
+
+        return blockdata
 
     def _readBlock(self, points):
         """read and return NumPy data-array of block corresponding to points (zero-based)
@@ -1160,6 +1188,112 @@ class SpectrumDataSourceABC(CcpNmrJson):
 
         return data
 
+    #=========================================================================================
+    # memory-mapped access of blocked data
+    #=========================================================================================
+
+    def setMemoryMapping(self, useMemoryMapping: bool):
+        """Define the use of memory-mapped (numpy.memmap) reading of the blocked data
+        """
+        self._useMemoryMapping = self.hasMemoryMapping and bool(useMemoryMapping)
+        self._closeMemoryMap()
+
+    def _closeMemoryMap(self):
+        """Release the memory map (if any)
+        """
+        self._memoryMap = None
+
+    def _getMemoryMap(self):
+        """Return a numpy.memmap of the binary data, shaped as a block-view; i.e. the first dimensionCount
+        axes are the block indices and the last dimensionCount axes are the offsets within the blocks
+        (both in inverse dimension order, i.e. [Nz][Ny][Nx][Bz][By][Bx]).
+
+        :return a numpy.memmap instance or None if memory-mapping is not possible for this data
+        """
+        if self._memoryMap is not None:
+            return self._memoryMap
+
+        if not self._useMemoryMapping or not self.isBlocked or self.blockHeaderSize != 0 or \
+                not self.hasOpenFile() or not self.mode.startswith('r'):
+            return None
+
+        try:
+            dataSizeInBytes = self._totalBlockSize * self._totalBlocks * self.wordSize
+            offset = self.headerSize * self.wordSize
+            if os.fstat(self.fp.fileno()).st_size < offset + dataSizeInBytes:
+                # truncated final block(s); these require padding, which is handled by the block-wise read
+                return None
+
+            shape = tuple(self._numBlocksPerDimension[::-1]) + \
+                    tuple(self.blockSizes[0:self.dimensionCount][::-1])
+            self._memoryMap = numpy.memmap(self.fp, dtype=self.dtype, mode='r', offset=offset, shape=shape)
+
+        except Exception as es:
+            getLogger().debug('%s: unable to memory-map data (%s); using block-wise reading' % (self, es))
+            self._useMemoryMapping = False
+            self._memoryMap = None
+
+        return self._memoryMap
+
+    def _readMemoryMappedData(self, dimensions, position, ranges=None) -> numpy.ndarray:
+        """Read the data along dimensions through position from the memory-mapped block-view,
+        without looping over the individual blocks.
+
+        :param dimensions: the (1-based) dimensions spanning the result;
+                           result is a numpy array with axes in inverse dimensions order, e.g. array[y][x]
+                           for dimensions=(xDim, yDim)
+        :param position: the (1-based) position; defines the point in the dimensions not in dimensions
+        :param ranges: optional list of (start, stop) tuples (0-based, stop exclusive) for each of dimensions;
+                       defaults to the full range
+        :return numpy array (converted to self._dtype, not scaled) or None if memory-mapping is not possible
+        """
+        if (blockView := self._getMemoryMap()) is None:
+            return None
+
+        nDim = self.dimensionCount
+        indices = [d - 1 for d in dimensions]
+        if ranges is None:
+            ranges = [(0, self.pointCounts[idx]) for idx in indices]
+
+        # select the block (and within-block) indices along all axes of the block view
+        selection = [None] * (2 * nDim)
+        for idx in range(nDim):
+            blockSize = self.blockSizes[idx]
+            if idx in indices:
+                start, stop = ranges[indices.index(idx)]
+                firstBlock = start // blockSize
+                lastBlock = (stop - 1) // blockSize
+                selection[nDim - 1 - idx] = slice(firstBlock, lastBlock + 1)
+                selection[2 * nDim - 1 - idx] = slice(None)
+            else:
+                point = position[idx] - 1
+                selection[nDim - 1 - idx] = point // blockSize
+                selection[2 * nDim - 1 - idx] = point % blockSize
+        data = blockView[tuple(selection)]
+
+        # The remaining axes are the block axes of indices (in inverse order), followed by the within-block axes;
+        # interleave these per dimension, in the order of the result
+        resultIndices = indices[::-1]
+        remaining = sorted(indices, reverse=True)
+        nFree = len(indices)
+        axes = []
+        shape = []
+        for idx in resultIndices:
+            pos = remaining.index(idx)
+            axes.extend([pos, nFree + pos])
+            shape.append(data.shape[pos] * data.shape[nFree + pos])
+        data = data.transpose(axes).reshape(shape)  # This does the actual reading from file
+
+        # trim to the requested ranges
+        trims = []
+        for idx in resultIndices:
+            start, stop = ranges[indices.index(idx)]
+            offset = (start // self.blockSizes[idx]) * self.blockSizes[idx]
+            trims.append(slice(start - offset, stop - offset))
+        data = data[tuple(trims)]
+
+        return self._convertBlockData(data)
+
     def _readBlockedPoint(self, position=()) -> float:
         """Read value at position (1-based)
         Return float value
@@ -1197,14 +1331,19 @@ class SpectrumDataSourceABC(CcpNmrJson):
         # data = numpy.zeros(self.pointCounts[sliceIdx], dtype=self.dataType)
         data = SliceData(dataSource=self, dimensions=(sliceDim,), position=position)
 
+        if not self.hasOpenFile():
+            self.openFile(mode=self.defaultOpenReadMode)
+
+        # Try reading from the memory-mapped data first
+        if (_data := self._readMemoryMappedData(dimensions=(sliceDim,), position=position)) is not None:
+            data[:] = _data
+            return data
+
         # we are reading nD blocks; need to slice across these with depth of 1 in non-slice dims and a
         # size of blockSizes[sliceIdx] along the sliceDim (set dynamically during the looping)
         blockOffsets = [offset for _tmp, offset in self._pointsToBlocksPerDimension(points)]
         slices = [slice(offset, offset + 1) for offset in blockOffsets]
 
-        if not self.hasOpenFile():
-            self.openFile(mode=self.defaultOpenReadMode)
-
         # loop through the points p of sliceDim in steps blockSize[sliceIdx]
         for p in range(0, self.pointCounts[sliceIdx], self.blockSizes[sliceIdx]):
             points[sliceIdx] = p
@@ -1229,6 +1368,14 @@ class SpectrumDataSourceABC(CcpNmrJson):
         # create the array with zeros
         data = PlaneData(dataSource=self, dimensions=(xDim, yDim), position=position)
 
+        if not self.hasOpenFile():
+            self.openFile(mode=self.defaultOpenReadMode)
+
+        # Try reading from the memory-mapped data first
+        if (_data := self._readMemoryMappedData(dimensions=(xDim, yDim), position=position)) is not None:
+            data[:] = _data
+            return data
+
         # convert to zero-based
         xDim -= 1
         yDim -= 1
@@ -1244,9 +1391,6 @@ class SpectrumDataSourceABC(CcpNmrJson):
         blockOffsets = [offset for _tmp, offset in self._pointsToBlocksPerDimension(points)]
         slices = [slice(offset, offset + 1) for offset in blockOffsets]
 
-        if not self.hasOpenFile():
-            self.openFile(mode=self.defaultOpenReadMode)
-
         # loop through the y points of yDim in steps blockSize[yDim]
         for y in range(0, self.pointCounts[yDim], self.blockSizes[yDim]):
 
@@ -1568,7 +1712,8 @@ class SpectrumDataSourceABC(CcpNmrJson):
         if self.isBuffered:
             self.closeHdf5Buffer()
 
-        self.cache.clear()
+        self.clearCache()
+        self.cache.removeStatistics(self._blockCacheId)
 
     def hasOpenFile(self):
         """Return True if dataSoure has active open file pointer
@@ -1585,7 +1730,7 @@ class SpectrumDataSourceABC(CcpNmrJson):
         self._setAxisCodes()
 
         if self.mode.startswith('r') and self.isBlocked and self.hasBlockCached:
-            self._setMaxCacheSize(self.maxCacheSize)
+            self.enableCache()
         else:
             self.disableCache()  # No caching on writing; that creates sync issues
 
@@ -1896,10 +2041,74 @@ class SpectrumDataSourceABC(CcpNmrJson):
 
         return sliceTuples
 
+    def _readRegion(self, ranges):
+        """Read the (folded) hyper-rectangle defined by ranges in one pass; to be subclassed
+        for formats with a native region access (e.g. Hdf5)
+
+        :param ranges: list of (start, stop) tuples (0-based, stop exclusive) for all dimensions;
+                       all within [0, pointCounts]
+        :return scaled numpy array (..,z,y,x ordered) or None if the format has no native region access
+        """
+        if self.isBlocked:
+            if not self.hasOpenFile():
+                self.openFile(mode=self.defaultOpenReadMode)
+            data = self._readMemoryMappedData(dimensions=self.dimensions, position=[1] * self.dimensionCount,
+                                              ranges=ranges)
+            if data is not None:
+                # not in-place: data may be a read-only view of the memory map
+                data = data * self.dataScale
+            return data
+
+        return None
+
+    def _getRegionDataNative(self, sliceTuples, aliasingFlags):
+        """Return an numpy array containing the region data; see getRegionData description
+        implementation based upon _readRegion method; reads the block ranges covering the folded region
+        in one pass and unfolds (aliases) using index arithmetic
+
+        :return RegionData instance or None if the format has no native region access
+        """
+        # per dimension: folded indices into the native region and sign factors
+        ranges = []
+        indices = []
+        factors = []
+        for idx, (start, stop) in enumerate(sliceTuples):
+            nPoints = self.pointCounts[idx]
+            points = numpy.arange(start - 1, stop)  # zero-based, unfolded
+            folded = points % nPoints
+            folds = numpy.abs(points // nPoints)
+            fMin = int(folded.min())
+            ranges.append((fMin, int(folded.max()) + 1))
+            indices.append(folded - fMin)
+            factors.append(numpy.power(float(aliasingFlags[idx]), folds))  # 0**0 == 1
+
+        if (data := self._readRegion(ranges)) is None:
+            return None
+
+        # unfold; data are ..,z,y,x ordered
+        for idx in self.dimensionIndices:
+            axis = self.dimensionCount - 1 - idx
+            if ranges[idx][1] - ranges[idx][0] != len(indices[idx]) or numpy.any(indices[idx][1:] <= indices[idx][:-1]):
+                # not a simple within-limits range
+                data = numpy.take(data, indices[idx], axis=axis)
+            if numpy.any(factors[idx] != 1.0):
+                shape = [1] * self.dimensionCount
+                shape[axis] = len(factors[idx])
+                data = data * factors[idx].astype(data.dtype).reshape(shape)
+
+        regionData = RegionData(shape=data.shape,
+                                dataSource=self, dimensions=self.dimensions,
+                                position=[st[0] for st in sliceTuples]
+                                )
+        regionData[:] = data
+        return regionData
+
     def _getRegionData(self, sliceTuples, aliasingFlags=None):
         """Return an numpy array containing the region data; see getRegionData description
         implementation based upon getSliceData method
         GWV 13/01/2022: new implementation
+
+        NB: Reference implementation; getRegionData uses _getRegionDataNative if possible
         """
         sliceDim = 1  # only works for 1, as there is otherwise a np shape mismatch
         sliceIdx = sliceDim - 1
@@ -1980,8 +2189,9 @@ class SpectrumDataSourceABC(CcpNmrJson):
             aliasingFlags = [0] * self.dimensionCount
 
         sliceTuples = self.checkForValidRegion(sliceTuples, aliasingFlags)
-        # No need to scale, as _getRegionData relies on getSliceData, which is already scaled
-        regionData = self._getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+        if (regionData := self._getRegionDataNative(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)) is None:
+            # No need to scale, as _getRegionData relies on getSliceData, which is already scaled
+            regionData = self._getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
 
         return regionData
 
@@ -1989,7 +2199,20 @@ class SpectrumDataSourceABC(CcpNmrJson):
         """Estimate  the ContourBase based on a quick approximation of the noise level.
         Use mean of abs of dataPlane or dataSlice
         """
+        cache = self._getStatisticsCache()
+        key = cache.getKey('initialNoiseLevel', self.dataScale)
+        if (noiseLevel := cache.get(key)) is None:
+            noiseLevel = self._estimateInitialNoiseLevel()
+            cache.set(key, noiseLevel)
 
+        positiveContourBase = noiseLevel * multiplier
+
+        return positiveContourBase
+
+    def _estimateInitialNoiseLevel(self) -> float:
+        """Quick approximation of the noise level from the median of the absolute values and the SD
+        of a dataPlane or dataSlice
+        """
         if self.dimensionCount == 1:
             data = self.getSliceData()
             stdFactor = 0.5
@@ -2016,9 +2239,8 @@ class SpectrumDataSourceABC(CcpNmrJson):
             # std may still be nan because contains HUGE numbers
             std = 0
         noiseLevel = median + stdFactor * std
-        positiveContourBase = float(noiseLevel) * multiplier
 
-        return positiveContourBase
+        return float(noiseLevel)
 
 
 
@@ -2112,6 +2334,132 @@ class SpectrumDataSourceABC(CcpNmrJson):
                 pointData = self.getPointData(position=position)
                 yield (position, pointData)
 
+    #=========================================================================================
+    # Multi-resolution (pyramid) planes
+    #=========================================================================================
+
+    def getMaxDecimationFactor(self, xDim: int = 1, yDim: int = 2) -> int:
+        """:return the largest decimation factor available for planes (xDim, yDim) (1-based);
+        1 indicates that the planes are not decimated
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.PlanePyramid import getMaxFactor
+
+        return getMaxFactor(self.pointCounts[xDim - 1], self.pointCounts[yDim - 1])
+
+    def getDecimatedPlaneData(self, position=None, xDim: int = 1, yDim: int = 2, factor: int = 1) -> PlaneData:
+        """Get plane defined by xDim, yDim and position (all 1-based), decimated by factor along both axes;
+        i.e. every point holds the signed maximum absolute value of a factor x factor block.
+
+        :param factor: decimation factor: a power of 2, at most getMaxDecimationFactor(xDim, yDim);
+                       factor=1 yields the full-resolution plane
+        :return PlaneData (i.e. numpy.ndarray) object.
+        """
+        if factor <= 1:
+            return self.getPlaneData(position=position, xDim=xDim, yDim=yDim)
+
+        position = self.checkForValidPlane(position=position, xDim=xDim, yDim=yDim)
+        if self._pyramid is None:
+            self._pyramid = self._newPyramid()
+
+        data = self._pyramid.getPlaneData(position=position, xDim=xDim, yDim=yDim, factor=factor)
+        planeData = PlaneData(shape=data.shape, dataSource=self, dimensions=(xDim, yDim), position=position)
+        planeData[:] = data
+        return planeData
+
+    def _newPyramid(self):
+        """:return a new PlanePyramid instance; stored next to a persistent hdf5 buffer,
+        or in a temporary file otherwise
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.PlanePyramid import PlanePyramid
+        from ccpn.framework.Application import getApplication
+
+        if self.isBuffered and not self._bufferIsTemporary and self.hdf5buffer is not None and \
+                os.access(self.hdf5buffer.path.parent, os.W_OK):
+            return PlanePyramid(self, path=self.hdf5buffer.path.withSuffix('.pyramid.hdf5'), isTemporary=False)
+
+        prefix = 'pyramid_%s_' % self.nameFromPath()
+        if (application := getApplication()) is not None:
+            path = application._getTemporaryPath(prefix=prefix, suffix='.hdf5')
+        else:
+            with tempfile.NamedTemporaryFile(prefix=prefix, suffix='.hdf5') as tFile:
+                path = tFile.name
+        return PlanePyramid(self, path=path, isTemporary=True)
+
+    def clearPyramid(self):
+        """Clear the decimated planes; e.g. after the data have been changed
+        """
+        if self._pyramid is not None:
+            self._pyramid.clear()
+
+    def closePyramid(self):
+        """Close the decimated planes store
+        """
+        if self._pyramid is not None:
+            self._pyramid.close()
+            self._pyramid = None
+
+    #=========================================================================================
+    # Projections
+    #=========================================================================================
+
+    def getProjectionData(self, xDim: int = 1, yDim: int = 2, method: str = 'max', threshold=None,
+                          callback=None, scale: float = 1.0) -> PlaneData:
+        """Get the projection of the planes defined by xDim, yDim (1-based) along all other dimensions,
+        using method and an optional threshold; see ProjectionEngine for details.
+
+        :param method: 'max', 'max above threshold', 'min', 'min below threshold',
+                       'sum', 'sum above threshold', 'sum below threshold'
+        :param threshold: threshold value for relevant method; applies to the scaled data
+        :param callback: optional function called as callback(planesDone, totalPlanes, partialProjection)
+                         while the projection is calculated
+        :param scale: additional scaling factor of the data; e.g. Spectrum.scale
+        :return PlaneData (i.e. numpy.ndarray) object.
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.Projection import ProjectionEngine
+
+        engine = ProjectionEngine(self, xDim=xDim, yDim=yDim, method=method, threshold=threshold, scale=scale)
+        data = engine.getProjection(callback=callback)
+        planeData = PlaneData(shape=data.shape, dataSource=self, dimensions=(xDim, yDim),
+                              position=[1] * self.dimensionCount)
+        planeData[:] = data
+        return planeData
+
+    def clearProjections(self):
+        """Clear the cached projections; e.g. after the data have been changed
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.Projection import clearProjectionCache
+
+        clearProjectionCache(self.path)
+
+    #=========================================================================================
+    # Statistics
+    #=========================================================================================
+
+    def _getStatisticsCache(self):
+        """:return the StatisticsCache instance of self; the statistics and estimates of the data,
+        stored with the metadata of the spectrum so that they are retained between sessions
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import StatisticsCache
+
+        if self._statisticsCache is None:
+            self._statisticsCache = StatisticsCache(self)
+        return self._statisticsCache
+
+    def getStatistics(self) -> dict:
+        """Get the statistics of (a sample of) the data: the median, noiseSD (from the median absolute
+        deviation), mean, std, robustMin/robustMax (0.1 and 99.9 percentiles), min, max, count and histogram.
+        Calculated on first request and retained, also between sessions, until the data change.
+
+        :return dict with the statistics
+        """
+        return self._getStatisticsCache().getStatistics()
+
+    def clearStatistics(self):
+        """Clear the statistics and estimates; e.g. after the data have been changed
+        """
+        if self._statisticsCache is not None:
+            self._statisticsCache.clear()
+
     #=========================================================================================
     # Hdf5 buffer
     #=========================================================================================
@@ -2121,6 +2469,13 @@ class SpectrumDataSourceABC(CcpNmrJson):
         """ReturnTrue if file is buffered"""
         return self._isBuffered
 
+    @property
+    def _isReadyForBackgroundReading(self) -> bool:
+        """Return True if the data can be read without creating or filling the hdf5 buffer
+        (which may show a progress dialog); i.e. from a thread other than the GUI thread
+        """
+        return not self.isBuffered or (self.hdf5buffer is not None and self._bufferFilled)
+
     def setBuffering(self, isBuffered: bool, bufferIsTemporary: bool = True, bufferPath=None):
         """Define the SpectrumDataSource buffering status
         :param isBuffered (True, False): set the buffering status
@@ -2129,6 +2484,7 @@ class SpectrumDataSourceABC(CcpNmrJson):
         """
         if self.isBuffered:
             self.closeHdf5Buffer()
+        self.closePyramid()
 
         self._isBuffered = isBuffered
         self._bufferFilled = False
@@ -2152,7 +2508,8 @@ class SpectrumDataSourceABC(CcpNmrJson):
         """Initialise a Hdf5SpectrumBuffer instance.
         :return: Hdf5SpectrumBuffer instance
         """
-        from ccpn.core.lib.SpectrumDataSources.Hdf5SpectrumDataSource import Hdf5SpectrumDataSource
+        from ccpn.core.lib.SpectrumDataSources.Hdf5SpectrumDataSource import Hdf5SpectrumDataSource, \
+            HDF5_BUFFER_INCOMPLETE
         from ccpn.framework.Application import getApplication
 
         if not self.isBuffered:
@@ -2169,14 +2526,29 @@ class SpectrumDataSourceABC(CcpNmrJson):
             # take path as defined in _bufferPath, or construct from self.path if None
             path = self._bufferPath
             if self._bufferPath is None:
-                path = self.path.withSuffix(Hdf5SpectrumDataSource.suffixes[0]).uniqueVersion()
+                path = self.path.withSuffix(Hdf5SpectrumDataSource.suffixes[0])
             # tFile = None
 
+            # A persistent buffer of an earlier session can be reused if it is complete and still
+            # matches the source; a stale or incomplete buffer is overwritten
+            path, hdf5buffer = self._findPersistentHdf5Buffer(path, probeVersions=self._bufferPath is None)
+            if hdf5buffer is not None:
+                hdf5buffer.parent = self
+                self.hdf5buffer = hdf5buffer
+                self._isBuffered = True
+                self._bufferFilled = True
+                getLogger().debug('initialiseHdf5Buffer: reusing %s' % self.hdf5buffer)
+                return self.hdf5buffer
+
         # create a hdf5 buffer file instance
         hdf5buffer = Hdf5SpectrumDataSource(path=path)
         hdf5buffer.copyParametersFrom(self)
-        # do not use openNewFile as it has to remain open to allow for filling the buffer
-        hdf5buffer.openFile(mode=Hdf5SpectrumDataSource.defaultOpenWriteMode)
+        # do not use openNewFile as it has to remain open to allow for filling the buffer;
+        # an existing file at path is a stale or incomplete buffer
+        hdf5buffer.openFile(mode=Hdf5SpectrumDataSource.defaultOpenWriteMode, overwrite=True)
+        if not self._bufferIsTemporary:
+            # mark as a buffer, so that it can be identified (and overwritten) if never completed
+            hdf5buffer._writeBufferSignature(HDF5_BUFFER_INCOMPLETE)
         # backward and forward linkages
         hdf5buffer.parent = self
         self.hdf5buffer = hdf5buffer
@@ -2199,7 +2571,7 @@ class SpectrumDataSourceABC(CcpNmrJson):
         self._isBuffered = False
         self.copyDataTo(self.hdf5buffer)
         self._isBuffered = True
-        self._bufferFilled = True
+        self._setBufferFilled()
 
         # close the source, as all data are now in the buffer
         if self.hasOpenFile():
@@ -2207,6 +2579,67 @@ class SpectrumDataSourceABC(CcpNmrJson):
             self.fp = None
             self.mode = None
 
+    def _setBufferFilled(self):
+        """Mark the hdf5Buffer as filled; a persistent buffer also gets the signature of self,
+        so that it can be reused in later sessions
+        """
+        self._bufferFilled = True
+        if not self._bufferIsTemporary and self.hdf5buffer is not None:
+            self.hdf5buffer._writeBufferSignature(self._getBufferSignature())
+            self.hdf5buffer.fp.flush()
+
+    def _getBufferSignature(self) -> str:
+        """:return a signature string identifying the (current state of) the binary file(s) of self;
+        used to validate persistent hdf5 buffers
+        """
+        _stats = [p.stat() for p in self.getAllFilePaths() if p.exists()]
+        _size = sum(st.st_size for st in _stats)
+        _mtime = max((st.st_mtime_ns for st in _stats), default=0)
+        return '%s;%s;%s;%d;%d' % (self.dataFormat, self.path, tuple(self.pointCounts), _size, _mtime)
+
+    @staticmethod
+    def _getBufferSignaturePath(signature) -> str:
+        """:return the path of the source in signature (see _getBufferSignature); None if undefined
+        """
+        if signature is None or signature.count(';') < 4:
+            return None
+        # the path may contain ';'
+        return ';'.join(signature.split(';')[1:-3])
+
+    def _findPersistentHdf5Buffer(self, path, probeVersions=True):
+        """Probe path, and optionally its incremented versions, for a persistent hdf5 buffer of self;
+        with probeVersions=True, files that are not hdf5 buffers or that are the buffers of another source
+        (e.g. spec.ft2 and spec.ucsf share spec.hdf5) are skipped; with probeVersions=False, path is used
+
+        :return: a (path, hdf5buffer) tuple; hdf5buffer is the opened (read-only) buffer if path is a complete
+                 buffer of self; None if path is a stale or incomplete buffer, or a new path
+        """
+        from ccpn.core.lib.SpectrumDataSources.Hdf5SpectrumDataSource import Hdf5SpectrumDataSource, \
+            HDF5_BUFFER_INCOMPLETE
+
+        path = aPath(path)
+        sourceSignature = self._getBufferSignature()
+        while path.exists():
+            hdf5buffer = Hdf5SpectrumDataSource(path=path)
+            signature = None
+            try:
+                hdf5buffer.openFile(mode=Hdf5SpectrumDataSource.defaultOpenReadMode)
+                signature = hdf5buffer._readBufferSignature()
+            except Exception as es:
+                getLogger().debug('_findPersistentHdf5Buffer: unable to use %s (%s)' % (path, es))
+
+            if signature == sourceSignature:
+                return path, hdf5buffer
+
+            hdf5buffer.closeFile()
+            if not probeVersions or signature == HDF5_BUFFER_INCOMPLETE or \
+                    self._getBufferSignaturePath(signature) == str(self.path):
+                # incomplete buffer, or stale buffer of self
+                return path, None
+            path = path.incrementVersion()
+
+        return path, None
+
     def closeHdf5Buffer(self):
         """Close the hdf5Buffer"""
         if not self.isBuffered:
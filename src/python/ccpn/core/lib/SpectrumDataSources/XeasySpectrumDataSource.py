@@ -31,7 +31,6 @@ __date__ = "$Date: 2020-11-20 10:28:48 +0000 (Fri, November 20, 2020) $"
 
 from typing import Sequence
 import numpy
-from numpy.lib import scimath
 
 from ccpn.util.Path import aPath
 from ccpn.util.Logging import getLogger
@@ -56,11 +55,7 @@ XEASY_PARAM_DICT = {
 }
 firstLine = 'Version ....................... '
 
-# A lookup dict for sqrt exponents (this is the slow step in decoding the 2-byte xeasy format)
-_exponentDict = {}
-sqrt2 = scimath.sqrt(2.0)
-for i in range(-128,129,1):
-    _exponentDict[i] = scimath.power(sqrt2, i)
+sqrt2 = numpy.sqrt(2.0)
 
 class XeasySpectrumDataSource(SpectrumDataSourceABC):
     """
@@ -210,34 +205,24 @@ class XeasySpectrumDataSource(SpectrumDataSourceABC):
         """Convert the blockdata array from  2 byte xeasy format into float32
         closely following the Xeasy manual found at:
         http://triton.iqfr.csic.es/HTML-manuals/xeasy-manual/xeasy_m3.html
-        """
-
-        blockDataByteView = blockdata.view(numpy.int8)
-        result = numpy.zeros(blockdata.size, numpy.float32)
-
-        idx = 0
-        for i in range(0, blockDataByteView.size, 2):
-            e_k = int(blockDataByteView[i+1])
-            a_k = int(blockDataByteView[i])
-            if e_k <= 47:
-                sign = 1.0
-                ell = e_k - 1
-            else:
-                sign = -1.0
-                ell = -1 * (e_k - 95)
 
-            exponent = 1.0
-            if ell != 0:
-                exponent = _exponentDict[ell]
+        Vectorised; maintains the shape of blockdata (e.g. for memory-mapped slices and planes)
+        """
+        shape = blockdata.shape
+        blockDataByteView = numpy.ascontiguousarray(blockdata).view(numpy.int8).reshape(-1, 2)
+        a_k = blockDataByteView[:, 0].astype(numpy.int32)
+        e_k = blockDataByteView[:, 1].astype(numpy.int32)
 
-            mantissa = 1.0
-            if ell != 0:
-                mantissa = float(a_k + 615) / 721.0
+        positive = e_k <= 47
+        sign = numpy.where(positive, 1.0, -1.0)
+        ell = numpy.where(positive, e_k - 1, 95 - e_k)
+        hasExponent = (ell != 0)
 
-            result[idx] = sign * mantissa * exponent
-            idx += 1
+        exponent = numpy.where(hasExponent, numpy.power(sqrt2, ell), 1.0)
+        mantissa = numpy.where(hasExponent, (a_k + 615) / 721.0, 1.0)
 
-        return result
+        result = (sign * mantissa * exponent).astype(numpy.float32)
+        return result.reshape(shape)
 
 # Register this format
 XeasySpectrumDataSource._registerFormat()
@@ -0,0 +1,274 @@
+"""
+This file contains the process-wide block cache shared by all (blocked) SpectrumDataSource instances
+
+The cache retains (key, blockData) pairs, where key is an integer tuple (dataSourceId, absoluteBlockIndex).
+Eviction is Least-Recently-Used, constrained by a single byte budget (preferences: general.spectrumBlockCacheSize,
+in MB). Hits and misses are counted per dataSourceId.
+
+Typical usage (see SpectrumDataSourceABC._readBlockFromFile):
+
+    cache = getBlockCache()
+    key = (self._blockCacheId, absoluteBlockIndex)
+    if (data := cache.get(key)) is None:
+        data = ...  # read the block
+        cache.add(key, data)
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import sys
+from collections import OrderedDict
+from itertools import count
+from threading import RLock
+
+from ccpn.util.decorators import singleton
+
+
+MB = 1024 * 1024
+DEFAULT_BLOCK_CACHE_SIZE = 512 * MB  # Default byte budget over all dataSources
+
+DEBUG = False
+
+_blockCacheIds = count(1)
+
+
+def newBlockCacheId() -> int:
+    """:return a new unique integer identifying a dataSource in the block cache
+    """
+    return next(_blockCacheIds)
+
+
+class BlockCacheStatistics(object):
+    """Simple container for the per-dataSource cache statistics
+    """
+
+    __slots__ = ('hits', 'misses', 'items', 'nBytes')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.items = 0
+        self.nBytes = 0
+
+    @property
+    def hitRatio(self) -> float:
+        """:return ratio hits / (hits + misses); 0.0 if there were no requests
+        """
+        total = self.hits + self.misses
+        return float(self.hits) / total if total > 0 else 0.0
+
+    def asDict(self) -> dict:
+        """:return the statistics as a dict
+        """
+        return dict(hits=self.hits, misses=self.misses, items=self.items, nBytes=self.nBytes,
+                    hitRatio=self.hitRatio)
+
+    def __str__(self):
+        return '<BlockCacheStatistics: hits=%d, misses=%d, items=%d, nBytes=%d>' % \
+               (self.hits, self.misses, self.items, self.nBytes)
+
+
+@singleton
+class BlockCache(object):
+    """
+    A process-wide Least-Recently-Used cache of spectral data blocks;
+
+    - Retains (key, blockData) pairs; key is an integer tuple (dataSourceId, absoluteBlockIndex)
+    - Total size of all retained blockData is limited by maxBytes; maxBytes == 0 disables caching
+    - Keeps hit/miss statistics per dataSourceId
+    - Access is thread-safe
+    """
+
+    def __init__(self, maxBytes=DEFAULT_BLOCK_CACHE_SIZE, debug=False):
+        self._maxBytes = int(maxBytes)
+        self._nBytes = 0
+        self._items = OrderedDict()  # (key, value) pairs; least-recently used first
+        self._statistics = {}  # (dataSourceId, BlockCacheStatistics) pairs
+        self._lock = RLock()
+        self._debug = DEBUG or debug
+
+    @property
+    def maxBytes(self) -> int:
+        """Maximum number of bytes retained by the cache"""
+        return self._maxBytes
+
+    @property
+    def nBytes(self) -> int:
+        """Number of bytes currently retained by the cache"""
+        return self._nBytes
+
+    def __len__(self):
+        return len(self._items)
+
+    def _getStatistics(self, dataSourceId) -> BlockCacheStatistics:
+        """:return the BlockCacheStatistics instance of dataSourceId; create if needed
+        """
+        if (stats := self._statistics.get(dataSourceId)) is None:
+            stats = self._statistics[dataSourceId] = BlockCacheStatistics()
+        return stats
+
+    def get(self, key):
+        """Get blockData for key; return None if not present.
+        Marks key as most-recently used and updates the hit/miss statistics
+        """
+        with self._lock:
+            stats = self._getStatistics(key[0])
+            value = self._items.get(key)
+            if value is None:
+                stats.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            stats.hits += 1
+            if self._debug: sys.stderr.write('DEBUG> %s ... Got cached item "%s"\n' % (self, key))
+            return value
+
+    def add(self, key, value):
+        """Add (key, value) to the cache, evicting least-recently used items as needed
+        """
+        nBytes = value.nbytes
+        if nBytes > self._maxBytes:
+            return  # cache is disabled or block is too large to ever fit
+
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return
+
+            while self._nBytes + nBytes > self._maxBytes and len(self._items) > 0:
+                self._popOldest()
+
+            if self._debug: sys.stderr.write('DEBUG> %s ... Adding "%s"\n' % (self, key))
+            self._items[key] = value
+            self._nBytes += nBytes
+            stats = self._getStatistics(key[0])
+            stats.items += 1
+            stats.nBytes += nBytes
+
+    def _popOldest(self):
+        """Remove the least-recently used item
+        """
+        key, value = self._items.popitem(last=False)
+        self._removed(key, value)
+
+    def _removed(self, key, value):
+        """Update the bookkeeping after removal of (key, value)
+        """
+        if self._debug: sys.stderr.write('DEBUG> %s ... removing "%s"\n' % (self, key))
+        nBytes = value.nbytes
+        self._nBytes -= nBytes
+        if (stats := self._statistics.get(key[0])) is not None:
+            stats.items -= 1
+            stats.nBytes -= nBytes
+
+    def resize(self, maxBytes):
+        """Resize the cache to retain at most maxBytes
+        """
+        with self._lock:
+            self._maxBytes = max(0, int(maxBytes))
+            while self._nBytes > self._maxBytes and len(self._items) > 0:
+                self._popOldest()
+
+    def hasItem(self, key) -> bool:
+        """Return True if key is in cache; does not affect the statistics or LRU order
+        """
+        return key in self._items
+
+    def clear(self, dataSourceId=None):
+        """Clear all items of dataSourceId from the cache, or all items if dataSourceId is None
+        """
+        with self._lock:
+            if dataSourceId is None:
+                self._items.clear()
+                self._nBytes = 0
+                for stats in self._statistics.values():
+                    stats.items = 0
+                    stats.nBytes = 0
+                return
+
+            if (stats := self._statistics.get(dataSourceId)) is None or stats.items == 0:
+                return
+            for key in [k for k in self._items.keys() if k[0] == dataSourceId]:
+                self._removed(key, self._items.pop(key))
+
+    def removeStatistics(self, dataSourceId):
+        """Clear all items of dataSourceId from the cache and remove its statistics; e.g. when closing the dataSource
+        """
+        with self._lock:
+            self.clear(dataSourceId)
+            self._statistics.pop(dataSourceId, None)
+
+    def getStatistics(self, dataSourceId) -> BlockCacheStatistics:
+        """:return the BlockCacheStatistics instance for dataSourceId
+        """
+        with self._lock:
+            return self._getStatistics(dataSourceId)
+
+    def resetStatistics(self, dataSourceId=None):
+        """Reset the hit/miss counters of dataSourceId, or of all if dataSourceId is None
+        """
+        with self._lock:
+            _allStats = self._statistics.values() if dataSourceId is None else [self._getStatistics(dataSourceId)]
+            for stats in _allStats:
+                stats.hits = 0
+                stats.misses = 0
+
+    def __str__(self):
+        return '<BlockCache; items:%d, bytes:(%d,max:%d)>' % (len(self._items), self._nBytes, self._maxBytes)
+
+
+def getBlockCache() -> BlockCache:
+    """:return the process-wide BlockCache instance;
+    initialised from the preferences (general.spectrumBlockCacheSize, in MB) if available
+    """
+    if not hasattr(singleton, '_instances') or singleton._instances.get(BlockCache) is None:
+        # the singleton decorator does not pass keywords; hence initialise the size afterwards
+        cache = BlockCache()
+        cache.resize(_getMaxBytesFromPreferences())
+        return cache
+    return BlockCache()
+
+
+def _getMaxBytesFromPreferences() -> int:
+    """:return the cache size in bytes as defined in the preferences, or the default
+    """
+    from ccpn.framework.Application import getApplication
+
+    try:
+        if (app := getApplication()) is not None and app.preferences is not None:
+            sizeInMB = app.preferences.general.get('spectrumBlockCacheSize')
+            if sizeInMB is not None:
+                return int(sizeInMB * MB)
+    except Exception:
+        pass
+    return DEFAULT_BLOCK_CACHE_SIZE
+
+
+def setBlockCacheSize(sizeInMB):
+    """Set the size of the process-wide block cache (in MB)
+    """
+    getBlockCache().resize(int(sizeInMB * MB))
@@ -0,0 +1,197 @@
+"""
+This file contains the chunk-layout and compression policies of the Hdf5SpectrumDataSource
+
+Chunk layouts (all shapes are x,y,z ordered, i.e. SpectrumDataSource-style):
+
+    auto    let h5py guess the chunk shape (historic behaviour)
+    plane   chunks span (a tile of) the xy-plane and one point along all other dimensions;
+            optimal for the display of xy-planes
+    slice   chunks span (a section of) the x-axis and one point along all other dimensions;
+            optimal for the extraction of 1D's along x
+    cube    chunks have (approximately) equal edges along all dimensions;
+            best compromise for planes/slices along any dimension and region reads; e.g. peak picking
+
+Compression modes:
+
+    None        no compression (default)
+    lzf         byte-shuffle + lzf; fast, moderate reduction
+    gzip        byte-shuffle + gzip level 1; better reduction, slow
+    blosc-lz4   blosc with byte-shuffle and lz4; fast; requires hdf5plugin
+    lz4         plain lz4; requires hdf5plugin
+
+Modes requiring hdf5plugin fall back to lzf if hdf5plugin is not available.
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+from itertools import combinations
+from typing import Sequence
+
+from ccpn.util.Logging import getLogger
+
+
+KB = 1024
+MB = 1024 * KB
+
+CHUNK_LAYOUT_AUTO = 'auto'
+CHUNK_LAYOUT_PLANE = 'plane'
+CHUNK_LAYOUT_SLICE = 'slice'
+CHUNK_LAYOUT_CUBE = 'cube'
+CHUNK_LAYOUTS = (CHUNK_LAYOUT_AUTO, CHUNK_LAYOUT_PLANE, CHUNK_LAYOUT_SLICE, CHUNK_LAYOUT_CUBE)
+
+DEFAULT_CHUNK_BYTES = 256 * KB  # target size of a chunk; hdf5 advises 10KB - 1MB
+MIN_CHUNK_CACHE_BYTES = 1 * MB
+MAX_CHUNK_CACHE_BYTES = 256 * MB
+
+COMPRESSION_LZF = 'lzf'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_BLOSC_LZ4 = 'blosc-lz4'
+COMPRESSION_LZ4 = 'lz4'
+COMPRESSION_MODES = (COMPRESSION_LZF, COMPRESSION_GZIP, COMPRESSION_BLOSC_LZ4, COMPRESSION_LZ4)
+_PLUGIN_COMPRESSION_MODES = (COMPRESSION_BLOSC_LZ4, COMPRESSION_LZ4)
+
+
+def hasHdf5Plugin() -> bool:
+    """:return True if the (optional) hdf5plugin package is available
+    """
+    try:
+        import hdf5plugin  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _fitToCount(size, count) -> int:
+    """:return size limited to [1, count]
+    """
+    return max(1, min(int(size + 1.0e-6), count))  # allow for rounding of fractional powers
+
+
+def getChunkShape(pointCounts: Sequence[int], layout: str = CHUNK_LAYOUT_CUBE, wordSize: int = 4,
+                  chunkBytes: int = DEFAULT_CHUNK_BYTES):
+    """Get the chunk shape for a dataset of pointCounts according to layout.
+
+    :param pointCounts: x,y,z-ordered number of points of the dataset
+    :param layout: one of CHUNK_LAYOUTS
+    :param wordSize: number of bytes per point
+    :param chunkBytes: target number of bytes of a chunk
+    :return x,y,z-ordered tuple with the chunk shape, or True for the 'auto' layout
+    """
+    if layout not in CHUNK_LAYOUTS:
+        raise ValueError('getChunkShape: invalid layout "%s"; should be one of %s' % (layout, CHUNK_LAYOUTS))
+
+    if layout == CHUNK_LAYOUT_AUTO:
+        return True
+
+    pointCounts = [int(p) for p in pointCounts]
+    dimensionCount = len(pointCounts)
+    maxPoints = max(1, chunkBytes // wordSize)
+    chunks = [1] * dimensionCount
+
+    if layout == CHUNK_LAYOUT_SLICE or dimensionCount == 1:
+        chunks[0] = _fitToCount(maxPoints, pointCounts[0])
+
+    elif layout == CHUNK_LAYOUT_PLANE:
+        xCount, yCount = pointCounts[0:2]
+        if xCount * yCount <= maxPoints:
+            chunks[0:2] = [xCount, yCount]
+        else:
+            # square-ish tile of the xy-plane; the x-axis takes any remaining space
+            edge = int(maxPoints ** 0.5)
+            chunks[1] = _fitToCount(edge, yCount)
+            chunks[0] = _fitToCount(maxPoints // chunks[1], xCount)
+
+    elif layout == CHUNK_LAYOUT_CUBE:
+        # distribute the points over the dimensions; dimensions smaller than the
+        # edge are taken whole and their 'space' is given to the others
+        remaining = list(range(dimensionCount))
+        points = maxPoints
+        while remaining:
+            edge = points ** (1.0 / len(remaining))
+            small = [dim for dim in remaining if pointCounts[dim] <= edge]
+            if not small:
+                for dim in remaining:
+                    chunks[dim] = _fitToCount(edge, pointCounts[dim])
+                break
+            for dim in small:
+                chunks[dim] = pointCounts[dim]
+                points = max(1, points // pointCounts[dim])
+                remaining.remove(dim)
+
+    return tuple(chunks)
+
+
+def getChunkCacheSize(pointCounts: Sequence[int], chunks: Sequence[int], wordSize: int = 4) -> int:
+    """Get the size (in bytes) of a chunk cache that can hold all chunks covering any (orthogonal) plane,
+    limited to [MIN_CHUNK_CACHE_BYTES, MAX_CHUNK_CACHE_BYTES]
+
+    :param pointCounts: x,y,z-ordered number of points of the dataset
+    :param chunks: x,y,z-ordered chunk shape
+    :param wordSize: number of bytes per point
+    :return size in bytes
+    """
+    chunkBytes = wordSize
+    for c in chunks:
+        chunkBytes *= c
+    nChunks = [-(-p // c) for p, c in zip(pointCounts, chunks)]
+
+    if len(nChunks) == 1:
+        nPlaneChunks = nChunks[0]
+    else:
+        nPlaneChunks = max(n1 * n2 for n1, n2 in combinations(nChunks, 2))
+    return max(MIN_CHUNK_CACHE_BYTES, min(nPlaneChunks * chunkBytes, MAX_CHUNK_CACHE_BYTES))
+
+
+def getCompressionKwds(compression) -> dict:
+    """Get the keywords for the h5py create_dataset method implementing compression
+
+    :param compression: None or one of COMPRESSION_MODES
+    :return dict with keywords
+    """
+    if compression is None:
+        return {}
+
+    if compression not in COMPRESSION_MODES:
+        raise ValueError('getCompressionKwds: invalid compression "%s"; should be one of %s' %
+                         (compression, COMPRESSION_MODES))
+
+    if compression in _PLUGIN_COMPRESSION_MODES and not hasHdf5Plugin():
+        getLogger().warning('Compression "%s" requires the hdf5plugin package; using "%s" instead' %
+                            (compression, COMPRESSION_LZF))
+        compression = COMPRESSION_LZF
+
+    if compression == COMPRESSION_LZF:
+        return dict(compression='lzf', shuffle=True)
+
+    if compression == COMPRESSION_GZIP:
+        return dict(compression='gzip', compression_opts=1, shuffle=True)
+
+    import hdf5plugin
+
+    if compression == COMPRESSION_BLOSC_LZ4:
+        return dict(hdf5plugin.Blosc(cname='lz4', clevel=5, shuffle=hdf5plugin.Blosc.SHUFFLE))
+
+    return dict(hdf5plugin.LZ4())
@@ -0,0 +1,232 @@
+"""
+This file contains the multi-resolution (pyramid) store for the planes of a SpectrumDataSource
+
+For each plane (defined by xDim, yDim and the position along the other dimensions), levels with
+decimation factors 2, 4, 8, ... are derived from the full-resolution plane on first request.
+Every level holds the maximum and minimum over the factor x factor blocks of the full-resolution
+plane, so that positive and negative peak maxima survive the decimation. The levels are stored in
+a (sidecar) hdf5 file; a small number of levels is retained in memory as well.
+
+Typical usage (see SpectrumDataSourceABC.getDecimatedPlaneData):
+
+    pyramid = PlanePyramid(dataSource, path)
+    data = pyramid.getPlaneData(position, xDim=1, yDim=2, factor=8)
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+from collections import OrderedDict
+from threading import RLock
+
+import numpy
+import h5py
+
+from ccpn.util.Path import aPath
+from ccpn.util.Logging import getLogger
+
+
+PYRAMID_MIN_POINTS = 512  # planes with fewer points along both axes are not decimated
+PYRAMID_MIN_LEVEL_POINTS = 32  # the coarsest level has at least this number of points along one axis
+PYRAMID_SIGNATURE_KEY = 'PyramidSignature'
+
+
+def decimate(maxData, minData, factor=2):
+    """Decimate the (yPoints, xPoints) arrays maxData and minData by factor along both axes;
+    i.e. take the maximum of maxData and the minimum of minData over factor x factor blocks.
+    Incomplete blocks at the edges are padded with the edge values.
+
+    :return a (maxData, minData) tuple with the decimated arrays
+    """
+    yCount, xCount = maxData.shape
+    padding = ((0, (-yCount) % factor), (0, (-xCount) % factor))
+    if any(pad for _tmp, pad in padding):
+        maxData = numpy.pad(maxData, padding, mode='edge')
+        minData = numpy.pad(minData, padding, mode='edge')
+
+    shape = (maxData.shape[0] // factor, factor, maxData.shape[1] // factor, factor)
+    return maxData.reshape(shape).max(axis=(1, 3)), minData.reshape(shape).min(axis=(1, 3))
+
+
+def maxAbsolute(maxData, minData):
+    """:return the signed values with the largest absolute value from maxData and minData
+    """
+    return numpy.where(maxData >= -minData, maxData, minData)
+
+
+def getMaxFactor(xCount, yCount) -> int:
+    """:return the largest decimation factor (a power of 2) stored for a (xCount, yCount) plane;
+    1 if the plane is too small to be decimated
+    """
+    if max(xCount, yCount) < PYRAMID_MIN_POINTS:
+        return 1
+    factor = 1
+    while max(xCount, yCount) // (factor * 2) >= PYRAMID_MIN_LEVEL_POINTS:
+        factor *= 2
+    return factor
+
+
+def getDecimationFactor(xPointsPerPixel, yPointsPerPixel, maxFactor) -> int:
+    """:return the largest decimation factor (a power of 2, at most maxFactor) that still yields
+    at least one point per pixel along both axes
+    """
+    factor = 1
+    while factor * 2 <= min(xPointsPerPixel, yPointsPerPixel) and factor * 2 <= maxFactor:
+        factor *= 2
+    return factor
+
+
+class PlanePyramid(object):
+    """
+    Multi-resolution store of the planes of a SpectrumDataSource instance.
+
+    - Levels are derived from dataSource.getPlaneData on first request of a plane
+    - Levels are stored in the hdf5 file at path, tagged with a signature of the dataSource; a file
+      with a non-matching signature is discarded
+    - Access is thread-safe
+    """
+
+    maxItems = 16  # number of levels retained in memory
+
+    def __init__(self, dataSource, path, isTemporary=True):
+        """
+        :param dataSource: the originating SpectrumDataSource instance
+        :param path: path of the hdf5 file storing the levels
+        :param isTemporary: remove the file upon close()
+        """
+        self.dataSource = dataSource
+        self.path = aPath(path)
+        self.isTemporary = isTemporary
+        self._fp = None
+        self._items = OrderedDict()  # (key, (maxData, minData)) pairs; least-recently used first
+        self._lock = RLock()
+
+    @staticmethod
+    def _getPlaneKey(position, xDim, yDim) -> str:
+        """:return the key identifying the plane (xDim, yDim) at position
+        """
+        _position = [str(p) for dim, p in enumerate(position, start=1) if dim not in (xDim, yDim)]
+        return 'plane_%d_%d_%s' % (xDim, yDim, '_'.join(_position))
+
+    def _openFile(self):
+        """Open the hdf5 file; discard its content if the signature does not match the dataSource
+        """
+        if self._fp is not None:
+            return self._fp
+
+        signature = self.dataSource._getBufferSignature()
+        self._fp = h5py.File(str(self.path), 'a')
+        if self._fp.attrs.get(PYRAMID_SIGNATURE_KEY) != signature:
+            for key in list(self._fp.keys()):
+                del self._fp[key]
+            self._fp.attrs[PYRAMID_SIGNATURE_KEY] = signature
+        return self._fp
+
+    def _getLevel(self, key, factor):
+        """:return the (maxData, minData) tuple of key, factor from memory or file; None if not present
+        """
+        itemKey = (key, factor)
+        if (item := self._items.get(itemKey)) is not None:
+            self._items.move_to_end(itemKey)
+            return item
+
+        fp = self._openFile()
+        if key not in fp or ('max_%d' % factor) not in fp[key]:
+            return None
+
+        item = (fp[key]['max_%d' % factor][()], fp[key]['min_%d' % factor][()])
+        self._addItem(itemKey, item)
+        return item
+
+    def _addItem(self, itemKey, item):
+        """Add item to the in-memory store, removing the least-recently used
+        """
+        self._items[itemKey] = item
+        while len(self._items) > self.maxItems:
+            self._items.popitem(last=False)
+
+    def _buildLevels(self, key, position, xDim, yDim):
+        """Build all levels of the plane from the full-resolution data and store these
+        """
+        planeData = numpy.asarray(self.dataSource.getPlaneData(position=position, xDim=xDim, yDim=yDim))
+        yCount, xCount = planeData.shape
+        maxFactor = getMaxFactor(xCount, yCount)
+
+        getLogger().debug('PlanePyramid: building %s of %s (factor <= %d)' % (key, self.dataSource, maxFactor))
+        fp = self._openFile()
+        group = fp.require_group(key)
+        maxData = minData = planeData
+        factor = 1
+        while factor < maxFactor:
+            maxData, minData = decimate(maxData, minData, 2)
+            factor *= 2
+            for name, data in (('max_%d' % factor, maxData), ('min_%d' % factor, minData)):
+                if name in group:
+                    del group[name]
+                group.create_dataset(name, data=data, track_times=False)
+            self._addItem((key, factor), (maxData, minData))
+        fp.flush()
+
+    def getPlaneData(self, position, xDim, yDim, factor) -> numpy.ndarray:
+        """Get the plane (xDim, yDim) at position decimated by factor
+
+        :param position: position vector (1-based)
+        :param xDim: dimension of the first axis (1-based)
+        :param yDim: dimension of the second axis (1-based)
+        :param factor: decimation factor; a power of 2
+        :return a (yPoints, xPoints) numpy array with the signed maximum absolute values of the
+                factor x factor blocks
+        """
+        key = self._getPlaneKey(position, xDim, yDim)
+        with self._lock:
+            if (item := self._getLevel(key, factor)) is None:
+                self._buildLevels(key, position, xDim, yDim)
+                if (item := self._getLevel(key, factor)) is None:
+                    raise ValueError('PlanePyramid.getPlaneData: invalid factor %s' % factor)
+            return maxAbsolute(*item)
+
+    def clear(self):
+        """Clear all levels, e.g. when the data have changed
+        """
+        with self._lock:
+            self._items.clear()
+            if self._fp is not None:
+                for key in list(self._fp.keys()):
+                    del self._fp[key]
+
+    def close(self):
+        """Close the file; remove if temporary
+        """
+        with self._lock:
+            self._items.clear()
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+            if self.isTemporary and self.path.exists():
+                self.path.removeFile()
+
+    def __str__(self):
+        return '<PlanePyramid: %s>' % self.path
@@ -0,0 +1,363 @@
+"""
+This file contains the projection engine of a SpectrumDataSource
+
+The projection of the (xDim, yDim) planes along all other dimensions is calculated from
+(block- or chunk-aligned) slabs of planes, read in one pass each. Slabs are reduced to a
+plane by a pool of worker threads while the next slab is read; the partial projections
+are merged as they complete and can be streamed to the caller.
+
+Finished projections are retained in a (small) cache keyed on the signature of the data
+(see SpectrumDataSourceABC._getBufferSignature), the dimensions, method and threshold.
+
+Typical usage (see SpectrumDataSourceABC.getProjectionData):
+
+    engine = ProjectionEngine(dataSource, xDim=1, yDim=2, method='max')
+    for planesDone, totalPlanes, partialData in engine.iterate():
+        ...
+    data = engine.getProjection()
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import product
+from threading import RLock
+
+import numpy
+
+import ccpn.core.lib.SpectrumLib as specLib
+from ccpn.util.Logging import getLogger
+
+
+MB = 1024 * 1024
+
+_ABOVE_METHODS = ('max above threshold', 'sum above threshold')
+_BELOW_METHODS = ('min below threshold', 'sum below threshold')
+_MAX_METHODS = ('max', 'max above threshold')
+_MIN_METHODS = ('min', 'min below threshold')
+
+
+def checkProjectionMethod(method, threshold):
+    """Check method and threshold; raise ValueError if invalid
+    """
+    if method not in specLib.PROJECTION_METHODS:
+        raise ValueError('For spectrum projection, method must be one of %s' % (specLib.PROJECTION_METHODS,))
+
+    if method.endswith('threshold') and threshold is None:
+        raise ValueError('For spectrum projection method "%s", threshold parameter must be defined' % (method,))
+
+
+def reduceSlab(data, method, threshold=None, scale=1.0) -> numpy.ndarray:
+    """Reduce the (nPlanes, yPoints, xPoints) array data to a (yPoints, xPoints) plane using method;
+    data are multiplied by scale before applying threshold; data are not modified
+
+    :return a float32 numpy array
+    """
+    if scale != 1.0:
+        data = data * numpy.float32(scale)
+
+    if method in _ABOVE_METHODS:
+        data = numpy.where(data < threshold, 0.0, data)
+    elif method in _BELOW_METHODS:
+        data = numpy.where(data > -threshold, 0.0, data)
+
+    if method in _MAX_METHODS:
+        result = data.max(axis=0)
+    elif method in _MIN_METHODS:
+        result = data.min(axis=0)
+    else:
+        result = data.sum(axis=0, dtype=numpy.float64)
+    return result.astype(numpy.float32, copy=False)
+
+
+def mergeProjections(data1, data2, method) -> numpy.ndarray:
+    """:return the merge of the (partial) projections data1 and data2 using method
+    """
+    if data1 is None:
+        return data2
+    if method in _MAX_METHODS:
+        return numpy.maximum(data1, data2)
+    if method in _MIN_METHODS:
+        return numpy.minimum(data1, data2)
+    return data1 + data2
+
+
+#=========================================================================================
+# Cache of finished projections
+#=========================================================================================
+
+DEFAULT_PROJECTION_CACHE_SIZE = 256 * MB  # byte budget over all cached projections
+
+_cacheMaxBytes = DEFAULT_PROJECTION_CACHE_SIZE
+_cacheBytes = 0
+_cache = OrderedDict()  # (key, data) pairs; least-recently used first
+_cacheLock = RLock()
+
+
+def _getCachedProjection(key):
+    """:return a copy of the projection stored under key, or None if not present
+    """
+    with _cacheLock:
+        if (data := _cache.get(key)) is None:
+            return None
+        _cache.move_to_end(key)
+        return data.copy()
+
+
+def _popOldestProjections(maxBytes):
+    """Remove the least-recently used projections until at most maxBytes are retained
+    """
+    global _cacheBytes
+
+    while _cacheBytes > maxBytes and len(_cache) > 0:
+        _key, data = _cache.popitem(last=False)
+        _cacheBytes -= data.nbytes
+
+
+def _cacheProjection(key, data):
+    """Store a copy of data under key, removing the least-recently used;
+    data exceeding the byte budget of the cache are not stored
+    """
+    global _cacheBytes
+
+    if data.nbytes > _cacheMaxBytes:
+        return  # cache is disabled or projection is too large to ever fit
+
+    with _cacheLock:
+        if (old := _cache.pop(key, None)) is not None:
+            _cacheBytes -= old.nbytes
+        _popOldestProjections(_cacheMaxBytes - data.nbytes)
+        _cache[key] = data.copy()
+        _cacheBytes += data.nbytes
+
+
+def resizeProjectionCache(maxBytes):
+    """Resize the projection cache to retain at most maxBytes; maxBytes == 0 disables caching
+    """
+    global _cacheMaxBytes
+
+    with _cacheLock:
+        _cacheMaxBytes = max(0, int(maxBytes))
+        _popOldestProjections(_cacheMaxBytes)
+
+
+def clearProjectionCache(path=None):
+    """Clear the cached projections of the dataSource with path; all projections if path is None
+    """
+    global _cacheBytes
+
+    with _cacheLock:
+        if path is None:
+            _cache.clear()
+            _cacheBytes = 0
+            return
+        for key in [key for key in _cache if key[0] == str(path)]:
+            _cacheBytes -= _cache.pop(key).nbytes
+
+
+#=========================================================================================
+# ProjectionEngine
+#=========================================================================================
+
+class ProjectionEngine(object):
+    """
+    Calculate the projection of the (xDim, yDim) planes of a SpectrumDataSource instance
+    along all other dimensions.
+
+    - Slabs are aligned to the blocks of blocked formats, and span up to slabBytes
+    - Slabs are read sequentially (by the calling thread) and reduced by maxWorkers threads
+    - iterate() yields the merged partial projection after every slab
+    """
+
+    slabBytes = 64 * MB  # target size of a slab
+    maxWorkers = min(8, os.cpu_count() or 1)
+
+    def __init__(self, dataSource, xDim: int = 1, yDim: int = 2, method: str = 'max', threshold=None,
+                 scale: float = 1.0):
+        """
+        :param dataSource: the SpectrumDataSource instance
+        :param xDim: dimension of the first axis of the projected plane (1-based)
+        :param yDim: dimension of the second axis of the projected plane (1-based)
+        :param method: one of SpectrumLib.PROJECTION_METHODS
+        :param threshold: threshold value for the relevant methods; applies to the scaled data
+        :param scale: scaling factor of the data; e.g. Spectrum.scale
+        """
+        checkProjectionMethod(method, threshold)
+        dataSource.checkForValidPlane(position=None, xDim=xDim, yDim=yDim)
+
+        self.dataSource = dataSource
+        self.xDim = xDim
+        self.yDim = yDim
+        self.method = method
+        self.threshold = threshold
+        self.scale = float(scale)
+
+    @property
+    def cacheKey(self) -> tuple:
+        """The key identifying the projection in the cache
+        """
+        return (str(self.dataSource.path), self.dataSource._getBufferSignature(),
+                self.xDim, self.yDim, self.method, self.threshold, self.scale)
+
+    @property
+    def totalPlanes(self) -> int:
+        """The total number of planes projected
+        """
+        result = 1
+        for idx in self._otherIndices:
+            result *= self.dataSource.pointCounts[idx]
+        return result
+
+    @property
+    def _otherIndices(self) -> list:
+        return [idx for idx in self.dataSource.dimensionIndices if idx not in (self.xDim - 1, self.yDim - 1)]
+
+    def _getSlabSteps(self) -> dict:
+        """:return dict with (index, step) for all dimensions perpendicular to the plane;
+        steps are multiples of the block sizes (if blocked)
+        """
+        pointCounts = self.dataSource.pointCounts
+        planeBytes = 4 * pointCounts[self.xDim - 1] * pointCounts[self.yDim - 1]
+        nPlanes = max(1, self.slabBytes // planeBytes)
+
+        steps = {}
+        for idx in self._otherIndices:
+            block = 1
+            if self.dataSource.isBlocked and self.dataSource.blockSizes[idx]:
+                block = self.dataSource.blockSizes[idx]
+            step = min(max(block, (nPlanes // block) * block), pointCounts[idx])
+            steps[idx] = step
+            nPlanes = max(1, nPlanes // step)
+        return steps
+
+    def _getSlabs(self):
+        """:return a list of the slabs, as sliceTuples (1-based, stop inclusive)
+        """
+        pointCounts = self.dataSource.pointCounts
+        steps = self._getSlabSteps()
+        starts = [range(0, pointCounts[idx], steps[idx]) for idx in self._otherIndices]
+
+        result = []
+        for _starts in product(*starts):
+            sliceTuples = [(1, p) for p in pointCounts]
+            for idx, start in zip(self._otherIndices, _starts):
+                sliceTuples[idx] = (start + 1, min(start + steps[idx], pointCounts[idx]))
+            result.append(sliceTuples)
+        return result
+
+    def _readSlab(self, sliceTuples) -> numpy.ndarray:
+        """Read slab defined by sliceTuples in one pass if the format allows;
+        plane-by-plane otherwise
+
+        :return a (nPlanes, yPoints, xPoints) numpy array
+        """
+        dataSource = self.dataSource
+        if dataSource.isBuffered:
+            dataSource._checkBuffer()
+            dataSource = dataSource.hdf5buffer
+
+        xAxis = dataSource.dimensionCount - self.xDim  # data are ..,z,y,x ordered
+        yAxis = dataSource.dimensionCount - self.yDim
+        xPoints = dataSource.pointCounts[self.xDim - 1]
+        yPoints = dataSource.pointCounts[self.yDim - 1]
+
+        ranges = [(start - 1, stop) for start, stop in sliceTuples]
+        if (data := dataSource._readRegion(ranges)) is not None:
+            data = numpy.moveaxis(data, (yAxis, xAxis), (-2, -1))
+            return data.reshape((-1, yPoints, xPoints))
+
+        planes = []
+        for position, _aliased in dataSource._selectedPointsIterator(sliceTuples,
+                                                                     excludeDimensions=[self.xDim, self.yDim]):
+            planes.append(numpy.asarray(dataSource.getPlaneData(position=position, xDim=self.xDim, yDim=self.yDim)))
+        return numpy.stack(planes)
+
+    def iterate(self):
+        """An iterator over the slabs, yielding (planesDone, totalPlanes, partialProjection) tuples
+        after each slab has been reduced. The final partialProjection is the projection.
+        """
+        totalPlanes = self.totalPlanes
+        planesDone = 0
+        projection = None
+        maxPending = 2 * self.maxWorkers  # limit the number of slabs in memory
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix='Projection') as pool:
+            pending = set()
+            try:
+                for sliceTuples in self._getSlabs():
+                    data = self._readSlab(sliceTuples)
+                    pending.add(pool.submit(lambda _data=data: (len(_data), reduceSlab(_data, self.method,
+                                                                                       self.threshold,
+                                                                                       self.scale))))
+                    while len(pending) >= maxPending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            nPlanes, result = future.result()
+                            planesDone += nPlanes
+                            projection = mergeProjections(projection, result, self.method)
+                            yield planesDone, totalPlanes, projection
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        nPlanes, result = future.result()
+                        planesDone += nPlanes
+                        projection = mergeProjections(projection, result, self.method)
+                        yield planesDone, totalPlanes, projection
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def getProjection(self, callback=None, useCache=True) -> numpy.ndarray:
+        """Get the projection; from the cache if present
+
+        :param callback: optional function called as callback(planesDone, totalPlanes, partialProjection)
+                         after each slab has been reduced
+        :param useCache: retrieve from and store the result in the cache
+        :return a (yPoints, xPoints) float32 numpy array
+        """
+        key = self.cacheKey
+        if useCache and (projection := _getCachedProjection(key)) is not None:
+            return projection
+
+        getLogger().debug('ProjectionEngine: projecting %s (xDim=%d, yDim=%d, method=%r)' %
+                          (self.dataSource, self.xDim, self.yDim, self.method))
+        projection = None
+        for planesDone, totalPlanes, projection in self.iterate():
+            if callback is not None:
+                callback(planesDone, totalPlanes, projection)
+
+        if useCache:
+            _cacheProjection(key, projection)
+        return projection
+
+    def __str__(self):
+        return '<ProjectionEngine: %s (%d,%d) %r>' % (self.dataSource, self.xDim, self.yDim, self.method)
@@ -0,0 +1,284 @@
+"""
+This file contains the persistent store of the (noise) statistics of the data of a SpectrumDataSource
+
+Estimates such as the noise level, the initial contour base and the noise standard deviation are
+sampled or calculated from (large parts of) the data, which is slow for nD spectra and large series.
+The results are stored in a json file with the metadata of the spectrum in the project, i.e.
+project/state/spectra/statistics/<spectrumName>.json (see Spectrum._statisticsPath); the raw data
+directory is never written to. Data-sources without a spectrum, or without a data file (e.g.
+EmptySpectrumDataSource), retain their statistics in memory only. The file is tagged with the
+signature of the data (see SpectrumDataSourceABC._getBufferSignature; i.e. path, size and
+modification time), and discarded if the signature does not match.
+
+The file holds:
+
+    statistics  the statistics of a sample of the data (see computeStatistics); i.e. the median,
+                noise SD (from the median absolute deviation), mean, SD, robust min/max
+                (0.1 and 99.9 percentiles), min/max and a histogram
+    estimates   (key, value) pairs of derived estimates, e.g. the NoiseEstimateTuple of
+                SpectrumLib.getNoiseEstimate; keys include the scale of the spectrum (see getKey)
+
+The statistics are of the data of the dataSource; scaleStatistics applies the scale of the spectrum
+(see SpectrumLib.getDataStatistics, used for the contour levels, the peak-picking thresholds and the
+signal-to-noise ratio of peaks).
+
+Typical usage (see SpectrumDataSourceABC.getStatistics and SpectrumLib.getNoiseEstimate):
+
+    cache = StatisticsCache(dataSource)
+    key = StatisticsCache.getKey('noiseEstimate', spectrum.scale)
+    if (value := cache.get(key)) is None:
+        value = ...
+        cache.set(key, value)
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import os
+import json
+from itertools import product
+from threading import RLock
+
+import numpy
+
+from ccpn.util.Path import aPath
+from ccpn.util.Logging import getLogger
+
+
+STATISTICS_DIRECTORY = 'statistics'  # subdirectory of the spectrum metadata (project/state/spectra)
+STATISTICS_VERSION = 1
+STATISTICS_MAX_PLANES = 16  # maximum number of planes sampled from nD data
+HISTOGRAM_BINS = 256
+ROBUST_PERCENTILES = (0.1, 99.9)
+MAD_TO_SD = 1.4826  # ratio of the SD and the median absolute deviation of normally-distributed data
+
+
+def computeStatistics(data) -> dict:
+    """Compute the statistics of data, ignoring non-finite values
+
+    :param data: numpy array
+    :return dict with median, noiseSD, mean, std, robustMin, robustMax, min, max, count and histogram
+            (a dict with the bin counts and edges); the values are None if data has no finite values
+    """
+    data = numpy.asarray(data, dtype=numpy.float64).ravel()
+    data = data[numpy.isfinite(data)]
+    if not len(data):
+        return dict(median=None, noiseSD=None, mean=None, std=None, robustMin=None, robustMax=None,
+                    min=None, max=None, count=0, histogram=None)
+
+    median = numpy.median(data)
+    counts, edges = numpy.histogram(data, bins=HISTOGRAM_BINS)
+    robustMin, robustMax = numpy.percentile(data, ROBUST_PERCENTILES)
+    return dict(median=float(median),
+                noiseSD=float(MAD_TO_SD * numpy.median(numpy.absolute(data - median))),
+                mean=float(numpy.mean(data)),
+                std=float(numpy.std(data)),
+                robustMin=float(robustMin),
+                robustMax=float(robustMax),
+                min=float(data.min()),
+                max=float(data.max()),
+                count=int(len(data)),
+                histogram=dict(counts=counts.tolist(), edges=edges.tolist()))
+
+
+def scaleStatistics(statistics, scale) -> dict:
+    """:return a copy of statistics (see computeStatistics) for the data multiplied by scale;
+    for a negative scale the minima and maxima are swapped and the histogram is reversed
+    """
+    result = dict(statistics)
+    if statistics['median'] is None:
+        return result
+
+    scale = float(scale)
+    for name in ('median', 'mean'):
+        result[name] = statistics[name] * scale
+    for name in ('noiseSD', 'std'):
+        result[name] = statistics[name] * abs(scale)
+
+    lows, highs = ('robustMin', 'min'), ('robustMax', 'max')
+    for low, high in zip(lows, highs):
+        values = sorted((statistics[low] * scale, statistics[high] * scale))
+        result[low], result[high] = values
+
+    counts, edges = statistics['histogram']['counts'], [edge * scale for edge in statistics['histogram']['edges']]
+    if scale < 0:
+        counts, edges = counts[::-1], edges[::-1]
+    result['histogram'] = dict(counts=list(counts), edges=edges)
+    return result
+
+
+def histogramPercentile(histogram, percentile) -> float:
+    """:return the value below which percentile % of the points of histogram lie (see computeStatistics);
+    linearly interpolated within the bins
+    """
+    counts = numpy.asarray(histogram['counts'], dtype=numpy.float64)
+    cumulative = numpy.concatenate(([0.0], numpy.cumsum(counts)))
+    return float(numpy.interp(percentile / 100.0 * cumulative[-1], cumulative, histogram['edges']))
+
+
+def sampleData(dataSource, maxPlanes=STATISTICS_MAX_PLANES) -> numpy.ndarray:
+    """:return a flat array with a sample of the data of dataSource; the complete data for 1D and 2D,
+    at most maxPlanes xy-planes (evenly spaced along the other dimensions) for nD
+    """
+    if dataSource.dimensionCount == 1:
+        return numpy.asarray(dataSource.getSliceData()).ravel()
+
+    if dataSource.dimensionCount == 2:
+        return numpy.asarray(dataSource.getPlaneData()).ravel()
+
+    otherCounts = dataSource.pointCounts[2:]
+    perDim = max(1, int(maxPlanes ** (1.0 / len(otherCounts))))
+    axes = [sorted(set(numpy.linspace(1, count, min(perDim, count), dtype=int).tolist())) for count in otherCounts]
+    planes = [numpy.asarray(dataSource.getPlaneData(position=[1, 1] + list(position), xDim=1, yDim=2)).ravel()
+              for position in product(*axes)]
+    return numpy.concatenate(planes)
+
+
+class StatisticsCache(object):
+    """
+    Persistent (json) store of the statistics and estimates of the data of a SpectrumDataSource.
+
+    - The store is discarded when the signature of the data changes
+    - Stored with the metadata of the spectrum of the dataSource; data without a file
+      (e.g. EmptySpectrumDataSource) or without a spectrum are retained in memory only
+    - Access is thread-safe
+    """
+
+    def __init__(self, dataSource):
+        """
+        :param dataSource: the originating SpectrumDataSource instance
+        """
+        self.dataSource = dataSource
+        self._content = None  # dict with the content of the file; read on first access
+        self._lock = RLock()
+
+    @staticmethod
+    def getKey(name, scale=1.0) -> str:
+        """:return the key of the estimate name for data scaled by scale
+        """
+        return '%s:%r' % (name, float(scale))
+
+    @property
+    def isPersistent(self) -> bool:
+        """True if the data are in a file and the dataSource belongs to a spectrum, so that the
+        statistics can be stored with the metadata of the spectrum
+        """
+        return self._hasDataFile and getattr(self.dataSource, 'spectrum', None) is not None
+
+    @property
+    def _hasDataFile(self) -> bool:
+        path = self.dataSource.path
+        return path is not None and aPath(path).exists()
+
+    @property
+    def path(self):
+        """:return the path of the statistics file, with the metadata of the spectrum
+        (see Spectrum._statisticsPath); None if not persistent
+        """
+        if not self.isPersistent:
+            return None
+        return self.dataSource.spectrum._statisticsPath
+
+    def _newContent(self) -> dict:
+        return dict(version=STATISTICS_VERSION,
+                    signature=self.dataSource._getBufferSignature() if self._hasDataFile else None,
+                    statistics=None,
+                    estimates={})
+
+    def _read(self) -> dict:
+        """:return the content of the file; new content if absent or if the signature does not match
+        """
+        content = self._newContent()
+        if self._content is not None and self._content['signature'] == content['signature']:
+            return self._content
+
+        self._content = content
+        if (path := self.path) is None or not path.exists():
+            return content
+
+        try:
+            with open(path, 'r') as fp:
+                stored = json.load(fp)
+            if stored.get('version') == STATISTICS_VERSION and stored.get('signature') == content['signature']:
+                self._content = stored
+        except Exception as es:
+            getLogger().debug('StatisticsCache: unable to read %s (%s)' % (path, es))
+        return self._content
+
+    def _write(self):
+        """Write the content to the file; errors are logged, as the cache is not essential
+        """
+        if not self.isPersistent:
+            return
+
+        path = None
+        try:
+            # None if the project is read-only
+            if (path := self.dataSource.spectrum._fetchStatisticsPath()) is None:
+                return
+            _tmpPath = str(path) + '.tmp'
+            with open(_tmpPath, 'w') as fp:
+                json.dump(self._content, fp)
+            os.replace(_tmpPath, str(path))
+        except Exception as es:
+            getLogger().debug('StatisticsCache: unable to write %s (%s)' % (path, es))
+
+    def get(self, key):
+        """:return the estimate stored for key, or None if not present
+        """
+        with self._lock:
+            return self._read()['estimates'].get(key)
+
+    def set(self, key, value):
+        """Store the (json-serialisable) estimate value for key
+        """
+        with self._lock:
+            self._read()['estimates'][key] = value
+            self._write()
+
+    def getStatistics(self) -> dict:
+        """:return the statistics of the data (see computeStatistics); calculated from a sample of
+        the data (see sampleData) on first request
+        """
+        with self._lock:
+            content = self._read()
+            if content['statistics'] is None:
+                getLogger().debug('StatisticsCache: calculating statistics of %s' % self.dataSource)
+                content['statistics'] = computeStatistics(sampleData(self.dataSource))
+                self._write()
+            return content['statistics']
+
+    def clear(self):
+        """Clear all statistics and estimates, e.g. when the data have changed
+        """
+        with self._lock:
+            self._content = self._newContent()
+            if (path := self.path) is not None and path.exists():
+                path.removeFile()
+
+    def __str__(self):
+        return '<StatisticsCache: %s>' % self.path
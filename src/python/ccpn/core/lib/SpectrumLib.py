@@ -35,7 +35,7 @@ from typing import Tuple, Optional, Sequence, Any
 from itertools import permutations
 from tqdm import tqdm
 from ccpn.framework.Application import getApplication
-from ccpn.core.lib.ContextManagers import notificationEchoBlocking, undoBlockWithoutSideBar
+from ccpn.core.lib.ContextManagers import notificationEchoBlocking, undoBlockWithoutSideBar, notificationSuspend
 from ccpn.core.lib.AxisCodeLib import getAxisCodeMatchIndices
 from ccpn.core.lib._DistanceRestraintsLib import _getBoundResonances, longRangeTransfers
 # from ccpn.util.Common import percentage, isIterable # this causes circular imports. DO NOT USE HERE
@@ -494,13 +494,43 @@ PROJECTION_METHODS = ('max', 'max above threshold', 'min', 'min below threshold'
                       'sum', 'sum above threshold', 'sum below threshold')
 
 
-def _getProjection(spectrum, axisCodes: tuple, method: str = 'max', threshold=None):
+def _getProjection(spectrum, axisCodes: tuple, method: str = 'max', threshold=None, callback=None):
     """Get projected plane defined by axisCodes using method and optional threshold
     return projected data array
 
+    Implemented by the (parallel, cached) ProjectionEngine of the dataSource;
+    callback is called as callback(planesDone, totalPlanes, partialProjection) while calculating
+
     NB Called by Spectrum.getProjection
     """
 
+    if method not in PROJECTION_METHODS:
+        raise ValueError('For spectrum projection, method must be one of %s' % (PROJECTION_METHODS,))
+
+    if method.endswith('threshold') and threshold is None:
+        raise ValueError('For spectrum projection method "%s", threshold parameter must be defined' % (method,))
+
+    if len(axisCodes) != 2:
+        raise ValueError('Invalid axisCodes %s, len should be 2' % axisCodes)
+
+    xDim, yDim = spectrum.getByAxisCodes('dimensions', axisCodes, exactMatch=True)
+    if xDim == yDim:
+        raise ValueError('Invalid axisCodes %s; identical' % axisCodes)
+
+    if not spectrum.hasValidPath():
+        raise RuntimeError('Not valid path for %s ' % spectrum)
+
+    return spectrum.dataSource.getProjectionData(xDim=xDim, yDim=yDim, method=method, threshold=threshold,
+                                                 callback=callback, scale=spectrum.scale)
+
+
+def _getProjectionByPlanes(spectrum, axisCodes: tuple, method: str = 'max', threshold=None):
+    """Get projected plane defined by axisCodes using method and optional threshold
+    return projected data array
+
+    NB: Reference implementation (plane-by-plane); _getProjection uses the ProjectionEngine
+    """
+
     if method not in PROJECTION_METHODS:
         raise ValueError('For spectrum projection, method must be one of %s' % (PROJECTION_METHODS,))
 
@@ -511,15 +541,13 @@ def _getProjection(spectrum, axisCodes: tuple, method: str = 'max', threshold=No
     for position, planeData in spectrum.allPlanes(axisCodes, exactMatch=True):
 
         if method == 'sum above threshold' or method == 'max above threshold':
-            lowIndices = planeData < threshold
-            planeData[lowIndices] = 0
+            planeData = np.where(planeData < threshold, 0, planeData)
         elif method == 'sum below threshold' or method == 'min below threshold':
-            lowIndices = planeData > -threshold
-            planeData[lowIndices] = 0
+            planeData = np.where(planeData > -threshold, 0, planeData)
 
         if projectedData is None:
             # first plane
-            projectedData = planeData
+            projectedData = planeData.copy()
         elif method == 'max' or method == 'max above threshold':
             projectedData = np.maximum(projectedData, planeData)
         elif method == 'min' or method == 'min below threshold':
@@ -941,6 +969,64 @@ def _recurseData(ii, dataList, startCondition, endCondition):
 DEFAULTMULTIPLIER = 1.414214
 DEFAULTLEVELS = 10
 DEFAULTCONTOURBASE = 10000.0
+NOISELEVELFACTOR = 3.5  # noise level = |median| + NOISELEVELFACTOR * noiseSD
+PEAKPICKINGPERCENTILE = 99.0  # peak-picking thresholds outside the (100 - x, x) percentiles of the data
+
+
+def getDataStatistics(spectrum) -> Optional[dict]:
+    """Get the statistics of (a sample of) the data of spectrum, scaled by spectrum.scale: the median,
+    noiseSD (from the median absolute deviation), mean, std, robustMin/robustMax, min, max, count
+    and histogram (see SpectrumDataSourceABC.getStatistics).
+    Calculated on first request and stored with the metadata of spectrum.
+
+    :return dict with the statistics, or None if not available (no dataSource, or no valid data)
+    """
+    from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import scaleStatistics
+
+    if (dataSource := spectrum.dataSource) is None:
+        return None
+
+    try:
+        with dataSource._readLock:
+            statistics = dataSource.getStatistics()
+    except Exception as es:
+        getLogger().debug('getDataStatistics: unable to get the statistics of %s (%s)' % (spectrum, es))
+        return None
+
+    if statistics['median'] is None:
+        return None
+    return scaleStatistics(statistics, spectrum.scale)
+
+
+def _getNoiseFromStatistics(spectrum) -> Optional[NoiseEstimateTuple]:
+    """:return a NoiseEstimateTuple from the statistics of the data of spectrum; the robust min/max bound
+    the contours, the noiseLevel is derived from the median and noiseSD.
+    None if there are no valid statistics
+    """
+    if (statistics := getDataStatistics(spectrum)) is None or not statistics['noiseSD']:
+        return None
+
+    return NoiseEstimateTuple(mean=statistics['median'],
+                              std=statistics['noiseSD'],
+                              min=statistics['robustMin'], max=statistics['robustMax'],
+                              noiseLevel=abs(statistics['median']) + NOISELEVELFACTOR * statistics['noiseSD'])
+
+
+def getPeakPickingThresholds(spectrum) -> Tuple[Optional[float], Optional[float]]:
+    """Get the (positive, negative) thresholds for picking the peaks of the whole of spectrum from the
+    statistics of its data: outside the noise level, and outside the PEAKPICKINGPERCENTILE of the
+    histogram, so that noise is not picked; the contour bases if there are no statistics.
+
+    :return tuple of (positiveThreshold, negativeThreshold)
+    """
+    from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import histogramPercentile
+
+    if (statistics := getDataStatistics(spectrum)) is None or not statistics['noiseSD']:
+        return spectrum.positiveContourBase, spectrum.negativeContourBase
+
+    median, noise, histogram = statistics['median'], NOISELEVELFACTOR * statistics['noiseSD'], statistics['histogram']
+    return (max(median + noise, histogramPercentile(histogram, PEAKPICKINGPERCENTILE)),
+            min(median - noise, histogramPercentile(histogram, 100.0 - PEAKPICKINGPERCENTILE)))
 
 
 def setContourLevelsFromNoise(spectrum, setNoiseLevel=True,
@@ -985,14 +1071,15 @@ def setContourLevelsFromNoise(spectrum, setNoiseLevel=True,
         raise NotImplementedError("setContourLevelsFromNoise not implemented for processed frequency spectra, dimension types were: {}".format(spectrum.dimensionTypes, ))
 
     getLogger().info("estimating noise level for spectrum %s" % str(spectrum.pid))
+    if (noise := _getNoiseFromStatistics(spectrum)) is None:
+        # get noise level using random sampling method - may be slow for large spectra;
+        # otherwise, need to generate a min/max
+        noise = getNoiseEstimate(spectrum) if setNoiseLevel else getContourEstimate(spectrum)
+
     if setNoiseLevel:
-        # get noise level using random sampling method - may be slow for large spectra
-        noise = getNoiseEstimate(spectrum)
         base = spectrum.noiseLevel = noise.noiseLevel
     else:
         base = spectrum.noiseLevel
-        # need to generate a min/max
-        noise = getContourEstimate(spectrum)
 
     # noise => noise.mean, noise.std, noise.min, noise.max, noise.noiseLevel
 
@@ -1083,7 +1170,8 @@ def getContourLevelsFromNoise(spectrum,
         raise NotImplementedError("getContourLevelsFromNoise not implemented for processed frequency spectra, dimension types were: {}".format(spectrum.dimensionTypes, ))
 
     # need to generate a min/max
-    noise = getContourEstimate(spectrum)
+    if (noise := _getNoiseFromStatistics(spectrum)) is None:
+        noise = getContourEstimate(spectrum)
 
     # noise => noise.mean, noise.std, noise.min, noise.max, noise.noiseLevel
 
@@ -1238,7 +1326,8 @@ def getNoiseEstimate(spectrum):
     nsubsets = max(1, int(nsamples * subsetFract))
 
     with notificationEchoBlocking():
-        return _getNoiseEstimate(spectrum, nsamples, nsubsets, fract)
+        return _getCachedEstimate(spectrum, 'noiseEstimate',
+                                  lambda: _getNoiseEstimate(spectrum, nsamples, nsubsets, fract))
 
 
 def getContourEstimate(spectrum):
@@ -1259,7 +1348,25 @@ def getContourEstimate(spectrum):
     nsubsets = max(1, int(nsamples * subsetFract))
 
     with notificationEchoBlocking():
-        return _getContourEstimate(spectrum, nsamples, nsubsets, fract)
+        return _getCachedEstimate(spectrum, 'contourEstimate',
+                                  lambda: _getContourEstimate(spectrum, nsamples, nsubsets, fract))
+
+
+def _getCachedEstimate(spectrum, name, func):
+    """Get the NoiseEstimateTuple name of spectrum from the statistics cache of its dataSource
+    (see SpectrumDataSourceABC.getStatistics); calculate it with func and store it if not present
+    """
+    if spectrum.dataSource is None:
+        return func()
+
+    cache = spectrum.dataSource._getStatisticsCache()
+    key = cache.getKey(name, spectrum.scale)
+    if (value := cache.get(key)) is not None:
+        return NoiseEstimateTuple(**value)
+
+    value = func()
+    cache.set(key, {attr: None if val is None else float(val) for attr, val in value._asdict().items()})
+    return value
 
 
 def _noiseFunc(value):
@@ -1277,6 +1384,22 @@ def _getNoiseRegionFromLimits(regionData, yLower, yUpper):
     return noiseRegion
 
 def _estimateNoiseSDforSpectrumNoiseLevel(spectrum, stdFactor=1.1, noiseLevelFactor=3.5):
+    """Estimate the SD of the noise from the points within ±noiseLevel/noiseLevelFactor;
+    the result is retained in the statistics cache of the dataSource, as all data are read
+    """
+    if spectrum.noiseLevel is None:
+        raise ValueError('This routine requires the noiseLevel to be set')
+    if spectrum.dataSource is None:
+        return _calculateNoiseSDforSpectrumNoiseLevel(spectrum, stdFactor, noiseLevelFactor)
+
+    cache = spectrum.dataSource._getStatisticsCache()
+    key = cache.getKey('noiseSD;%r;%r;%r' % (float(spectrum.noiseLevel), stdFactor, noiseLevelFactor), spectrum.scale)
+    if (sd := cache.get(key)) is None:
+        sd = _calculateNoiseSDforSpectrumNoiseLevel(spectrum, stdFactor, noiseLevelFactor)
+        cache.set(key, sd)
+    return sd
+
+def _calculateNoiseSDforSpectrumNoiseLevel(spectrum, stdFactor=1.1, noiseLevelFactor=3.5):
 
     regionData = spectrum.getAllRegionData()
     regionData = regionData.flatten()
@@ -2153,15 +2276,12 @@ def _createPeak(spectrum, peakList=None, height=None, **ppmPositions) -> Optiona
                 break
 
         else:
-            # get the list of existing peak pointPositions in this peakList
+            # get the (integer) pointPositions of the new peak
             pointCounts = spectrum.pointCounts
             intPositions = [int(((spectrum.ppm2point(pos, dimension=indx + 1)) - 1) % np) + 1
                             for indx, (pos, np) in enumerate(zip(_ppmPositions, pointCounts))]
 
-            # get the existing peak point-positions for this list
-            existingPositions = [[int(pp) for pp in pk.pointPositions] for pk in peakList.peaks if None not in pk.pointPositions]
-
-            if intPositions not in existingPositions:
+            if not peakList._getPeakIndex().peaksAtPoint(intPositions):
                 # add the new peak only if one doesn't exist at these pointPositions
                 pk = peakList.newPeak(ppmPositions=_ppmPositions, height=height)
                 return pk
@@ -2303,11 +2423,12 @@ def _pickPeaksByRegion(spectrum, sliceTuples, peakList, positiveThreshold, negat
     peaks = []
     with undoBlockWithoutSideBar():
         try:
-            peaks = peakPicker.pickPeaks(sliceTuples=_sliceTuples,
-                                         peakList=peakList,
-                                         positiveThreshold=positiveThreshold,
-                                         negativeThreshold=negativeThreshold
-                                         )
+            with notificationSuspend(application=application):
+                peaks = peakPicker.pickPeaks(sliceTuples=_sliceTuples,
+                                             peakList=peakList,
+                                             positiveThreshold=positiveThreshold,
+                                             negativeThreshold=negativeThreshold
+                                             )
         except Exception as err:
             # need to trap error that Nd spectra may not be defined in all dimensions of axisDict
             logger.debug('_pickPeaks %s, trapped error: %s' % (spectrum, str(err)))
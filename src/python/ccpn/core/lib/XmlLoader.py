@@ -209,9 +209,15 @@ __date__ = "$Date: 2018-05-14 10:28:41 +0000 (Fri, April 07, 2017) $"
 # Start of code
 #=========================================================================================
 
+import io
+import os
 import re
 import sys
-from contextlib import contextmanager
+import json
+import shutil
+from time import perf_counter
+from contextlib import contextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor
 
 from ccpnmodel.ccpncore.api.memops import Implementation
 from ccpnmodel.ccpncore.memops.metamodel import Constants as metaConstants
@@ -255,8 +261,13 @@ XML_SUFFIX = '.xml'
 BACKUP_SUFFIX = '.ccpnV3backup'
 AUTOBACKUP_SUFFIX = '.ccpnV3autobackup'
 TEMPBACKUP_SUFFIX = '.ccpnV3tempbackup'
+TEMPFILE_SUFFIX = '.tmp'
 KEY_SEPARATOR = '+'
 
+SAVE_MANIFEST = 'saveManifest.json'  # in v3Path; records the xml-files of deleted topObjects
+SAVE_MANIFEST_VERSION = 1
+MANIFEST_DELETED = 'deleted'
+
 XML_LOADER_ATTR = 'xmlLoader'  # attribute name for MemopsRoot
 ACTIVE_REPOSITORIES_ATTR = 'activeRepositories'
 
@@ -269,7 +280,7 @@ REPOSITORIES = [USERDATA, REFDATA, GENERALDATA, BACKUPDATA]
 
 USERDATA_PACKAGES = ['ccp.nmr.Nmr',
                      'ccp.lims.RefSampleComponent',
-                     'ccp.lims.Sample'
+                     'ccp.lims.Sample',
                      'ccp.molecule.MolSystem',
                      'ccpnmr.gui.Task',
                      'ccpnmr.gui.Window',
@@ -287,6 +298,171 @@ REFDATA_PACKAGES = ['ccp.molecule.ChemCompCoord',
 #TODO: original code implemented silencing of garbage collection on reading/writing: still valid?
 SILENCE_GARBAGE_COLLECTION = False
 
+PREFETCH_WORKERS = 4  # number of threads pre-reading the userData xml-files when loading a project
+PREFETCH_MAX_BYTES = 64 * 1024 * 1024  # maximum total size of the xml-files being pre-read or not yet loaded
+
+
+class XmlPrefetcher(object):
+    """
+    Pre-reads xml-files in a pool of threads, so that the loading of the topObjects (on the main
+    thread, in the order dictated by the api) does not have to wait for the disk.
+    The total size of the files being pre-read, or pre-read but not yet popped, is limited to maxBytes;
+    the next files are submitted as the pre-read ones are popped.
+    """
+
+    def __init__(self, paths, maxWorkers: int = PREFETCH_WORKERS, maxBytes: int = PREFETCH_MAX_BYTES):
+        """
+        :param paths: the xml-files to pre-read, in the order in which they are likely to be loaded
+        :param maxWorkers: the number of threads
+        :param maxBytes: the maximum total size of the pre-read files held in memory; larger files are not pre-read
+        """
+        self._maxBytes = maxBytes
+        self._bytes = 0  # total size of the submitted files that have not been popped
+        self._futures = {}  # the submitted files; path-string: (future, size)
+        self._queue = {}  # the files waiting to be submitted, in order; path-string: (path, size)
+        self._executor = None
+
+        for path in paths:
+            with suppress(OSError):
+                _size = path.stat().st_size
+                if _size <= maxBytes:
+                    self._queue[str(path)] = (path, _size)
+
+        if self._queue:
+            self._executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='XmlPrefetcher')
+            self._submit()
+
+    def _submit(self):
+        """Submit the queued files, in order, while their total size does not exceed maxBytes
+        """
+        while self._queue:
+            key = next(iter(self._queue))
+            path, _size = self._queue[key]
+            if self._bytes + _size > self._maxBytes:
+                break
+            del self._queue[key]
+            self._bytes += _size
+            self._futures[key] = (self._executor.submit(self._read, path), _size)
+
+    @staticmethod
+    def _read(path) -> tuple:
+        """:return a (text, readTime) tuple
+        """
+        _start = perf_counter()
+        with open(path, 'r') as fp:
+            text = fp.read()
+        return text, perf_counter() - _start
+
+    def pop(self, path):
+        """Get the pre-read contents of path, waiting for the read to complete if required
+        :return a (text, readTime) tuple or None if path was not (successfully) pre-read
+        """
+        key = str(path)
+        if (item := self._futures.pop(key, None)) is None:
+            # not submitted (yet); read by the caller
+            self._queue.pop(key, None)
+            return None
+
+        future, _size = item
+        try:
+            return future.result()
+        except OSError as es:
+            getLogger().debug(f'Pre-reading "{path}" failed: {es}')
+            return None
+        finally:
+            self._bytes -= _size
+            self._submit()
+
+    def close(self):
+        """Cancel the pending reads and release the resources
+        """
+        self._queue.clear()
+        for future, _size in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._bytes = 0
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class LoadTimings(object):
+    """
+    Timings of the loading of the topObjects. As loading a topObject may trigger the loading of
+    other topObjects, both the total (inclusive) and self (exclusive) times are recorded.
+    """
+
+    def __init__(self):
+        self.records = []  # a list of dicts, one for each loaded topObject
+        self._active = []  # the records of the topObjects being loaded
+
+    def clear(self):
+        """Clear all records
+        """
+        self.records = []
+        self._active = []
+
+    @contextmanager
+    def timing(self, topObject):
+        """Context manager timing the load of topObject
+        """
+        path = topObject.path
+        record = dict(package=topObject.package.name,
+                      guid=topObject.guid,
+                      path=str(path),
+                      size=path.stat().st_size if path.exists() else 0,
+                      prefetched=False,
+                      readTime=None,
+                      totalTime=0.0,
+                      selfTime=0.0,
+                      childTime=0.0,
+                      )
+        self._active.append(record)
+        _start = perf_counter()
+        try:
+            yield record
+
+        finally:
+            self._active.pop()
+            record['totalTime'] = perf_counter() - _start
+            record['selfTime'] = record['totalTime'] - record.pop('childTime')
+            if self._active:
+                self._active[-1]['childTime'] += record['totalTime']
+            self.records.append(record)
+
+    def setReadTime(self, readTime, prefetched=False):
+        """Set the read time of the topObject currently being loaded
+        """
+        if self._active:
+            self._active[-1]['readTime'] = readTime
+            self._active[-1]['prefetched'] = prefetched
+
+    def getPackageTimings(self) -> dict:
+        """:return a dict with (packageName, (fileCount, bytes, selfTime)) items, slowest first
+        """
+        result = {}
+        for record in self.records:
+            count, size, selfTime = result.get(record['package'], (0, 0, 0.0))
+            result[record['package']] = (count + 1, size + record['size'], selfTime + record['selfTime'])
+        return dict(sorted(result.items(), key=lambda item: -item[1][2]))
+
+    def getReport(self, maxTopObjects: int = 10) -> str:
+        """:return a report of the time per package and of the slowest topObjects
+        """
+        totalTime = sum(record['selfTime'] for record in self.records)
+        lines = [f'Loaded {len(self.records)} topObjects in {totalTime:.3f}s',
+                 f'  {"package":40s} {"files":>6s} {"kBytes":>10s} {"time(s)":>9s}']
+        for package, (count, size, selfTime) in self.getPackageTimings().items():
+            lines.append(f'  {package:40s} {count:6d} {size / 1024:10.1f} {selfTime:9.3f}')
+
+        lines.append('  slowest topObjects:')
+        for record in sorted(self.records, key=lambda rec: -rec['selfTime'])[:maxTopObjects]:
+            _read = '' if record['readTime'] is None else f'; read {record["readTime"]:.3f}s'
+            lines.append(f'  {record["package"]:40s} {record["size"] / 1024:10.1f} kB '
+                         f'{record["selfTime"]:9.3f}s ({record["guid"]}{_read})')
+
+        return '\n'.join(lines)
+
 
 class XmlLoaderABC(TraitBase):
     """Base class for the data structure
@@ -427,11 +603,26 @@ class TopObject(XmlLoaderABC):
 
         _stack = self.root.loadingStack
         _stack.append(self)
-        self._loadFromXml()
+        with self.root.loadTimings.timing(self):
+            self._loadFromXml()
         _stack.pop()
 
         return self
 
+    @property
+    def isDeleted(self) -> bool:
+        """:return True if the apiTopObject has been deleted
+        """
+        return self.apiTopObject is not None and self.apiTopObject.isDeleted
+
+    @property
+    def needsSaving(self) -> bool:
+        """:return True if the apiTopObject has been modified or its xml-file does not exist
+        """
+        if self.apiTopObject is None or self.apiTopObject.isDeleted:
+            return False
+        return self.apiTopObject.isModified or not self.path.exists()
+
     def _getGuidFromXmlPath(self, xmlPath) -> str:
         """Get the guid from the xml path
         :param xmlPath: Path instance defining the xml file
@@ -443,6 +634,18 @@ class TopObject(XmlLoaderABC):
         guid = xmlPath.basename.split(KEY_SEPARATOR)[-1]
         return guid
 
+    def _openXml(self):
+        """:return a stream with the contents of self.path; from the pre-read contents if available
+        """
+        if (_prefetched := self.root._popPrefetched(self.path)) is None:
+            return self.path.open('r')
+
+        text, readTime = _prefetched
+        self.root.loadTimings.setReadTime(readTime, prefetched=True)
+        stream = io.StringIO(text)
+        stream.name = str(self.path)
+        return stream
+
     def _loadFromXml(self):
         """Load api topObject from self.path
         """
@@ -451,7 +654,7 @@ class TopObject(XmlLoaderABC):
 
         if not self.isReading:
             self.isReading += 1
-            with self.path.open('r') as fp:
+            with self._openXml() as fp:
                 if self.apiTopObject is None:
                     try:
                         apiTopObject = loadFromStream(stream=fp,
@@ -506,8 +709,7 @@ class TopObject(XmlLoaderABC):
             try:
                 if not self.package.path.exists():
                     self.package.path.mkdir(parents=True, exist_ok=False)
-                with self.path.open('w') as fp:
-                    saveToStream(fp, self.apiTopObject)
+                saveToXmlFile(self.path, self.apiTopObject)
 
             except (PermissionError, FileNotFoundError):
                 self.logger.info('Saving: folder may be read-only')
@@ -627,10 +829,12 @@ class Package(XmlLoaderABC):
         if not self.path.exists():
             return []
 
-        result = list(self.path.listdir(suffix=XML_SUFFIX,
-                                        excludeDotFiles=True,
-                                        relative=False)
-                      )
+        # skip the xml-files of deleted topObjects that could not be removed
+        _deleted = self.root._getDeletedXmlPaths()
+        result = [_path for _path in self.path.listdir(suffix=XML_SUFFIX,
+                                                       excludeDotFiles=True,
+                                                       relative=False)
+                  if _path not in _deleted]
         return result
 
     @property
@@ -910,6 +1114,7 @@ class XmlLoader(XmlLoaderABC):
     repositories         = List(default_value=[])  # List with Repository instances
 
     loadingStack         = List(default_value=[])  # for debugging
+    loadTimings          = Any(default_value=None, allow_none=True)  # LoadTimings instance
 
     # useFileLogger        = False  # Toggling the logging from Api calls (!?) (to be eliminated)
     MAX_BACKUPS_ON_SAVE  = 10  # Maximum number of backups to keep on save
@@ -953,6 +1158,12 @@ class XmlLoader(XmlLoaderABC):
                 raise ValueError(f'Invalid name "{name}" (invalid characters or too long)')
             self.name = _name
 
+        # a set of xml-files recorded as deleted in the save manifest; read on first use
+        self._deletedXmlPaths = None
+
+        self.loadTimings = LoadTimings()
+        self._prefetcher = None  # XmlPrefetcher instance, only while loading a project
+
         # a dict of (_id, object pair)
         self._lookupDict = {}
         self._id = ('root', None, None)
@@ -1028,6 +1239,12 @@ class XmlLoader(XmlLoaderABC):
         """
         return self.v3ImplementationPath / (self.name + XML_SUFFIX)
 
+    @property
+    def saveManifestPath(self) -> Path:
+        """:return the save manifest file as Path object
+        """
+        return self.v3Path / SAVE_MANIFEST
+
     @property
     def apiName(self):
         """:return name of the project as extracted from self.memopsRoot
@@ -1277,6 +1494,16 @@ class XmlLoader(XmlLoaderABC):
 
         setattr(self.memopsRoot, XML_LOADER_ATTR, self)  # back linkage
 
+        with self._prefetchingXmlFiles():
+            self._loadUserData()
+
+        self.logger.debug(self.loadTimings.getReport())
+        self._debugInfo('After loadProject:')
+        return self.apiNmrProject
+
+    def _loadUserData(self):
+        """Load the userData topObjects and initialise the api data
+        """
         # call to sortedNmrProjects will also load the topObjects via
         # memopsRoot.refreshTopObjects
         nmrProjects = self.memopsRoot.sortedNmrProjects()
@@ -1319,8 +1546,29 @@ class XmlLoader(XmlLoaderABC):
 
         self._updateTopObjects()
         self.setUnmodified()
-        self._debugInfo('After loadProject:')
-        return self.apiNmrProject
+
+    @contextmanager
+    def _prefetchingXmlFiles(self):
+        """Context manager pre-reading the xml-files of the userData topObjects in a pool of threads
+        """
+        _order = {name: idx for idx, name in enumerate(USERDATA_PACKAGES)}
+        topObjects = sorted([topObj for topObj in self.userData.getTopObjects() if not topObj.isLoaded],
+                            key=lambda topObj: _order.get(topObj.package.name, len(_order)))
+        self.loadTimings.clear()
+        self._prefetcher = XmlPrefetcher([topObj.path for topObj in topObjects])
+        try:
+            yield
+
+        finally:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _popPrefetched(self, path):
+        """:return the pre-read (text, readTime) of path, or None if not available
+        """
+        if self._prefetcher is None:
+            return None
+        return self._prefetcher.pop(path)
 
     # @debug2Leave()
     def _getXmlProjectFile(self) -> Path:
@@ -1406,12 +1654,16 @@ class XmlLoader(XmlLoaderABC):
     # Saving
     #--------------------------------------------------------------------------------------------
 
-    def saveUserData(self, keepFallBack: bool = True, updateIsModified: bool = True, autoBackup: bool = False):
+    def saveUserData(self, keepFallBack: bool = True, updateIsModified: bool = True, autoBackup: bool = False,
+                     incremental: bool = False):
         """Save userData topObjects to Xml.
         :param keepFallBack: retain current ccpnv3 directory in backups
         :param updateIsModified: if False, the isModified flag of the apiTopObjects are retained 'as-is'
                                  and not set to False. This can be used e.g. when creating backups,
                                  which should not change the isModified status.
+        :param incremental: only save the modified topObjects, if a save manifest of a previous save
+                            exists; the backup is a snapshot with hard-links to (or copies of) the
+                            current files
         :raises RuntimeError on error
         """
         # NOTE:ED - quick hack for backup
@@ -1432,6 +1684,9 @@ class XmlLoader(XmlLoaderABC):
         if len(topObjects) == 0:
             raise RuntimeError('No data to save; this should not happen')
 
+        # incremental save requires a consistent v3Path, i.e. written by a previous save
+        incremental = incremental and self.saveManifestPath.exists()
+
         app = getApplication()
         try:
             # check if we have to keep current ccpnv3 directory before moving it
@@ -1453,19 +1708,17 @@ class XmlLoader(XmlLoaderABC):
                 # create the new backup by moving current v3Path
                 bPath = self.backupsPath / (CCPN_API_DIRECTORY + BACKUP_SUFFIX)
                 bPath = bPath.addTimeStamp()
-                self.v3Path.rename(bPath)
-
-            # NOTE:ED 2024-09-23 There is currently an issue if backupSaveEnabled is False
-            #   All .xml files are written to the existing folder, old files are not deleted.
-            #   But deleting, e.g., structureData requires the deletion of a .xml file in the NMRConstraint folder
-            #   Currently writing to the same folder does not delete the old files which are then loaded when the
-            #   project is loaded an reappear as the original objects.
-            #   So, must always save one backup until issue is resolved :|
-            #   Possible solutions - keep tally of old files and new files, and rename old files as .bak
-            #           or just rename everything to .bak before saving?
-            #   can-of-worms as any errors could result in renaming too many files
-            #   Loader checks whether .xml on load belong to the current project state...
-            #   keepFallBack=False will have the same issue
+                if incremental:
+                    # files are replaced (not overwritten) on saving; hence hard-links retain the current state
+                    _snapshotDirectory(self.v3Path, bPath)
+                else:
+                    self.v3Path.rename(bPath)
+
+            # NOTE:ED 2024-09-23 Writing to an existing folder (i.e. without moving it to the backups) does
+            #   not delete the .xml files of deleted topObjects; e.g. deleting structureData requires the
+            #   deletion of a .xml file in the NMRConstraint folder. These are now removed by
+            #   _removeDeletedXmlFiles and recorded in the save manifest, so that they are skipped on
+            #   loading if the removal failed.
 
         except (PermissionError, FileNotFoundError):
             getLogger().debug('Saving user-data: folder may be read-only')
@@ -1476,9 +1729,77 @@ class XmlLoader(XmlLoaderABC):
             # save memops file in v3Path
             self._saveMemopsToXml(updateIsModified=updateIsModified)
 
-            # save all topObject to xml files in v3Path
+            # save all (or modified) topObject to xml files in v3Path
+            _count = 0
             for topObject in topObjects:
-                topObject.save(updateIsModified=updateIsModified)
+                if not incremental or topObject.needsSaving:
+                    topObject.save(updateIsModified=updateIsModified)
+                    _count += 1
+            getLogger().debug(f'Saved {_count} of {len(topObjects)} TopObjects (incremental={incremental})')
+
+            deletedPaths = self._removeDeletedXmlFiles(topObjects)
+            self._saveManifest(deletedPaths)
+
+    def _removeDeletedXmlFiles(self, topObjects) -> list:
+        """Remove the xml-files of the deleted topObjects, and any stale memops project xml-file
+        :return a list of the removed paths, relative to v3Path
+        """
+        _paths = [topObject.path for topObject in topObjects if topObject.isDeleted]
+        if self.v3ImplementationPath.exists():
+            _paths.extend(_p for _p in self.v3ImplementationPath.listdir(suffix=XML_SUFFIX)
+                          if _p != self.xmlProjectFile)
+
+        result = []
+        for _path in _paths:
+            if not _path.exists():
+                continue
+            result.append(_path.relative_to(self.v3Path).as_posix())
+            try:
+                _path.removeFile()
+            except (PermissionError, FileNotFoundError):
+                getLogger().debug(f'Saving user-data: could not remove {_path}')
+
+        return result
+
+    def _readManifest(self) -> dict:
+        """:return the contents of the save manifest; empty if it does not exist or cannot be read
+        """
+        if not self.saveManifestPath.exists():
+            return {}
+        try:
+            with self.saveManifestPath.open('r') as fp:
+                return json.load(fp)
+        except (OSError, ValueError) as es:
+            getLogger().warning(f'Error reading {self.saveManifestPath}: {es}')
+            return {}
+
+    def _saveManifest(self, deletedPaths):
+        """Save the manifest, recording the xml-files of deleted topObjects; entries of previous saves
+        are retained as long as the files are still present
+        :param deletedPaths: list of paths, relative to v3Path
+        """
+        _deleted = [_p for _p in self._readManifest().get(MANIFEST_DELETED, [])
+                    if (self.v3Path / _p).exists() and _p not in deletedPaths]
+        manifest = {'version'       : SAVE_MANIFEST_VERSION,
+                    MANIFEST_DELETED: _deleted + list(deletedPaths),
+                    }
+        _path = self.saveManifestPath
+        _tmpPath = _path.with_name(_path.name + TEMPFILE_SUFFIX)
+        try:
+            with _tmpPath.open('w') as fp:
+                json.dump(manifest, fp, indent=2)
+            os.replace(_tmpPath, _path)
+        except (PermissionError, FileNotFoundError):
+            getLogger().debug('Saving manifest: folder may be read-only')
+
+        self._deletedXmlPaths = None
+
+    def _getDeletedXmlPaths(self) -> set:
+        """:return the set of xml-files recorded as deleted in the save manifest
+        """
+        if self._deletedXmlPaths is None:
+            self._deletedXmlPaths = set(self.v3Path / _p for _p in self._readManifest().get(MANIFEST_DELETED, []))
+        return self._deletedXmlPaths
 
     def _saveMemopsToXml(self, updateIsModified=True):
         """Saves memopsRoot to self.xmlProjectFile;
@@ -1496,8 +1817,7 @@ class XmlLoader(XmlLoaderABC):
         _xmlFile = self.xmlProjectFile
         try:
             _xmlFile.parent.mkdir(parents=True, exist_ok=True)
-            with _xmlFile.open('w') as fp:
-                saveToStream(stream=fp, apiTopObject=self.memopsRoot)
+            saveToXmlFile(_xmlFile, self.memopsRoot)
 
             if updateIsModified:
                 # make sure that isModified is not updated if the file is not saved
@@ -1732,6 +2052,40 @@ def saveToStream(stream, apiTopObject, mapping=None, comment=None, simplified=Tr
             gc.enable()
 
 
+def saveToXmlFile(path, apiTopObject):
+    """Save apiTopObject to the xml-file path.
+    The data are written to a temporary file that then replaces path; i.e. path is never partially
+    written and any hard-link to path (e.g. in a backup) retains the previous contents.
+    :raise RuntimeError on error
+    """
+    path = aPath(path)
+    tmpPath = path.with_name(path.name + TEMPFILE_SUFFIX)
+    try:
+        with tmpPath.open('w') as fp:
+            saveToStream(fp, apiTopObject)
+        os.replace(tmpPath, path)
+
+    except Exception:
+        with suppress(OSError):
+            tmpPath.unlink()
+        raise
+
+
+def _linkOrCopyFile(sourcePath, targetPath):
+    """Hard-link targetPath to sourcePath; copy if hard-links are not supported
+    """
+    try:
+        os.link(sourcePath, targetPath)
+    except OSError:
+        shutil.copy2(sourcePath, targetPath)
+
+
+def _snapshotDirectory(sourcePath, targetPath):
+    """Make a snapshot of the directory tree sourcePath as targetPath, using hard-links for the files
+    """
+    shutil.copytree(str(sourcePath), str(targetPath), symlinks=True, copy_function=_linkOrCopyFile)
+
+
 # @debug3Enter()
 def loadFromStream(stream, topObjId=None, topObject=None, partialLoad=False):
     """ Wrapper function, to handle garbage collection for Xml import.
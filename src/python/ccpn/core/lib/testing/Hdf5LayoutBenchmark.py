@@ -0,0 +1,131 @@
+"""
+Benchmark of the plane and slice read latency of Hdf5SpectrumDataSource files for the different
+chunk layouts and compression modes (see SpectrumDataSources/lib/Hdf5Chunking)
+
+Usage:
+    python Hdf5LayoutBenchmark.py [xPoints yPoints zPoints]
+
+For every (layout, compression) combination, a synthetic 3D file is written in a temporary
+directory, after which random xy-, xz- and yz-planes and x-, y- and z-slices are read
+(with a fresh chunk cache) and the mean latencies are reported in ms.
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import sys
+import random
+import tempfile
+from time import perf_counter
+
+import numpy
+
+from ccpn.util.Path import aPath
+from ccpn.core.lib.SpectrumDataSources.Hdf5SpectrumDataSource import Hdf5SpectrumDataSource
+from ccpn.core.lib.SpectrumDataSources.lib.Hdf5Chunking import CHUNK_LAYOUTS, COMPRESSION_LZF, \
+    COMPRESSION_BLOSC_LZ4, hasHdf5Plugin
+
+
+PLANES = ((1, 2), (1, 3), (2, 3))
+SLICES = (1, 2, 3)
+
+
+def _makeFile(path, pointCounts, chunkLayout, compressionMode):
+    """Write a 3D file with random data; return the file size in bytes
+    """
+    dataSource = Hdf5SpectrumDataSource(dimensionCount=3)
+    dataSource.pointCounts = pointCounts
+    dataSource.setStorageLayout(chunkLayout=chunkLayout, compressionMode=compressionMode)
+
+    xCount, yCount, zCount = pointCounts
+    with dataSource.openNewFile(path=path) as ds:
+        for z in range(1, zCount + 1):
+            data = numpy.random.standard_normal((yCount, xCount)).astype(numpy.float32)
+            ds.setPlaneData(data, position=[1, 1, z], xDim=1, yDim=2)
+    return aPath(path).stat().st_size
+
+
+def _timeReads(path, pointCounts, repeats):
+    """:return dict with the mean latencies (ms) of plane and slice reads
+    """
+    result = {}
+    for xDim, yDim in PLANES:
+        dataSource = Hdf5SpectrumDataSource(path=path)  # fresh chunk cache
+        times = []
+        for _ in range(repeats):
+            position = [random.randint(1, p) for p in pointCounts]
+            tStart = perf_counter()
+            dataSource.getPlaneData(position=position, xDim=xDim, yDim=yDim)
+            times.append(perf_counter() - tStart)
+        dataSource.closeFile()
+        result['plane%d%d' % (xDim, yDim)] = 1000.0 * sum(times) / repeats
+
+    for sliceDim in SLICES:
+        dataSource = Hdf5SpectrumDataSource(path=path)
+        times = []
+        for _ in range(repeats):
+            position = [random.randint(1, p) for p in pointCounts]
+            tStart = perf_counter()
+            dataSource.getSliceData(position=position, sliceDim=sliceDim)
+            times.append(perf_counter() - tStart)
+        dataSource.closeFile()
+        result['slice%d' % sliceDim] = 1000.0 * sum(times) / repeats
+
+    return result
+
+
+def runBenchmark(pointCounts=(1024, 256, 128), layouts=CHUNK_LAYOUTS, compressionModes=None, repeats=20,
+                 output=sys.stdout):
+    """Run the benchmark for all (layout, compressionMode) combinations
+    :return list of (layout, compressionMode, fileSize, latencies-dict) tuples
+    """
+    if compressionModes is None:
+        compressionModes = [None, COMPRESSION_LZF]
+        if hasHdf5Plugin():
+            compressionModes.append(COMPRESSION_BLOSC_LZ4)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='hdf5Benchmark_') as tmpDir:
+        for layout in layouts:
+            for compressionMode in compressionModes:
+                path = aPath(tmpDir) / ('%s_%s.hdf5' % (layout, compressionMode))
+                fileSize = _makeFile(path, pointCounts, layout, compressionMode)
+                latencies = _timeReads(path, pointCounts, repeats)
+                results.append((layout, compressionMode, fileSize, latencies))
+
+    if output is not None:
+        keys = ['plane%d%d' % p for p in PLANES] + ['slice%d' % s for s in SLICES]
+        output.write('pointCounts: %s; mean latencies in ms over %d reads\n' % (tuple(pointCounts), repeats))
+        output.write('%-8s %-10s %9s ' % ('layout', 'codec', 'size(MB)') + ' '.join('%9s' % k for k in keys) + '\n')
+        for layout, compressionMode, fileSize, latencies in results:
+            output.write('%-8s %-10s %9.1f ' % (layout, compressionMode, fileSize / 1024 / 1024) +
+                         ' '.join('%9.2f' % latencies[k] for k in keys) + '\n')
+
+    return results
+
+
+if __name__ == '__main__':
+    _pointCounts = tuple(int(p) for p in sys.argv[1:4]) if len(sys.argv) >= 4 else (1024, 256, 128)
+    runBenchmark(pointCounts=_pointCounts)
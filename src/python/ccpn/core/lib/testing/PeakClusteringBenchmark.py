@@ -0,0 +1,138 @@
+"""
+Benchmark of the peak clusterers (see core/lib/PeakClustering) for correctness and speed
+
+Usage:
+    python PeakClusteringBenchmark.py [peakCount ...]
+
+For every peakCount, random 2D peak positions are clustered by the DFS and KD-tree clusterers and
+the timings (in s) reported. The clusters are compared with the connected components of the full
+(all pairs) adjacency graph. NB: the DFS clusterer only follows adjacent pairs in the order of the
+peaks, and hence may split a connected component into several clusters.
+The DFS clusterer and the reference are skipped for peakCounts above MAX_DFS_PEAKS, as these are
+quadratic (or worse) in the number of peaks.
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import sys
+from time import perf_counter
+
+import numpy
+
+from ccpn.core.lib.PeakClustering import DFSPeakClusterer, KDTreePeakClusterer
+
+
+MAX_DFS_PEAKS = 2000
+TOLERANCES = (8, 8)
+
+
+class _Spectrum(object):
+    dimensionCount = len(TOLERANCES)
+
+
+class _Peak(object):
+    """Minimal stand-in for a core Peak, as required by the clusterers
+    """
+    spectrum = _Spectrum()
+
+    def __init__(self, pointPositions):
+        self.pointPositions = tuple(pointPositions)
+
+    def __repr__(self):
+        return '<_Peak %r>' % (self.pointPositions,)
+
+
+def makePeaks(peakCount, pointCounts=(2048, 512), seed=None):
+    """:return a list of peakCount _Peak instances at random (integer) positions within pointCounts
+    """
+    rng = numpy.random.default_rng(seed)
+    positions = set()
+    while len(positions) < peakCount:
+        positions.add(tuple(int(rng.integers(1, p + 1)) for p in pointCounts))
+    return [_Peak(pos) for pos in positions]
+
+
+def _asSets(clusters):
+    return sorted(sorted(pk.pointPositions for pk in cluster) for cluster in clusters)
+
+
+def referenceClusters(peaks, tolerances=TOLERANCES):
+    """:return the clusters of peaks as the connected components of the all-pairs adjacency graph
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    positions = numpy.array([pk.pointPositions for pk in peaks], dtype=float)
+    deltas = numpy.abs(positions[:, None, :] - positions[None, :, :])
+    adjacency = numpy.all(deltas < numpy.array(tolerances, dtype=float), axis=-1)
+    _count, labels = connected_components(adjacency, directed=False)
+
+    clusters = {}
+    for peak, label in zip(peaks, labels):
+        clusters.setdefault(label, []).append(peak)
+    return tuple(tuple(cluster) for cluster in clusters.values())
+
+
+def runBenchmark(peakCounts=(500, 1000, 2000, 20000), output=sys.stdout):
+    """Run the benchmark for all peakCounts
+    :return list of (peakCount, dfsTime, kdTreeTime, dfsCorrect, kdTreeCorrect) tuples;
+            dfsTime, dfsCorrect, kdTreeCorrect are None if skipped
+    """
+    results = []
+    for peakCount in peakCounts:
+        peaks = makePeaks(peakCount, seed=peakCount)
+
+        tStart = perf_counter()
+        kdClusters = KDTreePeakClusterer(peaks, TOLERANCES).findClusters()
+        kdTime = perf_counter() - tStart
+
+        dfsTime = dfsCorrect = kdCorrect = None
+        if peakCount <= MAX_DFS_PEAKS:
+            tStart = perf_counter()
+            dfsClusters = DFSPeakClusterer(peaks, TOLERANCES).findClusters()
+            dfsTime = perf_counter() - tStart
+
+            reference = _asSets(referenceClusters(peaks))
+            dfsCorrect = _asSets(dfsClusters) == reference
+            kdCorrect = _asSets(kdClusters) == reference
+
+        results.append((peakCount, dfsTime, kdTime, dfsCorrect, kdCorrect))
+
+    if output is not None:
+        def _fmt(value, fmt):
+            return '-' if value is None else fmt % value
+
+        output.write('tolerances: %s points; correct: identical to the connected components\n' % (TOLERANCES,))
+        output.write('%8s %10s %10s %12s %12s\n' % ('peaks', 'DFS(s)', 'KDTree(s)', 'DFS correct', 'KDTree correct'))
+        for peakCount, dfsTime, kdTime, dfsCorrect, kdCorrect in results:
+            output.write('%8d %10s %10.4f %12s %12s\n' % (peakCount, _fmt(dfsTime, '%.4f'), kdTime,
+                                                          _fmt(dfsCorrect, '%s'), _fmt(kdCorrect, '%s')))
+    return results
+
+
+if __name__ == '__main__':
+    _peakCounts = tuple(int(p) for p in sys.argv[1:]) or (500, 1000, 2000, 20000)
+    runBenchmark(peakCounts=_peakCounts)
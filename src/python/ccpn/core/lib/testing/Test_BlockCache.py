@@ -0,0 +1,122 @@
+"""Test the process-wide LRU block cache of the SpectrumDataSources
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import numpy
+import unittest
+
+from ccpn.core.lib.SpectrumDataSources.lib.BlockCache import BlockCache, newBlockCacheId, getBlockCache, \
+    DEFAULT_BLOCK_CACHE_SIZE
+from ccpn.util.decorators import singleton
+
+
+class BlockCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = BlockCache()
+        self.cache.clear()
+        self._oldMaxBytes = self.cache.maxBytes
+        # room for exactly four blocks of 1024 float32's
+        self.block = numpy.zeros(1024, dtype=numpy.float32)
+        self.cache.resize(4 * self.block.nbytes)
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache.resize(self._oldMaxBytes)
+
+    def test_singleton(self):
+        self.assertIs(self.cache, BlockCache())
+
+    def test_lruEviction(self):
+        sId = newBlockCacheId()
+        for idx in range(4):
+            self.cache.add((sId, idx), self.block.copy())
+        # touch block 0, so that block 1 becomes the least-recently used
+        self.assertIsNotNone(self.cache.get((sId, 0)))
+        self.cache.add((sId, 4), self.block.copy())
+
+        self.assertTrue(self.cache.hasItem((sId, 0)))
+        self.assertFalse(self.cache.hasItem((sId, 1)))
+        self.assertEqual(len(self.cache), 4)
+        self.assertEqual(self.cache.nBytes, 4 * self.block.nbytes)
+
+    def test_budgetSharedBetweenSources(self):
+        sId1 = newBlockCacheId()
+        sId2 = newBlockCacheId()
+        for idx in range(4):
+            self.cache.add((sId1, idx), self.block.copy())
+        for idx in range(2):
+            self.cache.add((sId2, idx), self.block.copy())
+
+        self.assertEqual(self.cache.getStatistics(sId1).items, 2)
+        self.assertEqual(self.cache.getStatistics(sId2).items, 2)
+
+        self.cache.clear(sId1)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.getStatistics(sId1).nBytes, 0)
+
+    def test_statistics(self):
+        sId = newBlockCacheId()
+        self.assertIsNone(self.cache.get((sId, 0)))
+        self.cache.add((sId, 0), self.block.copy())
+        self.assertIsNotNone(self.cache.get((sId, 0)))
+        self.assertIsNotNone(self.cache.get((sId, 0)))
+
+        stats = self.cache.getStatistics(sId)
+        self.assertEqual((stats.hits, stats.misses), (2, 1))
+        self.assertAlmostEqual(stats.hitRatio, 2.0 / 3.0)
+
+    def test_disabled(self):
+        sId = newBlockCacheId()
+        self.cache.resize(0)
+        self.cache.add((sId, 0), self.block.copy())
+        self.assertEqual(len(self.cache), 0)
+
+    def test_removeStatistics(self):
+        sId = newBlockCacheId()
+        self.cache.add((sId, 0), self.block.copy())
+        self.cache.removeStatistics(sId)
+        self.assertEqual(len(self.cache), 0)
+        self.assertNotIn(sId, self.cache._statistics)
+
+
+class GetBlockCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # remove the existing singleton instance, to mimic a fresh process
+        self._oldCache = singleton._instances.pop(BlockCache, None) if hasattr(singleton, '_instances') else None
+
+    def tearDown(self):
+        if self._oldCache is not None:
+            singleton._instances[BlockCache] = self._oldCache
+
+    def test_getBlockCache(self):
+        cache = getBlockCache()
+        self.assertIsInstance(cache, BlockCache)
+        self.assertEqual(cache.maxBytes, DEFAULT_BLOCK_CACHE_SIZE)
+        self.assertIs(cache, getBlockCache())
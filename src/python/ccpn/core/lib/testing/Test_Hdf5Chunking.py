@@ -0,0 +1,71 @@
+"""Test the chunk-layout policies of the Hdf5SpectrumDataSource
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+
+from ccpn.core.lib.SpectrumDataSources.lib.Hdf5Chunking import getChunkShape, getChunkCacheSize, \
+    getCompressionKwds, CHUNK_LAYOUT_AUTO, CHUNK_LAYOUT_PLANE, CHUNK_LAYOUT_SLICE, CHUNK_LAYOUT_CUBE, \
+    MIN_CHUNK_CACHE_BYTES, KB
+
+
+class Hdf5ChunkingTest(unittest.TestCase):
+
+    pointCounts = (1024, 256, 128)
+
+    def test_auto(self):
+        self.assertIs(getChunkShape(self.pointCounts, CHUNK_LAYOUT_AUTO), True)
+
+    def test_plane(self):
+        self.assertEqual(getChunkShape((128, 64, 32), CHUNK_LAYOUT_PLANE, chunkBytes=64 * KB), (128, 64, 1))
+        chunks = getChunkShape(self.pointCounts, CHUNK_LAYOUT_PLANE, chunkBytes=64 * KB)
+        self.assertEqual(chunks, (128, 128, 1))
+
+    def test_slice(self):
+        self.assertEqual(getChunkShape(self.pointCounts, CHUNK_LAYOUT_SLICE, chunkBytes=64 * KB), (1024, 1, 1))
+        self.assertEqual(getChunkShape(self.pointCounts, CHUNK_LAYOUT_SLICE, chunkBytes=1 * KB), (256, 1, 1))
+
+    def test_cube(self):
+        self.assertEqual(getChunkShape(self.pointCounts, CHUNK_LAYOUT_CUBE, chunkBytes=128 * KB), (32, 32, 32))
+        # small dimensions are taken whole
+        self.assertEqual(getChunkShape((1024, 1024, 4), CHUNK_LAYOUT_CUBE, chunkBytes=64 * KB), (64, 64, 4))
+
+    def test_invalidLayout(self):
+        with self.assertRaises(ValueError):
+            getChunkShape(self.pointCounts, 'diagonal')
+
+    def test_chunkCacheSize(self):
+        # largest plane (x,y) covers 32 x 8 chunks of 128KB each
+        self.assertEqual(getChunkCacheSize(self.pointCounts, (32, 32, 32)), 32 * 8 * 128 * KB)
+        self.assertEqual(getChunkCacheSize((16, 16), (16, 16)), MIN_CHUNK_CACHE_BYTES)
+
+    def test_compression(self):
+        self.assertEqual(getCompressionKwds(None), {})
+        self.assertEqual(getCompressionKwds('lzf'), dict(compression='lzf', shuffle=True))
+        with self.assertRaises(ValueError):
+            getCompressionKwds('zip')
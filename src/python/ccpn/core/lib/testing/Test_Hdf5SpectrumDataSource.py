@@ -0,0 +1,152 @@
+"""Test the optimisation (rewriting) of Hdf5SpectrumDataSource files
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import tempfile
+import unittest
+
+import numpy
+
+from ccpn.util.Path import aPath
+from ccpn.core.lib.SpectrumDataSources.Hdf5SpectrumDataSource import Hdf5SpectrumDataSource, \
+    HDF5_BUFFER_INCOMPLETE
+from ccpn.core.lib.SpectrumDataSources.SpectrumDataSourceABC import SpectrumDataSourceABC
+from ccpn.core.lib.SpectrumDataSources.lib.Hdf5Chunking import CHUNK_LAYOUT_PLANE
+
+
+class Hdf5OptimiseTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpDir = tempfile.TemporaryDirectory(prefix='hdf5Optimise_')
+        self.path = aPath(self._tmpDir.name) / 'optimise.hdf5'
+
+    def tearDown(self):
+        self._tmpDir.cleanup()
+
+    def test_optimiseWhileWriting(self):
+        """optimise() on a file that is still open for writing
+        """
+        dataSource = Hdf5SpectrumDataSource(dimensionCount=2)
+        dataSource.pointCounts = (64, 32)
+        data = numpy.random.standard_normal((32, 64)).astype(numpy.float32)
+
+        dataSource.setPath(self.path, checkSuffix=True)
+        dataSource.openFile(mode=dataSource.defaultOpenWriteMode)
+        dataSource.setPlaneData(data, position=[1, 1], xDim=1, yDim=2)
+        dataSource.optimise(chunkLayout=CHUNK_LAYOUT_PLANE)
+
+        self.assertTrue(dataSource.hasOpenFile())
+        self.assertTrue(numpy.allclose(dataSource.getPlaneData(position=[1, 1], xDim=1, yDim=2), data))
+        dataSource.closeFile()
+
+
+class _Source():
+    """Minimal source of a persistent hdf5 buffer
+    """
+    _getBufferSignaturePath = staticmethod(SpectrumDataSourceABC._getBufferSignaturePath)
+    _findPersistentHdf5Buffer = SpectrumDataSourceABC._findPersistentHdf5Buffer
+
+    def __init__(self, path, mtime=1):
+        self.path = aPath(path)
+        self.mtime = mtime
+
+    def _getBufferSignature(self):
+        return 'NmrPipe;%s;(8,);32;%d' % (self.path, self.mtime)
+
+
+class PersistentHdf5BufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpDir = tempfile.TemporaryDirectory(prefix='hdf5Buffer_')
+        self.dir = aPath(self._tmpDir.name)
+        self.bufferPath = self.dir / 'spec.hdf5'
+        self.source = _Source(self.dir / 'spec.ft2')
+
+    def tearDown(self):
+        self._tmpDir.cleanup()
+
+    @staticmethod
+    def _makeBuffer(path, signature):
+        buffer = Hdf5SpectrumDataSource(dimensionCount=1)
+        buffer.pointCounts = (8,)
+        buffer.setPath(path, checkSuffix=True)
+        buffer.openFile(mode=buffer.defaultOpenWriteMode, overwrite=True)
+        if signature is not None:
+            buffer._writeBufferSignature(signature)
+        buffer.closeFile()
+
+    def _find(self, probeVersions=True):
+        path, buffer = self.source._findPersistentHdf5Buffer(self.bufferPath, probeVersions=probeVersions)
+        if buffer is not None:
+            buffer.closeFile()
+        return path, buffer
+
+    def test_signaturePath(self):
+        self.assertEqual(_Source._getBufferSignaturePath(self.source._getBufferSignature()),
+                         str(self.source.path))
+        self.assertEqual(_Source._getBufferSignaturePath('Bruker;/a;b/c;(8,);32;1'), '/a;b/c')
+        self.assertIsNone(_Source._getBufferSignaturePath(HDF5_BUFFER_INCOMPLETE))
+        self.assertIsNone(_Source._getBufferSignaturePath(None))
+
+    def test_newBuffer(self):
+        self.assertEqual(self._find(), (self.bufferPath, None))
+
+    def test_reuseBuffer(self):
+        self._makeBuffer(self.bufferPath, self.source._getBufferSignature())
+        path, buffer = self._find()
+        self.assertEqual(path, self.bufferPath)
+        self.assertIsNotNone(buffer)
+
+    def test_overwriteOwnBuffer(self):
+        """An incomplete buffer, or a stale buffer of the same source, is overwritten
+        """
+        self._makeBuffer(self.bufferPath, HDF5_BUFFER_INCOMPLETE)
+        self.assertEqual(self._find(), (self.bufferPath, None))
+
+        self._makeBuffer(self.bufferPath, _Source(self.source.path, mtime=0)._getBufferSignature())
+        self.assertEqual(self._find(), (self.bufferPath, None))
+
+    def test_skipOtherBuffers(self):
+        """A file that is not a buffer, or the buffer of another source with the same stem, is retained
+        """
+        otherSource = _Source(self.dir / 'spec.ucsf')
+        self._makeBuffer(self.bufferPath, otherSource._getBufferSignature())
+        self._makeBuffer(self.bufferPath.incrementVersion(), None)
+
+        path, buffer = self._find()
+        self.assertEqual(path, self.bufferPath.incrementVersion().incrementVersion())
+        self.assertIsNone(buffer)
+
+        # the buffer of the other source is still found
+        path, buffer = otherSource._findPersistentHdf5Buffer(self.bufferPath)
+        self.assertEqual(path, self.bufferPath)
+        self.assertIsNotNone(buffer)
+        buffer.closeFile()
+
+        # an explicit path is always used
+        self.assertEqual(self._find(probeVersions=False), (self.bufferPath, None))
@@ -0,0 +1,66 @@
+"""Test the peak clusterers
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import unittest
+
+from ccpn.core.lib.PeakClustering import DFSPeakClusterer, KDTreePeakClusterer
+from ccpn.core.lib.testing.PeakClusteringBenchmark import makePeaks, referenceClusters, _Peak, TOLERANCES
+
+
+def _asSets(clusters):
+    return sorted(sorted(pk.pointPositions for pk in cluster) for cluster in clusters)
+
+
+class PeakClusteringTest(unittest.TestCase):
+
+    def test_connectedComponents(self):
+        peaks = makePeaks(400, pointCounts=(256, 128), seed=1)
+        kdClusters = KDTreePeakClusterer(peaks, TOLERANCES).findClusters()
+        self.assertEqual(_asSets(kdClusters), _asSets(referenceClusters(peaks)))
+
+    def test_refinesDFS(self):
+        # every DFS cluster is part of a single KD-tree cluster
+        peaks = makePeaks(400, pointCounts=(256, 128), seed=2)
+        kdClusters = KDTreePeakClusterer(peaks, TOLERANCES).findClusters()
+        clusterIds = {peak: ii for ii, cluster in enumerate(kdClusters) for peak in cluster}
+        for cluster in DFSPeakClusterer(peaks, TOLERANCES).findClusters():
+            self.assertEqual(len({clusterIds[peak] for peak in cluster}), 1)
+
+    def test_tolerances(self):
+        # adjacency requires a difference strictly smaller than the tolerance along all dimensions
+        peaks = [_Peak((10, 10)), _Peak((17, 10)), _Peak((25, 10)), _Peak((17, 30))]
+        clusters = KDTreePeakClusterer(peaks, TOLERANCES).findClusters()
+        self.assertEqual(clusters, ((peaks[0], peaks[1]), (peaks[2],), (peaks[3],)))
+
+    def test_chain(self):
+        # transitively adjacent peaks form one cluster; undefined positions a cluster of their own
+        peaks = [_Peak((0, 0)), _Peak((50, 0)), _Peak((7, 0)), _Peak((14, 0)), _Peak((None, 3))]
+        clusters = KDTreePeakClusterer(peaks, TOLERANCES).findClusters()
+        self.assertEqual(clusters, ((peaks[0], peaks[2], peaks[3]), (peaks[1],), (peaks[4],)))
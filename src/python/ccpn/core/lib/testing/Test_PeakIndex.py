@@ -0,0 +1,173 @@
+"""Test the grid hash of the PeakList spatial index
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import random
+import unittest
+from unittest import mock
+
+from ccpn.core.lib.PeakIndex import GridHash, PeakIndex
+
+
+class GridHashTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        self.positions = {ii: (random.uniform(0.0, 10.0), random.uniform(100.0, 130.0)) for ii in range(2000)}
+        self.grid = GridHash(cellSizes=(0.05, 0.5))
+        for item, position in self.positions.items():
+            self.grid.add(item, position)
+
+    def _bruteForce(self, position, tolerances):
+        return sorted(item for item, pos in self.positions.items()
+                      if all(abs(p - q) <= t for p, q, t in zip(pos, position, tolerances)))
+
+    def test_itemsNear(self):
+        for tolerances in ((0.02, 0.2), (0.5, 5.0), (20.0, 100.0)):
+            for item in (0, 17, 1999):
+                position = self.positions[item]
+                found = sorted(self.grid.itemsNear(position, tolerances))
+                self.assertEqual(found, self._bruteForce(position, tolerances))
+                self.assertIn(item, found)
+
+    def test_itemsInBox(self):
+        found = sorted(self.grid.itemsInBox((2.0, 110.0), (3.0, 112.0)))
+        expected = sorted(item for item, (x, y) in self.positions.items() if 2.0 <= x <= 3.0 and 110.0 <= y <= 112.0)
+        self.assertEqual(found, expected)
+
+    def test_update(self):
+        self.grid.add(0, (50.0, 50.0))  # move
+        self.assertEqual(self.grid.itemsNear((50.0, 50.0), (0.01, 0.01)), [0])
+        self.assertEqual(len(self.grid), 2000)
+        self.grid.remove(0)
+        self.grid.remove(0)  # ignored
+        self.assertEqual(self.grid.itemsNear((50.0, 50.0), (0.01, 0.01)), [])
+        self.assertEqual(len(self.grid), 1999)
+
+
+class _Peak():
+    """Minimal peak; ppm = 0.01 * points, as for a spectrum with a fixed referencing
+    """
+
+    def __init__(self, pointPositions, ppmPerPoint=0.01):
+        self.pointPositions = tuple(pointPositions)
+        self.ppmPerPoint = ppmPerPoint
+        self.isDeleted = False
+
+    @property
+    def ppmPositions(self):
+        return tuple(None if p is None else p * self.ppmPerPoint for p in self.pointPositions)
+
+
+class _Spectrum():
+    dimensionCount = 2
+    assignmentTolerances = (0.02, 0.05)
+
+
+class _PeakList():
+
+    def __init__(self, peaks):
+        self.spectrum = _Spectrum()
+        self.peaks = list(peaks)
+
+
+class PeakIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)
+        peaks = [_Peak((random.uniform(1.0, 1000.0), random.uniform(1.0, 500.0))) for _ii in range(1500)]
+        peaks.append(_Peak((None, 10.0)))
+        self.peakList = _PeakList(peaks)
+        self.index = PeakIndex(self.peakList)
+
+    def _peaksNear(self, ppmPositions, tolerances):
+        return {pk for pk in self.peakList.peaks if None not in pk.ppmPositions and
+                all(abs(p - q) <= t for p, q, t in zip(pk.ppmPositions, ppmPositions, tolerances))}
+
+    def _checkQueries(self):
+        index = self.index
+        for peak in self.peakList.peaks[:1500:150]:
+            self.assertEqual(set(index.peaksNear(peak.ppmPositions, (0.02, 0.05))),
+                             self._peaksNear(peak.ppmPositions, (0.02, 0.05)))
+            self.assertIn(peak, index.peaksAtPoint(peak.pointPositions))
+            self.assertEqual(set(index.peaksAtPoint(peak.pointPositions)),
+                             {pk for pk in self.peakList.peaks if None not in pk.pointPositions and
+                              tuple(int(p) for p in pk.pointPositions) ==
+                              tuple(int(p) for p in peak.pointPositions)})
+            self.assertEqual(set(index.peaksNearPoint(peak.pointPositions, (3.0, 3.0))),
+                             {pk for pk in self.peakList.peaks if None not in pk.pointPositions and
+                              all(abs(p - q) <= 3.0 for p, q in zip(pk.pointPositions, peak.pointPositions))})
+
+        region = ((5.0, 2.0), (1.0, 3.0))
+        self.assertEqual(set(index.peaksInRegion(region)),
+                         {pk for pk in self.peakList.peaks if None not in pk.ppmPositions and
+                          2.0 <= pk.ppmPositions[0] <= 5.0 and 1.0 <= pk.ppmPositions[1] <= 3.0})
+
+    def test_queries(self):
+        self.assertEqual(len(self.index), len(self.peakList.peaks))
+        self._checkQueries()
+
+    def test_updatePeak(self):
+        """create, delete and move are applied incrementally, without a rebuild
+        """
+        peaks = self.peakList.peaks
+        with mock.patch.object(self.index, 'rebuild', side_effect=AssertionError('rebuild')):
+            newPeak = _Peak((400.5, 200.5))
+            peaks.append(newPeak)
+            self.index.updatePeak(newPeak, 'create')
+            self.assertIn(newPeak, self.index.peaksAtPoint((400, 200)))
+
+            deleted = peaks.pop(3)
+            deleted.isDeleted = True
+            self.index.updatePeak(deleted, 'delete')
+            self.assertNotIn(deleted, self.index.peaksNear(deleted.ppmPositions, (0.01, 0.01)))
+
+            moved = peaks[7]
+            oldPosition = moved.pointPositions
+            moved.pointPositions = (oldPosition[0] + 250.0, oldPosition[1] - 0.5)
+            self.index.updatePeak(moved, 'change')
+            self.assertNotIn(moved, self.index.peaksAtPoint(oldPosition))
+            self.assertIn(moved, self.index.peaksNear(moved.ppmPositions, (0.001, 0.001)))
+
+            # same number of peaks, but moved; still found
+            self.assertEqual(len(self.index), len(peaks))
+            self._checkQueries()
+
+    def test_invalidate(self):
+        """a change of referencing moves all peaks; the index is rebuilt on the next query only
+        """
+        for peak in self.peakList.peaks:
+            peak.ppmPerPoint = 0.02
+
+        with mock.patch.object(self.index, 'rebuild', wraps=self.index.rebuild) as rebuild:
+            self.index.invalidate()
+            rebuild.assert_not_called()
+            self._checkQueries()
+            self._checkQueries()
+            rebuild.assert_called_once()
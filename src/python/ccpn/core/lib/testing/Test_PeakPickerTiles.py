@@ -0,0 +1,224 @@
+"""
+Tests for the tiled picking of peaks in large regions (PeakPickerABC)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import sys
+import unittest
+from unittest import mock
+from contextlib import contextmanager
+from threading import RLock
+import numpy as np
+
+from ccpn.core.lib import ContextManagers
+from ccpn.core.lib.PeakPickers.PeakPickerABC import PeakPickerABC, SimplePeak
+from ccpn.util.AttrDict import AttrDict
+
+
+POINTCOUNTS = (80, 64)  # x, y
+THRESHOLD = 0.1
+
+
+def _makeData():
+    """:return a y,x ordered plane with a grid of gaussian peaks, some on the tile boundaries
+    """
+    y, x = np.mgrid[0:POINTCOUNTS[1], 0:POINTCOUNTS[0]]
+    data = np.zeros((POINTCOUNTS[1], POINTCOUNTS[0]), dtype=np.float32)
+    for ii, (yPos, xPos) in enumerate([(5, 7), (10, 35), (10, 40), (31, 20), (32, 60), (50, 10),
+                                       (47, 45), (58, 70), (20, 78), (62, 30)]):
+        data += (1.0 + ii / 10.0) * np.exp(-((x - xPos) ** 2 + (y - yPos) ** 2) / 4.0)
+    # a negative peak
+    data -= 0.8 * np.exp(-((x - 25) ** 2 + (y - 16) ** 2) / 4.0)
+    return data
+
+
+class _DataSource():
+
+    def __init__(self, data):
+        self._readLock = RLock()
+        self.data = data
+        self.reads = []
+
+    def getRegionData(self, sliceTuples, aliasingFlags=None):
+        if not self._readLock._is_owned():
+            raise RuntimeError('data-source read without holding _readLock')
+        self.reads.append(tuple(sliceTuples))
+        (xStart, xStop), (yStart, yStop) = sliceTuples
+        return self.data[yStart - 1:yStop, xStart - 1:xStop]
+
+
+class _Spectrum():
+    pid = 'SP:test'
+    dimensionCount = 2
+    scale = 2.0
+
+    def __init__(self, data):
+        self.dataSource = _DataSource(data)
+
+
+class _PeakPicker(PeakPickerABC):
+    """Picks the points that exceed the thresholds and their eight neighbours
+    """
+    peakPickerType = '_TestTiles'
+
+    def findPeaks(self, data) -> list:
+        peaks = []
+        for sign, threshold in ((1.0, self.positiveThreshold), (-1.0, self.negativeThreshold)):
+            values = sign * data
+            centre = values[1:-1, 1:-1]
+            isMax = centre > sign * threshold
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if dy or dx:
+                        isMax &= centre > values[1 + dy:values.shape[0] - 1 + dy, 1 + dx:values.shape[1] - 1 + dx]
+            for yy, xx in zip(*np.nonzero(isMax)):
+                peaks.append(SimplePeak(points=(yy + 1, xx + 1), height=float(data[yy + 1, xx + 1])))
+        return peaks
+
+
+class _Progress():
+    """progressHandler stand-in; cancels after cancelAfter tiles
+    """
+
+    def __init__(self, cancelAfter=None):
+        self.cancelAfter = cancelAfter
+        self.value = 0
+
+    def setValue(self, value):
+        self.value = value
+
+    def increment(self, value):
+        self.value += value
+
+    def checkCancel(self):
+        if self.cancelAfter is not None and self.value >= self.cancelAfter:
+            raise StopIteration
+
+
+class PeakPickerTilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.spectrum = _Spectrum(_makeData())
+        with mock.patch.dict(sys.modules, {'ccpn.core.Spectrum': AttrDict(Spectrum=_Spectrum)}):
+            self.picker = _PeakPicker(self.spectrum)
+        self.picker.positiveThreshold = THRESHOLD
+        self.picker.negativeThreshold = -THRESHOLD
+        self.sliceTuples = [(1, POINTCOUNTS[0]), (1, POINTCOUNTS[1])]
+        self.progress = None
+
+    @contextmanager
+    def _progressHandler(self, *args, **kwds):
+        try:
+            yield self.progress
+        except StopIteration:
+            # cancelled
+            pass
+
+    def _pickTiled(self, maxTilePoints=400):
+        self.picker.maxTilePoints = maxTilePoints
+        self.picker.sliceTuples = self.sliceTuples
+        with mock.patch.object(ContextManagers, 'progressHandler', self._progressHandler):
+            return self.picker._findPeaksTiled()
+
+    def _pickUntiled(self):
+        self.picker.sliceTuples = self.sliceTuples
+        with self.spectrum.dataSource._readLock:
+            data = self.spectrum.dataSource.getRegionData(self.sliceTuples)
+        return self.picker.findPeaks(data * self.spectrum.scale)
+
+    @staticmethod
+    def _asDict(peaks):
+        return {tuple(pk.points): pk.height for pk in peaks}
+
+    def test_getTiles(self):
+        self.picker.maxTilePoints = 400
+        tiles = self.picker._getTiles(self.sliceTuples, overlap=1)
+        self.assertGreater(len(tiles), 1)
+
+        # the cores partition the region; the tiles do not exceed maxTilePoints
+        covered = np.zeros((POINTCOUNTS[1], POINTCOUNTS[0]), dtype=int)
+        for coreTuples, readTuples in tiles:
+            (xStart, xStop), (yStart, yStop) = coreTuples
+            covered[yStart - 1:yStop, xStart - 1:xStop] += 1
+            self.assertLessEqual(np.prod([stop - start + 1 for start, stop in readTuples]), 400)
+            for (cStart, cStop), (rStart, rStop), (start, stop) in zip(coreTuples, readTuples, self.sliceTuples):
+                self.assertEqual((rStart, rStop), (max(start, cStart - 1), min(stop, cStop + 1)))
+        self.assertTrue(np.all(covered == 1))
+
+        self.assertTrue(self.picker._useTiles(self.sliceTuples))
+        self.picker.maxTilePoints = POINTCOUNTS[0] * POINTCOUNTS[1]
+        self.assertFalse(self.picker._useTiles(self.sliceTuples))
+
+    def test_tiledEqualsUntiled(self):
+        untiled = self._asDict(self._pickUntiled())
+        # all the peaks, including the negative one
+        self.assertEqual(len(untiled), 11)
+
+        for maxTilePoints in (400, 1000, 2500):
+            self.progress = _Progress()
+            tiled = self._asDict(self._pickTiled(maxTilePoints))
+            self.assertEqual(tiled, untiled, msg=f'maxTilePoints = {maxTilePoints}')
+            self.assertIsNone(self.picker._tileCheckpoint)
+            self.assertEqual(self.picker.sliceTuples, self.sliceTuples)
+
+    def test_subRegion(self):
+        """Points are relative to the picked region
+        """
+        self.sliceTuples = [(11, 70), (4, 60)]
+        untiled = self._asDict(self._pickUntiled())
+        self.progress = _Progress()
+        self.assertEqual(self._asDict(self._pickTiled()), untiled)
+
+    def test_cancelResume(self):
+        untiled = self._asDict(self._pickUntiled())
+        self.picker.maxTilePoints = 400
+        tileCount = len(self.picker._getTiles(self.sliceTuples, overlap=1))
+
+        # cancelled half-way; the picked tiles are retained
+        self.progress = _Progress(cancelAfter=tileCount // 2)
+        self.assertIsNone(self._pickTiled())
+        checkpoint = self.picker._tileCheckpoint
+        self.assertEqual(len(checkpoint['done']), tileCount // 2)
+        reads = len(self.spectrum.dataSource.reads)
+
+        # resuming only reads the remaining tiles
+        self.progress = _Progress()
+        self.assertEqual(self._asDict(self._pickTiled()), untiled)
+        self.assertEqual(self.progress.value, tileCount)
+        self.assertEqual(len(self.spectrum.dataSource.reads) - reads, tileCount - tileCount // 2)
+
+    def test_restart(self):
+        """A cancelled pick is not resumed for different thresholds
+        """
+        self.progress = _Progress(cancelAfter=3)
+        self.assertIsNone(self._pickTiled())
+
+        self.picker.positiveThreshold = 2.0
+        self.progress = _Progress()
+        peaks = self._asDict(self._pickTiled())
+        self.assertEqual(peaks, {points: height for points, height in self._asDict(self._pickUntiled()).items()
+                                 if height > 2.0 or height < -THRESHOLD})
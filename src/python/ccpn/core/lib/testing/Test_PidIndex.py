@@ -0,0 +1,84 @@
+"""Test the prefix index of the PidDict
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import unittest
+
+from ccpn.core.lib.PidIndex import PidDict, MAX_PENDING_IDS
+
+
+class PidDictTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dd = PidDict()
+        for chain in 'AB':
+            for seq in range(1, 13):
+                self.dd[f'{chain}.{seq}.ALA'] = (chain, seq)
+
+    def _scan(self, prefix):
+        return [key for key in self.dd if key.startswith(prefix)]
+
+    def test_prefix(self):
+        self.assertEqual(self.dd.getKeysByPrefix('A.1.'), ['A.1.ALA'])
+        self.assertEqual(self.dd.getKeysByPrefix('A.1'), self._scan('A.1'))
+        self.assertEqual(len(self.dd.getKeysByPrefix('B.')), 12)
+        self.assertEqual(self.dd.getKeysByPrefix('C.'), [])
+        self.assertEqual(self.dd.getValuesByPrefix('B.12.'), [('B', 12)])
+
+    def test_deleteAndRename(self):
+        del self.dd['A.1.ALA']
+        self.assertEqual(self.dd.getKeysByPrefix('A.1.'), [])
+
+        # rename; moves to the end of the insertion order
+        self.dd['A.1.GLY'] = self.dd.pop('A.10.ALA')
+        self.assertEqual(self.dd.getKeysByPrefix('A.1'), self._scan('A.1'))
+        self.assertEqual(self.dd.getKeysByPrefix('A.1')[-1], 'A.1.GLY')
+
+        # re-adding a removed id
+        self.dd['A.1.ALA'] = ('A', 1)
+        self.assertEqual(self.dd.getKeysByPrefix('A.1.'), ['A.1.GLY', 'A.1.ALA'])
+
+    def test_manyUpdates(self):
+        for ii in range(3 * MAX_PENDING_IDS):
+            self.dd[f'C.{ii}.'] = ii
+            if ii % 3:
+                del self.dd[f'C.{ii}.']
+            # interleaved lookups
+            self.assertEqual(self.dd.getKeysByPrefix(f'C.{ii}.'), self._scan(f'C.{ii}.'))
+
+        for prefix in ('C.1', 'C.', 'A.', ''):
+            self.assertEqual(self.dd.getKeysByPrefix(prefix), self._scan(prefix))
+
+    def test_dictMethods(self):
+        self.dd.setdefault('A.0.', 0)
+        self.dd.update({'A.00.': 1})
+        self.assertEqual(self.dd.getKeysByPrefix('A.0'), ['A.0.', 'A.00.'])
+        self.assertIsInstance(self.dd.copy(), PidDict)
+        self.dd.clear()
+        self.assertEqual(self.dd.getKeysByPrefix(''), [])
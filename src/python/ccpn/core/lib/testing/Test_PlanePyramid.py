@@ -0,0 +1,65 @@
+"""Test the decimation routines of the multi-resolution plane store
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import numpy
+import unittest
+
+from ccpn.core.lib.SpectrumDataSources.lib.PlanePyramid import decimate, maxAbsolute, getMaxFactor, \
+    getDecimationFactor
+
+
+class PlanePyramidTest(unittest.TestCase):
+
+    def test_decimate(self):
+        data = numpy.arange(30, dtype=numpy.float32).reshape((5, 6)) - 10.0
+        maxData, minData = decimate(data, data, 2)
+        self.assertEqual(maxData.shape, (3, 3))
+        self.assertEqual(maxData[0, 0], data[0:2, 0:2].max())
+        self.assertEqual(minData[1, 2], data[2:4, 4:6].min())
+        # incomplete blocks use the edge values
+        self.assertEqual(maxData[2, 2], data[4, 5])
+
+    def test_decimateTwice(self):
+        data = numpy.random.standard_normal((64, 96)).astype(numpy.float32)
+        maxData, minData = decimate(*decimate(data, data, 2), 2)
+        maxData4, minData4 = decimate(data, data, 4)
+        self.assertTrue(numpy.array_equal(maxData, maxData4))
+        self.assertTrue(numpy.array_equal(minData, minData4))
+
+    def test_maxAbsolute(self):
+        maxData = numpy.array([3.0, 1.0])
+        minData = numpy.array([-1.0, -5.0])
+        self.assertEqual(list(maxAbsolute(maxData, minData)), [3.0, -5.0])
+
+    def test_factors(self):
+        self.assertEqual(getMaxFactor(256, 128), 1)
+        self.assertEqual(getMaxFactor(16384, 4096), 512)
+        self.assertEqual(getDecimationFactor(20.0, 9.5, 512), 8)
+        self.assertEqual(getDecimationFactor(20.0, 9.5, 4), 4)
+        self.assertEqual(getDecimationFactor(0.5, 9.5, 512), 1)
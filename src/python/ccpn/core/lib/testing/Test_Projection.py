@@ -0,0 +1,184 @@
+"""Test the projection engine of SpectrumDataSources
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import numpy
+import unittest
+
+from ccpn.core.lib.SpectrumDataSources.lib import Projection as ProjectionModule
+from ccpn.core.lib.SpectrumDataSources.lib.Projection import reduceSlab, mergeProjections, checkProjectionMethod, \
+    ProjectionEngine, clearProjectionCache, resizeProjectionCache
+
+
+class _DataSource(object):
+    """Minimal non-blocked dataSource with native region access, for testing the ProjectionEngine
+    """
+
+    def __init__(self, data):
+        self.data = data  # ..,z,y,x ordered
+        self.pointCounts = list(data.shape[::-1])
+        self.dimensionCount = len(self.pointCounts)
+        self.dimensionIndices = list(range(self.dimensionCount))
+        self.isBlocked = False
+        self.isBuffered = False
+        self.path = '_testProjection'
+
+    def checkForValidPlane(self, position, xDim, yDim):
+        pass
+
+    def _getBufferSignature(self):
+        return 'signature'
+
+    def _readRegion(self, ranges):
+        slices = tuple(slice(start, stop) for start, stop in ranges)
+        return self.data[slices[::-1]].copy()
+
+
+class ProjectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = numpy.random.standard_normal((6, 8, 10)).astype(numpy.float32)
+
+    def test_reduce(self):
+        self.assertTrue(numpy.array_equal(reduceSlab(self.data, 'max'), self.data.max(axis=0)))
+        self.assertTrue(numpy.array_equal(reduceSlab(self.data, 'min'), self.data.min(axis=0)))
+        self.assertTrue(numpy.allclose(reduceSlab(self.data, 'sum'), self.data.sum(axis=0), atol=1.0e-5))
+
+    def test_threshold(self):
+        data = self.data.copy()
+        result = reduceSlab(data, 'sum above threshold', threshold=0.5)
+        self.assertTrue(numpy.allclose(result, numpy.where(data < 0.5, 0.0, data).sum(axis=0), atol=1.0e-5))
+        result = reduceSlab(data, 'min below threshold', threshold=0.5)
+        self.assertTrue(numpy.array_equal(result, numpy.where(data > -0.5, 0.0, data).min(axis=0)))
+        # data are not modified
+        self.assertTrue(numpy.array_equal(data, self.data))
+
+    def test_merge(self):
+        # merging the reduced halves equals reducing the whole
+        for method in ('max', 'min', 'sum'):
+            merged = mergeProjections(reduceSlab(self.data[:2], method), reduceSlab(self.data[2:], method), method)
+            self.assertTrue(numpy.allclose(merged, reduceSlab(self.data, method), atol=1.0e-5))
+
+    def test_invalidMethod(self):
+        with self.assertRaises(ValueError):
+            checkProjectionMethod('average', None)
+        with self.assertRaises(ValueError):
+            checkProjectionMethod('max above threshold', None)
+
+    def test_scale(self):
+        result = reduceSlab(self.data, 'max above threshold', threshold=0.5, scale=2.0)
+        scaled = 2.0 * self.data
+        self.assertTrue(numpy.allclose(result, numpy.where(scaled < 0.5, 0.0, scaled).max(axis=0)))
+
+    def test_engineScale(self):
+        clearProjectionCache()
+        dataSource = _DataSource(self.data)
+        for method in ('max', 'sum above threshold'):
+            projection = ProjectionEngine(dataSource, xDim=1, yDim=2, method=method, threshold=0.5).getProjection()
+            # the scale is part of the cache key; hence a scaled projection is not retrieved from the cache
+            scaledProjection = ProjectionEngine(dataSource, xDim=1, yDim=2, method=method, threshold=0.5,
+                                                scale=2.0).getProjection()
+            self.assertTrue(numpy.allclose(scaledProjection, reduceSlab(2.0 * self.data, method, threshold=0.5),
+                                           atol=1.0e-5))
+            self.assertFalse(numpy.allclose(scaledProjection, projection))
+        clearProjectionCache()
+
+
+
+class ProjectionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        clearProjectionCache()
+        maxBytes = ProjectionModule._cacheMaxBytes
+        self.addCleanup(resizeProjectionCache, maxBytes)
+        self.addCleanup(clearProjectionCache)
+        resizeProjectionCache(1000)
+
+    @staticmethod
+    def _cached():
+        return [key[-1] for key in ProjectionModule._cache]
+
+    @staticmethod
+    def _store(path, name, nBytes=400):
+        ProjectionModule._cacheProjection((path, name), numpy.zeros(nBytes // 4, dtype=numpy.float32))
+
+    def test_lru_eviction(self):
+        for name in 'abc':
+            self._store('path', name)
+        # 1200 bytes > maxBytes; 'a' was used least recently
+        self.assertEqual(self._cached(), ['b', 'c'])
+        self.assertEqual(ProjectionModule._cacheBytes, 800)
+
+        self.assertIsNotNone(ProjectionModule._getCachedProjection(('path', 'b')))
+        self._store('path', 'd')
+        self.assertEqual(self._cached(), ['b', 'd'])
+
+        # replacing a projection updates the byte count
+        self._store('path', 'd', 100)
+        self.assertEqual(ProjectionModule._cacheBytes, 500)
+
+        # a projection exceeding maxBytes is not retained
+        self._store('path', 'e', 2000)
+        self.assertEqual(self._cached(), ['b', 'd'])
+        self.assertEqual(ProjectionModule._cacheBytes, 500)
+
+    def test_resize(self):
+        for name in 'ab':
+            self._store('path', name)
+        resizeProjectionCache(500)
+        self.assertEqual(self._cached(), ['b'])
+        self.assertEqual(ProjectionModule._cacheBytes, 400)
+
+        # disabled
+        resizeProjectionCache(0)
+        self._store('path', 'c')
+        self.assertEqual(self._cached(), [])
+        self.assertEqual(ProjectionModule._cacheBytes, 0)
+
+    def test_clear(self):
+        self._store('path1', 'a', 100)
+        self._store('path2', 'b', 200)
+        clearProjectionCache('path1')
+        self.assertEqual(self._cached(), ['b'])
+        self.assertEqual(ProjectionModule._cacheBytes, 200)
+        clearProjectionCache()
+        self.assertEqual(ProjectionModule._cacheBytes, 0)
+
+    def test_getProjection(self):
+        dataSource = _DataSource(numpy.random.standard_normal((6, 8, 10)).astype(numpy.float32))
+        resizeProjectionCache(ProjectionModule.DEFAULT_PROJECTION_CACHE_SIZE)
+        engine = ProjectionEngine(dataSource, method='max')
+        projection = engine.getProjection()
+        self.assertEqual(ProjectionModule._cacheBytes, projection.nbytes)
+
+        # a copy is retrieved from the cache
+        cached = engine.getProjection()
+        self.assertTrue(numpy.array_equal(cached, projection))
+        cached[:] = 0.0
+        self.assertTrue(numpy.array_equal(engine.getProjection(), projection))
@@ -46,3 +46,98 @@ class SpectrumTest(WrapperTesting):
         sliceData = spectrum.getSliceData()
         print('sliceData.shape =', sliceData.shape)
         print('sliceData =', sliceData)
+
+    def test_getRegionData(self):
+        """Compare the native (one-pass) region read with the slice-based reference implementation
+        """
+        import numpy
+
+        spectrum = self.project.getSpectrum(spectrumName)
+        dataSource = spectrum.dataSource
+        np0, np1 = dataSource.pointCounts[0:2]
+
+        for sliceTuples, aliasingFlags in [
+            ([(10, 50), (20, 40)], [0, 0]),
+            ([(-5, 30), (np1 - 10, np1 + 6)], [1, -1]),
+            ([(np0 - 3, np0 + 4), (-2, 3)], [-1, 1]),
+            ]:
+            regionData = dataSource.getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+            referenceData = dataSource._getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+            self.assertEqual(regionData.shape, referenceData.shape)
+            self.assertTrue(numpy.allclose(regionData, referenceData))
+
+    def test_getRegionData_singleBlock(self):
+        """A region within a single block is a view of the (read-only) memory map; must not fail on scaling
+        """
+        import numpy
+
+        spectrum = self.project.getSpectrum(spectrumName)
+        dataSource = spectrum.dataSource
+        sliceTuples = [(1, min(4, bs)) for bs in dataSource.blockSizes]
+        aliasingFlags = [0] * dataSource.dimensionCount
+
+        regionData = dataSource.getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+        referenceData = dataSource._getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+        self.assertTrue(numpy.allclose(regionData, referenceData))
+
+    def test_getRegionData_multipleFolds(self):
+        """Points folded n times are multiplied by aliasingFlag**n along every dimension
+        """
+        import numpy
+
+        spectrum = self.project.getSpectrum(spectrumName)
+        dataSource = spectrum.dataSource
+        np0, np1 = dataSource.pointCounts[0:2]
+        planeData = dataSource.getPlaneData(position=[1] * dataSource.dimensionCount, xDim=1, yDim=2)
+
+        # x: points 1-3 folded twice (factor (-1)**2); y: all points folded once below (factor -1), unfolded,
+        # and points 1-3 folded once above (factor -1)
+        sliceTuples = [(2 * np0 + 1, 2 * np0 + 3), (-np1 + 1, np1 + 3)] + \
+                      [(1, 1)] * (dataSource.dimensionCount - 2)
+        aliasingFlags = [-1, -1] + [0] * (dataSource.dimensionCount - 2)
+        regionData = dataSource.getRegionData(sliceTuples=sliceTuples, aliasingFlags=aliasingFlags)
+        regionData = regionData.reshape(regionData.shape[-2:])
+
+        yFactors = numpy.array([-1.0] * np1 + [1.0] * np1 + [-1.0] * 3)
+        yIndices = numpy.concatenate([numpy.arange(np1), numpy.arange(np1), numpy.arange(3)])
+        expected = planeData[yIndices, 0:3] * yFactors[:, None]
+        self.assertTrue(numpy.allclose(regionData, expected))
+
+
+    def test_getPlaneRegionData(self):
+        """The regions of a plane equal the corresponding parts of the (scaled) full plane
+        """
+        import numpy
+
+        spectrum = self.project.getSpectrum(spectrumName)
+        for xDim, yDim in ((1, 2), (2, 1)):
+            planeData = spectrum.getPlaneData(xDim=xDim, yDim=yDim)
+            nx, ny = spectrum.pointCounts[xDim - 1], spectrum.pointCounts[yDim - 1]
+
+            # defaults to the full plane
+            regionData = spectrum.getPlaneRegionData(xDim=xDim, yDim=yDim)
+            self.assertEqual(regionData.shape, (ny, nx))
+            self.assertTrue(numpy.allclose(regionData, planeData))
+
+            for xLimits, yLimits in [((10, 50), (20, 40)),
+                                     ((1, 1), (1, ny)),
+                                     ((nx - 16, nx), (ny - 3, ny)),
+                                     ((33, 33), (17, 17)),
+                                     ]:
+                regionData = spectrum.getPlaneRegionData(xDim=xDim, yDim=yDim, xLimits=xLimits, yLimits=yLimits)
+                expected = planeData[yLimits[0] - 1:yLimits[1], xLimits[0] - 1:xLimits[1]]
+                self.assertEqual(regionData.shape, expected.shape)
+                self.assertTrue(numpy.allclose(regionData, expected))
+
+        # the scale is applied
+        scale = spectrum.scale
+        try:
+            spectrum.scale = 2.0 * scale
+            regionData = spectrum.getPlaneRegionData(xLimits=(10, 50), yLimits=(20, 40))
+            expected = spectrum.getPlaneData()[19:40, 9:50]
+            self.assertTrue(numpy.allclose(regionData, expected))
+        finally:
+            spectrum.scale = scale
+
+        with self.assertRaises(ValueError):
+            spectrum.getPlaneRegionData(xDim=1, yDim=1)
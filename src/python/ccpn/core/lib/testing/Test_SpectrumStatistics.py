@@ -0,0 +1,188 @@
+"""Test the statistics (sidecar) cache of the SpectrumDataSource
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import numpy
+import tempfile
+import unittest
+
+from ccpn.util.Path import aPath
+from ccpn.core.lib.SpectrumDataSources.lib.SpectrumStatistics import computeStatistics, sampleData, \
+    scaleStatistics, histogramPercentile, StatisticsCache, HISTOGRAM_BINS
+
+
+class _Spectrum(object):
+    """Minimal spectrum with the path of the statistics in its metadata directory
+    """
+
+    def __init__(self, metaDataDir, name='test'):
+        self._metaDataDir = aPath(metaDataDir)
+        self.name = name
+        self.readOnly = False
+
+    @property
+    def _statisticsPath(self):
+        return self._metaDataDir / 'statistics' / self.name + '.json'
+
+    def _fetchStatisticsPath(self):
+        if self.readOnly:
+            return None
+        self._metaDataDir.fetchDir('statistics')
+        return self._statisticsPath
+
+
+class _DataSource(object):
+    """Minimal dataSource with (x,y,z-ordered) data in a file
+    """
+
+    def __init__(self, path, data):
+        self.path = aPath(path)
+        self.data = data  # z,y,x-ordered
+        self.dimensionCount = data.ndim
+        self.pointCounts = tuple(reversed(data.shape))
+        self.planeReads = 0
+        self.spectrum = None
+        self.data.tofile(str(self.path))
+
+    def _getBufferSignature(self):
+        st = self.path.stat()
+        return '%s;%d;%d' % (self.path, st.st_size, st.st_mtime_ns)
+
+    def getPlaneData(self, position=None, xDim=1, yDim=2):
+        self.planeReads += 1
+        return self.data[position[2] - 1] if self.dimensionCount == 3 else self.data
+
+
+class SpectrumStatisticsTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpDir = tempfile.TemporaryDirectory()
+        rng = numpy.random.default_rng(1)
+        data = rng.normal(scale=2.0, size=(8, 64, 128)).astype(numpy.float32)
+        data[3, 10, 20] = 1000.0
+        dataDir = aPath(self._tmpDir.name).fetchDir('data')
+        self.dataSource = _DataSource(dataDir / 'test.dat', data)
+        self.dataSource.spectrum = _Spectrum(aPath(self._tmpDir.name).fetchDir('state', 'spectra'))
+
+    def tearDown(self):
+        self._tmpDir.cleanup()
+
+    def test_computeStatistics(self):
+        stats = computeStatistics(self.dataSource.data)
+        self.assertAlmostEqual(stats['noiseSD'], 2.0, delta=0.05)
+        self.assertAlmostEqual(stats['median'], 0.0, delta=0.05)
+        self.assertEqual(stats['max'], 1000.0)
+        # the outlier does not affect the robust maximum
+        self.assertLess(stats['robustMax'], 10.0)
+        self.assertEqual(len(stats['histogram']['counts']), HISTOGRAM_BINS)
+        self.assertEqual(sum(stats['histogram']['counts']), self.dataSource.data.size)
+        self.assertIsNone(computeStatistics(numpy.array([numpy.nan]))['median'])
+
+    def test_sampleData(self):
+        self.assertEqual(len(sampleData(self.dataSource, maxPlanes=4)), 4 * 64 * 128)
+        self.assertEqual(len(sampleData(self.dataSource, maxPlanes=100)), 8 * 64 * 128)
+
+    def test_scaleStatistics(self):
+        stats = computeStatistics(self.dataSource.data)
+        scaled = scaleStatistics(stats, 2.0)
+        self.assertAlmostEqual(scaled['noiseSD'], 2.0 * stats['noiseSD'])
+        self.assertEqual(scaled['max'], 2000.0)
+        self.assertEqual(scaled['histogram']['counts'], stats['histogram']['counts'])
+
+        # a negative scale swaps the minima and maxima, and reverses the histogram
+        scaled = scaleStatistics(stats, -2.0)
+        self.assertAlmostEqual(scaled['noiseSD'], 2.0 * stats['noiseSD'])
+        self.assertAlmostEqual(scaled['median'], -2.0 * stats['median'])
+        self.assertEqual(scaled['min'], -2000.0)
+        self.assertAlmostEqual(scaled['robustMax'], -2.0 * stats['robustMin'])
+        self.assertEqual(scaled['histogram']['counts'], stats['histogram']['counts'][::-1])
+        self.assertTrue(numpy.all(numpy.diff(scaled['histogram']['edges']) > 0))
+        # the stored statistics are not changed
+        self.assertEqual(stats, computeStatistics(self.dataSource.data))
+
+        empty = computeStatistics(numpy.array([numpy.nan]))
+        self.assertEqual(scaleStatistics(empty, 2.0), empty)
+
+    def test_histogramPercentile(self):
+        data = numpy.arange(1000, dtype=numpy.float32)
+        histogram = computeStatistics(data)['histogram']
+        self.assertAlmostEqual(histogramPercentile(histogram, 0.0), 0.0)
+        self.assertAlmostEqual(histogramPercentile(histogram, 100.0), 999.0)
+        for percentile in (1.0, 50.0, 99.0):
+            self.assertAlmostEqual(histogramPercentile(histogram, percentile), numpy.percentile(data, percentile),
+                                   delta=1.0)
+
+    def test_persistence(self):
+        cache = StatisticsCache(self.dataSource)
+        # stored with the metadata of the spectrum; not with the data
+        self.assertEqual(cache.path, self.dataSource.spectrum._statisticsPath)
+        stats = cache.getStatistics()
+        self.assertTrue(cache.path.exists())
+        self.assertEqual(list(self.dataSource.path.parent.iterdir()), [self.dataSource.path])
+        key = cache.getKey('noiseEstimate', 2.0)
+        cache.set(key, {'noiseLevel': 7.0})
+
+        # a new instance (i.e. a new session) reads the sidecar
+        reads = self.dataSource.planeReads
+        cache = StatisticsCache(self.dataSource)
+        self.assertEqual(cache.getStatistics(), stats)
+        self.assertEqual(cache.get(key), {'noiseLevel': 7.0})
+        self.assertIsNone(cache.get(cache.getKey('noiseEstimate', 1.0)))
+        self.assertEqual(self.dataSource.planeReads, reads)
+
+    def test_notPersistent(self):
+        # without a spectrum, or in a read-only project, the statistics are retained in memory only
+        spectrum, self.dataSource.spectrum = self.dataSource.spectrum, None
+        cache = StatisticsCache(self.dataSource)
+        self.assertIsNone(cache.path)
+        stats = cache.getStatistics()
+        self.assertEqual(cache.getStatistics(), stats)
+        self.assertEqual(self.dataSource.planeReads, 8)
+
+        self.dataSource.spectrum = spectrum
+        spectrum.readOnly = True
+        cache.set(cache.getKey('initialNoiseLevel'), 3.0)
+        self.assertFalse(cache.path.exists())
+        self.assertEqual(cache.get(cache.getKey('initialNoiseLevel')), 3.0)
+
+    def test_invalidation(self):
+        cache = StatisticsCache(self.dataSource)
+        key = cache.getKey('initialNoiseLevel')
+        cache.set(key, 3.0)
+
+        # changing the data file invalidates the stored estimates
+        with open(self.dataSource.path, 'ab') as fp:
+            fp.write(b'\0' * 4)
+        self.assertIsNone(StatisticsCache(self.dataSource).get(key))
+        self.assertIsNone(cache.get(key))
+
+        cache.set(key, 3.0)
+        cache.clear()
+        self.assertFalse(cache.path.exists())
+        self.assertIsNone(cache.get(key))
@@ -0,0 +1,241 @@
+"""
+Tests for the pre-reading of the xml-files (XmlPrefetcher) and the timings of the loading of the topObjects (LoadTimings)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from unittest import mock
+from tempfile import TemporaryDirectory
+
+from ccpn.core.lib import XmlLoader as XmlLoaderModule
+from ccpn.core.lib.XmlLoader import XmlPrefetcher, LoadTimings
+from ccpn.util.AttrDict import AttrDict
+from ccpn.util.Path import aPath
+
+
+FILESIZE = 100
+
+
+class XmlPrefetcherTest(unittest.TestCase):
+
+    def setUp(self):
+        tempDir = TemporaryDirectory()
+        self.addCleanup(tempDir.cleanup)
+        self.paths = []
+        for ii in range(6):
+            path = aPath(tempDir.name) / f'file{ii}.xml'
+            path.write_text(str(ii) * FILESIZE)
+            self.paths.append(path)
+
+    def _prefetcher(self, paths, maxBytes):
+        prefetcher = XmlPrefetcher(paths, maxWorkers=2, maxBytes=maxBytes)
+        self.addCleanup(prefetcher.close)
+        return prefetcher
+
+    @staticmethod
+    def _submitted(prefetcher):
+        return [aPath(key).name for key in prefetcher._futures]
+
+    def test_pop(self):
+        prefetcher = self._prefetcher(self.paths, maxBytes=10 * FILESIZE)
+        for ii, path in enumerate(self.paths):
+            text, readTime = prefetcher.pop(path)
+            self.assertEqual(text, str(ii) * FILESIZE)
+            self.assertGreaterEqual(readTime, 0.0)
+            # popped only once
+            self.assertIsNone(prefetcher.pop(path))
+        self.assertEqual(prefetcher._bytes, 0)
+
+    def test_maxBytes(self):
+        """Only maxBytes are pre-read ahead; the next files are submitted as the pre-read ones are popped
+        """
+        prefetcher = self._prefetcher(self.paths, maxBytes=2 * FILESIZE)
+        self.assertEqual(self._submitted(prefetcher), ['file0.xml', 'file1.xml'])
+        self.assertEqual(prefetcher._bytes, 2 * FILESIZE)
+
+        self.assertIsNotNone(prefetcher.pop(self.paths[0]))
+        self.assertEqual(self._submitted(prefetcher), ['file1.xml', 'file2.xml'])
+
+        # a file loaded out of order that was not submitted is read by the caller, and not pre-read later
+        self.assertIsNone(prefetcher.pop(self.paths[4]))
+        self.assertEqual(self._submitted(prefetcher), ['file1.xml', 'file2.xml'])
+        for path in self.paths[1:4]:
+            self.assertIsNotNone(prefetcher.pop(path))
+        self.assertEqual(self._submitted(prefetcher), ['file5.xml'])
+        self.assertIsNotNone(prefetcher.pop(self.paths[5]))
+        self.assertEqual(prefetcher._bytes, 0)
+
+    def test_largeFile(self):
+        """Files larger than maxBytes are not pre-read
+        """
+        self.paths[1].write_text('1' * 3 * FILESIZE)
+        prefetcher = self._prefetcher(self.paths, maxBytes=2 * FILESIZE)
+        self.assertEqual(self._submitted(prefetcher), ['file0.xml', 'file2.xml'])
+        self.assertIsNone(prefetcher.pop(self.paths[1]))
+
+    def test_missingFile(self):
+        prefetcher = self._prefetcher([self.paths[0].parent / 'missing.xml'] + self.paths[:1],
+                                      maxBytes=10 * FILESIZE)
+        self.assertEqual(self._submitted(prefetcher), ['file0.xml'])
+
+        # a file that fails to read is read by the caller
+        with mock.patch.object(XmlPrefetcher, '_read', side_effect=FileNotFoundError('removed')):
+            prefetcher = self._prefetcher(self.paths[2:3], maxBytes=10 * FILESIZE)
+            self.assertIsNone(prefetcher.pop(self.paths[2]))
+        self.assertEqual(prefetcher._bytes, 0)
+
+    def test_close(self):
+        prefetcher = self._prefetcher(self.paths, maxBytes=2 * FILESIZE)
+        futures = [future for future, _size in prefetcher._futures.values()]
+        prefetcher.close()
+        self.assertIsNone(prefetcher._executor)
+        self.assertEqual((prefetcher._futures, prefetcher._queue, prefetcher._bytes), ({}, {}, 0))
+        self.assertTrue(all(future.done() for future in futures))
+
+        # nothing is pre-read after closing
+        self.assertIsNone(prefetcher.pop(self.paths[0]))
+        self.assertIsNone(prefetcher.pop(self.paths[3]))
+
+        # no files; no threads
+        self.assertIsNone(self._prefetcher([], maxBytes=FILESIZE)._executor)
+
+
+class _Clock():
+    """perf_counter stand-in; advanced by the test
+    """
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class LoadTimingsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        patcher = mock.patch.object(XmlLoaderModule, 'perf_counter', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        tempDir = TemporaryDirectory()
+        self.addCleanup(tempDir.cleanup)
+        self.tempPath = aPath(tempDir.name)
+        self.timings = LoadTimings()
+
+    def _topObject(self, package, guid, size=1024):
+        path = self.tempPath / f'{guid}.xml'
+        path.write_text('x' * size)
+        return AttrDict(package=AttrDict(name=package), guid=guid, path=path)
+
+    def _load(self, topObject, selfTime, children=()):
+        """Simulate the loading of topObject, loading the children half-way
+        """
+        with self.timings.timing(topObject):
+            self.clock.time += selfTime / 2
+            for child, childTime in children:
+                self._load(child, childTime)
+            self.clock.time += selfTime / 2
+
+    def test_selfTime(self):
+        nmr = self._topObject('ccp.nmr.Nmr', 'nmr')
+        molSystem = self._topObject('ccp.molecule.MolSystem', 'molSystem', size=2048)
+        chemComp = self._topObject('ccp.molecule.ChemComp', 'chemComp')
+        self._load(nmr, 1.0, children=[(molSystem, 2.0), (chemComp, 4.0)])
+
+        records = {record['guid']: record for record in self.timings.records}
+        # the children complete first
+        self.assertEqual([record['guid'] for record in self.timings.records], ['molSystem', 'chemComp', 'nmr'])
+        self.assertAlmostEqual(records['nmr']['totalTime'], 7.0)
+        self.assertAlmostEqual(records['nmr']['selfTime'], 1.0)
+        self.assertAlmostEqual(records['molSystem']['selfTime'], 2.0)
+        self.assertAlmostEqual(records['chemComp']['totalTime'], 4.0)
+        self.assertNotIn('childTime', records['nmr'])
+        self.assertEqual(records['molSystem']['size'], 2048)
+        self.assertEqual(self.timings._active, [])
+
+    def test_nested(self):
+        """Only the time of the direct children is subtracted
+        """
+        nmr = self._topObject('ccp.nmr.Nmr', 'nmr')
+        with self.timings.timing(nmr):
+            self.clock.time += 1.0
+            with self.timings.timing(self._topObject('ccp.molecule.MolSystem', 'molSystem')):
+                self.clock.time += 1.0
+                self._load(self._topObject('ccp.molecule.ChemComp', 'chemComp'), 3.0)
+
+        records = {record['guid']: record for record in self.timings.records}
+        self.assertAlmostEqual(records['nmr']['selfTime'], 1.0)
+        self.assertAlmostEqual(records['molSystem']['selfTime'], 1.0)
+        self.assertAlmostEqual(records['molSystem']['totalTime'], 4.0)
+        self.assertAlmostEqual(records['chemComp']['selfTime'], 3.0)
+        # the self-times add up to the total time
+        self.assertAlmostEqual(sum(record['selfTime'] for record in self.timings.records), 5.0)
+
+    def test_error(self):
+        """A failed load is recorded, and does not leave an active record
+        """
+        with self.assertRaises(RuntimeError):
+            with self.timings.timing(self._topObject('ccp.nmr.Nmr', 'nmr')):
+                self.clock.time += 1.0
+                raise RuntimeError('load failed')
+        self.assertEqual(self.timings._active, [])
+        self.assertAlmostEqual(self.timings.records[0]['selfTime'], 1.0)
+
+    def test_readTime(self):
+        nmr = self._topObject('ccp.nmr.Nmr', 'nmr')
+        with self.timings.timing(nmr):
+            self.timings.setReadTime(0.25, prefetched=True)
+            self._load(self._topObject('ccp.molecule.MolSystem', 'molSystem'), 1.0)
+        records = {record['guid']: record for record in self.timings.records}
+        self.assertEqual((records['nmr']['readTime'], records['nmr']['prefetched']), (0.25, True))
+        self.assertEqual((records['molSystem']['readTime'], records['molSystem']['prefetched']), (None, False))
+
+        # no topObject being loaded
+        self.timings.setReadTime(1.0)
+        self.timings.clear()
+        self.assertEqual(self.timings.records, [])
+
+    def test_getReport(self):
+        chemComps = [self._topObject('ccp.molecule.ChemComp', f'chemComp{ii}', size=512) for ii in range(3)]
+        self._load(self._topObject('ccp.nmr.Nmr', 'nmr'), 1.0, children=[(chemComp, 2.0) for chemComp in chemComps])
+        self._load(self._topObject('ccp.molecule.MolSystem', 'molSystem', size=2048), 0.5)
+
+        packageTimings = self.timings.getPackageTimings()
+        # slowest first
+        self.assertEqual(list(packageTimings), ['ccp.molecule.ChemComp', 'ccp.nmr.Nmr', 'ccp.molecule.MolSystem'])
+        count, size, selfTime = packageTimings['ccp.molecule.ChemComp']
+        self.assertEqual((count, size), (3, 1536))
+        self.assertAlmostEqual(selfTime, 6.0)
+
+        report = self.timings.getReport(maxTopObjects=2).splitlines()
+        self.assertEqual(report[0], 'Loaded 5 topObjects in 7.500s')
+        self.assertEqual(len(report), 2 + 3 + 1 + 2)
+        self.assertEqual(report[2].split(), ['ccp.molecule.ChemComp', '3', '1.5', '6.000'])
+        self.assertIn('(chemComp0)', report[-2])
+        self.assertTrue(all('chemComp' in line for line in report[-2:]))
@@ -157,3 +157,131 @@ class ChemicalShiftTestNew(WrapperTesting):
 
         # check again to make sure that the class has not changed
         # self.assertTrue(isinstance(ch._wrappedData.data, (DataFrameABC, type(None))), 'must be of class DataFrameABC')
+
+
+class ChemicalShiftIndexTest(WrapperTesting):
+    """Check that the chemicalShiftList lookup-indexes match the dataframe and shifts after each operation
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.shiftList = self.project.newChemicalShiftList(name='indexTest')
+        self.shifts = [self.shiftList.newChemicalShift(value=float(ii)) for ii in range(4)]
+
+        nmrResidue = self.project.nmrChains[0].newNmrResidue()
+        self.nmrAtoms = [nmrResidue.newNmrAtom(name=name) for name in ('H', 'N')]
+
+    def _checkIndexes(self):
+        from ccpn.core.ChemicalShiftList import CS_UNIQUEID, CS_NMRATOM
+
+        shiftList = self.shiftList
+        _data = shiftList._data
+        uniqueIds = [] if _data is None else [int(uid) for uid in _data[CS_UNIQUEID]]
+        pids = [] if _data is None else list(_data[CS_NMRATOM])
+
+        nmrAtomIndex, rowIndex = shiftList._getIndexes()
+        self.assertEqual(rowIndex, {uid: row for row, uid in enumerate(uniqueIds)})
+        self.assertEqual(nmrAtomIndex, {pid: uid for pid, uid in zip(pids, uniqueIds) if isinstance(pid, str)})
+
+        for sh in shiftList._shifts:
+            self.assertIs(shiftList._getShiftByUniqueId(sh._uniqueId), sh)
+        for sh in shiftList._deletedShifts:
+            self.assertIsNone(shiftList._getShiftByUniqueId(sh._uniqueId))
+            self.assertIs(shiftList._getShiftByUniqueId(sh._uniqueId, includeDeleted=True), sh)
+
+    def _checkUndoRedo(self):
+        self._checkIndexes()
+        self.undo.undo()
+        self._checkIndexes()
+        self.undo.redo()
+        self._checkIndexes()
+
+    def test_create(self):
+        self._checkIndexes()
+        self.shiftList.newChemicalShift(value=4.0, nmrAtom=self.nmrAtoms[0])
+        self._checkUndoRedo()
+
+    def test_delete(self):
+        self.shifts[1].delete()
+        self.assertNotIn(self.shifts[1], self.shiftList.chemicalShifts)
+        self._checkUndoRedo()
+
+        self.shiftList.deleteChemicalShift(uniqueId=self.shifts[2]._uniqueId)
+        self._checkUndoRedo()
+
+    def test_nmrAtomReassignment(self):
+        sh0, sh1 = self.shifts[:2]
+
+        sh0.nmrAtom = self.nmrAtoms[0]
+        self._checkUndoRedo()
+        self.assertEqual(self.shiftList._getIndexes()[0].get(self.nmrAtoms[0].pid), sh0._uniqueId)
+
+        # move to another nmrAtom
+        sh0.nmrAtom = self.nmrAtoms[1]
+        self._checkUndoRedo()
+        self.assertNotIn(self.nmrAtoms[0].pid, self.shiftList._getIndexes()[0])
+
+        sh1.nmrAtom = self.nmrAtoms[0]
+        self._checkUndoRedo()
+
+        sh0.nmrAtom = None
+        self._checkUndoRedo()
+        self.assertNotIn(self.nmrAtoms[1].pid, self.shiftList._getIndexes()[0])
+
+    def test_setColumns(self):
+        from ccpn.core.ChemicalShiftList import CS_VALUE, CS_UNIQUEID, CS_NMRATOM, CS_CHAINCODE, CS_ATOMNAME
+
+        shiftList = self.shiftList
+        uniqueIds = [sh._uniqueId for sh in self.shifts[1:3]]
+
+        shiftList._setColumns([CS_VALUE], [[10.0], [11.0]], uniqueIds)
+        self._checkIndexes()
+        self.assertEqual([sh.value for sh in self.shifts], [0.0, 10.0, 11.0, 3.0])
+        self.undo.undo()
+        self._checkIndexes()
+        self.assertEqual([sh.value for sh in self.shifts], [0.0, 1.0, 2.0, 3.0])
+        self.undo.redo()
+        self._checkIndexes()
+        self.assertEqual([sh.value for sh in self.shifts], [0.0, 10.0, 11.0, 3.0])
+
+        # the uniqueId, nmrAtom and derived columns are set through the nmrAtom property of the shifts
+        pids = [nmrAtom.pid for nmrAtom in self.nmrAtoms]
+        for name in (CS_UNIQUEID, CS_NMRATOM, CS_CHAINCODE, CS_ATOMNAME):
+            with self.assertRaises(ValueError):
+                shiftList._setColumns([CS_VALUE, name], [[12.0, pid] for pid in pids], uniqueIds)
+        self.assertEqual([sh.value for sh in self.shifts], [0.0, 10.0, 11.0, 3.0])
+        self.assertEqual(shiftList._getIndexes()[0], {})
+        self._checkIndexes()
+
+    def test_newChemicalShifts(self):
+        shiftList = self.shiftList
+        nmrAtom0, nmrAtom1 = self.nmrAtoms
+
+        shifts = shiftList._newChemicalShifts([dict(value=4.0, nmrAtom=nmrAtom0),
+                                               dict(value=5.0, atomName='HA', comment='bulk'),
+                                               dict(value=6.0, nmrAtom=nmrAtom1.pid)])
+        self.assertEqual(shiftList.chemicalShifts, self.shifts + shifts)
+        self.assertEqual([sh.value for sh in shifts], [4.0, 5.0, 6.0])
+        self.assertEqual([sh.nmrAtom for sh in shifts], [nmrAtom0, None, nmrAtom1])
+        self.assertEqual((shifts[1].atomName, shifts[1].comment), ('HA', 'bulk'))
+        self.assertEqual(shiftList._getIndexes()[0], {nmrAtom0.pid: shifts[0]._uniqueId,
+                                                      nmrAtom1.pid: shifts[2]._uniqueId})
+
+        # a single undo/redo event
+        self._checkIndexes()
+        self.undo.undo()
+        self._checkIndexes()
+        self.assertEqual(shiftList.chemicalShifts, self.shifts)
+        self.undo.redo()
+        self._checkIndexes()
+        self.assertEqual(shiftList.chemicalShifts, self.shifts + shifts)
+
+        # an existing or repeated nmrAtom, or an invalid value, creates no shifts
+        nmrAtom2 = nmrAtom0.nmrResidue.newNmrAtom(name='CA')
+        for shiftParameters in ([dict(value=7.0, nmrAtom=nmrAtom0)],
+                                [dict(nmrAtom=nmrAtom2), dict(nmrAtom=nmrAtom2)],
+                                [dict(value=7.0), dict(value='7.0')]):
+            with self.assertRaises(ValueError):
+                shiftList._newChemicalShifts(shiftParameters)
+            self.assertEqual(shiftList.chemicalShifts, self.shifts + shifts)
+            self._checkIndexes()
@@ -270,6 +270,71 @@ class NotificationTest(WrapperTesting):
         self.assertEqual(registered.get(('Note', 'create')), {})
         self.assertEqual(registered.get(('Note', 'delete')), {})
 
+    def test_notifiers_suspend_queue(self):
+        project = self.project
+        ll = []
+        not1 = project.registerNotifier('Note', 'create', notifyfunc,
+                                        parameterDict={'value': 'createx', 'll': ll})
+        not2 = project.registerNotifier('Note', 'delete', notifyfunc,
+                                        parameterDict={'value': 'deletex', 'll': ll})
+        project.suspendNotification(queueNotifiers=True)
+
+        note1 = project.newNote(name='test1')
+        note2 = project.newNote(name='test2')
+        self.assertEqual(ll, [])
+
+        # delete notifiers are not queued; the pending create of note1 is discarded
+        note1.delete()
+        self.assertEqual(ll, ['deletex'])
+        project.resumeNotification(queueNotifiers=True)
+        self.assertEqual(ll, ['deletex', 'createx'])
+
+        project.removeNotifier(not1)
+        project.removeNotifier(not2)
+
+    def test_notifiers_suspend_batch(self):
+        project = self.project
+        ll = []
+
+        def batchfunc(objs):
+            ll.append(list(objs))
+
+        not1 = project.registerNotifier('Note', 'create', batchfunc, batch=True)
+        project.suspendNotification(queueNotifiers=True)
+        note1 = project.newNote(name='test1')
+        note2 = project.newNote(name='test2')
+        project.resumeNotification(queueNotifiers=True)
+        self.assertEqual(ll, [[note1, note2]])
+
+        # not suspended; a list with a single object
+        note3 = project.newNote(name='test3')
+        self.assertEqual(ll, [[note1, note2], [note3]])
+
+        project.removeNotifier(not1)
+
+    def test_notifiers_suspend_error(self):
+        project = self.project
+        ll = []
+
+        def badfunc(obj):
+            raise RuntimeError('notifier error')
+
+        not1 = project.registerNotifier('Note', 'create', badfunc)
+        not2 = project.registerNotifier('Note', 'create', notifyfunc,
+                                        parameterDict={'value': 'createx', 'll': ll})
+        project.suspendNotification(queueNotifiers=True)
+        project.newNote(name='test1')
+
+        # the error is raised as for an immediate notifier, after executing the other notifiers
+        with self.assertRaisesRegex(RuntimeError, 'notifier error'):
+            project.resumeNotification(queueNotifiers=True)
+        self.assertEqual(ll, ['createx'])
+        self.assertEqual(project._notificationSuspension, 0)
+        self.assertEqual(project._pendingNotifications, [])
+
+        project.removeNotifier(not1)
+        project.removeNotifier(not2)
+
     @unittest.skip("ISSUE: notifier suspension is now handled by modules")
     def test_notifiers_rename(self):
         project = self.project
@@ -73,3 +73,28 @@ class ProjectTestIo(WrapperTesting):
                        overwrite=True)
         self.assertTrue(project.name.startswith('_SAVED_TO_NAME'))
         self.assertTrue(project.name == '_SAVED_TO_NAME' or project.name[14] == '_')
+
+
+class ProjectTestIncrementalSave(WrapperTesting):
+    # Path of project to load (None for new project)
+    projectPath = 'V3ProjectForTests.ccpn'
+
+    def test_incrementalSave_chemicalShift(self):
+        project = self.project
+        baseDir, _projDir = os.path.split(project.path)
+        newPath = os.path.join(baseDir, '_INCREMENTAL_SAVE.ccpn')
+
+        shiftList = project.newChemicalShiftList()
+        shift = shiftList.newChemicalShift(value=1.0)
+        shiftListPid, uniqueId = shiftList.pid, shift._uniqueId
+        project.saveAs(newPath=newPath, overwrite=True)
+
+        # in-place edit of the dataframe only; must still be saved
+        shift.value = 2.5
+        self.framework.preferences.general.incrementalSave = True
+        project.save()
+
+        loadedProject = self.framework.loadProject(newPath)
+        loadedShift = loadedProject.getByPid(shiftListPid).getChemicalShift(uniqueId=uniqueId)
+        self.assertEqual(loadedShift.value, 2.5)
+
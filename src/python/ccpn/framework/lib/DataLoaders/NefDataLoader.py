@@ -39,7 +39,7 @@ from ccpn.util.Logging import getLogger
 from ccpn.util.nef.GenericStarParser import DataBlock
 from ccpn.util.nef import StarIo
 
-from ccpn.core.lib.ContextManagers import undoStackBlocking, notificationBlanking
+from ccpn.core.lib.ContextManagers import undoStackBlocking, notificationBlanking, notificationSuspend
 from ccpn.framework.lib.ccpnNef import CcpnNefIo
 from ccpn.framework.lib.ccpnNef.CcpnNefImporter import CcpnNefImporter, NEF_STANDARD
 
@@ -95,7 +95,8 @@ class NefDataLoader(DataLoaderABC):
             _reader = self._nefReader
 
         # self._nefImporter._attachReader(_reader) # GWV: pretty sure don't need this as we
-        # call the _reader method to import
-        _reader.importExistingProject(project, self.dataBlock, projectIsEmpty=self.createNewProject)
+        # call the _reader method to import; notifiers are executed (once) at the end of the import
+        with notificationSuspend(application=project.application):
+            _reader.importExistingProject(project, self.dataBlock, projectIsEmpty=self.createNewProject)
 
 NefDataLoader._registerFormat()
@@ -5029,8 +5029,7 @@ class CcpnNefReader(CcpnNefContent):
         from ccpn.util.isotopes import name2ElementSymbol, DEFAULT_ISOTOPE_DICT
 
         result = []
-
-        creatorFunc = parent.newChemicalShift
+        shiftParameters = []
 
         mapping = nef2CcpnMap.get(loop.name) or {}
         map2 = dict(item for item in mapping.items() if item[1] and '.' not in item[1])
@@ -5062,16 +5061,27 @@ class CcpnNefReader(CcpnNefContent):
                         (nmrAtom := self.produceNmrAtom(nmrResidue, tt[3], isotopeCode=isotopeCode)):
                     parameters['nmrAtom'] = nmrAtom
                 parameters['static'] = row.get('ccpn_static') or False  # may be undefined for older nef files
-
-                shift = creatorFunc(**parameters)
-                shift._static = False if shift.chemicalShiftList.spectra else True
-
-                result.append(shift)
+                shiftParameters.append((tt, parameters))
 
             except ValueError as es:
                 self.warning("Cannot produce NmrAtom for assignment %s. Skipping ChemicalShift" % (tt,), loop)
                 # Should eventually be removed - raise while still testing
                 # raise
+
+        try:
+            # create the shifts in bulk; the dataframe is extended once rather than per shift
+            result = parent._newChemicalShifts([parameters for _tt, parameters in shiftParameters])
+        except ValueError:
+            # create the shifts one-by-one, skipping the invalid ones
+            for tt, parameters in shiftParameters:
+                try:
+                    result.append(parent.newChemicalShift(**parameters))
+                except ValueError as es:
+                    self.warning("Cannot produce NmrAtom for assignment %s. Skipping ChemicalShift" % (tt,), loop)
+
+        _static = False if parent.spectra else True
+        for shift in result:
+            shift._static = _static
         #
         return result
 
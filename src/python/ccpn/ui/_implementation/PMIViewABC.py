@@ -31,6 +31,7 @@ import typing
 from ccpn.core.lib import Pid
 from ccpn.core._implementation.AbstractWrapperObject import AbstractWrapperObject
 from ccpn.core.lib.ContextManagers import ccpNmrV3CoreSetter  #, undoStackBlocking
+from ccpn.core.lib.PidIndex import PidDict
 from ccpn.util.decorators import logCommand
 
 # TODO:ED - should be in a Gui-class
@@ -236,7 +237,7 @@ class PMIViewABC(AbstractWrapperObject):
         # update pid:object mapping dictionary
         dd = project._pid2Obj.get(className)
         if dd is None:
-            dd = {}
+            dd = PidDict()
             project._pid2Obj[className] = dd
             project._pid2Obj[self.shortClassName] = dd
         # assert oldId is not None
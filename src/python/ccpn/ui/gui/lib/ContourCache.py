@@ -0,0 +1,224 @@
+"""
+This file contains the cache and worker pool for the background construction of the contours
+of the planes of a spectrum (see GuiSpectrumViewNd._constructContours)
+
+The contours (as returned by Contourer2d.contourerGLList) are stored in a least-recently-used
+cache, keyed on spectrum, plane positions, levels and colours; stepping back and forth through the
+planes of a 3D spectrum reuses the finished contours.
+
+Typical usage:
+
+    cache = getContourCache()
+    if (contours := cache.get(key)) is None:
+        future = cache.submit(key, getData, posLevels, negLevels, posColours, negColours, flatten)
+        future.add_done_callback(...)
+
+The data are read by the job (getData is called by the worker), and the Contourer2d C-extension
+releases the GIL while tracing the contours; the GUI hence remains responsive while the contours
+are built. The data-source access is serialised by its _readLock (see Spectrum.getPlaneData).
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+
+import numpy
+
+from ccpn.util.Logging import getLogger
+
+
+MB = 1024 * 1024
+
+
+def buildContours(dataArrays, posLevels, negLevels, posColours, negColours, flatten=True):
+    """Build the contours of dataArrays
+
+    :param dataArrays: tuple of (yPoints, xPoints) float32 arrays
+    :param posLevels, negLevels: float32 arrays with the contour levels
+    :param posColours, negColours: float32 arrays with the rgba-colours of the levels
+    :param flatten: overlay the planes into a single plane
+    :return a (numVertices, indices, vertices, colours) tuple; numVertices = 0 if there are no contours
+    """
+    from ccpnc.contour import Contourer2d
+
+    contourList = Contourer2d.contourerGLList(dataArrays, posLevels, negLevels, posColours, negColours, flatten)
+    if not contourList or contourList[1] <= 0:
+        return 0, numpy.array((), dtype=numpy.uint32), numpy.array((), dtype=numpy.float32), \
+            numpy.array((), dtype=numpy.float32)
+    return contourList[1], contourList[2], contourList[3], contourList[4]
+
+
+class ContourCache(object):
+    """
+    Least-recently-used cache of contours, with a worker pool building missing items.
+
+    - Items are (numVertices, indices, vertices, colours) tuples
+    - The cache is limited to maxBytes; the least-recently used items are removed first
+    - A key being built is only submitted once; further requests share the build. Pending builds of
+      superseded keys are cancelled once no requesters remain
+    - Access is thread-safe
+    """
+
+    maxBytes = 256 * MB
+    maxWorkers = 1
+
+    def __init__(self, maxBytes=None):
+        if maxBytes is not None:
+            self.maxBytes = maxBytes
+        self._items = OrderedDict()  # (key, item) pairs; least-recently used first
+        self._bytes = 0
+        self._pending = {}  # (key, future) pairs of the builds in progress
+        self._requests = {}  # (key, count) pairs; number of requesters of the builds in progress
+        self._lock = RLock()
+        self._executor = None
+
+    @staticmethod
+    def _itemBytes(item) -> int:
+        return sum(arr.nbytes for arr in item[1:])
+
+    def get(self, key):
+        """:return the contours of key; None if not present
+        """
+        with self._lock:
+            if (item := self._items.get(key)) is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, item):
+        """Add item (a (numVertices, indices, vertices, colours) tuple) as key, removing the
+        least-recently used items to stay within maxBytes
+        """
+        with self._lock:
+            if (old := self._items.pop(key, None)) is not None:
+                self._bytes -= self._itemBytes(old)
+            self._items[key] = item
+            self._bytes += self._itemBytes(item)
+            while self._bytes > self.maxBytes and len(self._items) > 1:
+                _key, old = self._items.popitem(last=False)
+                self._bytes -= self._itemBytes(old)
+
+    def isPending(self, key) -> bool:
+        """:return True if key is being built
+        """
+        with self._lock:
+            return key in self._pending
+
+    def getPending(self, key):
+        """:return the concurrent.futures.Future of key if it is being built, registering the caller
+        as a requester of the build (see cancel); None otherwise
+        """
+        with self._lock:
+            if (future := self._pending.get(key)) is not None:
+                self._requests[key] += 1
+            return future
+
+    def submit(self, key, getData, posLevels, negLevels, posColours, negColours, flatten=True):
+        """Build the contours of key on the worker pool and add these to the cache;
+        getData is called by the worker and should return the data arrays; these and the
+        remaining arguments are passed to buildContours.
+
+        :return a concurrent.futures.Future yielding the (numVertices, indices, vertices, colours) tuple
+        """
+        with self._lock:
+            if (future := self._pending.get(key)) is not None:
+                self._requests[key] += 1
+                return future
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix='contours')
+            future = self._executor.submit(self._build, key, getData, posLevels, negLevels,
+                                           posColours, negColours, flatten)
+            self._pending[key] = future
+            self._requests[key] = 1
+            future.add_done_callback(lambda _future, _key=key: self._removePending(_key))
+            return future
+
+    def _build(self, key, getData, *args):
+        """Read the data and build the contours of key; executed by the worker pool
+        """
+        try:
+            item = buildContours(getData(), *args)
+        except Exception as es:
+            getLogger().warning(f'Contouring error: {es}')
+            raise es
+        self.put(key, item)
+        return item
+
+    def _removePending(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._requests.pop(key, None)
+
+    def cancel(self, key) -> bool:
+        """Withdraw a request of the build of key; cancel the build if it has not started yet and
+        there are no other requesters (e.g. strips showing the same plane)
+        :return True if cancelled
+        """
+        with self._lock:
+            if (future := self._pending.get(key)) is None:
+                return False
+            self._requests[key] -= 1
+            if self._requests[key] > 0:
+                return False
+            return future.cancel()
+
+    def clear(self, spectrumId=None):
+        """Clear all items, or only those of spectrumId (i.e. with spectrumId as first element of the key)
+        """
+        with self._lock:
+            for key in list(self._items.keys()):
+                if spectrumId is None or key[0] == spectrumId:
+                    self._bytes -= self._itemBytes(self._items.pop(key))
+
+    def shutdown(self):
+        """Cancel the pending builds and stop the worker pool
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __str__(self):
+        return '<ContourCache: %d items, %.1f MB>' % (len(self._items), self._bytes / MB)
+
+
+_contourCache = None
+
+
+def getContourCache() -> ContourCache:
+    """:return the (application-wide) ContourCache instance
+    """
+    global _contourCache
+
+    if _contourCache is None:
+        _contourCache = ContourCache()
+    return _contourCache
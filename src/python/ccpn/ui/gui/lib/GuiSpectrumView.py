@@ -367,6 +367,12 @@ class GuiSpectrumView(QtWidgets.QGraphicsObject):
         # MUST BE SUBCLASSED
         raise NotImplementedError("Code error: function not implemented")
 
+    def _isContourDecimationChanged(self) -> bool:
+        """Return True if the contours need rebuilding at a different resolution;
+        subclassed for nD spectra
+        """
+        return False
+
 
 def _spectrumViewHasChanged(data):
     """Change action icon colour and other changes when spectrumView changes.
@@ -31,6 +31,7 @@ import numpy as np
 from itertools import product
 from PyQt5 import QtGui
 from ccpn.ui.gui.lib.GuiSpectrumView import GuiSpectrumView, SpectrumCache
+from ccpn.ui.gui.lib.SlicePyramid import SlicePyramid
 from ccpn.util.Colour import spectrumColours, colorSchemeTable
 
 
@@ -61,6 +62,10 @@ class GuiSpectrumView1d(GuiSpectrumView):
         self.buildContours = True
         self.buildContoursOnly = False
 
+        # min/max decimation of the intensities, and the (factor, start, stop) of the current vertices
+        self._slicePyramid = None
+        self._decimation = None
+
     def getVisibleState(self, dimensionCount=None):
         """Get the visible state for the X/Y axes
         """
@@ -90,11 +95,40 @@ class GuiSpectrumView1d(GuiSpectrumView):
         GLSignals = GLNotifier(parent=self)
         GLSignals.emitPaintEvent()
 
-    def _buildGLContours(self, glList, firstShow=False):
-        # build a glList for the spectrum
+    def _buildGLContours(self, glList, firstShow=False, visibleRange=None, pixelCount=None):
+        """Build the vertex arrays of the spectrum; the data are decimated to pixelCount pixels
+        spanning visibleRange (ppm), or displayed at full resolution if visibleRange is None
+        """
+        # the intensities may have changed
+        self._slicePyramid = SlicePyramid(self.spectrum.intensities)
+        self._buildGLDecimated(glList, self._getDecimation(visibleRange, pixelCount))
+
+    def _getDecimation(self, visibleRange, pixelCount, margin=None):
+        """:return the (factor, start, stop) tuple of the decimation of visibleRange
+        """
+        # folded copies are drawn shifted by the spectral width, so the slice cannot be clipped
+        return self._slicePyramid.getRange(self.spectrum.positions, visibleRange, pixelCount,
+                                           clip=not self.spectrum.displayFoldedContours, margin=margin)
+
+    def _decimationChanged(self, visibleRange, pixelCount) -> bool:
+        """:return True if the current vertex arrays do not have the decimation required for
+        visibleRange and pixelCount; i.e. after zooming or panning beyond the built margins
+        """
+        if self._slicePyramid is None:
+            return False
+        return not SlicePyramid.covers(self._decimation, self._getDecimation(visibleRange, pixelCount, margin=0.0))
+
+    def _buildGLDecimated(self, glList, decimation):
+        """Build the vertex arrays of the spectrum for the (factor, start, stop) tuple decimation
+        """
         glList.clearArrays()
+        self._decimation = factor, start, stop = decimation
+
+        positions = self.spectrum.positions
+        intensities = self._slicePyramid.intensities
+        indices = self._slicePyramid.getIndices(start, stop, factor) if len(positions) else []
 
-        numVertices = len(self.spectrum.positions)
+        numVertices = len(indices)
         # glList.indices = numVertices
         glList.numVertices = numVertices
         # glList.indices = np.arange(numVertices, dtype=np.uint32)
@@ -114,8 +148,8 @@ class GuiSpectrumView1d(GuiSpectrumView):
         try:
             dim = self.strip.spectrumDisplay._flipped
             # may be empty
-            glList.vertices[dim::2] = self.spectrum.positions
-            glList.vertices[1 - dim::2] = self.spectrum.intensities
+            glList.vertices[dim::2] = positions[indices]
+            glList.vertices[1 - dim::2] = intensities[indices]
         except Exception:
             pass
 
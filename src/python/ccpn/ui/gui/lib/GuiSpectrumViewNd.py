@@ -31,15 +31,19 @@ from PyQt5 import QtGui
 import numpy as np
 from itertools import product
 from collections import namedtuple
+from functools import partial
+from math import floor, ceil
 from PyQt5 import QtCore, QtGui
 from numba import jit
 
 from ccpn.ui.gui.lib.GuiSpectrumView import GuiSpectrumView, SpectrumCache
+from ccpn.ui.gui.lib.ContourCache import getContourCache, buildContours
+from ccpn.ui.gui.lib.TraceCache import getTraceCache
 from ccpn.util import Colour
+from ccpn.util.Phasing import analyticData
 from ccpn.util.Logging import getLogger
 from ccpn.core.Spectrum import MAXALIASINGRANGE
 from ccpn.core.lib.ContextManagers import notificationEchoBlocking
-from ccpnc.contour import Contourer2d
 
 
 AxisPlaneData = namedtuple('AxisPlaneData', 'startPoint endPoint pointCount')
@@ -55,6 +59,26 @@ def _getLevels(count: int, base: float, factor: float) -> list:
     return levels
 
 
+def _getTileIndices(start, stop, pointCount, tileSize, wrap=False) -> list:
+    """:return the sorted indices of the tiles of tileSize points covering the (0-based, inclusive) point range
+    [start, stop] along an axis of pointCount points; points outside [0, pointCount) wrap around (wrap=True)
+    or are clipped
+    """
+    if wrap:
+        if stop - start + 1 >= pointCount:
+            return list(range(-(-pointCount // tileSize)))
+        start, stop = start % pointCount, stop % pointCount
+        ranges = [(start, stop)] if start <= stop else [(start, pointCount - 1), (0, stop)]
+    else:
+        ranges = [(max(start, 0), min(stop, pointCount - 1))]
+
+    tiles = set()
+    for first, last in ranges:
+        if first <= last:
+            tiles.update(range(first // tileSize, last // tileSize + 1))
+    return sorted(tiles)
+
+
 #=========================================================================================
 # GuiSpectrumViewNd
 #=========================================================================================
@@ -63,6 +87,12 @@ class GuiSpectrumViewNd(GuiSpectrumView):
 
     ###PeakListItemClass = PeakListNdItem
 
+    contourTileSize = 256  # number of points along both axes of the tiles of the region-limited contours
+    contourTileMargin = 0.5  # margin around the visible region, as a fraction of its width
+    contourTileFraction = 0.25  # the full plane is contoured if the tiles cover more than this fraction
+
+    _contoursReady = QtCore.pyqtSignal()  # emitted (from the worker thread) when background contours are built
+
     #def __init__(self, guiSpectrumDisplay, apiSpectrumView, dimMapping=None, region=None, **kwds):
     def __init__(self):
         """ guiSpectrumDisplay is the parent
@@ -73,6 +103,9 @@ class GuiSpectrumViewNd(GuiSpectrumView):
         self.posLevelsPrev = []
         self.negLevelsPrev = []
         self.zRegionPrev = None
+        self._contourDecimation = 1  # decimation factor of the planes of the current contours
+        self._contourKeys = set()  # keys of the contours being built in the background
+        self._contourTiles = None  # tiles of the current contours; None for the full plane
         self.posDisplayLists = []
         self.negDisplayLists = []
         self._traceScale = None  # For now: Initialised by CcpOpenGl._getSliceData
@@ -91,6 +124,8 @@ class GuiSpectrumViewNd(GuiSpectrumView):
         self.buildContours = True
         self.buildContoursOnly = False
 
+        self._contoursReady.connect(self._installContours)
+
     def _turnOnPhasing(self):
         """
         # CCPN INTERNAL - called by turnOnPhasing method of GuiStrip.
@@ -222,6 +257,10 @@ class GuiSpectrumViewNd(GuiSpectrumView):
     def _constructContours(self, posLevels, negLevels, glList=None):
         """Construct the contours for this spectrum using an OpenGL display list
         The way this is done here, any change in contour level needs to call this function.
+
+        Contours are taken from the contour cache if present; otherwise these are built on the worker pool
+        (preferences.general.backgroundContours) and the current contours are retained until the new ones
+        have arrived (see _contoursBuilt)
         """
 
         posLevelsArray = np.array(posLevels, np.float32)
@@ -231,58 +270,159 @@ class GuiSpectrumViewNd(GuiSpectrumView):
         self.negLevelsPrev = list(negLevels)
         self.zRegionPrev = tuple([tuple(axis.region) for axis in self.strip.orderedAxes[2:] if axis is not None])
 
-        # posContoursAll = negContoursAll = None
-        # numDims = self.spectrum.dimensionCount
-
         # get the positive/negative contour colour lists
-        _posColours = self._interpolateColours(self.posColours, posLevels)
-        _negColours = self._interpolateColours(self.negColours, negLevels)
+        _posColours = np.array(self._interpolateColours(self.posColours, posLevels), dtype=np.float32)
+        _negColours = np.array(self._interpolateColours(self.negColours, negLevels), dtype=np.float32)
+
+        flatten = not self._application.preferences.general.generateSinglePlaneContours
+        self._contourDecimation = self._getContourDecimation()
+        self._contourTiles = self._getContourTiles()
+        baseKey = self._getContourKey(posLevelsArray, negLevelsArray, _posColours, _negColours, flatten)
+
+        # the full plane, or the tiles covering the visible region
+        tiles = (None,) if self._contourTiles is None else self._contourTiles
+        cache = getContourCache()
+        tileContours = {tile: cache.get(baseKey + (tile,)) for tile in tiles}
+        missing = [tile for tile, contours in tileContours.items() if contours is None]
+
+        if not missing:
+            self._contourKeys = set()
+            self._setGLContours(glList, self._stitchContours(tileContours), self._contourDecimation)
+            return
 
-        contourList = None
+        contourKeys = {baseKey + (tile,) for tile in missing}
+        if contourKeys == self._contourKeys and all(cache.isPending(key) for key in contourKeys):
+            # already being built; keep the current contours
+            return
+
+        contours = None
         try:
-            if True:  # numDims < 3 or self._application.preferences.general.generateSinglePlaneContours:
-                dataArrays = tuple()
-
-                for position, dataArray in self._getPlaneData():
-                    # overlay all the planes into a single plane
-                    dataArrays += (dataArray,)
-                    # break
-
-                # moved to C Code
-                # if len(dataArrays) > 1 and not self._application.preferences.general.generateSinglePlaneContours:
-                #     sum = dataArrays[0]
-                #     for ii in range(1, len(dataArrays)):
-                #         sum = np.max(sum, dataArrays[ii].clip(0.0, 1e16)) + np.min(sum, dataArrays[ii].clip(-1e16, 0.0))
-                #     dataArrays = (sum,)
-
-                # build the contours
-                contourList = Contourer2d.contourerGLList(dataArrays,
-                                                          posLevelsArray,
-                                                          negLevelsArray,
-                                                          np.array(_posColours, dtype=np.float32),
-                                                          np.array(_negColours, dtype=np.float32),
-                                                          not self._application.preferences.general.generateSinglePlaneContours)
+            if self._application.preferences.general.backgroundContours:
+                # keep the current contours until the new ones have been built; pending builds of
+                # the previous request are superseded
+                previousKeys, self._contourKeys = self._contourKeys, contourKeys
+                for key in previousKeys - contourKeys:
+                    cache.cancel(key)
+                # the worker reads the planes of this request
+                getData = partial(self._getContourData, positions=list(self._getPlanePositions()),
+                                  decimation=self._contourDecimation)
+                if (dataSource := self.spectrum.dataSource) is not None and not dataSource._isReadyForBackgroundReading:
+                    # create/fill the hdf5 buffer here, as it may show a progress dialog
+                    with dataSource._readLock:
+                        dataSource._checkBuffer()
+                for tile in missing:
+                    key = baseKey + (tile,)
+                    if key in previousKeys and cache.isPending(key):
+                        # already requested
+                        continue
+                    if (future := cache.getPending(key)) is None:
+                        future = cache.submit(key, partial(getData, tile), posLevelsArray, negLevelsArray,
+                                              _posColours, _negColours, flatten)
+                    # else: being built for another strip with the same spectrum/plane/levels; share the result
+                    future.add_done_callback(partial(self._contoursBuilt, key))
+                return
+
+            for tile in missing:
+                tileContours[tile] = buildContours(self._getContourData(tile), posLevelsArray, negLevelsArray,
+                                                   _posColours, _negColours, flatten)
+                cache.put(baseKey + (tile,), tileContours[tile])
+            contours = self._stitchContours(tileContours)
 
         except Exception as es:
             getLogger().warning(f'Contouring error: {es}')
 
-        finally:
-            if contourList and contourList[1] > 0:
+        self._setGLContours(glList, contours, self._contourDecimation)
 
-                # self._expand(contourList[2])  # indices compressed inplace
+    def _getContourKey(self, posLevels, negLevels, posColours, negColours, flatten) -> tuple:
+        """:return the key of the contours in the contour cache; the tile is to be appended
+        """
+        dataSource = self.spectrum.dataSource
+        dataVersion = (id(dataSource), dataSource._dataVersion) if dataSource is not None else None
+        # the contoured data are scaled by spectrum.scale
+        return (self.spectrum.pid, dataVersion, self.spectrum.scale, tuple(self.dimensionIndices[:2]),
+                tuple(self._getPlanePositions()), self._contourDecimation,
+                posLevels.tobytes(), negLevels.tobytes(), posColours.tobytes(), negColours.tobytes(), flatten)
+
+    def _getContourData(self, tile=None, positions=None, decimation=None) -> tuple:
+        """:return a tuple with the data of the planes at positions (default: the visible planes) to be contoured;
+        the full planes, decimated by decimation (default: the contour decimation), if tile is None, or the
+        region of tile ((x0, x1), (y0, y1)), 0-based inclusive point ranges.
+        Called by the contouring worker with the positions and decimation of the request
+        """
+        positions = list(self._getPlanePositions()) if positions is None else positions
+        decimation = self._contourDecimation if decimation is None else decimation
+        if tile is None:
+            return tuple(dataArray for _position, dataArray in self._getPlaneData(decimation=decimation,
+                                                                                 positions=positions))
+
+        xDim, yDim = self.dimensionIndices[:2]
+        (x0, x1), (y0, y1) = tile
+        return tuple(self.spectrum.getPlaneRegionData(list(position), xDim=xDim + 1, yDim=yDim + 1,
+                                                      xLimits=(x0 + 1, x1 + 1), yLimits=(y0 + 1, y1 + 1))
+                     for position in positions)
 
-                # set the contour arrays for the GL object
-                glList.numVertices = contourList[1]
-                glList.indices = contourList[2]
-                glList.vertices = contourList[3]
-                glList.colors = contourList[4]
+    @staticmethod
+    def _stitchContours(tileContours):
+        """Combine the contours of the tiles into a single (numVertices, indices, vertices, colours) tuple
 
-            else:
-                # clear the arrays
-                glList.numVertices = 0
-                glList.indices = np.array((), dtype=np.uint32)
-                glList.vertices = np.array((), dtype=np.float32)
-                glList.colors = np.array((), dtype=np.float32)
+        :param tileContours: dict of (tile, contours) items; tile is ((x0, x1), (y0, y1)) or None for the full plane
+        """
+        if len(tileContours) == 1 and None in tileContours:
+            return tileContours[None]
+
+        numVertices = 0
+        indices, vertices, colours = [], [], []
+        for tile, (tileVertexCount, tileIndices, tileVertices, tileColours) in tileContours.items():
+            if tileVertexCount <= 0:
+                continue
+            (x0, _x1), (y0, _y1) = tile
+            indices.append(tileIndices + np.uint32(numVertices))
+            vertices.append((tileVertices.reshape((-1, 2)) + np.array((x0, y0), dtype=np.float32)).ravel())
+            colours.append(tileColours)
+            numVertices += tileVertexCount
+
+        if numVertices == 0:
+            return None
+        return numVertices, np.concatenate(indices), np.concatenate(vertices).astype(np.float32), np.concatenate(colours)
+
+    @staticmethod
+    def _setGLContours(glList, contours, decimation=1):
+        """Set the contour arrays of glList from contours, a (numVertices, indices, vertices, colours) tuple
+        """
+        if contours and contours[0] > 0:
+            numVertices, indices, vertices, colours = contours
+            if decimation > 1:
+                # map the points of the decimated planes onto the centres of their blocks
+                vertices = vertices * np.float32(decimation) + np.float32(0.5 * (decimation - 1))
+
+            # set the contour arrays for the GL object
+            glList.numVertices = numVertices
+            glList.indices = indices
+            glList.vertices = vertices
+            glList.colors = colours
+
+        else:
+            # clear the arrays
+            glList.numVertices = 0
+            glList.indices = np.array((), dtype=np.uint32)
+            glList.vertices = np.array((), dtype=np.float32)
+            glList.colors = np.array((), dtype=np.float32)
+
+    def _contoursBuilt(self, contourKey, future):
+        """Callback upon completion of a background contour build; executed in the worker thread
+        """
+        if future.cancelled() or future.exception() is not None or contourKey not in self._contourKeys:
+            return
+        # signal the gui thread
+        self._contoursReady.emit()
+
+    def _installContours(self):
+        """Install the contours built in the background; executed in the gui thread
+        """
+        if self.isDeleted or self.strip.isDeleted:
+            return
+        self.buildContoursOnly = True
+        self.strip._CcpnGLWidget.update()
 
     @staticmethod
     def _interpolateColours(colourList, levels):
@@ -310,20 +450,99 @@ class GuiSpectrumViewNd(GuiSpectrumView):
 
         return colours
 
-    def _getPlaneData(self):
+    def _getContourDecimation(self) -> int:
+        """:return the decimation factor of the planes for contouring at the current zoom;
+        the coarsest that still has one point per pixel (see Spectrum.getPlaneDataAtResolution)
+        """
+        from ccpn.core.lib.SpectrumDataSources.lib.PlanePyramid import getDecimationFactor
+
+        spectrum = self.spectrum
+        if not self._application.preferences.general.multiResolutionContours or spectrum.dataSource is None:
+            return 1
+
+        xDim, yDim = self.dimensionIndices[:2]
+        maxFactor = spectrum.dataSource.getMaxDecimationFactor(xDim=xDim + 1, yDim=yDim + 1)
+        if maxFactor == 1:
+            return 1
+
+        glWidget = self.strip._CcpnGLWidget
+        ppmPerPoints = spectrum.ppmPerPoints
+        return getDecimationFactor(abs(glWidget.pixelX) / ppmPerPoints[xDim],
+                                   abs(glWidget.pixelY) / ppmPerPoints[yDim],
+                                   maxFactor)
+
+    def _getContourTiles(self):
+        """:return a tuple of the tiles ((x0, x1), (y0, y1)), i.e. 0-based inclusive point ranges, covering the
+        visible region plus a margin; None if the full plane is to be contoured; i.e. when zoomed out or if the
+        tiles would cover a large part of the plane.
+        Adjacent tiles share their edge points, so that the contours connect
+        """
+        spectrum = self.spectrum
+        if not self._application.preferences.general.regionContours or \
+                self._contourDecimation > 1 or spectrum.dataSource is None:
+            return None
+
+        xDim, yDim = self.dimensionIndices[:2]
+        pointCounts = spectrum.pointCounts
+        folded = spectrum.displayFoldedContours
+        if folded and 'mirror' in (spectrum.foldingModes[xDim], spectrum.foldingModes[yDim]):
+            return None
+
+        glWidget = self.strip._CcpnGLWidget
+        tileSize = self.contourTileSize
+        tileIndices = []
+        for dim, ppmLimits in ((xDim, (glWidget.axisL, glWidget.axisR)), (yDim, (glWidget.axisB, glWidget.axisT))):
+            first, last = sorted(spectrum.ppm2point(ppm, dimension=dim + 1) - 1.0 for ppm in ppmLimits)
+            margin = self.contourTileMargin * (last - first) + 1.0
+            tileIndices.append(_getTileIndices(int(floor(first - margin)), int(ceil(last + margin)),
+                                               pointCounts[dim], tileSize, wrap=folded))
+
+        xTiles, yTiles = tileIndices
+        if len(xTiles) * len(yTiles) * tileSize * tileSize >= \
+                self.contourTileFraction * pointCounts[xDim] * pointCounts[yDim]:
+            return None
+        return tuple(((ix * tileSize, min((ix + 1) * tileSize, pointCounts[xDim] - 1)),
+                      (iy * tileSize, min((iy + 1) * tileSize, pointCounts[yDim] - 1)))
+                     for ix in xTiles for iy in yTiles)
+
+    def _isContourTilingChanged(self) -> bool:
+        """:return True if the contours need rebuilding for a different set of tiles; e.g. after panning
+        """
+        return self._getContourTiles() != self._contourTiles
+
+    def _isContourDecimationChanged(self) -> bool:
+        """:return True if the contours need rebuilding at a different resolution
+        """
+        return self._getContourDecimation() != self._contourDecimation
 
+    def _getPlaneData(self, decimation=1, positions=None):
+        """Yield (position, planeData) tuples for the planes at positions (default: the visible planes);
+        decimated by decimation along both axes
+        """
+        spectrum = self.spectrum
+        xDim, yDim = self.dimensionIndices[:2]
+
+        for position in (self._getPlanePositions() if positions is None else positions):
+            position = list(position)
+            if decimation > 1:
+                planeData, _factor = spectrum.getPlaneDataAtResolution(position, xDim=xDim + 1, yDim=yDim + 1,
+                                                                       xPointsPerPixel=decimation,
+                                                                       yPointsPerPixel=decimation)
+            else:
+                planeData = spectrum._getPlaneData(position, xDim=xDim + 1, yDim=yDim + 1)
+            yield position, planeData
+
+    def _getPlanePositions(self):
+        """Yield the position tuples (1-based) of the visible planes
+        """
         spectrum = self.spectrum
         dimensionCount = spectrum.dimensionCount
         dimIndices = self.dimensionIndices
-        xDim = dimIndices[0]
-        yDim = dimIndices[1]
 
         orderedAxes = self.strip.axes
 
         if dimensionCount == 2:
-            planeData = spectrum.getPlaneData(xDim=xDim + 1, yDim=yDim + 1)
-            position = [1, 1]
-            yield position, planeData
+            yield (1, 1)
 
         elif dimensionCount == 3:
 
@@ -341,8 +560,7 @@ class GuiSpectrumViewNd(GuiSpectrumView):
             for z in range(axisData.startPoint, axisData.endPoint,
                            1 if axisData.endPoint > axisData.startPoint else -1):
                 position[dimIndices[2]] = (z % axisData.pointCount) + 1
-                planeData = spectrum.getPlaneData(position, xDim=xDim + 1, yDim=yDim + 1)
-                yield position, planeData
+                yield tuple(position)
 
         elif dimensionCount >= 4:
 
@@ -367,9 +585,7 @@ class GuiSpectrumViewNd(GuiSpectrumView):
                     _axis = axes[dim]
                     position[dimIndices[dim + _offset]] = (pos % axes[dim].pointCount) + 1
 
-                # get the plane data
-                planeData = spectrum.getPlaneData(position, xDim=xDim + 1, yDim=yDim + 1)
-                yield position, planeData
+                yield tuple(position)
 
     def _getAxisInfo(self, orderedAxes, axisIndex):
         """Get the information for the required axis
@@ -502,33 +718,36 @@ class GuiSpectrumViewNd(GuiSpectrumView):
         GLSignals = GLNotifier(parent=self)
         GLSignals.emitPaintEvent()
 
-    def _getSliceData(self, points, sliceDim):
+    def _getSliceData(self, points, sliceDim, analytic=False):
         """Get the slice along sliceDim.
         Separate routine to allow for caching,
-        uses Spectrum._getSliceDataFromPlane for efficient extraction of slices
+        uses the TraceCache for cached and prefetched extraction of slices
 
         points as integer list, with points[sliceDim-1] set to 1, as this allows
         the cached _getSliceFromPlane to work best
 
-        return sliceData numpy array
+        return sliceData numpy array; or a (sliceData, analyticData) tuple of numpy arrays if analytic is True
+        (see Phasing.phaseAnalyticData). The arrays are cached and are not to be modified
         """
 
         # need to block logging
         with notificationEchoBlocking(self.application):
-            axisCodes = [a.code for a in self.strip.axes][0:2]
-            # planeDims = spectrumView.spectrum.getByAxisCodes('dimensions', axisCodes)
             pointCounts = self.spectrum.pointCounts
             pointInt = [int(round(pnt) % pointCounts[ii]) + 1 for ii, pnt in enumerate(points)]
             pointInt[sliceDim - 1] = 1  # To improve caching; points, dimensions are 1-based
 
-            # GWV: why copy again into numpy array? the routine already returns this
-            # data = np.array(spectrumView.spectrum._getSliceDataFromPlane(position=pointInt,
-            #                                                              xDim=planeDims[0], yDim=planeDims[1], sliceDim=sliceDim))
-            # GWV reverted to getSliceData
-            data = self.spectrum.getSliceData(position=pointInt, sliceDim=sliceDim)
+            if self.spectrum.dataSource is None:
+                # GWV reverted to getSliceData
+                data = self.spectrum.getSliceData(position=pointInt, sliceDim=sliceDim)
+                analytic = analyticData(data) if analytic else None
+            elif analytic:
+                data, analytic = getTraceCache().getAnalyticSlice(self.spectrum, pointInt, sliceDim)
+            else:
+                data, analytic = getTraceCache().getSlice(self.spectrum, pointInt, sliceDim), None
+
             if self._traceScale is None:
                 self._traceScale = 1.0 / max(data) * 0.5
-        return data
+        return data if analytic is None else (data, analytic)
 
     def _getVisibleSpectrumViewParams(self, dimRange=None, delta=None, stacking=None) -> SpectrumCache:
         """Get parameters for axisDim'th axis (zero-origin) of spectrum in display-order.
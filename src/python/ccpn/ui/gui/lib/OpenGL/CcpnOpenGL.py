@@ -99,6 +99,7 @@ from ccpn.ui.gui.lib.mouseEvents import (leftMouse, shiftLeftMouse, controlLeftM
                                          makeDragEvent)
 from ccpn.ui.gui.lib.OpenGL import GL
 from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLNotifier import GLNotifier
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLScheduler import GLRenderScheduler
 from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLGlobal import GLGlobalData
 from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLFonts import GLString
 from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLSimpleLabels import GLSimpleStrings
@@ -231,6 +232,8 @@ class CcpnGLWidget(QOpenGLWidget):
         self.setMinimumSize(self.AXIS_MARGINRIGHT + 10, self.AXIS_MARGINBOTTOM + 10)
         # initialise the pyqt-signal notifier
         self.GLSignals = GLNotifier(parent=self, strip=strip)
+        self._renderScheduler = GLRenderScheduler()
+        self._paintMode = PaintModes.PAINT_ALL
         self.lastPixelRatio = None
         self._setStyle()
 
@@ -505,8 +508,21 @@ class CcpnGLWidget(QOpenGLWidget):
 
     def update(self, mode=PaintModes.PAINT_ALL):
         """Update the glWidget with the correct refresh mode
+        Full repaints are coalesced into frames by the render-scheduler
+        """
+        if mode == PaintModes.PAINT_ALL:
+            self._renderScheduler.requestUpdate(self)
+            return
+
+        if self._paintMode != PaintModes.PAINT_ALL:
+            # a full repaint that has not been painted yet takes precedence
+            self._paintMode = mode
+        super().update()
+
+    def _updateFrame(self):
+        """Full repaint released by the render-scheduler
         """
-        self._paintMode = mode
+        self._paintMode = PaintModes.PAINT_ALL
         super().update()
 
     def rescale(self, rescaleOverlayText=True, rescaleMarksRulers=True,
@@ -615,6 +631,10 @@ class CcpnGLWidget(QOpenGLWidget):
 
             self._buildSpectrumSetting(spectrumView=spectrumView, stackCount=stackCount)
 
+            if spectrumView._isContourDecimationChanged() or spectrumView._isContourTilingChanged():
+                # zoomed across a level of the multi-resolution planes, or panned/zoomed beyond the contoured tiles
+                spectrumView.buildContoursOnly = True
+
     def setXRegion(self, axisL=None, axisR=None):
         if axisL is not None:
             self.axisL = axisL
@@ -3145,6 +3165,10 @@ class CcpnGLWidget(QOpenGLWidget):
             if not self._ordering:
                 return
 
+            # rebuilt before the frame was released, e.g. on resize; a pending full repaint is redundant
+            self._renderScheduler.takeRequest(self)
+
+            _buildStart = time.perf_counter()
             for _ in self.glBlocking():
                 # simple profile of building all
 
@@ -3177,7 +3201,9 @@ class CcpnGLWidget(QOpenGLWidget):
                         objList._caching = False
                         objList._objCache = None
 
+                _paintStart = time.perf_counter()
                 self._paintGL()
+                self._renderScheduler.addTimings(_paintStart - _buildStart, time.perf_counter() - _paintStart)
 
             # make all following paint events into mouse only
             # so only paints a single frame from an update event
@@ -4786,7 +4812,7 @@ class CcpnGLWidget(QOpenGLWidget):
                              point, dim, positionPixel):
 
         try:
-            data = spectrumView._getSliceData(points=point, sliceDim=dim)
+            data, analytic = spectrumView._getSliceData(points=point, sliceDim=dim, analytic=True)
             x = spectrumView.spectrum.getPpmArray(dimension=dim)
             _posColour = spectrumView.posColours[0]
             colR, colG, colB = _posColour[0:3]
@@ -4817,6 +4843,7 @@ class CcpnGLWidget(QOpenGLWidget):
 
             # store the pre-phase data
             hSpectrum.data = data
+            hSpectrum.analytic = analytic
             hSpectrum.positionPixel = positionPixel
             hSpectrum.spectrumView = spectrumView
 
@@ -4827,7 +4854,7 @@ class CcpnGLWidget(QOpenGLWidget):
                              point, dim, positionPixel):
 
         try:
-            data = spectrumView._getSliceData(points=point, sliceDim=dim)
+            data, analytic = spectrumView._getSliceData(points=point, sliceDim=dim, analytic=True)
             y = spectrumView.spectrum.getPpmArray(dimension=dim)
             _posColour = spectrumView.posColours[0]
             colR, colG, colB = _posColour[0:3]
@@ -4858,6 +4885,7 @@ class CcpnGLWidget(QOpenGLWidget):
 
             # store the pre-phase data
             vSpectrum.data = data
+            vSpectrum.analytic = analytic
             vSpectrum.positionPixel = positionPixel
             vSpectrum.spectrumView = spectrumView
 
@@ -4869,10 +4897,12 @@ class CcpnGLWidget(QOpenGLWidget):
                           ph0=None, ph1=None, pivot=None):
 
         try:
-            data = spectrumView._getSliceData(points=point, sliceDim=dim)
-
             if ph0 is not None and ph1 is not None and pivot is not None:
-                data = Phasing.phaseRealData(data, ph0, ph1, pivot)
+                # only the phase-correction is recomputed for the cached trace
+                _data, analytic = spectrumView._getSliceData(points=point, sliceDim=dim, analytic=True)
+                data = Phasing.phaseAnalyticData(analytic, ph0, ph1, pivot)
+            else:
+                data = spectrumView._getSliceData(points=point, sliceDim=dim)
 
             x = spectrumView.spectrum.getPpmArray(dimension=dim)
 
@@ -4927,10 +4957,12 @@ class CcpnGLWidget(QOpenGLWidget):
                           ph0=None, ph1=None, pivot=None):
 
         try:
-            data = spectrumView._getSliceData(points=point, sliceDim=dim)
-
             if ph0 is not None and ph1 is not None and pivot is not None:
-                data = Phasing.phaseRealData(data, ph0, ph1, pivot)
+                # only the phase-correction is recomputed for the cached trace
+                _data, analytic = spectrumView._getSliceData(points=point, sliceDim=dim, analytic=True)
+                data = Phasing.phaseAnalyticData(analytic, ph0, ph1, pivot)
+            else:
+                data = spectrumView._getSliceData(points=point, sliceDim=dim)
 
             y = spectrumView.spectrum.getPpmArray(dimension=dim)
             x = positionPixel[0] + spectrumView._traceScale * (self.axisL - self.axisR) * data
@@ -5148,7 +5180,7 @@ class CcpnGLWidget(QOpenGLWidget):
                     axisIndex = specView.dimensionIndices[direction]
                     pivot = specView.spectrum.ppm2point(pivotPpm, dimension=axisIndex + 1)
                     positionPixel = trace.positionPixel
-                    preData = Phasing.phaseRealData(trace.data, ph0, ph1, pivot)
+                    preData = Phasing.phaseAnalyticData(trace.analytic, ph0, ph1, pivot)
 
                     if self.is1D:
                         trace.vertices[1::2] = preData
@@ -5178,7 +5210,7 @@ class CcpnGLWidget(QOpenGLWidget):
                     axisIndex = specView.dimensionIndices[direction]
                     pivot = specView.spectrum.ppm2point(pivotPpm, dimension=axisIndex + 1)
                     positionPixel = trace.positionPixel
-                    preData = Phasing.phaseRealData(trace.data, ph0, ph1, pivot)
+                    preData = Phasing.phaseAnalyticData(trace.analytic, ph0, ph1, pivot)
 
                     if self.is1D:
                         trace.vertices[::2] = preData
@@ -6687,45 +6719,18 @@ class CcpnGLWidget(QOpenGLWidget):
                         xAxis = spectrumIndices[0]
                         yAxis = spectrumIndices[1]
 
-                        # for peak in peakList.peaks:
-                        for drawList in labelling.stringList:
-
-                            try:
-                                peak = drawList.stringObject
-                                # NOTE:ED - need to speed this up
-                                pView = peak.getPeakView(peakListView)
-                                _pos = peak.position
-                                px, py = float(_pos[xAxis]), float(_pos[yAxis])
-                                tx, ty = pView.textOffset
-                                if not tx and not ty:
-                                    # pixels
-                                    tx, ty = self._symbolSize, self._symbolSize
-                                    # ppm
-                                    # tx, ty = self.symbolX, self.symbolY
-
-                                # pixels
-                                # mx, my = px + (tx + drawList.width / 2) * pixX, py + (ty + drawList.height / 2) * pixY
-                                # ppms
-                                mx, my = px + tx * sgnX + drawList.width * pixX / 2, py + ty * sgnY + drawList.height * pixY / 2
-
-                                if (xPositions[0] < px < xPositions[1] and yPositions[0] < py < yPositions[1]) or \
-                                        (xPositions[0] < mx < xPositions[1] and yPositions[0] < my < yPositions[1]):
-                                    if len(peak.axisCodes) > 2 and zPositions is not None:
-                                        # zAxis = spectrumIndices[2]
-
-                                        # within the XY bounds so check whether inPlane
-                                        _isInPlane, _isInFlankingPlane, planeIndex, fade = self._GLPeaks.objIsInVisiblePlanes(
-                                                spectrumView, peak)
-
-                                        # if zPositions[0] < float(peak.position[zAxis]) < zPositions[1]:
-                                        if _isInPlane or _isInFlankingPlane:
-                                            peaks.add(peak)
-                                    else:
-                                        peaks.add(peak)
+                        # query the spatial index of the symbols/labels
+                        hitIndex = labelling.getHitIndex((xAxis, yAxis))
+                        for peak in hitIndex.regionHits(xPositions, yPositions, pixX, pixY, self._symbolSize):
+                            if len(peak.axisCodes) > 2 and zPositions is not None:
+                                # within the XY bounds so check whether inPlane
+                                _isInPlane, _isInFlankingPlane, planeIndex, fade = self._GLPeaks.objIsInVisiblePlanes(
+                                        spectrumView, peak)
 
-                            except Exception:
-                                # NOTE:ED - skip for now
-                                continue
+                                if _isInPlane or _isInFlankingPlane:
+                                    peaks.add(peak)
+                            else:
+                                peaks.add(peak)
 
         self.current.peaks = list(currentPeaks | peaks)
 
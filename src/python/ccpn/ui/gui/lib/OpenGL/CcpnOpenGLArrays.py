@@ -31,6 +31,8 @@ import ctypes
 import numpy as np
 from ccpn.ui.gui.lib.OpenGL import GL
 from ccpn.ui.gui.lib.OpenGL import VBO
+from ccpn.ui.gui.lib.OpenGL import CcpnOpenGLDefs as GLDefs
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLHitIndex import GLHitIndex
 from ccpn.util.Logging import getLogger
 from ccpn.util.Common import isRHEL
 from ccpn.ui.gui.guiSettings import consoleStyle
@@ -2038,18 +2040,281 @@ else:
 # GLSymbolArray
 #=========================================================================================
 
+class _RemovedItem:
+    """Placeholder for the object of an item removed from a GLSymbolArray
+    """
+    isDeleted = True
+    pid = None
+
+    def __bool__(self):
+        return False
+
+
+REMOVEDITEM = _RemovedItem()
+
+
+class _GrowableArray:
+    """
+    A 1D numpy array with spare capacity; the capacity is doubled when full, so that appending is
+    amortised O(1). array is a view of the filled part of the buffer.
+    """
+
+    minimumCapacity = 64
+
+    def __init__(self, dtype):
+        self._buffer = np.empty(0, dtype=dtype)
+        self._count = 0
+
+    @property
+    def array(self):
+        """The filled part of the buffer
+        """
+        return self._buffer[:self._count]
+
+    def set(self, values):
+        """Replace the contents by values; e.g. when all arrays are rebuilt
+        """
+        self._buffer = np.asarray(values, dtype=self._buffer.dtype).ravel()
+        self._count = len(self._buffer)
+
+    def append(self, values):
+        """Append values to the end of the filled part, doubling the capacity as required
+        """
+        values = np.asarray(values, dtype=self._buffer.dtype).ravel()
+        count = self._count
+        end = count + len(values)
+        if end > len(self._buffer):
+            buffer = np.empty(max(end, 2 * len(self._buffer), self.minimumCapacity), dtype=self._buffer.dtype)
+            buffer[:count] = self._buffer[:count]
+            self._buffer = buffer
+        self._buffer[count:end] = values
+        self._count = end
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+
+def _growableProperty(name, doc):
+    """:return a property for the growable array name of a GLSymbolArray
+    """
+
+    def _get(self):
+        return self._arrays[name].array
+
+    def _set(self, value):
+        self._arrays[name].set(value)
+
+    def _del(self):
+        self._arrays[name].set(())
+
+    return property(_get, _set, _del, doc)
+
+
 class GLSymbolArray(GLVertexArray):
     """
     Array class to handle symbols.
+
+    The items (i.e. the symbols of the objects) occupy slots of LENPID elements in the pids array,
+    with a dict mapping the objects to their slot; the slot holds the offset of the vertices of the item,
+    so the slots are not necessarily in the order of the vertices.
+    The arrays have spare capacity, so that appending an item (see appendIndices, appendVertices, ... and
+    appendPids) does not copy the arrays.
+    Removing an item leaves its vertices in place and turns its primitives into degenerate primitives
+    (all indices point to the first vertex of the item); the slot is tombstoned with REMOVEDITEM,
+    and reused by the next appended item.
+    The arrays are compacted when the fraction of removed vertices exceeds compactFraction.
+    Changes may be collected and pushed to the graphics card in a single upload (see pushPendingAliasedIndexVBO).
     """
 
+    compactFraction = 0.25
+
+    indices = _growableProperty('indices', """Array of the indices of the primitives""")
+    vertices = _growableProperty('vertices', """Array of dimension elements per vertex""")
+    colors = _growableProperty('colors', """Array of the rgba-colours per vertex""")
+    attribs = _growableProperty('attribs', """Array of the attributes per vertex""")
+    offsets = _growableProperty('offsets', """Array of the offsets per vertex""")
+
     def __init__(self, GLContext=None, spectrumView=None, objListView=None):
+        self._arrays = {'indices'  : _GrowableArray(np.uint32),
+                        'vertices' : _GrowableArray(np.float32),
+                        'colors'   : _GrowableArray(np.float32),
+                        'attribs'  : _GrowableArray(np.float32),
+                        'offsets'  : _GrowableArray(np.float32),
+                        'pids'     : _GrowableArray(np.object_),
+                        }
+        self._slots = None
+        self._freeSlots = []
+        self._removedVertices = []
+        self._pushPending = False
         super().__init__(renderMode=GLRENDERMODE_REBUILD,
                          blendMode=False, drawMode=GL.GL_LINES,
                          dimension=4, GLContext=GLContext)
         self.spectrumView = spectrumView
         self.objListView = objListView
 
+    @property
+    def _pids(self):
+        return self._arrays['pids'].array
+
+    @property
+    def pids(self):
+        """Array of LENPID elements per item: obj, vertexOffset, numPoints, ..., indexStart, indexEnd, ...
+        """
+        return self._arrays['pids'].array
+
+    @pids.setter
+    def pids(self, value):
+        self._arrays['pids'].set(value)
+        self._slots = None  # rebuilt on demand
+        self._freeSlots = [pp for pp in range(0, len(self._pids), GLDefs.LENPID) if self._pids[pp] is REMOVEDITEM]
+
+    @pids.deleter
+    def pids(self):
+        self._arrays['pids'].set(())
+        self._slots = None
+        self._freeSlots = []
+
+    def clearArrays(self):
+        """Clear and reset all arrays
+        """
+        super().clearArrays()
+        self.resetSlots()
+
+    def resetSlots(self):
+        """Reset the removed items; e.g. when all arrays are rebuilt
+        """
+        self._slots = None
+        self._removedVertices = []
+
+    def getSlot(self, obj):
+        """:return the offset of the slot of obj in the pids array; None if not present
+        """
+        if self._slots is None:
+            _lenPid = GLDefs.LENPID
+            self._slots = {pid: pp * _lenPid for pp, pid in enumerate(self._pids[0::_lenPid])
+                           if pid is not REMOVEDITEM}
+        return self._slots.get(obj)
+
+    def appendIndices(self, values):
+        """Append values to the indices array
+        """
+        self._arrays['indices'].append(values)
+
+    def appendVertices(self, values):
+        """Append values to the vertices array
+        """
+        self._arrays['vertices'].append(values)
+
+    def appendColors(self, values):
+        """Append values to the colors array
+        """
+        self._arrays['colors'].append(values)
+
+    def appendAttribs(self, values):
+        """Append values to the attribs array
+        """
+        self._arrays['attribs'].append(values)
+
+    def appendOffsets(self, values):
+        """Append values to the offsets array
+        """
+        self._arrays['offsets'].append(values)
+
+    def appendPids(self, values):
+        """Add the LENPID values of a new item to the pids array; in the slot of a removed item if available
+        """
+        if self._freeSlots:
+            offset = self._freeSlots.pop()
+            self._pids[offset:offset + GLDefs.LENPID] = values
+        else:
+            offset = len(self._pids)
+            self._arrays['pids'].append(values)
+        if self._slots is not None:
+            # the other slots are unchanged
+            self._slots[values[0]] = offset
+
+    def removeItem(self, obj, numPoints=None):
+        """Remove the item of obj; its primitives are made degenerate and its slot is tombstoned
+
+        :param obj: the object to remove
+        :param numPoints: the number of vertices of the item; defaults to the value stored in pids
+        :return True if obj was present
+        """
+        if (pp := self.getSlot(obj)) is None:
+            return False
+
+        pids = self._pids
+        offset = pids[pp + 1]
+        if numPoints is None:
+            numPoints = pids[pp + 2]
+        indexStart, indexEnd = pids[pp + 6], pids[pp + 7]
+
+        self.indices[indexStart:indexEnd] = offset
+        pids[pp] = REMOVEDITEM
+        del self._slots[obj]
+        self._freeSlots.append(pp)
+        self._removedVertices.append((offset, offset + numPoints))
+        return True
+
+    @property
+    def isFragmented(self) -> bool:
+        """True if the fraction of removed vertices exceeds compactFraction
+        """
+        removed = sum(end - start for start, end in self._removedVertices)
+        return removed > 0 and removed >= self.compactFraction * self.numVertices
+
+    def compact(self):
+        """Remove the vertices, primitives and slots of the removed items from the arrays
+        """
+        if not self._removedVertices:
+            return
+
+        _lenPid = GLDefs.LENPID
+        stride = self.dimension
+        vertexCount = len(self.vertices) // stride
+        keep = np.ones(vertexCount, dtype=bool)
+        for start, end in self._removedVertices:
+            keep[start:end] = False
+        newVertex = np.cumsum(keep) - 1
+
+        # primitives referencing removed vertices are removed as a whole
+        keepIndex = keep[self.indices]
+        newIndexPos = np.concatenate(([0], np.cumsum(keepIndex)))
+
+        slots = self._pids.reshape((-1, _lenPid))
+        alive = np.array([pid is not REMOVEDITEM for pid in slots[:, 0]], dtype=bool)
+        slots = slots[alive].copy()
+        if len(slots):
+            slots[:, 1] = newVertex[slots[:, 1].astype(np.int64)]
+            slots[:, 6] = newIndexPos[slots[:, 6].astype(np.int64)]
+            slots[:, 7] = newIndexPos[slots[:, 7].astype(np.int64)]
+
+        self.indices = newVertex[self.indices[keepIndex]].astype(np.uint32)
+        for name in ('vertices', 'colors', 'attribs', 'offsets'):
+            arr = getattr(self, name)
+            if arr is not None and len(arr) == vertexCount * stride:
+                setattr(self, name, arr.reshape((-1, stride))[keep].ravel())
+        self.numVertices = int(np.count_nonzero(keep[:self.numVertices]))
+        self.pids = slots.ravel()
+        self._removedVertices = []
+
+    def setPushPending(self):
+        """Flag the arrays to be pushed to the graphics card on the next pushPendingAliasedIndexVBO
+        """
+        self._pushPending = True
+
+    def pushPendingAliasedIndexVBO(self):
+        """Push the arrays to the graphics card if flagged by setPushPending; compact first if fragmented.
+        Collects the changes of multiple create/change/delete notifiers into a single upload
+        """
+        if not self._pushPending:
+            return
+        self._pushPending = False
+        if self.isFragmented:
+            self.compact()
+        self.pushAliasedIndexVBO()
+
 
 #=========================================================================================
 # GLLabelArray
@@ -2067,3 +2332,32 @@ class GLLabelArray(GLVertexArray):
         self.spectrumView = spectrumView
         self.objListView = objListView
         self.stringList = []
+        self._hitIndex = None
+
+    def getHitIndex(self, dims):
+        """Get the spatial index of the labels for hit-testing; rebuilt on first use after invalidateHitIndex
+        :param dims: the (x, y) indices of the object positions
+        """
+        if self._hitIndex is None or self._hitIndex.dims != tuple(dims):
+            self._hitIndex = GLHitIndex.fromStringList(self.stringList, self.objListView, dims)
+        return self._hitIndex
+
+    def invalidateHitIndex(self):
+        """Invalidate the spatial index, e.g. when labels have been added/removed
+        """
+        self._hitIndex = None
+
+    def addToHitIndex(self, drawStr):
+        """Add the label drawStr, appended to the stringList, to the spatial index; if built
+        """
+        if self._hitIndex is not None:
+            self._hitIndex.addString(drawStr, self.objListView)
+
+    def removeFromHitIndex(self, obj):
+        """Remove the label of obj from the spatial index; if built.
+        The index is rebuilt on next use when more than half of its labels have been removed
+        """
+        if self._hitIndex is not None:
+            self._hitIndex.remove(obj)
+            if self._hitIndex.isFragmented:
+                self._hitIndex = None
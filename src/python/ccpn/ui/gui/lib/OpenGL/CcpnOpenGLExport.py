@@ -2404,6 +2404,9 @@ class GLExporter():
 
         for ii in range(0, len(indArray.indices), indexLen):
             ii0 = [int(ind) for ind in indArray.indices[ii:ii + indexLen]]
+            if len(set(ii0)) == 1:
+                # skip degenerate primitives, e.g. of removed symbols
+                continue
 
             newLine = []
             for vv in ii0:
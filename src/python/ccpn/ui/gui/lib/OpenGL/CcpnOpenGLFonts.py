@@ -43,6 +43,8 @@ FULL_FONT_NAME = 1
 GLGlyphTuple = namedtuple('GLGlyphTuple', 'xPos yPos width height xOffset yOffset origW origH kerns '
                                           'TX0 TY0 TX1 TY1 PX0 PY0 PX1 PY1')
 
+MAXLAYOUTS = 8192  # maximum number of string-layouts cached per font
+
 
 #=========================================================================================
 # CcpnGLFont
@@ -136,6 +138,7 @@ class CcpnGLFont():
         _glyphs.height = 0
         _glyphs.spaceWidth = 0
         _glyphs.fontTransparency = fontTransparency
+        _glyphs._layouts = {}  # cache of string-layouts, see GLString.buildString
 
         # texture sizes
         dx = 1.0 / float(self.fontPNG.shape[1])
@@ -270,25 +273,60 @@ class GLString(GLVertexArray):
         ox, oy = self._offset
         # self.pid = self.stringObject.pid if hasattr(self.stringObject, 'pid') else None
 
+        # the layout of the glyphs only depends on the text, angle and scale; labels often share the same text
+        _layouts = font._layouts
+        key = (text, self._angle, self._scale)
+        if (layout := _layouts.get(key)) is None:
+            layout = self._layoutString(text, font, self._angle, self._scale)
+            if len(_layouts) >= MAXLAYOUTS:
+                _layouts.clear()
+            _layouts[key] = layout
+
+        vertices, indices, texcoords, self.width, self.height = layout
+        self.vertices = vertices.copy()
+        self.vertices[2::4] = self._alias
+        self.indices = indices.copy()
+        self.texcoords = texcoords.copy()
+        self.indexOffset = 0
+
+        # set the offsets for the characters to the desired coordinates
+        self.numVertices = len(self.vertices) // 4
+        self.attribs = np.array((x + ox, y + oy, 0.0, 0.0) * self.numVertices, dtype=np.float32)
+        self.offsets = np.array((x, y, 0.0, 0.0) * self.numVertices, dtype=np.float32)
+        self.stringOffset = None  # (ox, oy)
+
+        # set the colour for the whole string
+        self.colors = np.array(colour * self.numVertices, dtype=np.float32)
+
+        # create VBOs from the arrays
+        self.defineTextArrayVBO()
+
+        # total width of text - probably don't need
+        # width = penX - glyph.advance[0] / 64.0 + glyph.size[0]
+
+    @staticmethod
+    def _layoutString(text, font, angle, scale):
+        """Layout the glyphs of text in font; the alias of the vertices is set to 0.0
+        :return tuple(vertices, indices, texcoords, width, height)
+        """
         _glyphs = font.glyphs
-        self.height = font.height
-        self.width = 0
+        height = font.height
+        width = 0
 
         _validText = [tt for tt in text if _glyphs[ord(tt)] and ord(tt) > 32]
         lenText = len(_validText)
 
         # allocate space for all the letters, bad are discarded, spaces/tabs are not stored
-        self.indices = np.empty(lenText * 6, dtype=np.uint32)
-        self.vertices = np.zeros(lenText * 16, dtype=np.float32)
-        self.texcoords = np.empty(lenText * 8, dtype=np.float32)
+        indices = np.empty(lenText * 6, dtype=np.uint32)
+        vertices = np.zeros(lenText * 16, dtype=np.float32)
+        texcoords = np.empty(lenText * 8, dtype=np.float32)
 
-        self.indexOffset = 0
         penX = 0
         penY = 0  # offset the string from (0, 0) and use (x, y) in shader
         prev = None
 
-        if self._angle != 0.0:
-            cs, sn = math.cos(self._angle), math.sin(self._angle)
+        if angle != 0.0:
+            cs, sn = math.cos(angle), math.sin(angle)
         else:
             cs, sn = 1.0, 0.0
         # rotate = np.matrix([[cs, sn], [-sn, cs]])
@@ -319,13 +357,13 @@ class GLString(GLVertexArray):
                 i8 = i * 8
                 i16 = i * 16
 
-                if self._angle == 0.0:
+                if angle == 0.0:
                     # horizontal text
-                    self.vertices[i16:i16 + 16] = (x0, y0, self._alias, 0.0,
-                                                   x0, y1, self._alias, 0.0,
-                                                   x1, y1, self._alias, 0.0,
-                                                   x1, y0, self._alias, 0.0,
-                                                   )  # pixel coordinates in string
+                    vertices[i16:i16 + 16] = (x0, y0, 0.0, 0.0,
+                                              x0, y1, 0.0, 0.0,
+                                              x1, y1, 0.0, 0.0,
+                                              x1, y0, 0.0, 0.0,
+                                              )  # pixel coordinates in string
                 else:
                     # apply rotation to the text
                     xbl, ybl = x0 * cs + y0 * sn, -x0 * sn + y0 * cs
@@ -333,18 +371,14 @@ class GLString(GLVertexArray):
                     xtr, ytr = x1 * cs + y1 * sn, -x1 * sn + y1 * cs
                     xbr, ybr = x1 * cs + y0 * sn, -x1 * sn + y0 * cs
 
-                    self.vertices[i16:i16 + 16] = (xbl, ybl, self._alias, 0.0,
-                                                   xtl, ytl, self._alias, 0.0,
-                                                   xtr, ytr, self._alias, 0.0,
-                                                   xbr, ybr, self._alias, 0.0,
-                                                   )  # pixel coordinates in string
+                    vertices[i16:i16 + 16] = (xbl, ybl, 0.0, 0.0,
+                                              xtl, ytl, 0.0, 0.0,
+                                              xtr, ytr, 0.0, 0.0,
+                                              xbr, ybr, 0.0, 0.0,
+                                              )  # pixel coordinates in string
 
-                self.indices[i6:i6 + 6] = (i4, i4 + 1, i4 + 2, i4, i4 + 2, i4 + 3)
-                self.texcoords[i8:i8 + 8] = (u0, v0, u0, v1, u1, v1, u1, v0)
-
-                # # store the attribs and offsets
-                # self.attribs[i * 4:i * 4 + 4] = attribs
-                # self.offsets[i * 4:i * 4 + 4] = offsets
+                indices[i6:i6 + 6] = (i4, i4 + 1, i4 + 2, i4, i4 + 2, i4 + 3)
+                texcoords[i8:i8 + 8] = (u0, v0, u0, v1, u1, v1, u1, v0)
 
                 penX += glyph.origW + kerning
                 i += 1
@@ -355,42 +389,27 @@ class GLString(GLVertexArray):
             elif (c == 10):  # newline
                 penX = 0
                 penY = 0  # penY + font.height
-                # for vt in self.vertices:
-                #   vt[1] = vt[1] + font.height
 
                 # move all characters up by font height, centred bottom-left
-                self.vertices[1::4] += font.height
-                self.height += font.height
+                vertices[1::4] += font.height
+                height += font.height
 
             elif (c == 9):  # tab
                 penX += 4 * font.spaceWidth
 
-            self.width = max(self.width, penX)
+            width = max(width, penX)
 
             # penY = penY + glyph[GlyphHeight]
             prev = charCode
 
-        if not (0.9999 < self._scale < 1.0001):  # strange - need to remove
+        if not (0.9999 < scale < 1.0001):  # strange - need to remove
             # apply font scaling for hi-res displays - shader will do this soon
-            self.vertices[::4] /= self._scale
-            self.vertices[1::4] /= self._scale
-            self.height /= self._scale
-            self.width /= self._scale
-
-        # set the offsets for the characters to the desired coordinates
-        self.numVertices = len(self.vertices) // 4
-        self.attribs = np.array((x + ox, y + oy, 0.0, 0.0) * self.numVertices, dtype=np.float32)
-        self.offsets = np.array((x, y, 0.0, 0.0) * self.numVertices, dtype=np.float32)
-        self.stringOffset = None  # (ox, oy)
+            vertices[::4] /= scale
+            vertices[1::4] /= scale
+            height /= scale
+            width /= scale
 
-        # set the colour for the whole string
-        self.colors = np.array(colour * self.numVertices, dtype=np.float32)
-
-        # create VBOs from the arrays
-        self.defineTextArrayVBO()
-
-        # total width of text - probably don't need
-        # width = penX - glyph.advance[0] / 64.0 + glyph.size[0]
+        return vertices, indices, texcoords, width, height
 
     def drawTextArrayImmediate(self):
         """Draw text array with textures
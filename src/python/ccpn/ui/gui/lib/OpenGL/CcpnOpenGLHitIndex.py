@@ -0,0 +1,324 @@
+"""
+This file contains the screen-space spatial index used for hit-testing the symbols and labels
+of peaks and multiplets with the mouse
+
+The index holds the symbol positions (ppm), label offsets (ppm) and label sizes (pixels) of the
+objects of a GLLabelArray in arrays. As the bounding-boxes of the labels depend on the pixel-size
+of the strip, a uniform grid over the bounding-boxes is (re)built whenever the pixel-size or
+symbol-size changes; point queries then only test the items of a single grid-cell.
+Labels created or deleted after the index was built are added to, or flagged as removed from,
+the index; only the grid-cells covered by an added label are updated.
+
+Typical usage (see GLLabelArray.getHitIndex):
+
+    hitIndex = GLHitIndex.fromStringList(drawList.stringList, objListView, dims=(0, 1))
+    objs = hitIndex.pointHits(x, y, pixelX, pixelY, symbolX, symbolY, symbolSize)
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import numpy as np
+
+
+class GLHitIndex():
+    """
+    Spatial index of the symbols and labels of the objects of a GLLabelArray.
+
+    - items are ordered as the stringList, so hits are returned in drawing order
+    - a label without a textOffset is placed at the default symbolSize offset
+    - items are added at the end (see add) and removed by flagging (see remove); the grid-cells
+      covered by the items added since the grid was built are kept separately
+    """
+
+    cellPixels = 32.0  # size of a grid-cell in pixels
+    maxCellFactor = 16  # revert to testing all items if the grid has more than maxCellFactor entries per item
+    minimumCapacity = 64
+
+    def __init__(self, objects, values, dims):
+        """
+        :param objects: list of objects
+        :param values: (len(objects), 6) array of (px, py, tx, ty, width, height) per object;
+                       tx, ty are nan for the default offset
+        :param dims: the (x, y) indices of the positions used
+        """
+        self.objects = list(objects)
+        self.dims = dims
+
+        self._count = count = len(self.objects)
+        self._values = np.asarray(values, dtype=np.float64).reshape((count, 6))
+        self._alive = np.ones(count, dtype=bool)
+        self._items = {obj: ii for ii, obj in enumerate(self.objects)}
+        self._gridKey = None
+        self._boxes = None
+        self._grid = None
+        self._addedCells = {}  # (ix, iy): list of the items added since the grid was built
+        self._addedCount = 0
+
+    @staticmethod
+    def _getStringValues(drawStr, objListView, dims):
+        """:return the (obj, (px, py, tx, ty, width, height)) of the GLString drawStr; None if not valid
+        """
+        try:
+            obj = drawStr.stringObject
+            _pos = obj.position
+            px, py = float(_pos[dims[0]]), float(_pos[dims[1]])
+            tx, ty = obj.getTextOffset(objListView) or (np.nan, np.nan)
+
+        except Exception:
+            return None
+
+        return obj, (px, py, tx, ty, drawStr.width, drawStr.height)
+
+    @classmethod
+    def fromStringList(cls, stringList, objListView, dims):
+        """Create a new index from the GLStrings in stringList;
+        objects without a valid position are skipped
+        """
+        objects = []
+        values = []
+        for drawStr in stringList or ():
+            if (item := cls._getStringValues(drawStr, objListView, dims)) is not None:
+                objects.append(item[0])
+                values.append(item[1])
+
+        return cls(objects, values, tuple(dims))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def isFragmented(self) -> bool:
+        """True if more than half of the items have been removed
+        """
+        return 2 * len(self._items) < self._count
+
+    def add(self, obj, value):
+        """Add an item at the end, e.g. for a label appended to the stringList; replaces the item of obj if present
+
+        :param obj: the object
+        :param value: (px, py, tx, ty, width, height) of the object; see __init__
+        """
+        self.remove(obj)
+        if self._count == len(self._values):
+            self._grow()
+        idx = self._count
+        self._values[idx] = value
+        self._alive[idx] = True
+        self._count += 1
+        self.objects.append(obj)
+        self._items[obj] = idx
+
+        if self._gridKey is None:
+            # the boxes and grid are built on first use
+            return
+
+        pixelX, pixelY, symbolX, symbolY, symbolSize = self._gridKey
+        self._boxes[idx] = minX, maxX, minY, maxY = self._labelBoxes(pixelX, pixelY, symbolSize, items=[idx])[0]
+        if self._grid is None:
+            # all items are tested
+            return
+
+        self._addedCount += 1
+        px, py = self._values[idx, :2]
+        sX, sY = abs(symbolX), abs(symbolY)
+        for box in ((px - sX, px + sX, py - sY, py + sY), (minX, maxX, minY, maxY)):
+            ix0, ix1, iy0, iy1 = (int(val) for val in self._cellRanges(*box))
+            if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self.maxCellFactor or 4 * self._addedCount > self._count:
+                # a large box, or many additions; rebuild on the next query
+                self._gridKey = None
+                return
+
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    cell = self._addedCells.setdefault((ix, iy), [])
+                    if not cell or cell[-1] != idx:
+                        cell.append(idx)
+
+    def addString(self, drawStr, objListView) -> bool:
+        """Add the GLString drawStr; see add
+        :return True if drawStr has a valid position
+        """
+        if (item := self._getStringValues(drawStr, objListView, self.dims)) is None:
+            return False
+        self.add(*item)
+        return True
+
+    def remove(self, obj) -> bool:
+        """Remove the item of obj, e.g. for a label removed from the stringList;
+        the item is flagged and no longer returned by the queries
+        :return True if obj was present
+        """
+        if (idx := self._items.pop(obj, None)) is None:
+            return False
+        self._alive[idx] = False
+        return True
+
+    def _grow(self):
+        """Double the capacity of the item arrays
+        """
+        capacity = max(2 * len(self._values), self.minimumCapacity)
+        for name in ('_values', '_alive', '_boxes'):
+            if (arr := getattr(self, name)) is not None:
+                newArr = np.zeros((capacity,) + arr.shape[1:], dtype=arr.dtype)
+                newArr[:self._count] = arr[:self._count]
+                setattr(self, name, newArr)
+
+    def _labelBoxes(self, pixelX, pixelY, symbolSize, items=None):
+        """:return (n, 4) array with the bounding-boxes (minX, maxX, minY, maxY) of the labels (ppm);
+        of all items, or of the items with the given indices
+        """
+        px, py, tx, ty, width, height = (self._values[:self._count] if items is None else self._values[items]).T
+        hasOffset = ~np.isnan(tx)
+        tx = np.where(hasOffset, tx, symbolSize)
+        ty = np.where(hasOffset, ty, symbolSize)
+        x0 = px + tx * np.sign(pixelX)
+        y0 = py + ty * np.sign(pixelY)
+        x1 = x0 + width * pixelX
+        y1 = y0 + height * pixelY
+        return np.stack((np.minimum(x0, x1), np.maximum(x0, x1), np.minimum(y0, y1), np.maximum(y0, y1)), axis=1)
+
+    def _cellRanges(self, boxMinX, boxMaxX, boxMinY, boxMaxY):
+        """:return the (ix0, ix1, iy0, iy1) ranges of the grid-cells covered by the boxes
+        """
+        (originX, originY), (cellX, cellY) = self._origin, self._cellSize
+        return (np.floor_divide(boxMinX - originX, cellX).astype(np.int64),
+                np.floor_divide(boxMaxX - originX, cellX).astype(np.int64),
+                np.floor_divide(boxMinY - originY, cellY).astype(np.int64),
+                np.floor_divide(boxMaxY - originY, cellY).astype(np.int64))
+
+    def _update(self, pixelX, pixelY, symbolX, symbolY, symbolSize):
+        """Rebuild the label-boxes and the grid if the scaling has changed
+        """
+        key = (pixelX, pixelY, symbolX, symbolY, symbolSize)
+        if key == self._gridKey:
+            return
+        self._gridKey = key
+        self._boxes = np.zeros((len(self._values), 4), dtype=np.float64)
+        self._boxes[:self._count] = self._labelBoxes(pixelX, pixelY, symbolSize)
+        self._grid = None
+        self._addedCells = {}
+        self._addedCount = 0
+
+        items = np.flatnonzero(self._alive[:self._count])
+        itemCount = len(items)
+        cellX, cellY = abs(pixelX) * self.cellPixels, abs(pixelY) * self.cellPixels
+        if not itemCount or not (cellX > 0 and cellY > 0):
+            return
+
+        # the symbol- and label-boxes are entered separately, as labels may be offset far from the symbol
+        sX, sY = abs(symbolX), abs(symbolY)
+        px, py = self._values[items, 0], self._values[items, 1]
+        minX, maxX, minY, maxY = self._boxes[items].T
+        boxMinX = np.concatenate((px - sX, minX))
+        boxMaxX = np.concatenate((px + sX, maxX))
+        boxMinY = np.concatenate((py - sY, minY))
+        boxMaxY = np.concatenate((py + sY, maxY))
+
+        self._origin = np.min(boxMinX), np.min(boxMinY)
+        self._cellSize = (cellX, cellY)
+        ix0, ix1, iy0, iy1 = self._cellRanges(boxMinX, boxMaxX, boxMinY, boxMaxY)
+
+        nx = ix1 - ix0 + 1
+        counts = nx * (iy1 - iy0 + 1)
+        total = int(np.sum(counts))
+        if total > self.maxCellFactor * itemCount:
+            # very large boxes compared to the pixel-size; test all items
+            return
+
+        # expand every box into the cells it covers
+        self._rows = rows = int(np.max(iy1)) + 1
+        boxes = np.repeat(np.arange(2 * itemCount), counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        nx = nx[boxes]
+        keys = (ix0[boxes] + local % nx) * rows + (iy0[boxes] + local // nx)
+
+        order = np.argsort(keys, kind='stable')
+        self._grid = (keys[order], items[boxes[order] % itemCount])
+
+    def _candidates(self, x, y):
+        """:return array with the indices of the items that may contain (x, y); in ascending order
+        """
+        alive = self._alive[:self._count]
+        if self._grid is None:
+            return np.flatnonzero(alive)
+
+        (originX, originY), (cellX, cellY) = self._origin, self._cellSize
+        ix, iy = int((x - originX) // cellX), int((y - originY) // cellY)
+        cand = self._addedCells.get((ix, iy), [])
+        if ix >= 0 and 0 <= iy < self._rows:
+            keys, items = self._grid
+            key = ix * self._rows + iy
+            cand = np.concatenate((items[np.searchsorted(keys, key, side='left'):
+                                         np.searchsorted(keys, key, side='right')], cand))
+        cand = np.unique(np.asarray(cand, dtype=np.int64))
+        return cand[alive[cand]]
+
+    def pointHits(self, x, y, pixelX, pixelY, symbolX, symbolY, symbolSize, labelsOnly=False) -> list:
+        """Get the objects with a symbol or label under (x, y)
+
+        :param x, y: position (ppm)
+        :param pixelX, pixelY: pixel-size of the strip (ppm)
+        :param symbolX, symbolY: half-size of the symbols (ppm)
+        :param symbolSize: default offset of the labels
+        :param labelsOnly: only test the labels
+        :return list of objects in drawing order
+        """
+        self._update(pixelX, pixelY, symbolX, symbolY, symbolSize)
+        if not (cand := self._candidates(x, y)).size:
+            return []
+
+        minX, maxX, minY, maxY = self._boxes[cand].T
+        hits = (minX < x) & (x < maxX) & (minY < y) & (y < maxY)
+        if not labelsOnly:
+            px, py = self._values[cand, 0], self._values[cand, 1]
+            hits |= ((x - symbolX < px) & (px < x + symbolX) & (y - symbolY < py) & (py < y + symbolY))
+
+        objects = self.objects
+        return [objects[ii] for ii in cand[hits]]
+
+    def regionHits(self, xPositions, yPositions, pixelX, pixelY, symbolSize) -> list:
+        """Get the objects with a symbol or label-centre inside the region
+
+        :param xPositions, yPositions: (min, max) ranges of the region (ppm)
+        :param pixelX, pixelY: pixel-size of the strip (ppm)
+        :param symbolSize: default offset of the labels
+        :return list of objects in drawing order
+        """
+        if not self._items:
+            return []
+
+        minX, maxX, minY, maxY = self._labelBoxes(pixelX, pixelY, symbolSize).T
+        mx, my = (minX + maxX) / 2, (minY + maxY) / 2
+        (x0, x1), (y0, y1) = xPositions, yPositions
+        px, py = self._values[:self._count, 0], self._values[:self._count, 1]
+        hits = ((x0 < px) & (px < x1) & (y0 < py) & (py < y1)) | \
+               ((x0 < mx) & (mx < x1) & (y0 < my) & (my < y1))
+        hits &= self._alive[:self._count]
+
+        objects = self.objects
+        return [objects[ii] for ii in np.flatnonzero(hits)]
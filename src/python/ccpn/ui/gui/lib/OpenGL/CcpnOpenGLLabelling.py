@@ -97,6 +97,9 @@ class GLLabelling():
     LENARR4 = GLDefs.LENARR4
     ARROWCOLOURS = GLDefs.ARROWCOLOURS
 
+    # build the cross/plus symbols of a list in one pass; only for objects without extra indices/vertices
+    _bulkSymbols = False
+
     def __init__(self, parent=None, strip=None, name=None, enableResize=False):
         """Initialise the class
         """
@@ -252,7 +255,7 @@ class GLLabelling():
 
                             self._removeArrow(spectrumView, objListView, obj)
                             # self._updateHighlightedArrows(spectrumView, objListView)
-                            self._GLArrows[objListView].pushAliasedIndexVBO()
+                            self._GLArrows[objListView].setPushPending()
                             break
 
     # from ccpn.util.decorators import profile
@@ -271,7 +274,7 @@ class GLLabelling():
 
                             self._appendArrow(spectrumView, objListView, obj)
                             # self._updateHighlightedArrows(spectrumView, objListView)
-                            self._GLArrows[objListView].pushAliasedIndexVBO()
+                            self._GLArrows[objListView].setPushPending()
                             break
 
     def _changeArrow(self, obj):
@@ -289,69 +292,24 @@ class GLLabelling():
                             self._removeArrow(spectrumView, objListView, obj)
                             self._appendArrow(spectrumView, objListView, obj)
                             # self._updateHighlightedArrows(spectrumView, objListView)
-                            self._GLArrows[objListView].pushAliasedIndexVBO()
+                            self._GLArrows[objListView].setPushPending()
                             break
 
     def _removeArrow(self, spectrumView, objListView, delObj):
         """Remove an arrow from the list
         """
-        # arrowType = self.strip.arrowType
-
         drawList = self._GLArrows[objListView]
         self.objIsInVisiblePlanesRemove(spectrumView, delObj)  # probably only needed in create/change
 
-        indexOffset = 0
-        numPoints = 0
-
-        pp = 0
-        while (pp < len(drawList.pids)):
-            # check whether the peaks still exists
-            obj = drawList.pids[pp]
-
-            if obj == delObj:
-                offset = drawList.pids[pp + 1]
-                numPoints = drawList.pids[pp + 2]
-
-                # if arrowType != 0 and arrowType != 3:  # not a cross/plus
-                #     numPoints = 2 * numPoints + 5
-
-                # _isInPlane = drawList.pids[pp + 3]
-                # _isInFlankingPlane = drawList.pids[pp + 4]
-                # _selected = drawList.pids[pp + 5]
-                indexStart = drawList.pids[pp + 6]
-                indexEnd = drawList.pids[pp + 7]
-                indexOffset = indexEnd - indexStart
-
-                st, end = 4 * offset, 4 * (offset + numPoints)
-                drawList.indices = np.delete(drawList.indices, np.s_[indexStart:indexEnd])
-                drawList.vertices = np.delete(drawList.vertices, np.s_[st: end])
-                drawList.attribs = np.delete(drawList.attribs, np.s_[st: end])
-                drawList.offsets = np.delete(drawList.offsets, np.s_[st: end])
-                drawList.colors = np.delete(drawList.colors, np.s_[st: end])
-
-                drawList.pids = np.delete(drawList.pids, np.s_[pp:pp + GLDefs.LENPID])
-                drawList.numVertices -= numPoints
-
-                # subtract the offset from all the higher indices to account for the removed points
-                drawList.indices[np.where(drawList.indices >= offset)] -= numPoints
-                break
-
-            else:
-                pp += GLDefs.LENPID
-
-        # clean up the rest of the list
-        while (pp < len(drawList.pids)):
-            drawList.pids[pp + 1] -= numPoints
-            drawList.pids[pp + 6] -= indexOffset
-            drawList.pids[pp + 7] -= indexOffset
-            pp += GLDefs.LENPID
+        # tombstone the slot; the vertices are removed when the list is compacted
+        drawList.removeItem(delObj)
 
     def _appendArrow(self, spectrumView, objListView, obj):
         """Append a new arrow to the end of the list
         """
         spectrum = spectrumView.spectrum
         drawList = self._GLArrows[objListView]
-        if obj in drawList.pids[0::GLDefs.LENPID]:
+        if drawList.getSlot(obj) is not None:
             return
 
         self.objIsInVisiblePlanesRemove(spectrumView, obj)
@@ -491,22 +449,21 @@ class GLLabelling():
                                  planeIndex, r, w, alias, sx, sy, rx, ry, tnx, tny):
 
         try:
-            drawList.vertices = np.append(drawList.vertices, np.array((pxy[0] + sx, pxy[1] + sy, alias, 0.0,
-                                                                       pxy[0] + r + rx, pxy[1] + w + ry, alias, 0.0,
-                                                                       pxy[0] + r - rx, pxy[1] + w - ry, alias, 0.0,
-                                                                       pxy[0] + r, pxy[1] + w, alias, 0.0,
-                                                                       pxy[0] + sx + rx + 2 * tnx,
-                                                                       pxy[1] + sy + ry + 2 * tny, alias, 0.0,
-                                                                       pxy[0] + sx - rx + 2 * tnx,
-                                                                       pxy[1] + sy - ry + 2 * tny, alias, 0.0,
-                                                                       ),
-                                                                      dtype=np.float32))
+            drawList.appendVertices(np.array((pxy[0] + sx, pxy[1] + sy, alias, 0.0,
+                                              pxy[0] + r + rx, pxy[1] + w + ry, alias, 0.0,
+                                              pxy[0] + r - rx, pxy[1] + w - ry, alias, 0.0,
+                                              pxy[0] + r, pxy[1] + w, alias, 0.0,
+                                              pxy[0] + sx + rx + 2 * tnx,
+                                              pxy[1] + sy + ry + 2 * tny, alias, 0.0,
+                                              pxy[0] + sx - rx + 2 * tnx,
+                                              pxy[1] + sy - ry + 2 * tny, alias, 0.0,
+                                              ),
+                                             dtype=np.float32))
         except Exception as es:
             print(es)
-        drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * self.LENARR, dtype=np.float32))
-        drawList.attribs = np.append(drawList.attribs, np.array((alias, 0.0, 0.0, 0.0) * self.LENARR, dtype=np.float32))
-        drawList.offsets = np.append(drawList.offsets,
-                                     np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENARR, dtype=np.float32))
+        drawList.appendColors(np.array((*cols, fade) * self.LENARR, dtype=np.float32))
+        drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * self.LENARR, dtype=np.float32))
+        drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENARR, dtype=np.float32))
 
         # called extraIndices, extraIndexCount above
         # add extra indices
@@ -514,10 +471,10 @@ class GLLabelling():
         # add extra vertices for the multiplet
         extraVertices = self.appendExtraVertices(drawList, pIndex, obj, pxy, (*cols, fade), fade)
         # keep a pointer to the obj
-        drawList.pids = np.append(drawList.pids, (obj, drawList.numVertices, (self.LENARR + extraVertices),
-                                                  _isInPlane, _isInFlankingPlane, _selected,
-                                                  indexing.end, indexing.end + iCount + _indexCount, planeIndex, 0, 0,
-                                                  0))
+        drawList.appendPids((obj, drawList.numVertices, (self.LENARR + extraVertices),
+                             _isInPlane, _isInFlankingPlane, _selected,
+                             indexing.end, indexing.end + iCount + _indexCount, planeIndex, 0, 0,
+                             0))
 
         indexing.start += (self.LENARR + extraIndices)
         indexing.end += (iCount + _indexCount)
@@ -565,7 +522,7 @@ class GLLabelling():
         _selected = self._isSelected(obj)
         _indices = self._arrow[arrowType][planeIndex % 3][_selected] + vertexStart
         iCount = len(_indices)
-        drawList.indices = np.append(drawList.indices, _indices)
+        drawList.appendIndices(_indices)
 
         return iCount, _selected
 
@@ -738,6 +695,7 @@ class GLLabelling():
         drawList.attribs = np.empty(vc, dtype=np.float32)
         drawList.offsets = np.empty(vc, dtype=np.float32)
         drawList.pids = np.empty(objCount * GLDefs.LENPID, dtype=np.object_)
+        drawList.resetSlots()
         drawList.numVertices = 0
 
         return indCount, vertCount
@@ -887,6 +845,7 @@ class GLLabelling():
 
         for objListView, specView in self._visibleListViews:
             if specView == spectrumView and not objListView.isDeleted and objListView in self._GLArrows.keys():
+                self._GLArrows[objListView].pushPendingAliasedIndexVBO()
                 self._GLArrows[objListView].drawAliasedIndexVBO()
 
     def _rescaleArrowOffsets(self, r, w):
@@ -956,6 +915,8 @@ class GLLabelling():
             obj = drawList.pids[pp]
             offset = drawList.pids[pp + 1]
             numPoints = drawList.pids[pp + 2]
+            # a reused slot is not necessarily in the order of the vertices
+            vertexStart = indexStart = offset
 
             if not obj.isDeleted:
                 _selected = False
@@ -986,9 +947,6 @@ class GLLabelling():
                                                 indexEnd, indexEnd + iCount + _indexCount, planeIndex)
                 indexEnd += (iCount + _indexCount)
 
-            indexStart += numPoints
-            vertexStart += numPoints
-
         drawList.pushIndexVBOIndices()
         drawList.pushTextArrayVBOColour()
 
@@ -1011,7 +969,7 @@ class GLLabelling():
 
                             self._removeSymbol(spectrumView, objListView, obj)
                             # self._updateHighlightedSymbols(spectrumView, objListView)
-                            self._GLSymbols[objListView].pushAliasedIndexVBO()
+                            self._GLSymbols[objListView].setPushPending()
                             break
 
     # from ccpn.util.decorators import profile
@@ -1031,7 +989,7 @@ class GLLabelling():
 
                             self._appendSymbol(spectrumView, objListView, obj)
                             # self._updateHighlightedSymbols(spectrumView, objListView)
-                            self._GLSymbols[objListView].pushAliasedIndexVBO()
+                            self._GLSymbols[objListView].setPushPending()
                             break
 
     def _changeSymbol(self, obj):
@@ -1050,7 +1008,7 @@ class GLLabelling():
                             self._removeSymbol(spectrumView, objListView, obj)
                             self._appendSymbol(spectrumView, objListView, obj)
                             # self._updateHighlightedSymbols(spectrumView, objListView)
-                            self._GLSymbols[objListView].pushAliasedIndexVBO()
+                            self._GLSymbols[objListView].setPushPending()
                             break
 
     def _deleteLabel(self, obj, parentList, spectrum):
@@ -1060,6 +1018,7 @@ class GLLabelling():
             for drawStr in drawList.stringList:
                 if drawStr.stringObject == obj:
                     drawList.stringList.remove(drawStr)
+                    drawList.removeFromHitIndex(obj)
                     break
 
     def _changeLabel(self, obj):
@@ -1081,8 +1040,12 @@ class GLLabelling():
                                 continue
 
                             drawList = self._GLLabels[objListView]
+                            labelCount = len(drawList.stringList)
                             self._appendLabel(spectrumView, objListView, drawList.stringList, obj)
                             self._rescaleLabels(spectrumView, objListView, drawList)
+                            if len(drawList.stringList) > labelCount:
+                                # only the new label is added to the spatial index
+                                drawList.addToHitIndex(drawList.stringList[-1])
 
     def _getSymbolWidths(self, spectrumView):
         """return the required r, w, symbolWidth for the current screen scaling.
@@ -1333,51 +1296,15 @@ class GLLabelling():
         drawList = self._GLSymbols[objListView]
         self.objIsInVisiblePlanesRemove(spectrumView, delObj)  # probably only needed in create/change
 
-        indexOffset = 0
-        numPoints = 0
-
-        pp = 0
-        while (pp < len(drawList.pids)):
-            # check whether the peaks still exists
-            obj = drawList.pids[pp]
-
-            if obj == delObj:
-                offset = drawList.pids[pp + 1]
-                numPoints = drawList.pids[pp + 2]
-
-                if symbolType != 0 and symbolType != 3:  # not a cross/plus
-                    numPoints = 2 * numPoints + 5
-
-                # _isInPlane = drawList.pids[pp + 3]
-                # _isInFlankingPlane = drawList.pids[pp + 4]
-                # _selected = drawList.pids[pp + 5]
-                indexStart = drawList.pids[pp + 6]
-                indexEnd = drawList.pids[pp + 7]
-                indexOffset = indexEnd - indexStart
-
-                st, end = 4 * offset, 4 * (offset + numPoints)
-                drawList.indices = np.delete(drawList.indices, np.s_[indexStart:indexEnd])
-                drawList.vertices = np.delete(drawList.vertices, np.s_[st: end])
-                drawList.attribs = np.delete(drawList.attribs, np.s_[st: end])
-                drawList.offsets = np.delete(drawList.offsets, np.s_[st: end])
-                drawList.colors = np.delete(drawList.colors, np.s_[st: end])
-
-                drawList.pids = np.delete(drawList.pids, np.s_[pp:pp + GLDefs.LENPID])
-                drawList.numVertices -= numPoints
-
-                # subtract the offset from all the higher indices to account for the removed points
-                drawList.indices[np.where(drawList.indices >= offset)] -= numPoints
-                break
+        if (pp := drawList.getSlot(delObj)) is None:
+            return
 
-            else:
-                pp += GLDefs.LENPID
+        numPoints = drawList.pids[pp + 2]
+        if symbolType != 0 and symbolType != 3:  # not a cross/plus
+            numPoints = 2 * numPoints + 5
 
-        # clean up the rest of the list
-        while (pp < len(drawList.pids)):
-            drawList.pids[pp + 1] -= numPoints
-            drawList.pids[pp + 6] -= indexOffset
-            drawList.pids[pp + 7] -= indexOffset
-            pp += GLDefs.LENPID
+        # tombstone the slot; the vertices are removed when the list is compacted
+        drawList.removeItem(delObj, numPoints)
 
     _squareSymbol = (
     (np.array((0, 1, 2, 3), dtype=np.uint32), np.array((0, 1, 2, 3, 0, 2, 2, 1, 0, 3, 3, 1), dtype=np.uint32)),
@@ -1408,7 +1335,7 @@ class GLLabelling():
         _selected = self._isSelected(obj)
         _indices = self._squareSymbol[planeIndex % 3][_selected] + vertexStart
         iCount = len(_indices)
-        drawList.indices = np.append(drawList.indices, _indices)
+        drawList.appendIndices(_indices)
 
         return iCount, _selected
 
@@ -1443,7 +1370,7 @@ class GLLabelling():
         _selected = self._isSelected(obj)
         _indices = self._plusSymbol[planeIndex % 3][_selected] + vertexStart
         iCount = len(_indices)
-        drawList.indices = np.append(drawList.indices, _indices)
+        drawList.appendIndices(_indices)
 
         return iCount, _selected
 
@@ -1743,6 +1670,112 @@ class GLLabelling():
         indexing.vertexPtr += (4 * (self.LENSQ + extraVertices))
         indexing.vertexStart += (self.LENSQ + extraVertices)
 
+    def _insertSymbolItems(self, spectrumView, objListView, drawList, symbolType, r, w,
+                           listCol, meritCol, meritEnabled, meritThreshold):
+        """insert the cross/plus symbols for all objects of the list in bulk
+        The object attributes are gathered into arrays from which the vertices and indices
+        are built in a single pass; requires objects without extra indices/vertices
+        """
+        self._objectStore = {}
+
+        pIndex = self._spectrumSettings[spectrumView].dimensionIndices
+        highlightCol = self._GLParent.highlightColour[:3]
+
+        objs = []
+        planeFlags = []  # (_isInPlane, _isInFlankingPlane, _selected, planeIndex) per object
+        values = []  # (x, y, alias, fade, r, g, b) per object
+        for obj in self.objects(self.objectList(objListView)):
+            # get visible/plane status
+            _isInPlane, _isInFlankingPlane, planeIndex, fade = self.objIsInVisiblePlanes(spectrumView, obj)
+
+            # skip if not visible
+            if not _isInPlane and not _isInFlankingPlane:
+                continue
+
+            try:
+                _alias = obj.aliasing
+                alias = getAliasSetting(_alias[pIndex[0]], _alias[pIndex[1]])
+            except Exception:
+                alias = 0
+
+            try:
+                # fix the pointPositions
+                objPos = obj.pointPositions
+                pxy = (objPos[pIndex[0]] - 1, objPos[pIndex[1]] - 1)
+                _badPos = False
+            except Exception:
+                pxy = (0.0, 0.0)
+                _badPos = True
+
+            _selected = self._isSelected(obj)
+            if _selected:
+                cols = highlightCol
+            elif _badPos:
+                cols = (1.0, 0.2, 0.1)  # red for bad position
+            elif meritEnabled and obj.figureOfMerit < meritThreshold:
+                cols = meritCol
+            else:
+                cols = listCol
+
+            objs.append(obj)
+            planeFlags.append((_isInPlane, _isInFlankingPlane, _selected, planeIndex))
+            values.append((*pxy, alias, fade, *cols))
+
+        objCount = len(objs)
+        lenSq = self.LENSQ
+        values = np.array(values, dtype=np.float64).reshape((objCount, 7))
+        px, py, alias = values[:, 0:1], values[:, 1:2], values[:, 2:3]
+
+        # vertices in the same order as _insertSymbolItemVertices
+        dx = np.array((-r, r, r, -r, 0.0, 0.0, 0.0, r, -r))
+        dy = np.array((-w, w, -w, w, 0.0, -w, w, 0.0, 0.0))
+        vertices = np.zeros((objCount, lenSq, 4), dtype=np.float32)
+        vertices[:, :, 0] = px + dx
+        vertices[:, :, 1] = py + dy
+        vertices[:, :, 2] = alias
+        colors = np.empty((objCount, lenSq, 4), dtype=np.float32)
+        colors[:, :, 0:3] = values[:, None, 4:7]
+        colors[:, :, 3] = values[:, 3:4]
+        attribs = np.zeros((objCount, lenSq, 4), dtype=np.float32)
+        attribs[:, :, 0] = alias
+        offsets = np.zeros((objCount, lenSq, 4), dtype=np.float32)
+        offsets[:, :, 0] = px
+        offsets[:, :, 1] = py
+
+        # indices from the templates for each planeIndex/selected combination
+        symbols = self._squareSymbol if symbolType == 0 else self._plusSymbol
+        flags = np.array(planeFlags, dtype=np.int64).reshape((objCount, 4))
+        combination = 2 * (flags[:, 3] % 3) + flags[:, 2]
+        templates = [symbols[cc // 2][cc % 2] for cc in range(6)]
+        iCounts = np.array([len(template) for template in templates], dtype=np.int64)[combination]
+        indexEnd = np.cumsum(iCounts)
+        indexStart = indexEnd - iCounts
+        vertexStart = np.arange(objCount, dtype=np.int64) * lenSq
+        indices = np.empty(int(indexEnd[-1]) if objCount else 0, dtype=np.uint32)
+        for cc, template in enumerate(templates):
+            if (items := np.flatnonzero(combination == cc)).size:
+                indices[indexStart[items, None] + np.arange(len(template))] = template + vertexStart[items, None]
+
+        # keep a pointer to the objs
+        pids = np.zeros((objCount, GLDefs.LENPID), dtype=np.object_)
+        for ii, (obj, flag) in enumerate(zip(objs, planeFlags)):
+            pids[ii, 0] = obj
+            pids[ii, 3:6] = flag[0:3]
+            pids[ii, 8] = flag[3]
+        pids[:, 1] = vertexStart.tolist()
+        pids[:, 2] = lenSq
+        pids[:, 6] = indexStart.tolist()
+        pids[:, 7] = indexEnd.tolist()
+
+        drawList.indices = indices
+        drawList.vertices = vertices.ravel()
+        drawList.colors = colors.ravel()
+        drawList.attribs = attribs.ravel()
+        drawList.offsets = offsets.ravel()
+        drawList.pids = pids.ravel()
+        drawList.resetSlots()
+        drawList.numVertices = objCount * lenSq
+
     # NOTE:ED - new pre-defined indices/vertex lists
     # # indices for lineWidth symbols, not selected/selected in different number of points
     # _lineWidthIndices = {numPoints: ((np.append(np.array(tuple(val for an in range(numPoints) for val in ((2 * an), (2 * an) + 1)), dtype=np.uint32),
@@ -1854,59 +1887,54 @@ class GLLabelling():
 
                 _vertexStart = indexing.vertexStart
                 if _isInPlane or _isInFlankingPlane:
-                    drawList.indices = np.append(drawList.indices, np.array(tuple(val for an in ang
-                                                                                  for val in ((2 * an), (2 * an) + 1)),
-                                                                            dtype=np.uint32) + _vertexStart)
+                    drawList.appendIndices(np.array(tuple(val for an in ang
+                                                          for val in ((2 * an), (2 * an) + 1)),
+                                                    dtype=np.uint32) + _vertexStart)
 
                     iCount = np2
                     if self._isSelected(obj):
                         _selected = True
-                        drawList.indices = np.append(drawList.indices,
-                                                     np.array((0, 2, 2, 1, 0, 3, 3, 1), dtype=np.uint32) + (
-                                                                 _vertexStart + np2))
+                        drawList.appendIndices(np.array((0, 2, 2, 1, 0, 3, 3, 1), dtype=np.uint32) + (
+                                                           _vertexStart + np2))
                         iCount += 8
 
                 # add extra indices for the multiplet
                 extraIndices = 0  #self.appendExtraIndices(drawList, indexStart + np2, obj)
 
                 # draw an ellipse at lineWidth
-                drawList.vertices = np.append(drawList.vertices, np.array(tuple(val for an in ang
-                                                                                for val in (pxy[0] - r * math.sin(
+                drawList.appendVertices(np.array(tuple(val for an in ang
+                                                       for val in (pxy[0] - r * math.sin(
                         skip * an * angPlus / numPoints),
-                                                                                            pxy[1] - w * math.cos(
-                                                                                                    skip * an * angPlus / numPoints),
-                                                                                            alias, 0.0,
-                                                                                            pxy[0] - r * math.sin((
-                                                                                                                          skip * an + 1) * angPlus / numPoints),
-                                                                                            pxy[1] - w * math.cos((
-                                                                                                                          skip * an + 1) * angPlus / numPoints),
-                                                                                            alias, 0.0)
-                                                                                ),
-                                                                          dtype=np.float32)
-                                              )
-                drawList.vertices = np.append(drawList.vertices, np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
-                                                                           pxy[0] + r, pxy[1] + w, alias, 0.0,
-                                                                           pxy[0] + r, pxy[1] - w, alias, 0.0,
-                                                                           pxy[0] - r, pxy[1] + w, alias, 0.0,
-                                                                           pxy[0], pxy[1], alias, 0.0,
-                                                                           ), dtype=np.float32)
-                                              )
+                                                                   pxy[1] - w * math.cos(
+                                                                           skip * an * angPlus / numPoints),
+                                                                   alias, 0.0,
+                                                                   pxy[0] - r * math.sin((
+                                                                                                 skip * an + 1) * angPlus / numPoints),
+                                                                   pxy[1] - w * math.cos((
+                                                                                                 skip * an + 1) * angPlus / numPoints),
+                                                                   alias, 0.0)
+                                                       ),
+                                                 dtype=np.float32))
+                drawList.appendVertices(np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
+                                                  pxy[0] + r, pxy[1] + w, alias, 0.0,
+                                                  pxy[0] + r, pxy[1] - w, alias, 0.0,
+                                                  pxy[0] - r, pxy[1] + w, alias, 0.0,
+                                                  pxy[0], pxy[1], alias, 0.0,
+                                                  ), dtype=np.float32))
 
                 step = np2 + 5
-                drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * step, dtype=np.float32))
-                drawList.attribs = np.append(drawList.attribs,
-                                             np.array((alias, 0.0, 0.0, 0.0) * step, dtype=np.float32))
-                drawList.offsets = np.append(drawList.offsets,
-                                             np.array((pxy[0], pxy[1], 0.0, 0.0) * step, dtype=np.float32))
+                drawList.appendColors(np.array((*cols, fade) * step, dtype=np.float32))
+                drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * step, dtype=np.float32))
+                drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * step, dtype=np.float32))
 
                 # add extra vertices for the multiplet
                 extraVertices = 0  #self.appendExtraVertices(drawList, obj, p0, [*cols, fade], fade)
 
                 # keep a pointer to the obj
-                drawList.pids = np.append(drawList.pids, (obj, drawList.numVertices, (numPoints + extraVertices),
-                                                          _isInPlane, _isInFlankingPlane, _selected,
-                                                          indexEnd, indexEnd + iCount + extraIndices,
-                                                          planeIndex, 0, 0, 0))
+                drawList.appendPids((obj, drawList.numVertices, (numPoints + extraVertices),
+                                     _isInPlane, _isInFlankingPlane, _selected,
+                                     indexEnd, indexEnd + iCount + extraIndices,
+                                     planeIndex, 0, 0, 0))
                 # indexEnd = len(drawList.indices)
 
                 # indexList[0] += (step + extraIndices)
@@ -1940,50 +1968,45 @@ class GLLabelling():
 
                 _vertexStart = indexing.vertexStart
                 if _isInPlane or _isInFlankingPlane:
-                    drawList.indices = np.append(drawList.indices,
-                                                 np.array(tuple(val for an in ang
-                                                                for val in ((2 * an), (2 * an) + 1, np2 + 4)),
-                                                          dtype=np.uint32) + _vertexStart)
+                    drawList.appendIndices(np.array(tuple(val for an in ang
+                                                          for val in ((2 * an), (2 * an) + 1, np2 + 4)),
+                                                    dtype=np.uint32) + _vertexStart)
                     iCount = 3 * numPoints
 
                 # add extra indices for the multiplet
                 extraIndices = 0  #self.appendExtraIndices(drawList, indexStart + np2 + 4, obj)
 
                 # draw an ellipse at lineWidth
-                drawList.vertices = np.append(drawList.vertices, np.array(tuple(val for an in ang
-                                                                                for val in (pxy[0] - r * math.sin(skip * an * angPlus / numPoints),
-                                                                                            pxy[1] - w * math.cos(skip * an * angPlus / numPoints),
-                                                                                            alias, 0.0,
-                                                                                            pxy[0] - r * math.sin((skip * an + 1) * angPlus / numPoints),
-                                                                                            pxy[1] - w * math.cos((skip * an + 1) * angPlus / numPoints),
-                                                                                            alias, 0.0,)
-                                                                                ),
-                                                                          dtype=np.float32)
-                                              )
-
-                drawList.vertices = np.append(drawList.vertices, np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
-                                                                           pxy[0] + r, pxy[1] + w, alias, 0.0,
-                                                                           pxy[0] + r, pxy[1] - w, alias, 0.0,
-                                                                           pxy[0] - r, pxy[1] + w, alias, 0.0,
-                                                                           pxy[0], pxy[1], alias, 0.0,
-                                                                           ), dtype=np.float32)
-                                              )
+                drawList.appendVertices(np.array(tuple(val for an in ang
+                                                       for val in (pxy[0] - r * math.sin(skip * an * angPlus / numPoints),
+                                                                   pxy[1] - w * math.cos(skip * an * angPlus / numPoints),
+                                                                   alias, 0.0,
+                                                                   pxy[0] - r * math.sin((skip * an + 1) * angPlus / numPoints),
+                                                                   pxy[1] - w * math.cos((skip * an + 1) * angPlus / numPoints),
+                                                                   alias, 0.0,)
+                                                       ),
+                                                 dtype=np.float32))
+
+                drawList.appendVertices(np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
+                                                  pxy[0] + r, pxy[1] + w, alias, 0.0,
+                                                  pxy[0] + r, pxy[1] - w, alias, 0.0,
+                                                  pxy[0] - r, pxy[1] + w, alias, 0.0,
+                                                  pxy[0], pxy[1], alias, 0.0,
+                                                  ), dtype=np.float32))
 
                 step = np2 + 5
-                drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * step, dtype=np.float32))
-                drawList.attribs = np.append(drawList.attribs,
-                                             np.array((alias, 0.0, 0.0, 0.0) * step, dtype=np.float32))
-                drawList.offsets = np.append(drawList.offsets,
-                                             np.array((pxy[0], pxy[1], 0.0, 0.0) * step, dtype=np.float32))
+                drawList.appendColors(np.array((*cols, fade) * step, dtype=np.float32))
+                drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * step, dtype=np.float32))
+                drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * step, dtype=np.float32))
 
                 # add extra vertices for the multiplet
                 extraVertices = 0  #self.appendExtraVertices(drawList, obj, p0, [*cols, fade], fade)
 
                 # keep a pointer to the obj
-                drawList.pids = np.append(drawList.pids, (obj, drawList.numVertices, (numPoints + extraVertices),
-                                                          _isInPlane, _isInFlankingPlane, _selected,
-                                                          indexEnd, indexEnd + iCount + extraIndices,
-                                                          planeIndex, 0, 0, 0))
+                drawList.appendPids((obj, drawList.numVertices, (numPoints + extraVertices),
+                                     _isInPlane, _isInFlankingPlane, _selected,
+                                     indexEnd, indexEnd + iCount + extraIndices,
+                                     planeIndex, 0, 0, 0))
 
                 indexing.start += (step + extraIndices)
                 indexing.end += (iCount + extraIndices)
@@ -1997,20 +2020,19 @@ class GLLabelling():
                                   drawList, fade, iCount, indexing, obj, pxy, pIndex,
                                   planeIndex, r, w, alias):
 
-        drawList.vertices = np.append(drawList.vertices, np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1] + w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1] - w, alias, 0.0,
-                                                                   pxy[0] - r, pxy[1] + w, alias, 0.0,
-                                                                   pxy[0], pxy[1], alias, 0.0,
-                                                                   pxy[0], pxy[1] - w, alias, 0.0,
-                                                                   pxy[0], pxy[1] + w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1], alias, 0.0,
-                                                                   pxy[0] - r, pxy[1], alias, 0.0,
-                                                                   ), dtype=np.float32))
-        drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * self.LENSQ, dtype=np.float32))
-        drawList.attribs = np.append(drawList.attribs, np.array((alias, 0.0, 0.0, 0.0) * self.LENSQ, dtype=np.float32))
-        drawList.offsets = np.append(drawList.offsets,
-                                     np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENSQ, dtype=np.float32))
+        drawList.appendVertices(np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
+                                          pxy[0] + r, pxy[1] + w, alias, 0.0,
+                                          pxy[0] + r, pxy[1] - w, alias, 0.0,
+                                          pxy[0] - r, pxy[1] + w, alias, 0.0,
+                                          pxy[0], pxy[1], alias, 0.0,
+                                          pxy[0], pxy[1] - w, alias, 0.0,
+                                          pxy[0], pxy[1] + w, alias, 0.0,
+                                          pxy[0] + r, pxy[1], alias, 0.0,
+                                          pxy[0] - r, pxy[1], alias, 0.0,
+                                          ), dtype=np.float32))
+        drawList.appendColors(np.array((*cols, fade) * self.LENSQ, dtype=np.float32))
+        drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * self.LENSQ, dtype=np.float32))
+        drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENSQ, dtype=np.float32))
 
         # called extraIndices, extraIndexCount above
         # add extra indices
@@ -2019,10 +2041,10 @@ class GLLabelling():
         extraVertices = self.appendExtraVertices(drawList, pIndex, obj,
                                                  pxy, (*cols, fade), fade, alias)
         # keep a pointer to the obj
-        drawList.pids = np.append(drawList.pids, (obj, drawList.numVertices, (self.LENSQ + extraVertices),
-                                                  _isInPlane, _isInFlankingPlane, _selected,
-                                                  indexing.end, indexing.end + iCount + _indexCount, planeIndex,
-                                                  0, 0, 0))
+        drawList.appendPids((obj, drawList.numVertices, (self.LENSQ + extraVertices),
+                             _isInPlane, _isInFlankingPlane, _selected,
+                             indexing.end, indexing.end + iCount + _indexCount, planeIndex,
+                             0, 0, 0))
 
         indexing.start += (self.LENSQ + extraIndices)
         indexing.end += (iCount + _indexCount)
@@ -2034,7 +2056,7 @@ class GLLabelling():
         """
         spectrum = spectrumView.spectrum
         drawList = self._GLSymbols[objListView]
-        if obj in drawList.pids[0::GLDefs.LENPID]:
+        if drawList.getSlot(obj) is not None:
             return
 
         self.objIsInVisiblePlanesRemove(spectrumView, obj)
@@ -2189,6 +2211,8 @@ class GLLabelling():
                 obj = drawList.pids[pp]
                 offset = drawList.pids[pp + 1]
                 numPoints = drawList.pids[pp + 2]
+                # a reused slot is not necessarily in the order of the vertices
+                vertexStart = indexStart = offset
 
                 if not obj.isDeleted:
                     _selected = False
@@ -2224,9 +2248,6 @@ class GLLabelling():
                                                     indexEnd, indexEnd + iCount + _indexCount, planeIndex)
                     indexEnd += (iCount + _indexCount)
 
-                indexStart += numPoints
-                vertexStart += numPoints
-
         elif symbolType == 1:
 
             for pp in range(0, len(drawList.pids), GLDefs.LENPID):
@@ -2235,6 +2256,8 @@ class GLLabelling():
                 obj = drawList.pids[pp]
                 offset = drawList.pids[pp + 1]
                 numPoints = drawList.pids[pp + 2]
+                # a reused slot is not necessarily in the order of the vertices
+                vertexStart = indexStart = offset
                 np2 = 2 * numPoints
 
                 if not obj.isDeleted:
@@ -2245,20 +2268,19 @@ class GLLabelling():
                     _isInPlane, _isInFlankingPlane, planeIndex, fade = self.objIsInVisiblePlanes(spectrumView, obj)
 
                     if _isInPlane or _isInFlankingPlane:
-                        drawList.indices = np.append(drawList.indices, np.array(tuple(val for an in ang
-                                                                                      for val in (indexStart + (2 * an),
-                                                                                                  indexStart + (2 * an) + 1)),
-                                                                                dtype=np.uint32))
+                        drawList.appendIndices(np.array(tuple(val for an in ang
+                                                              for val in (indexStart + (2 * an),
+                                                                          indexStart + (2 * an) + 1)),
+                                                        dtype=np.uint32))
 
                         if self._isSelected(obj):
                             _selected = True
                             cols = self._GLParent.highlightColour[:3]
-                            drawList.indices = np.append(drawList.indices,
-                                                         np.array((indexStart + np2, indexStart + np2 + 2,
-                                                                   indexStart + np2 + 2, indexStart + np2 + 1,
-                                                                   indexStart + np2, indexStart + np2 + 3,
-                                                                   indexStart + np2 + 3, indexStart + np2 + 1),
-                                                                  dtype=np.uint32))
+                            drawList.appendIndices(np.array((indexStart + np2, indexStart + np2 + 2,
+                                                             indexStart + np2 + 2, indexStart + np2 + 1,
+                                                             indexStart + np2, indexStart + np2 + 3,
+                                                             indexStart + np2 + 3, indexStart + np2 + 1),
+                                                            dtype=np.uint32))
                         elif obj.pointPositions and None in obj.pointPositions:
                             cols = [1.0, 0.2, 0.1]  # red if the position is bad
                         else:
@@ -2273,8 +2295,6 @@ class GLLabelling():
                                                     indexEnd, len(drawList.indices), planeIndex)
                     indexEnd = len(drawList.indices)
 
-                indexStart += np2 + 5
-
         elif symbolType == 2:
 
             for pp in range(0, len(drawList.pids), GLDefs.LENPID):
@@ -2283,6 +2303,8 @@ class GLLabelling():
                 obj = drawList.pids[pp]
                 offset = drawList.pids[pp + 1]
                 numPoints = drawList.pids[pp + 2]
+                # a reused slot is not necessarily in the order of the vertices
+                vertexStart = indexStart = offset
                 np2 = 2 * numPoints
 
                 if not obj.isDeleted:
@@ -2293,10 +2315,10 @@ class GLLabelling():
                     _isInPlane, _isInFlankingPlane, planeIndex, fade = self.objIsInVisiblePlanes(spectrumView, obj)
 
                     if _isInPlane or _isInFlankingPlane:
-                        drawList.indices = np.append(drawList.indices, np.array(tuple(val for an in ang
-                                                                                      for val in
-                                                                                      (2 * an, (2 * an) + 1, np2 + 4)),
-                                                                                dtype=np.uint32) + indexStart)
+                        drawList.appendIndices(np.array(tuple(val for an in ang
+                                                              for val in
+                                                              (2 * an, (2 * an) + 1, np2 + 4)),
+                                                        dtype=np.uint32) + indexStart)
                         if self._isSelected(obj):
                             _selected = True
                             cols = self._GLParent.highlightColour[:3]
@@ -2314,8 +2336,6 @@ class GLLabelling():
                                                     indexEnd, len(drawList.indices), planeIndex)
                     indexEnd = len(drawList.indices)
 
-                indexStart += np2 + 5
-
         else:
             raise ValueError('GL Error: bad symbol type')
 
@@ -2536,6 +2556,7 @@ class GLLabelling():
         drawList.attribs = np.empty(vc, dtype=np.float32)
         drawList.offsets = np.empty(vc, dtype=np.float32)
         drawList.pids = np.empty(objCount * GLDefs.LENPID, dtype=np.object_)
+        drawList.resetSlots()
         drawList.numVertices = 0
 
         return indCount, vertCount
@@ -2628,8 +2649,12 @@ class GLLabelling():
             spectrumFrequency = spectrum.spectrometerFrequencies
             strip = spectrumView.strip
 
-            ind, vert = self._buildSymbolsCount(spectrumView, objListView, drawList)
-            if ind:
+            if self._bulkSymbols and (symbolType == 0 or symbolType == 3):
+                # build the cross/plus symbols for the whole list in one pass
+                self._insertSymbolItems(spectrumView, objListView, drawList, symbolType, r, w,
+                                        listCol, meritCol, meritEnabled, meritThreshold)
+
+            elif self._buildSymbolsCount(spectrumView, objListView, drawList)[0]:
 
                 for tCount, obj in enumerate(self.objects(pls)):
 
@@ -2769,6 +2794,7 @@ class GLLabelling():
         #     print(f'>>> building {len(tempList)} labels  -  {self._tempMax}')
 
         drawList.stringList = tempList
+        drawList.invalidateHitIndex()
         # drawList.renderMode = GLRENDERMODE_RESCALE
 
     def _threadBuildAllLabels(self, viewList, glStrip, _outList):
@@ -2800,6 +2826,7 @@ class GLLabelling():
 
         for objListView, specView in self._visibleListViews:
             if specView == spectrumView and not objListView.isDeleted and objListView in self._GLSymbols.keys():
+                self._GLSymbols[objListView].pushPendingAliasedIndexVBO()
                 self._GLSymbols[objListView].drawAliasedIndexVBO()
 
     def drawLabels(self, spectrumView):
@@ -2863,7 +2890,7 @@ class GL1dLabelling():
         """Append a new arrow to the end of the list
         """
         drawList = self._GLArrows[objListView]
-        if obj in drawList.pids[0::GLDefs.LENPID]:
+        if drawList.getSlot(obj) is not None:
             return
 
         # find the correct scale to draw square pixels
@@ -3043,48 +3070,10 @@ class GL1dLabelling():
     def _removeArrow(self, spectrumView, objListView, delObj):
         """Remove an arrow from the list
         """
-
         drawList = self._GLArrows[objListView]
 
-        indexOffset = 0
-        numPoints = 0
-
-        pp = 0
-        while (pp < len(drawList.pids)):
-            # check whether the peaks still exists
-            obj = drawList.pids[pp]
-
-            if obj and obj == delObj:
-                offset = drawList.pids[pp + 1]
-                numPoints = drawList.pids[pp + 2]
-
-                indexStart = drawList.pids[pp + 6]
-                indexEnd = drawList.pids[pp + 7]
-                indexOffset = indexEnd - indexStart
-
-                st, end = 4 * offset, 4 * (offset + numPoints)
-                drawList.indices = np.delete(drawList.indices, np.s_[indexStart:indexEnd])
-                drawList.vertices = np.delete(drawList.vertices, np.s_[st: end])
-                drawList.attribs = np.delete(drawList.attribs, np.s_[st: end])
-                drawList.offsets = np.delete(drawList.offsets, np.s_[st: end])
-                drawList.colors = np.delete(drawList.colors, np.s_[st: end])
-
-                drawList.pids = np.delete(drawList.pids, np.s_[pp:pp + GLDefs.LENPID])
-                drawList.numVertices -= numPoints
-
-                # subtract the offset from all the higher indices to account for the removed points
-                drawList.indices[np.where(drawList.indices >= offset)] -= numPoints
-                break
-
-            else:
-                pp += GLDefs.LENPID
-
-        # clean up the rest of the list
-        while (pp < len(drawList.pids)):
-            drawList.pids[pp + 1] -= numPoints
-            drawList.pids[pp + 6] -= indexOffset
-            drawList.pids[pp + 7] -= indexOffset
-            pp += GLDefs.LENPID
+        # tombstone the slot; the vertices are removed when the list is compacted
+        drawList.removeItem(delObj)
 
     def _updateHighlightedArrows(self, spectrumView, objListView):
         """update the highlighted arrows
@@ -3119,6 +3108,8 @@ class GL1dLabelling():
             obj = drawList.pids[pp]
             offset = drawList.pids[pp + 1]
             numPoints = drawList.pids[pp + 2]
+            # a reused slot is not necessarily in the order of the vertices
+            vertexStart = indexStart = offset
 
             if not obj.isDeleted:
 
@@ -3145,9 +3136,6 @@ class GL1dLabelling():
                                                 0)  # don't need to change planeIndex, but keep space for it
                 indexEnd += (iCount + _indexCount)
 
-            indexStart += numPoints
-            vertexStart += numPoints
-
         drawList.pushIndexVBOIndices()
         drawList.pushTextArrayVBOColour()
 
@@ -3257,6 +3245,8 @@ class GL1dLabelling():
                 obj = drawList.pids[pp]
                 offset = drawList.pids[pp + 1]
                 numPoints = drawList.pids[pp + 2]
+                # a reused slot is not necessarily in the order of the vertices
+                vertexStart = indexStart = offset
 
                 if not obj.isDeleted:
 
@@ -3287,9 +3277,6 @@ class GL1dLabelling():
                                                     0)  # don't need to change planeIndex, but keep space for it
                     indexEnd += (iCount + _indexCount)
 
-                indexStart += numPoints
-                vertexStart += numPoints
-
             drawList.pushIndexVBOIndices()
             drawList.pushTextArrayVBOColour()
 
@@ -3445,7 +3432,7 @@ class GL1dLabelling():
         """Append a new symbol to the end of the list
         """
         drawList = self._GLSymbols[objListView]
-        if obj in drawList.pids[0::GLDefs.LENPID]:
+        if drawList.getSlot(obj) is not None:
             return
 
         # find the correct scale to draw square pixels
@@ -3516,48 +3503,10 @@ class GL1dLabelling():
     def _removeSymbol(self, spectrumView, objListView, delObj):
         """Remove a symbol from the list
         """
-
         drawList = self._GLSymbols[objListView]
 
-        indexOffset = 0
-        numPoints = 0
-
-        pp = 0
-        while (pp < len(drawList.pids)):
-            # check whether the peaks still exists
-            obj = drawList.pids[pp]
-
-            if obj and obj == delObj:
-                offset = drawList.pids[pp + 1]
-                numPoints = drawList.pids[pp + 2]
-
-                indexStart = drawList.pids[pp + 6]
-                indexEnd = drawList.pids[pp + 7]
-                indexOffset = indexEnd - indexStart
-
-                st, end = 4 * offset, 4 * (offset + numPoints)
-                drawList.indices = np.delete(drawList.indices, np.s_[indexStart:indexEnd])
-                drawList.vertices = np.delete(drawList.vertices, np.s_[st: end])
-                drawList.attribs = np.delete(drawList.attribs, np.s_[st: end])
-                drawList.offsets = np.delete(drawList.offsets, np.s_[st: end])
-                drawList.colors = np.delete(drawList.colors, np.s_[st: end])
-
-                drawList.pids = np.delete(drawList.pids, np.s_[pp:pp + GLDefs.LENPID])
-                drawList.numVertices -= numPoints
-
-                # subtract the offset from all the higher indices to account for the removed points
-                drawList.indices[np.where(drawList.indices >= offset)] -= numPoints
-                break
-
-            else:
-                pp += GLDefs.LENPID
-
-        # clean up the rest of the list
-        while (pp < len(drawList.pids)):
-            drawList.pids[pp + 1] -= numPoints
-            drawList.pids[pp + 6] -= indexOffset
-            drawList.pids[pp + 7] -= indexOffset
-            pp += GLDefs.LENPID
+        # tombstone the slot; the vertices are removed when the list is compacted
+        drawList.removeItem(delObj)
 
     def _appendLabel(self, spectrumView, objListView, stringList, obj):
         """Append a new label to the end of the list
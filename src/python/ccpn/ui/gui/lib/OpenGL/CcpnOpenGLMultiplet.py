@@ -180,8 +180,8 @@ class GLmultipletListMethods():
             return 0, 0
 
         insertNum = len(multiplet.peaks)
-        drawList.indices = np.append(drawList.indices, np.array(tuple(val for ii in range(insertNum)
-                                                                      for val in (index, 1 + index + ii)), dtype=np.uint32))
+        drawList.appendIndices(np.array(tuple(val for ii in range(insertNum)
+                                              for val in (index, 1 + index + ii)), dtype=np.uint32))
         return 2 * insertNum, insertNum + 1
 
     @staticmethod
@@ -222,7 +222,7 @@ class GLmultipletListMethods():
         _selected = self._isSelected(obj)
         _indices = self._squareMultSymbol[planeIndex % 3][_selected] + vertexStart
         iCount = len(_indices)
-        drawList.indices = np.append(drawList.indices, _indices)
+        drawList.appendIndices(_indices)
 
         return iCount, _selected
 
@@ -249,7 +249,7 @@ class GLmultipletListMethods():
         _selected = self._isSelected(obj)
         _indices = self._plusMultSymbol[planeIndex % 3][_selected] + vertexStart
         iCount = len(_indices)
-        drawList.indices = np.append(drawList.indices, _indices)
+        drawList.appendIndices(_indices)
 
         return iCount, _selected
 
@@ -310,10 +310,10 @@ class GLmultipletListMethods():
                 posList += (0, 0, alias, 0)  # add the bad-point
 
         numVertices = len(multiplet.peaks) + 1
-        drawList.vertices = np.append(drawList.vertices, np.array(posList, dtype=np.float32))
-        drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * numVertices, dtype=np.float32))
-        drawList.attribs = np.append(drawList.attribs, np.array((alias, 0.0, 0.0, 0.0) * numVertices, dtype=np.float32))
-        drawList.offsets = np.append(drawList.offsets, np.array((pxy[0], pxy[1], 0.0, 0.0) * numVertices, dtype=np.float32))
+        drawList.appendVertices(np.array(posList, dtype=np.float32))
+        drawList.appendColors(np.array((*cols, fade) * numVertices, dtype=np.float32))
+        drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * numVertices, dtype=np.float32))
+        drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * numVertices, dtype=np.float32))
 
         return numVertices
 
@@ -399,24 +399,24 @@ class GLmultipletListMethods():
     def _appendSymbolItemVertices(self, _isInFlankingPlane, _isInPlane, _selected, cols, drawList, fade, iCount, indexing, obj, pxy, pIndex,
                                   planeIndex, r, w, alias):
 
-        drawList.vertices = np.append(drawList.vertices, np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1] + w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1] - w, alias, 0.0,
-                                                                   pxy[0] - r, pxy[1] + w, alias, 0.0,
-                                                                   pxy[0], pxy[1], alias, 0.0,
-                                                                   pxy[0], pxy[1] - w, alias, 0.0,
-                                                                   pxy[0], pxy[1] + w, alias, 0.0,
-                                                                   pxy[0] + r, pxy[1], alias, 0.0,
-                                                                   pxy[0] - r, pxy[1], alias, 0.0,
-                                                                   pxy[0] + (r * 0.85), pxy[1] + (w * 0.50), alias, 0.0,
-                                                                   pxy[0] + (r * 0.5), pxy[1] + (w * 0.85), alias, 0.0,
-                                                                   pxy[0] - (r * 0.5), pxy[1] + (w * 0.85), alias, 0.0,
-                                                                   pxy[0] - (r * 0.85), pxy[1] + (w * 0.50), alias, 0.0,
-                                                                   pxy[0] - (r * 0.85), pxy[1] - (w * 0.50), alias, 0.0,
-                                                                   pxy[0] - (r * 0.5), pxy[1] - (w * 0.85), alias, 0.0,
-                                                                   pxy[0] + (r * 0.5), pxy[1] - (w * 0.85), alias, 0.0,
-                                                                   pxy[0] + (r * 0.85), pxy[1] - (w * 0.50), alias, 0.0,
-                                                                   ), dtype=np.float32))
+        drawList.appendVertices(np.array((pxy[0] - r, pxy[1] - w, alias, 0.0,
+                                          pxy[0] + r, pxy[1] + w, alias, 0.0,
+                                          pxy[0] + r, pxy[1] - w, alias, 0.0,
+                                          pxy[0] - r, pxy[1] + w, alias, 0.0,
+                                          pxy[0], pxy[1], alias, 0.0,
+                                          pxy[0], pxy[1] - w, alias, 0.0,
+                                          pxy[0], pxy[1] + w, alias, 0.0,
+                                          pxy[0] + r, pxy[1], alias, 0.0,
+                                          pxy[0] - r, pxy[1], alias, 0.0,
+                                          pxy[0] + (r * 0.85), pxy[1] + (w * 0.50), alias, 0.0,
+                                          pxy[0] + (r * 0.5), pxy[1] + (w * 0.85), alias, 0.0,
+                                          pxy[0] - (r * 0.5), pxy[1] + (w * 0.85), alias, 0.0,
+                                          pxy[0] - (r * 0.85), pxy[1] + (w * 0.50), alias, 0.0,
+                                          pxy[0] - (r * 0.85), pxy[1] - (w * 0.50), alias, 0.0,
+                                          pxy[0] - (r * 0.5), pxy[1] - (w * 0.85), alias, 0.0,
+                                          pxy[0] + (r * 0.5), pxy[1] - (w * 0.85), alias, 0.0,
+                                          pxy[0] + (r * 0.85), pxy[1] - (w * 0.50), alias, 0.0,
+                                          ), dtype=np.float32))
         # drawList.vertices = np.append(drawList.vertices, np.array((- r, - w, 0.0, 0.0,
         #                                                            + r, + w, 0.0, 0.0,
         #                                                            + r, - w, 0.0, 0.0,
@@ -435,9 +435,9 @@ class GLmultipletListMethods():
         #                                                            + (r * 0.5), - (w * 0.85), 0.0, 0.0,
         #                                                            + (r * 0.85), - (w * 0.50), 0.0, 0.0,
         #                                                            ), dtype=np.float32))
-        drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * self.LENSQ, dtype=np.float32))
-        drawList.attribs = np.append(drawList.attribs, np.array((alias, 0.0, 0.0, 0.0) * self.LENSQ, dtype=np.float32))
-        drawList.offsets = np.append(drawList.offsets, np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENSQ, dtype=np.float32))
+        drawList.appendColors(np.array((*cols, fade) * self.LENSQ, dtype=np.float32))
+        drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * self.LENSQ, dtype=np.float32))
+        drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * self.LENSQ, dtype=np.float32))
 
         # add extra indices
         _indexCount, extraIndices = self.appendExtraIndices(drawList, indexing.vertexStart + self.LENSQ, obj)
@@ -445,10 +445,10 @@ class GLmultipletListMethods():
         extraVertices = self.appendExtraVertices(drawList, pIndex, obj,
                                                  pxy, (*cols, fade), fade)
         # keep a pointer to the obj
-        drawList.pids = np.append(drawList.pids, (obj, drawList.numVertices, (self.LENSQ + extraVertices),
-                                                  _isInPlane, _isInFlankingPlane, _selected,
-                                                  indexing.end, indexing.end + iCount + _indexCount,
-                                                  planeIndex, 0, 0, 0))
+        drawList.appendPids((obj, drawList.numVertices, (self.LENSQ + extraVertices),
+                             _isInPlane, _isInFlankingPlane, _selected,
+                             indexing.end, indexing.end + iCount + _indexCount,
+                             planeIndex, 0, 0, 0))
 
         indexing.start += (self.LENSQ + extraIndices)
         indexing.end += (iCount + _indexCount)
@@ -611,10 +611,10 @@ class GLmultiplet1dLabelling(GL1dLabelling, GLmultipletNdLabelling):
                 posList += (0, 0, alias, 0)  # add the bad-point
 
         numVertices = len(multiplet.peaks) + 1
-        drawList.vertices = np.append(drawList.vertices, np.array(posList, dtype=np.float32))
-        drawList.colors = np.append(drawList.colors, np.array((*cols, fade) * numVertices, dtype=np.float32))
-        drawList.attribs = np.append(drawList.attribs, np.array((alias, 0.0, 0.0, 0.0) * numVertices, dtype=np.float32))
-        drawList.offsets = np.append(drawList.offsets, np.array((pxy[0], pxy[1], 0.0, 0.0) * numVertices, dtype=np.float32))
+        drawList.appendVertices(np.array(posList, dtype=np.float32))
+        drawList.appendColors(np.array((*cols, fade) * numVertices, dtype=np.float32))
+        drawList.appendAttribs(np.array((alias, 0.0, 0.0, 0.0) * numVertices, dtype=np.float32))
+        drawList.appendOffsets(np.array((pxy[0], pxy[1], 0.0, 0.0) * numVertices, dtype=np.float32))
 
         return numVertices
 
@@ -208,6 +208,8 @@ class GLpeakNdLabelling(GLpeakListMethods, GLLabelling):
     """Class to handle symbol and symbol labelling for Nd displays
     """
 
+    _bulkSymbols = True
+
     # def __init__(self, parent=None, strip=None, name=None, resizeGL=False):
     #     """Initialise the class
     #     """
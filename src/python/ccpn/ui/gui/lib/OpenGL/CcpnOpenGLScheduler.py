@@ -0,0 +1,131 @@
+"""
+A small class to coalesce the repaints of the GL widgets of all strips and spectrumDisplays.
+
+Full repaints (PaintModes.PAINT_ALL; i.e. those rebuilding contours, symbols and labels) requested
+through CcpnGLWidget.update are collected and released at most once per frame interval
+(1/frameRate seconds); any number of requests of a widget within a frame results in a single rebuild.
+Mouse-only repaints are not delayed.
+
+The time spent in building and painting is accumulated per frame; see frameTimings.
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import time
+from collections import deque, namedtuple
+from PyQt5 import QtCore
+
+from ccpn.util.decorators import singleton
+from ccpn.util.Logging import getLogger
+
+
+FrameTiming = namedtuple('FrameTiming', 'time widgetCount buildTime paintTime')
+
+
+@singleton
+class GLRenderScheduler(QtCore.QObject):
+    """
+    Class to coalesce the full repaints of the GL widgets into frames
+    """
+    frameRate = 60.0  # maximum number of frames per second
+    maxFrameTimings = 256  # number of frames retained in frameTimings
+
+    def __init__(self):
+        super().__init__()
+
+        self._pending = {}  # (widget, None) pairs, in order of request
+        self._lastFrame = 0.0
+        self._frame = None  # [time, widgetCount, buildTime, paintTime] of the current frame
+        self.frameTimings = deque(maxlen=self.maxFrameTimings)
+
+        self._timer = QtCore.QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._releaseFrame)
+
+    @property
+    def frameInterval(self) -> float:
+        """Minimum time between frames (s)
+        """
+        return 1.0 / self.frameRate
+
+    def requestUpdate(self, widget):
+        """Request a full repaint of widget; released with the next frame
+        """
+        self._pending[widget] = None
+        if not self._timer.isActive():
+            delay = max(0.0, self.frameInterval - (time.perf_counter() - self._lastFrame))
+            self._timer.start(int(delay * 1000.0))
+
+    def takeRequest(self, widget) -> bool:
+        """Remove the pending request of widget; only when widget is fully rebuilt before the frame is released,
+        a partial (e.g. mouse-only) paint leaves the request pending
+        :return True if there was a pending request
+        """
+        if widget in self._pending:
+            del self._pending[widget]
+            return True
+        return False
+
+    def _releaseFrame(self):
+        """Release the pending requests; executed by the timer
+        """
+        self._finishFrame()
+
+        self._lastFrame = time.perf_counter()
+        widgets, self._pending = list(self._pending), {}
+        if widgets:
+            self._frame = [self._lastFrame, 0, 0.0, 0.0]
+        for widget in widgets:
+            try:
+                widget._updateFrame()
+            except RuntimeError:
+                # underlying Qt object has been deleted
+                continue
+
+    def _finishFrame(self):
+        """Store the timings of the current frame
+        """
+        if self._frame is None:
+            return
+
+        frame = FrameTiming(*self._frame)
+        self._frame = None
+        if frame.widgetCount:
+            self.frameTimings.append(frame)
+            if frame.buildTime + frame.paintTime > self.frameInterval:
+                getLogger().debug('GL frame: %d widgets, build %.1f ms, paint %.1f ms' %
+                                  (frame.widgetCount, frame.buildTime * 1000.0, frame.paintTime * 1000.0))
+
+    def addTimings(self, buildTime, paintTime):
+        """Add the build and paint times (s) of a widget to the current frame
+        """
+        if self._frame is None:
+            # painted outside of a frame; e.g. resize or expose
+            self._frame = [time.perf_counter(), 0, 0.0, 0.0]
+        self._frame[1] += 1
+        self._frame[2] += buildTime
+        self._frame[3] += paintTime
@@ -0,0 +1,168 @@
+"""
+This file contains the min/max decimation pyramid for the display of 1D spectra (see GuiSpectrumView1d)
+
+For a slice of n points, level 'factor' (2, 4, 8, ...) holds, for every block of factor consecutive
+points, the indices of the maximum and the minimum of the block; drawing a line-strip through these
+points (in index order) reproduces the envelope of the full-resolution slice, so that no peak maxima
+(or minima) are lost. Levels are derived from the previous level on first request and retained.
+
+The level to display is chosen from the number of points per (screen) pixel of the visible region;
+the vertices cover the visible region and a margin on both sides, so that small pans do not require
+a rebuild (see SlicePyramid.getRange).
+
+Typical usage:
+
+    pyramid = SlicePyramid(intensities)
+    factor, start, stop = pyramid.getRange(positions, visibleRange, pixelCount)
+    indices = pyramid.getIndices(start, stop, factor)
+    x, y = positions[indices], intensities[indices]
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import numpy
+
+
+PYRAMID_MIN_POINTS = 4096  # slices with fewer points are always displayed in full
+
+
+def getIndexRange(positions, limits):
+    """:return the (start, stop) indices of positions (monotonic; increasing or decreasing)
+    covering limits, extended by one point on both sides
+    """
+    count = len(positions)
+    lo, hi = sorted(limits)
+    if count < 2 or positions[0] <= positions[-1]:
+        start = numpy.searchsorted(positions, lo, side='left')
+        stop = numpy.searchsorted(positions, hi, side='right')
+    else:
+        _reversed = positions[::-1]
+        start = count - numpy.searchsorted(_reversed, hi, side='right')
+        stop = count - numpy.searchsorted(_reversed, lo, side='left')
+    return max(int(start) - 1, 0), min(int(stop) + 1, count)
+
+
+class SlicePyramid(object):
+    """
+    Min/max decimation pyramid of the intensities of a 1D spectrum.
+
+    - Levels are stored as the indices of the block extrema, so that the vertices are the true
+      positions and intensities of the extrema
+    - Levels are derived on first request
+    """
+
+    minPoints = PYRAMID_MIN_POINTS
+    margin = 1.0  # fraction of the visible width included on both sides of the visible region
+
+    def __init__(self, intensities):
+        """
+        :param intensities: the (1D) intensities of the spectrum
+        """
+        self.intensities = numpy.asarray(intensities)
+        self._levels = {}  # (factor, (maxIndices, minIndices)) pairs
+
+    def _getLevel(self, factor):
+        """:return the (maxIndices, minIndices) tuple of factor; derived from level factor // 2
+        """
+        if (level := self._levels.get(factor)) is not None:
+            return level
+
+        data = self.intensities
+        if factor == 2:
+            maxIndices = minIndices = numpy.arange(len(data), dtype=numpy.int64)
+        else:
+            maxIndices, minIndices = self._getLevel(factor // 2)
+
+        # pair the blocks of the previous level; an incomplete last pair is padded with its last block
+        if len(maxIndices) % 2:
+            maxIndices = numpy.append(maxIndices, maxIndices[-1])
+            minIndices = numpy.append(minIndices, minIndices[-1])
+        max0, max1 = maxIndices[0::2], maxIndices[1::2]
+        min0, min1 = minIndices[0::2], minIndices[1::2]
+        level = (numpy.where(data[max0] >= data[max1], max0, max1),
+                 numpy.where(data[min0] <= data[min1], min0, min1))
+
+        self._levels[factor] = level
+        return level
+
+    def getFactor(self, pointCount, pixelCount) -> int:
+        """:return the largest decimation factor (a power of 2) that still yields at least one block
+        per pixel for pointCount visible points; 1 if the slice is not to be decimated
+        """
+        if len(self.intensities) < self.minPoints or not pixelCount:
+            return 1
+        factor = 1
+        while factor * 2 <= pointCount / pixelCount:
+            factor *= 2
+        return factor
+
+    def getRange(self, positions, visibleRange, pixelCount, clip=True, margin=None):
+        """Get the decimation of the visible region
+
+        :param positions: positions (ppm) of the points; monotonic
+        :param visibleRange: (limit1, limit2) tuple with the visible region (ppm)
+        :param pixelCount: number of pixels spanning the visible region
+        :param clip: if False, the range spans the complete slice
+        :param margin: fraction of the visible width to include on both sides; defaults to self.margin
+        :return a (factor, start, stop) tuple with the decimation factor and the (point) range to display
+        """
+        count = len(self.intensities)
+        if count < self.minPoints or visibleRange is None:
+            return 1, 0, count
+
+        start, stop = getIndexRange(positions, visibleRange)
+        factor = self.getFactor(stop - start, pixelCount)
+        if not clip:
+            return factor, 0, count
+
+        margin = int((self.margin if margin is None else margin) * (stop - start))
+        return factor, max(start - margin, 0), min(stop + margin, count)
+
+    @staticmethod
+    def covers(decimation, newDecimation) -> bool:
+        """:return True if the (factor, start, stop) tuple decimation has the factor of newDecimation
+        and spans its range
+        """
+        if decimation is None:
+            return False
+        factor, start, stop = decimation
+        newFactor, newStart, newStop = newDecimation
+        return factor == newFactor and start <= newStart and stop >= newStop
+
+    def getIndices(self, start, stop, factor) -> numpy.ndarray:
+        """:return the indices of the points of the range [start, stop) to display at factor,
+        in increasing order
+        """
+        if factor <= 1:
+            return numpy.arange(start, stop, dtype=numpy.int64)
+
+        maxIndices, minIndices = self._getLevel(factor)
+        blocks = slice(start // factor, -(-stop // factor))
+        maxIndices, minIndices = maxIndices[blocks], minIndices[blocks]
+        return numpy.column_stack((numpy.minimum(maxIndices, minIndices),
+                                   numpy.maximum(maxIndices, minIndices))).ravel()
@@ -0,0 +1,254 @@
+"""
+This file contains the cache and prefetching worker for the 1D traces (slices) of the spectra
+displayed in nD strips (see CcpnOpenGL.updateTraces and GuiSpectrumViewNd._getSliceData)
+
+The raw slices are stored per spectrum in a least-recently-used cache; the analytic (complex) data
+required for phasing are derived on first request and retained with the slice, so that changing the
+phase only recomputes the (vectorised) phase correction.
+
+Every request records the position of the slice; when the cursor moves, the slices next in the
+direction of movement are read ahead on a background thread. Prefetches that are no longer ahead of
+the cursor are dropped as soon as a new request arrives.
+
+All reads hold the _readLock of the data-source (as do the Spectrum data methods), so that the
+worker does not interleave with other access of the data-source. Only sources that can be read
+without creating or filling their hdf5 buffer (which may show a progress dialog) are prefetched.
+
+Typical usage:
+
+    cache = getTraceCache()
+    data = cache.getSlice(spectrum, position, sliceDim)
+    data, analytic = cache.getAnalyticSlice(spectrum, position, sliceDim)
+
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+
+from ccpn.util.Phasing import analyticData
+from ccpn.util.Logging import getLogger
+
+
+def _readSlice(dataSource, scale, position, sliceDim):
+    """Read the slice along sliceDim at position (1-based) from dataSource;
+    as Spectrum.getSliceData, without the logging and side-effects, so that it can run in a worker thread
+    """
+    with dataSource._readLock:
+        position = dataSource.checkForValidSlice(list(position), sliceDim)
+        data = dataSource.getSliceData(position=position, sliceDim=sliceDim)
+    return data.copy(order='K') * scale
+
+
+class TraceCache(object):
+    """
+    Least-recently-used cache of the slices of spectra, with a worker prefetching the neighbouring slices.
+
+    - Slices are keyed on the data-source (and its data-version), scale, sliceDim and position
+    - At most maxItems slices are retained per spectrum
+    - A prefetch that is no longer ahead of the last request is cancelled, or skipped when it starts
+    - Access is thread-safe
+    """
+
+    maxItems = 64  # number of slices retained per spectrum
+    prefetchCount = 4  # number of slices read ahead in the direction of the cursor movement
+    maxWorkers = 1
+
+    def __init__(self):
+        self._items = {}  # (spectrumPid, OrderedDict) pairs; (sliceKey, [data, analytic]) pairs, least-recently used first
+        self._pending = {}  # (sliceKey, future) pairs of the prefetches in progress
+        self._wanted = {}  # keys of the slices ahead of the last request per (spectrumPid, sliceDim)
+        self._lastPositions = {}  # position of the last request per (spectrumPid, sliceDim)
+        self._lock = RLock()
+        self._executor = None
+
+    @staticmethod
+    def _getSliceKey(spectrum, position, sliceDim) -> tuple:
+        """:return the key of the slice in the cache
+        """
+        dataSource = spectrum.dataSource
+        return (id(dataSource), dataSource._dataVersion, spectrum.scale, sliceDim, tuple(position))
+
+    def _getItem(self, spectrumPid, sliceKey):
+        with self._lock:
+            if (items := self._items.get(spectrumPid)) is not None and (item := items.get(sliceKey)) is not None:
+                items.move_to_end(sliceKey)
+                return item
+
+    def _putItem(self, spectrumPid, sliceKey, data):
+        """Add data as sliceKey, removing the least-recently used slices of the spectrum
+        :return the item
+        """
+        with self._lock:
+            items = self._items.setdefault(spectrumPid, OrderedDict())
+            items[sliceKey] = item = [data, None]
+            while len(items) > self.maxItems:
+                items.popitem(last=False)
+            return item
+
+    def _getSliceItem(self, spectrum, position, sliceDim, prefetch):
+        """:return the [data, analytic] item of the slice; read in the calling thread if not present
+        """
+        position = tuple(position)
+        sliceKey = self._getSliceKey(spectrum, position, sliceDim)
+        with self._lock:
+            future = self._pending.get(sliceKey)
+        if future is not None and future.running():
+            # being read by the worker; wait rather than reading twice
+            future.result()
+
+        if (item := self._getItem(spectrum.pid, sliceKey)) is None:
+            item = self._putItem(spectrum.pid, sliceKey,
+                                 _readSlice(spectrum.dataSource, spectrum.scale, position, sliceDim))
+        if prefetch:
+            self._prefetch(spectrum, position, sliceDim)
+        return item
+
+    def getSlice(self, spectrum, position, sliceDim, prefetch=True):
+        """Get the slice along sliceDim at position
+
+        :param spectrum: Spectrum instance; should have a dataSource
+        :param position: position vector (1-based integers); position[sliceDim-1] should be 1
+        :param sliceDim: dimension of the slice (1-based)
+        :param prefetch: read ahead the next slices in the direction of the previous request
+        :return numpy array with the slice data; not to be modified
+        """
+        return self._getSliceItem(spectrum, position, sliceDim, prefetch)[0]
+
+    def getAnalyticSlice(self, spectrum, position, sliceDim, prefetch=True):
+        """Get the slice along sliceDim at position, and its analytic (complex) data for phasing
+        (see Phasing.phaseAnalyticData); parameters as getSlice
+
+        :return a (data, analytic) tuple of numpy arrays; not to be modified
+        """
+        item = self._getSliceItem(spectrum, position, sliceDim, prefetch)
+        if item[1] is None:
+            item[1] = analyticData(item[0])
+        return tuple(item)
+
+    def _prefetch(self, spectrum, position, sliceDim):
+        """Submit the prefetch of the slices beyond position, in the direction of the cursor movement
+        since the previous request; drop the pending prefetches of earlier requests that are no longer ahead
+        """
+        requestKey = (spectrum.pid, sliceDim)
+        with self._lock:
+            lastPosition = self._lastPositions.get(requestKey)
+            self._lastPositions[requestKey] = position
+
+            wanted = []
+            if lastPosition is not None and len(lastPosition) == len(position):
+                steps = [(p > lp) - (p < lp) for p, lp in zip(position, lastPosition)]
+                if any(steps):
+                    pointCounts = spectrum.pointCounts
+                    for count in range(1, self.prefetchCount + 1):
+                        nextPosition = tuple((p - 1 + count * step) % pointCount + 1
+                                             for p, step, pointCount in zip(position, steps, pointCounts))
+                        wanted.append((self._getSliceKey(spectrum, nextPosition, sliceDim), nextPosition))
+            self._wanted[requestKey] = {sliceKey for sliceKey, _position in wanted}
+
+            for sliceKey, future in list(self._pending.items()):
+                if future.requestKey == requestKey and sliceKey not in self._wanted[requestKey]:
+                    future.cancel()
+
+            if not wanted or not spectrum.dataSource._isReadyForBackgroundReading:
+                return
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix='traces')
+
+            dataSource, scale = spectrum.dataSource, spectrum.scale
+            for sliceKey, nextPosition in wanted:
+                if self._getItem(spectrum.pid, sliceKey) is not None or sliceKey in self._pending:
+                    continue
+
+                future = self._executor.submit(self._fetch, spectrum.pid, sliceKey, requestKey,
+                                               dataSource, scale, nextPosition, sliceDim)
+                future.requestKey = requestKey
+                self._pending[sliceKey] = future
+                future.add_done_callback(lambda _future, _key=sliceKey: self._removePending(_key))
+
+    def _fetch(self, spectrumPid, sliceKey, requestKey, dataSource, scale, position, sliceDim):
+        """Read a slice and add it to the cache; executed by the worker
+        """
+        with self._lock:
+            if sliceKey not in self._wanted.get(requestKey, ()):
+                # the cursor has moved on
+                return
+
+        try:
+            data = _readSlice(dataSource, scale, position, sliceDim)
+        except Exception as es:
+            getLogger().debug(f'TraceCache: prefetching {position} failed: {es}')
+            return
+        self._putItem(spectrumPid, sliceKey, data)
+
+    def _removePending(self, sliceKey):
+        with self._lock:
+            self._pending.pop(sliceKey, None)
+
+    def clear(self, spectrumPid=None):
+        """Clear all slices, or only those of spectrumPid
+        """
+        with self._lock:
+            if spectrumPid is None:
+                self._items.clear()
+                self._lastPositions.clear()
+                self._wanted.clear()
+            else:
+                self._items.pop(spectrumPid, None)
+                for requestKey in [key for key in self._lastPositions if key[0] == spectrumPid]:
+                    del self._lastPositions[requestKey]
+                    self._wanted.pop(requestKey, None)
+
+    def shutdown(self):
+        """Cancel the pending prefetches and stop the worker
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def __len__(self):
+        return sum(len(items) for items in self._items.values())
+
+    def __str__(self):
+        return '<TraceCache: %d slices of %d spectra>' % (len(self), len(self._items))
+
+
+_traceCache = None
+
+
+def getTraceCache() -> TraceCache:
+    """:return the (application-wide) TraceCache instance
+    """
+    global _traceCache
+
+    if _traceCache is None:
+        _traceCache = TraceCache()
+    return _traceCache
@@ -598,6 +598,14 @@ class PreferencesPopup(CcpnDialogMainWidget):
         self.backupSaveCountData.setMinimumWidth(LineEditsMinimumWidth)
         self.backupSaveCountData.valueChanged.connect(self._queueSetBackupSaveCount)
 
+        row += 1
+        tTip = "Only write the modified parts of the project on 'Save'.\n" \
+               'The backup on user-save then links to the unchanged files instead of moving them.'
+        self.incrementalSaveBox = _makeCheckBox(parent, row=row, text="Incremental 'Save'",
+                                                callback=partial(self._queueToggleGeneralOptions,
+                                                                 'incrementalSave'),
+                                                toolTip=tTip)
+
         row += 1
         self._backupButton = _makeButton(parent, text='', row=row,
                                          buttonText='View backups',
@@ -1144,6 +1152,7 @@ class PreferencesPopup(CcpnDialogMainWidget):
         self.autoBackupCountData.setValue(self.preferences.general.autoBackupCount)
         self.backupSaveEnabledBox.setChecked(self.preferences.general.backupSaveEnabled)
         self.backupSaveCountData.setValue(self.preferences.general.backupSaveCount)
+        self.incrementalSaveBox.setChecked(self.preferences.general.incrementalSave)
 
         # not needed setting the index sets path.
         # self.userWorkingPathData.setText(self.preferences.general.userWorkingPath)
@@ -1176,6 +1185,8 @@ class PreferencesPopup(CcpnDialogMainWidget):
         """
         self.autoSetDataPathBox.setChecked(self.preferences.general.autoSetDataPath)
         self.userDataPathText.setText(self.preferences.general.dataPath)
+        self.blockCacheSizeData.setValue(self.preferences.general.spectrumBlockCacheSize)
+        self.keepNmrPipeBuffersBox.setChecked(self.preferences.general.keepNmrPipeBuffers)
 
         # populate ValidateFrame
         # self._validateFrame._populate()
@@ -1235,6 +1246,9 @@ class PreferencesPopup(CcpnDialogMainWidget):
         # multipletAveraging = self.preferences.general.multipletAveraging
         # self.multipletAveraging.setIndex(MULTIPLETAVERAGINGTYPES.index(multipletAveraging) if multipletAveraging in MULTIPLETAVERAGINGTYPES else 0)
         self.singleContoursBox.setChecked(self.preferences.general.generateSinglePlaneContours)
+        self.multiResolutionContoursBox.setChecked(self.preferences.general.multiResolutionContours)
+        self.backgroundContoursBox.setChecked(self.preferences.general.backgroundContours)
+        self.regionContoursBox.setChecked(self.preferences.general.regionContours)
         # self.negativeTraceColourBox.setChecked(self.preferences.general.traceIncludeNegative)
 
         for aspect, aspectValue in self.preferences.general.aspectRatios.items():
@@ -1333,6 +1347,22 @@ class PreferencesPopup(CcpnDialogMainWidget):
         self.userDataPathButton = Button(parent, grid=(row, 2), callback=self._getUserDataPath, icon='icons/directory',
                                          hPolicy='fixed', hAlign='left')
 
+        row += 1
+        tTip = 'The size (in MB) of the memory cache for data-blocks, shared by all spectra.\n' \
+               'Used by the blocked spectrum formats; e.g. UCSF, Azara, Felix, NmrView and Xeasy.'
+        self.blockCacheSizeLabel = _makeLabel(parent, text="Block cache size (MB)", grid=(row, 0))
+        self.blockCacheSizeData = DoubleSpinbox(parent, grid=(row, 1), hAlign='l', min=0, max=65536, decimals=0, step=64)
+        self.blockCacheSizeLabel.setToolTip(tTip)
+        self.blockCacheSizeData.setToolTip(tTip)
+        self.blockCacheSizeData.setMinimumWidth(LineEditsMinimumWidth)
+        self.blockCacheSizeData.valueChanged.connect(self._queueSetBlockCacheSize)
+
+        row += 1
+        self.keepNmrPipeBuffersBox = _makeCheckBox(parent, text="Keep NmrPipe buffers", row=row,
+                                                   callback=partial(self._queueToggleGeneralOptions, 'keepNmrPipeBuffers'),
+                                                   toolTip='Keep the hdf5 buffer files next to the NmrPipe data,\n'
+                                                           'so that later sessions can reuse them')
+
         #====== Spectrum Display ======
         row += 1
         _makeLine(parent, grid=(row, 0), text="Spectrum Display")
@@ -1568,6 +1598,33 @@ class PreferencesPopup(CcpnDialogMainWidget):
         self.singleContoursBox = CheckBox(parent, grid=(row, 1))
         self.singleContoursBox.toggled.connect(partial(self._queueToggleGeneralOptions, 'generateSinglePlaneContours'))
 
+        row += 1
+        self.multiResolutionContoursLabel = _makeLabel(parent, text="Multi-resolution contours", grid=(row, 0))
+        self.multiResolutionContoursBox = CheckBox(parent, grid=(row, 1))
+        self.multiResolutionContoursBox.toggled.connect(partial(self._queueToggleGeneralOptions, 'multiResolutionContours'))
+        _tTip = 'Contour large planes from decimated data when zoomed out;\n' \
+                'the decimated planes retain the largest (absolute) value of each block'
+        self.multiResolutionContoursLabel.setToolTip(_tTip)
+        self.multiResolutionContoursBox.setToolTip(_tTip)
+
+        row += 1
+        self.backgroundContoursLabel = _makeLabel(parent, text="Build contours in background", grid=(row, 0))
+        self.backgroundContoursBox = CheckBox(parent, grid=(row, 1))
+        self.backgroundContoursBox.toggled.connect(partial(self._queueToggleGeneralOptions, 'backgroundContours'))
+        _tTip = 'Build the contours on a worker thread;\n' \
+                'the current contours are shown until the new contours are ready'
+        self.backgroundContoursLabel.setToolTip(_tTip)
+        self.backgroundContoursBox.setToolTip(_tTip)
+
+        row += 1
+        self.regionContoursLabel = _makeLabel(parent, text="Contour visible region only", grid=(row, 0))
+        self.regionContoursBox = CheckBox(parent, grid=(row, 1))
+        self.regionContoursBox.toggled.connect(partial(self._queueToggleGeneralOptions, 'regionContours'))
+        _tTip = 'When zoomed in, read and contour only the tiles of the plane covering the visible region;\n' \
+                'tiles are added as the view is panned'
+        self.regionContoursLabel.setToolTip(_tTip)
+        self.regionContoursBox.setToolTip(_tTip)
+
         row += 1
         self.contourThicknessLabel = _makeLabel(parent, text="Contour thickness (pixel)", grid=(row, 0))
         self.contourThicknessData = Spinbox(parent, step=1,
@@ -1997,6 +2054,20 @@ class PreferencesPopup(CcpnDialogMainWidget):
         dialog = SpectrumFileDialog(parent=self)
         dialog.initialPath = aPath(value).filepath
 
+    @queueStateChange(_verifyPopupApply)
+    def _queueSetBlockCacheSize(self, _value):
+        textFromValue = self.blockCacheSizeData.textFromValue
+        value = self.blockCacheSizeData.get()
+        prefValue = textFromValue(self.preferences.general.spectrumBlockCacheSize)
+        if textFromValue(value) != prefValue:
+            return partial(self._setBlockCacheSize, value)
+
+    def _setBlockCacheSize(self, value):
+        from ccpn.core.lib.SpectrumDataSources.lib.BlockCache import setBlockCacheSize
+
+        self.preferences.general.spectrumBlockCacheSize = int(value)
+        setBlockCacheSize(int(value))
+
     def _getUserDataPath(self):
         currentDataPath = aPath(self.userDataPathText.text() or '~')
         currentDataPath = currentDataPath if currentDataPath.exists() else aPath('~')
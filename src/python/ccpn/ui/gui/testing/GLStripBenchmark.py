@@ -0,0 +1,328 @@
+"""
+Benchmark of the OpenGL strip pipeline (see lib/OpenGL/CcpnOpenGL) on synthetic spectra
+
+Usage:
+    python GLStripBenchmark.py [-d dimensionCount ...] [-p peakCount ...] [-r repeats] [-o results.json]
+
+The strips are driven offscreen: unless defined otherwise in the environment, the Qt 'offscreen' platform
+is used with (Mesa) software rendering, so that neither a display nor a GPU is required.
+
+For every (dimensionCount, peakCount) case, a synthetic Hdf5 spectrum (gaussian peaks on noise) with a
+peakList of peakCount peaks is shown in a new spectrumDisplay, and for every repeat the timings (s) of
+the following stages of its strip are recorded:
+
+    contourBuild    contours of the visible planes (CcpnGLWidget.buildSpectra; contour cache cleared)
+    symbolBuild     peak symbols (GLLabelling.buildSymbols)
+    labelBuild      peak labels (GLLabelling.buildLabels)
+    vboUpload       upload of the vertex/index arrays of the above stages to the graphics card
+                    (define...VBO methods); excluded from the stage timings
+    frame           a full frame (CcpnGLWidget.paintGL) once all has been built
+
+The medians (and all values) are written as json, together with the GL vendor/renderer/version, so that
+the results of different releases (or machines) can be compared. Contours are built synchronously
+(preferences.general.backgroundContours is disabled during the benchmark).
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+
+import os
+import sys
+import json
+import platform
+from contextlib import contextmanager
+from statistics import median
+from time import perf_counter
+
+import numpy
+
+
+DIMENSION_POINTCOUNTS = {2: (2048, 512),
+                         3: (1024, 128, 64)}
+DIMENSION_ISOTOPECODES = {2: ('1H', '15N'),
+                          3: ('1H', '15N', '13C')}
+STAGES = ('contourBuild', 'symbolBuild', 'labelBuild', 'vboUpload', 'frame')
+NOISE = 1.0e4
+PEAK_HEIGHT = 1.0e6
+
+
+def _setupEnvironment():
+    """Select the offscreen platform and software rendering, unless defined otherwise;
+    must be called before the QApplication is created
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ.setdefault('LIBGL_ALWAYS_SOFTWARE', '1')
+
+
+def makeSpectrumData(pointCounts, peakCount, seed=None):
+    """Make the data of a synthetic spectrum
+
+    :param pointCounts: x,y,z-ordered number of points
+    :param peakCount: number of gaussian peaks
+    :return a (data, peakPoints) tuple; data is a float32 numpy array in z,y,x order, peakPoints is an
+            (peakCount, dimensionCount) array of the x,y,z-ordered (0-based) points of the peaks
+    """
+    from scipy.ndimage import gaussian_filter
+
+    rng = numpy.random.default_rng(seed)
+    shape = tuple(reversed(pointCounts))
+    peakPoints = numpy.column_stack([rng.integers(0, p, size=peakCount) for p in pointCounts])
+
+    data = numpy.zeros(shape, dtype=numpy.float32)
+    numpy.add.at(data, tuple(peakPoints[:, ::-1].T), PEAK_HEIGHT * rng.uniform(0.1, 1.0, size=peakCount))
+    data = gaussian_filter(data, sigma=1.5)
+    data += rng.normal(scale=NOISE, size=shape).astype(numpy.float32)
+    return data.astype(numpy.float32), peakPoints
+
+
+def makeSpectrum(project, dimensionCount, peakCount, seed=None):
+    """Make a synthetic Hdf5 spectrum with peakCount peaks in its (first) peakList
+    :return the Spectrum instance
+    """
+    from ccpn.core.lib.ContextManagers import undoBlockWithoutSideBar, notificationEchoBlocking
+
+    pointCounts = DIMENSION_POINTCOUNTS[dimensionCount]
+    data, peakPoints = makeSpectrumData(pointCounts, peakCount, seed=seed)
+
+    spectrum = project.newHdf5Spectrum(isotopeCodes=DIMENSION_ISOTOPECODES[dimensionCount],
+                                       name='benchmark%dD_%d' % (dimensionCount, peakCount),
+                                       pointCounts=pointCounts)
+    if dimensionCount == 2:
+        spectrum.setPlaneData(data, position=[1, 1], xDim=1, yDim=2)
+    else:
+        for zPoint, plane in enumerate(data, start=1):
+            spectrum.setPlaneData(plane, position=[1, 1, zPoint], xDim=1, yDim=2)
+
+    spectrum.noiseLevel = NOISE
+    spectrum.positiveContourBase = 5.0 * NOISE
+    spectrum.positiveContourFactor = 1.41
+    spectrum.positiveContourCount = 10
+    spectrum.includeNegativeContours = False
+
+    peakList = spectrum.peakLists[0]
+    with undoBlockWithoutSideBar():
+        with notificationEchoBlocking():
+            for points in peakPoints:
+                ppmPositions = [spectrum.point2ppm(float(p) + 1.0, dimension=dim)
+                                for dim, p in enumerate(points, start=1)]
+                peakList.newPeak(ppmPositions=ppmPositions)
+    return spectrum
+
+
+class _VBOTimer(object):
+    """Accumulate the time spent in uploading the vertex/index arrays to the graphics card
+    by wrapping the define...VBO methods of the vertex-array classes
+    """
+    methods = ('defineIndexVBO', 'defineAliasedIndexVBO', 'defineVertexColorVBO', 'defineTextArrayVBO',
+               'defineIntIndexVBO')
+
+    def __init__(self):
+        self.time = 0.0
+        self._depth = 0
+
+    def _wrap(self, func):
+        def _timed(*args, **kwds):
+            self._depth += 1
+            tStart = perf_counter()
+            try:
+                return func(*args, **kwds)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.time += perf_counter() - tStart
+
+        return _timed
+
+    @contextmanager
+    def installed(self):
+        from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLArrays import _GLVertexArray, _VBOGLVertexArray
+
+        originals = [(cls, name, cls.__dict__[name]) for cls in (_GLVertexArray, _VBOGLVertexArray)
+                     for name in self.methods if name in cls.__dict__]
+        try:
+            for cls, name, func in originals:
+                setattr(cls, name, self._wrap(func))
+            yield self
+        finally:
+            for cls, name, func in originals:
+                setattr(cls, name, func)
+
+
+def _timeStage(glWidget, vboTimer, func):
+    """Time func within the GL context of glWidget
+    :return a (time, vboTime) tuple; time excludes vboTime
+    """
+    from ccpn.ui.gui.lib.OpenGL import GL
+
+    glWidget.makeCurrent()
+    try:
+        vboStart = vboTimer.time
+        tStart = perf_counter()
+        func()
+        GL.glFinish()
+        elapsed = perf_counter() - tStart
+        vboTime = vboTimer.time - vboStart
+    finally:
+        glWidget.doneCurrent()
+    return elapsed - vboTime, vboTime
+
+
+def benchmarkStrip(strip, repeats=5):
+    """Time the stages of the GL pipeline of strip
+    :return dict of (stage, list of timings) items
+    """
+    from ccpn.ui.gui.lib.ContourCache import getContourCache
+    from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLDefs import PaintModes
+
+    glWidget = strip._CcpnGLWidget
+    GLPeaks = glWidget._GLPeaks
+    peakListViews = [plv for sv in strip.spectrumViews for plv in sv.peakListViews]
+
+    def _buildContours():
+        getContourCache().clear()
+        for spectrumView in strip.spectrumViews:
+            spectrumView.buildContours = True
+        glWidget.buildSpectra()
+
+    def _buildSymbols():
+        for plv in peakListViews:
+            plv.buildSymbols = True
+        GLPeaks._spectrumSettings = glWidget._spectrumSettings
+        GLPeaks.buildSymbols()
+
+    def _buildLabels():
+        for plv in peakListViews:
+            plv.buildLabels = True
+        GLPeaks.buildLabels()
+
+    def _paintFrame():
+        glWidget._paintMode = PaintModes.PAINT_ALL
+        glWidget.paintGL()
+
+    timings = {stage: [] for stage in STAGES}
+    vboTimer = _VBOTimer()
+    with vboTimer.installed():
+        for _count in range(repeats):
+            vboTime = 0.0
+            for stage, func in (('contourBuild', _buildContours),
+                                ('symbolBuild', _buildSymbols),
+                                ('labelBuild', _buildLabels)):
+                elapsed, vbo = _timeStage(glWidget, vboTimer, func)
+                timings[stage].append(elapsed)
+                vboTime += vbo
+            timings['vboUpload'].append(vboTime)
+
+            elapsed, vbo = _timeStage(glWidget, vboTimer, _paintFrame)
+            timings['frame'].append(elapsed + vbo)
+    return timings
+
+
+def _getGLInfo(glWidget) -> dict:
+    from ccpn.ui.gui.lib.OpenGL import GL
+
+    glWidget.makeCurrent()
+    try:
+        return {name: (GL.glGetString(value) or b'').decode('utf-8', 'replace')
+                for name, value in (('vendor', GL.GL_VENDOR), ('renderer', GL.GL_RENDERER),
+                                    ('version', GL.GL_VERSION))}
+    finally:
+        glWidget.doneCurrent()
+
+
+def runBenchmark(dimensionCounts=(2, 3), peakCounts=(1000, 10000), repeats=5, jsonPath=None, output=sys.stdout):
+    """Run the benchmark for all (dimensionCount, peakCount) cases
+    :return dict with the results; written as json to jsonPath (if defined)
+    """
+    _setupEnvironment()
+
+    from PyQt5 import QtCore, QtWidgets
+    from ccpn.ui.gui.widgets.Application import newTestApplication
+    from ccpn.framework.Application import getApplication
+    from ccpn.framework.Version import applicationVersion
+
+    app = newTestApplication(interface='Gui')
+    application = getApplication()
+    project = application.project
+    mainWindow = application.ui.mainWindow
+    application.preferences.general.backgroundContours = False
+
+    results = {'applicationVersion': str(applicationVersion),
+               'python'            : platform.python_version(),
+               'qt'                : QtCore.QT_VERSION_STR,
+               'platform'          : platform.platform(),
+               'qpaPlatform'       : QtWidgets.QApplication.platformName(),
+               'gl'                : None,
+               'cases'             : []}
+
+    for dimensionCount in dimensionCounts:
+        for peakCount in peakCounts:
+            spectrum = makeSpectrum(project, dimensionCount, peakCount, seed=peakCount)
+            display = mainWindow.newSpectrumDisplay(spectrum)
+            QtWidgets.QApplication.processEvents()
+            strip = display.strips[0]
+
+            if results['gl'] is None:
+                results['gl'] = _getGLInfo(strip._CcpnGLWidget)
+
+            timings = benchmarkStrip(strip, repeats=repeats)
+            results['cases'].append({'dimensionCount': dimensionCount,
+                                     'pointCounts'   : list(spectrum.pointCounts),
+                                     'peakCount'     : peakCount,
+                                     'repeats'       : repeats,
+                                     'median'        : {stage: median(values) for stage, values in timings.items()},
+                                     'timings'       : timings})
+            display.delete()
+            spectrum.delete()
+
+    if jsonPath is not None:
+        with open(jsonPath, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    if output is not None:
+        gl = results['gl'] or {}
+        output.write('GL: %s / %s / %s (%s)\n' % (gl.get('vendor'), gl.get('renderer'), gl.get('version'),
+                                                  results['qpaPlatform']))
+        output.write('%4s %8s' % ('dims', 'peaks') + ''.join('%14s' % stage for stage in STAGES) + '  (median, s)\n')
+        for case in results['cases']:
+            output.write('%4d %8d' % (case['dimensionCount'], case['peakCount']) +
+                         ''.join('%14.4f' % case['median'][stage] for stage in STAGES) + '\n')
+
+    app.quit()
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark of the OpenGL strip pipeline')
+    parser.add_argument('-d', '--dimensionCounts', type=int, nargs='+', default=[2, 3], choices=(2, 3))
+    parser.add_argument('-p', '--peakCounts', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('-r', '--repeats', type=int, default=5)
+    parser.add_argument('-o', '--output', dest='jsonPath', default=None, help='path of the json results')
+    _args = parser.parse_args()
+
+    runBenchmark(dimensionCounts=_args.dimensionCounts, peakCounts=_args.peakCounts, repeats=_args.repeats,
+                 jsonPath=_args.jsonPath)
@@ -0,0 +1,210 @@
+"""
+Tests for the least-recently-used cache and the background builds of the contours (ContourCache)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from unittest import mock
+from threading import Event
+import numpy as np
+
+from ccpn.ui.gui.lib import ContourCache as ContourCacheModule
+from ccpn.ui.gui.lib.ContourCache import ContourCache, buildContours
+
+
+TIMEOUT = 10.0
+
+
+def _item(nBytes):
+    """:return a (numVertices, indices, vertices, colours) tuple of nBytes in total
+    """
+    return (1, np.zeros(nBytes // 4, dtype=np.uint32), np.zeros(0, dtype=np.float32),
+            np.zeros(0, dtype=np.float32))
+
+
+def _buildContours(dataArrays, *args):
+    """Stand-in for buildContours; an item of the size of dataArrays
+    """
+    return _item(sum(arr.nbytes for arr in dataArrays))
+
+
+class ContourCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(ContourCacheModule, 'buildContours', _buildContours)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ContourCache(maxBytes=1000)
+        self.addCleanup(self.cache.shutdown)
+
+        # the first build blocks the (single) worker until released; later builds are queued
+        self.started = Event()
+        self.release = Event()
+        self.addCleanup(self.release.set)
+        self.reads = []
+
+    def _blockingData(self):
+        self.started.set()
+        self.release.wait(TIMEOUT)
+        return self._data('blocking')
+
+    def _data(self, name, nBytes=400):
+        self.reads.append(name)
+        return (np.zeros(nBytes // 4, dtype=np.float32),)
+
+    def _submit(self, key, getData):
+        return self.cache.submit(key, getData, None, None, None, None)
+
+    def _blockWorker(self):
+        future = self._submit('blocking', self._blockingData)
+        self.assertTrue(self.started.wait(TIMEOUT))
+        return future
+
+    def test_lru_eviction(self):
+        cache = self.cache
+        for key in 'abc':
+            cache.put(key, _item(400))
+        # 1200 bytes > maxBytes; 'a' was used least recently
+        self.assertEqual(list(cache._items), ['b', 'c'])
+        self.assertEqual(cache._bytes, 800)
+
+        self.assertIsNotNone(cache.get('b'))
+        cache.put('d', _item(400))
+        self.assertEqual(list(cache._items), ['b', 'd'])
+
+        # replacing an item updates the byte count
+        cache.put('d', _item(100))
+        self.assertEqual(cache._bytes, 500)
+
+        # an item exceeding maxBytes is retained on its own
+        cache.put('e', _item(2000))
+        self.assertEqual(list(cache._items), ['e'])
+        self.assertEqual(cache._bytes, 2000)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache._bytes, 0)
+
+    def test_clear_spectrum(self):
+        cache = self.cache
+        cache.put(('SP:1', 1), _item(100))
+        cache.put(('SP:2', 1), _item(100))
+        cache.clear('SP:1')
+        self.assertEqual(list(cache._items), [('SP:2', 1)])
+        self.assertEqual(cache._bytes, 100)
+
+    def test_submit(self):
+        future = self._submit('a', lambda: self._data('a'))
+        item = future.result(TIMEOUT)
+        self.assertEqual(item[1].nbytes, 400)
+        self.assertIs(self.cache.get('a'), item)
+        self.assertFalse(self.cache.isPending('a'))
+
+    def test_data_read_by_job(self):
+        self._blockWorker()
+        future = self._submit('a', lambda: self._data('a'))
+        # queued; the data have not been read yet
+        self.assertTrue(self.cache.isPending('a'))
+        self.assertEqual(self.reads, [])
+
+        self.release.set()
+        future.result(TIMEOUT)
+        self.assertEqual(self.reads, ['blocking', 'a'])
+
+    def test_cancel(self):
+        blocking = self._blockWorker()
+        future = self._submit('a', lambda: self._data('a'))
+        self.assertTrue(self.cache.isPending('a'))
+
+        self.assertTrue(self.cache.cancel('a'))
+        self.assertTrue(future.cancelled())
+        self.assertFalse(self.cache.isPending('a'))
+        self.assertFalse(self.cache.cancel('a'))
+
+        # a running build is not cancelled
+        self.assertFalse(self.cache.cancel('blocking'))
+        self.release.set()
+        blocking.result(TIMEOUT)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertNotIn('a', self.reads)
+
+    def test_request_counting(self):
+        self._blockWorker()
+        cache = self.cache
+        self.assertIsNone(cache.getPending('a'))
+
+        future = self._submit('a', lambda: self._data('a'))
+        # a second submit and a getPending share the build
+        self.assertIs(self._submit('a', lambda: self._data('other')), future)
+        self.assertIs(cache.getPending('a'), future)
+        self.assertEqual(cache._requests['a'], 3)
+
+        # cancelled only when the last requester withdraws
+        self.assertFalse(cache.cancel('a'))
+        self.assertFalse(cache.cancel('a'))
+        self.assertTrue(cache.isPending('a'))
+        self.assertTrue(cache.cancel('a'))
+        self.assertFalse(cache.isPending('a'))
+        self.assertNotIn('a', cache._requests)
+
+    def test_build_error(self):
+        def _error():
+            raise ValueError('no data')
+
+        future = self._submit('a', _error)
+        with self.assertRaises(ValueError):
+            future.result(TIMEOUT)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertFalse(self.cache.isPending('a'))
+
+
+class BuildContoursTest(unittest.TestCase):
+
+    def test_buildContours(self):
+        try:
+            from ccpnc.contour import Contourer2d  # noqa: F401
+        except ImportError:
+            self.skipTest('Contourer2d C-extension not available')
+
+        y, x = np.mgrid[-2:2:64j, -2:2:80j]
+        data = (np.exp(-(x ** 2 + y ** 2)) - 0.5 * np.exp(-((x - 1) ** 2 + (y - 1) ** 2) * 4)).astype(np.float32)
+        posLevels = np.array([0.2, 0.5], dtype=np.float32)
+        negLevels = np.array([-0.2], dtype=np.float32)
+        posColours = np.ones(8, dtype=np.float32)
+        negColours = np.zeros(4, dtype=np.float32)
+
+        numVertices, indices, vertices, colours = buildContours((data,), posLevels, negLevels,
+                                                                posColours, negColours)
+        self.assertGreater(numVertices, 0)
+        self.assertEqual(vertices.size, 2 * numVertices)
+        self.assertEqual(colours.size, 4 * numVertices)
+        self.assertLess(indices.max(), numVertices)
+
+        # no contours above the maximum of the data
+        numVertices, *_arrays = buildContours((data,), np.array([2.0], dtype=np.float32),
+                                              np.array([], dtype=np.float32), posColours[:4], negColours[:0])
+        self.assertEqual(numVertices, 0)
@@ -0,0 +1,157 @@
+"""
+Tests for the contouring of the tiles of a plane (GuiSpectrumViewNd)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from collections import Counter
+import numpy as np
+
+from ccpn.ui.gui.lib.ContourCache import buildContours
+from ccpn.ui.gui.lib.GuiSpectrumViewNd import GuiSpectrumViewNd, _getTileIndices
+
+
+POSLEVELS = np.array([0.1, 0.3, 0.6], dtype=np.float32)
+NEGLEVELS = np.array([-0.1, -0.3], dtype=np.float32)
+POSCOLOURS = np.array([1.0, 0.0, 0.0, 1.0] * 3, dtype=np.float32)
+NEGCOLOURS = np.array([0.0, 0.0, 1.0, 1.0] * 2, dtype=np.float32)
+
+
+def _makePlane(xCount=90, yCount=70):
+    """:return a (y, x) ordered plane with positive and negative peaks; some at the edges of the plane
+    """
+    y, x = np.mgrid[0:yCount, 0:xCount].astype(np.float32)
+    data = np.zeros((yCount, xCount), dtype=np.float32)
+    for height, xPos, yPos, width in [(1.0, 20.3, 15.7, 6.0), (0.8, 47.5, 33.2, 10.0), (-0.7, 70.1, 50.4, 5.0),
+                                      (0.9, 0.0, 40.0, 8.0), (0.5, 88.0, 2.0, 6.0), (-0.5, 31.9, 47.9, 4.0)]:
+        data += height * np.exp(-((x - xPos) ** 2 + (y - yPos) ** 2) / (2.0 * width ** 2))
+    return data
+
+
+def _getTiles(pointCounts, tileSize):
+    """:return the tiles covering the plane, as GuiSpectrumViewNd._getContourTiles; adjacent tiles share their edge points
+    """
+    xCount, yCount = pointCounts
+    return [((ix * tileSize, min((ix + 1) * tileSize, xCount - 1)),
+             (iy * tileSize, min((iy + 1) * tileSize, yCount - 1)))
+            for ix in _getTileIndices(0, xCount - 1, xCount, tileSize)
+            for iy in _getTileIndices(0, yCount - 1, yCount, tileSize)]
+
+
+def _segments(contours, decimals=4):
+    """:return a Counter of the line-segments of contours; excluding the degenerate segments that end open lines
+    """
+    numVertices, indices, vertices, colours = contours
+    vertices = np.round(vertices.reshape((-1, 2)).astype(np.float64), decimals)
+    colours = colours.reshape((-1, 4))
+    segments = Counter()
+    for first, second in indices.reshape((-1, 2)):
+        v0, v1 = tuple(vertices[first]), tuple(vertices[second])
+        if v0 != v1:
+            segments[(min(v0, v1), max(v0, v1), tuple(colours[first]))] += 1
+    return segments
+
+
+class TileIndicesTest(unittest.TestCase):
+
+    def test_tileEdges(self):
+        self.assertEqual(_getTileIndices(0, 15, 100, 16), [0])
+        self.assertEqual(_getTileIndices(0, 16, 100, 16), [0, 1])
+        self.assertEqual(_getTileIndices(15, 16, 100, 16), [0, 1])
+        self.assertEqual(_getTileIndices(16, 31, 100, 16), [1])
+        self.assertEqual(_getTileIndices(17, 17, 100, 16), [1])
+        # the last, partial, tile
+        self.assertEqual(_getTileIndices(90, 99, 100, 16), [5, 6])
+        self.assertEqual(_getTileIndices(0, 99, 100, 16), list(range(7)))
+
+    def test_clipped(self):
+        self.assertEqual(_getTileIndices(-10, 5, 100, 16), [0])
+        self.assertEqual(_getTileIndices(90, 120, 100, 16), [5, 6])
+        self.assertEqual(_getTileIndices(-50, 150, 100, 16), list(range(7)))
+        # outside of the axis
+        self.assertEqual(_getTileIndices(120, 130, 100, 16), [])
+        self.assertEqual(_getTileIndices(-30, -10, 100, 16), [])
+
+    def test_wrap(self):
+        # points outside [0, pointCount) wrap around
+        self.assertEqual(_getTileIndices(-5, 3, 100, 16, wrap=True), [0, 5, 6])
+        self.assertEqual(_getTileIndices(95, 105, 100, 16, wrap=True), [0, 5, 6])
+        self.assertEqual(_getTileIndices(200, 210, 100, 16, wrap=True), [0])
+        self.assertEqual(_getTileIndices(-30, -10, 100, 16, wrap=True), [4, 5])
+        # covering the axis
+        self.assertEqual(_getTileIndices(-50, 60, 100, 16, wrap=True), list(range(7)))
+        self.assertEqual(_getTileIndices(10, 109, 100, 16, wrap=True), list(range(7)))
+        # inside the axis; as without wrapping
+        self.assertEqual(_getTileIndices(20, 40, 100, 16, wrap=True), _getTileIndices(20, 40, 100, 16))
+
+
+class StitchContoursTest(unittest.TestCase):
+
+    def test_fullPlane(self):
+        item = (4, np.arange(8, dtype=np.uint32), np.zeros(8, dtype=np.float32), np.zeros(16, dtype=np.float32))
+        self.assertIs(GuiSpectrumViewNd._stitchContours({None: item}), item)
+
+    def test_offsets(self):
+        """The vertices are offset by the origin of their tile; the indices by the preceding vertices
+        """
+        empty = (0, np.array((), dtype=np.uint32), np.array((), dtype=np.float32), np.array((), dtype=np.float32))
+        item = (2, np.array([0, 1, 1, 0], dtype=np.uint32), np.array([0.5, 1.0, 2.0, 3.5], dtype=np.float32),
+                np.arange(8, dtype=np.float32))
+        tileContours = {((0, 10), (0, 10)): item, ((10, 20), (0, 10)): empty, ((10, 20), (10, 20)): item}
+
+        numVertices, indices, vertices, colours = GuiSpectrumViewNd._stitchContours(tileContours)
+        self.assertEqual(numVertices, 4)
+        np.testing.assert_array_equal(indices, [0, 1, 1, 0, 2, 3, 3, 2])
+        np.testing.assert_array_equal(vertices, [0.5, 1.0, 2.0, 3.5, 10.5, 11.0, 12.0, 13.5])
+        self.assertEqual(vertices.dtype, np.float32)
+        np.testing.assert_array_equal(colours, np.tile(np.arange(8, dtype=np.float32), 2))
+
+        self.assertIsNone(GuiSpectrumViewNd._stitchContours({((0, 10), (0, 10)): empty}))
+
+    def test_stitchedEqualsFullPlane(self):
+        """The stitched contours of the tiles covering a plane equal the contours of the full plane
+        """
+        try:
+            from ccpnc.contour import Contourer2d  # noqa: F401
+        except ImportError:
+            self.skipTest('Contourer2d C-extension not available')
+
+        data = _makePlane()
+        yCount, xCount = data.shape
+        fullContours = buildContours((data.copy(),), POSLEVELS, NEGLEVELS, POSCOLOURS, NEGCOLOURS)
+        fullSegments = _segments(fullContours)
+        self.assertGreater(len(fullSegments), 0)
+
+        for tileSize in (16, 25, 64):
+            tileContours = {}
+            for tile in _getTiles((xCount, yCount), tileSize):
+                (x0, x1), (y0, y1) = tile
+                tileContours[tile] = buildContours((np.ascontiguousarray(data[y0:y1 + 1, x0:x1 + 1]),),
+                                                   POSLEVELS, NEGLEVELS, POSCOLOURS, NEGCOLOURS)
+            stitched = GuiSpectrumViewNd._stitchContours(tileContours)
+            self.assertLess(int(np.max(stitched[1])), stitched[0])
+            self.assertEqual(_segments(stitched), fullSegments, msg=f'tileSize = {tileSize}')
@@ -0,0 +1,239 @@
+"""
+Tests for the spatial index used for hit-testing the symbols and labels (GLHitIndex)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+import numpy as np
+
+from ccpn.util.AttrDict import AttrDict
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLHitIndex import GLHitIndex
+
+
+ITEMCOUNT = 400
+# pixel-size, symbol half-size and default label offset of the strip (ppm); the x-axis is reversed
+SCALING = dict(pixelX=-0.01, pixelY=0.2, symbolX=0.05, symbolY=0.8, symbolSize=0.1)
+
+
+class _Obj():
+    """Object with a position and an optional text-offset
+    """
+
+    def __init__(self, index, position, textOffset=None):
+        self.index = index
+        self.position = position
+        self.textOffset = textOffset
+
+    def getTextOffset(self, objListView):
+        return self.textOffset
+
+    def __repr__(self):
+        return f'<_Obj {self.index}>'
+
+
+def _makeItems(rng, count, start=0):
+    """:return lists of objects and (px, py, tx, ty, width, height) values; some labels are offset
+    """
+    objects, values = [], []
+    for ii in range(start, start + count):
+        px, py = rng.uniform(0.0, 10.0), rng.uniform(100.0, 130.0)
+        tx, ty = (rng.uniform(-0.5, 0.5), rng.uniform(-5.0, 5.0)) if ii % 4 == 0 else (np.nan, np.nan)
+        objects.append(_Obj(ii, (px, py), None if np.isnan(tx) else (tx, ty)))
+        values.append((px, py, tx, ty, rng.uniform(10.0, 60.0), 12.0))
+    return objects, values
+
+
+def _bruteLabelBox(value, pixelX, pixelY, symbolSize):
+    px, py, tx, ty, width, height = value
+    if np.isnan(tx):
+        tx = ty = symbolSize
+    x0, y0 = px + tx * np.sign(pixelX), py + ty * np.sign(pixelY)
+    x1, y1 = x0 + width * pixelX, y0 + height * pixelY
+    return min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+
+
+def _brutePointHits(items, x, y, symbolX, symbolY, labelsOnly=False):
+    """:return the objects with a symbol or label under (x, y), testing all (obj, value, labelBox) items
+    """
+    hits = []
+    for obj, (px, py, *_values), (minX, maxX, minY, maxY) in items:
+        if (minX < x < maxX and minY < y < maxY) or \
+                (not labelsOnly and x - symbolX < px < x + symbolX and y - symbolY < py < y + symbolY):
+            hits.append(obj)
+    return hits
+
+
+def _bruteRegionHits(items, xPositions, yPositions, pixelX, pixelY, symbolSize):
+    (x0, x1), (y0, y1) = xPositions, yPositions
+    hits = []
+    for obj, value in items:
+        minX, maxX, minY, maxY = _bruteLabelBox(value, pixelX, pixelY, symbolSize)
+        mx, my = (minX + maxX) / 2, (minY + maxY) / 2
+        px, py = value[:2]
+        if (x0 < px < x1 and y0 < py < y1) or (x0 < mx < x1 and y0 < my < y1):
+            hits.append(obj)
+    return hits
+
+
+class GLHitIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(13)
+        objects, values = _makeItems(self.rng, ITEMCOUNT)
+        self.items = list(zip(objects, values))
+        self.index = GLHitIndex(objects, values, dims=(0, 1))
+
+    def _queryPoints(self, count=100):
+        # random points, and points at the symbols and label-corners
+        points = [(self.rng.uniform(-1.0, 11.0), self.rng.uniform(95.0, 135.0)) for _ in range(count)]
+        for _obj, value in self.items[::17]:
+            minX, maxX, minY, maxY = _bruteLabelBox(value, SCALING['pixelX'], SCALING['pixelY'],
+                                                    SCALING['symbolSize'])
+            points.extend([value[:2], (minX + 1e-6, minY + 1e-6), (maxX - 1e-6, maxY - 1e-6)])
+        return points
+
+    def _assertPointHits(self, scaling=SCALING, labelsOnly=False):
+        items = [(obj, value, _bruteLabelBox(value, scaling['pixelX'], scaling['pixelY'], scaling['symbolSize']))
+                 for obj, value in self.items]
+        for x, y in self._queryPoints():
+            self.assertEqual(self.index.pointHits(x, y, labelsOnly=labelsOnly, **scaling),
+                             _brutePointHits(items, x, y, scaling['symbolX'], scaling['symbolY'], labelsOnly),
+                             msg=f'({x}, {y})')
+
+    def _assertRegionHits(self, scaling=SCALING):
+        for _ in range(50):
+            xPositions = tuple(sorted(self.rng.uniform(-1.0, 11.0, 2)))
+            yPositions = tuple(sorted(self.rng.uniform(95.0, 135.0, 2)))
+            args = (xPositions, yPositions, scaling['pixelX'], scaling['pixelY'], scaling['symbolSize'])
+            self.assertEqual(self.index.regionHits(*args), _bruteRegionHits(self.items, *args))
+
+    def test_pointHits(self):
+        self._assertPointHits()
+        self.assertIsNotNone(self.index._grid)
+        self._assertPointHits(labelsOnly=True)
+
+        # zoomed; the grid is rebuilt
+        scaling = dict(SCALING, pixelX=-0.002, pixelY=0.05)
+        self._assertPointHits(scaling)
+        self.assertEqual(self.index._gridKey, tuple(scaling.values()))
+
+    def test_largeLabels(self):
+        """Symbols that are large compared to the pixel-size are tested without the grid
+        """
+        scaling = dict(SCALING, pixelX=-0.0001, pixelY=0.002)
+        self._assertPointHits(scaling)
+        self.assertIsNone(self.index._grid)
+        self._assertRegionHits(scaling)
+
+    def test_regionHits(self):
+        self._assertRegionHits()
+
+    def test_remove(self):
+        self._assertPointHits()
+        for obj, _value in self.items[::3]:
+            self.assertTrue(self.index.remove(obj))
+            self.assertFalse(self.index.remove(obj))
+        self.items = [item for ii, item in enumerate(self.items) if ii % 3]
+        self.assertEqual(len(self.index), len(self.items))
+        self.assertFalse(self.index.isFragmented)
+
+        self._assertPointHits()
+        self._assertRegionHits()
+        # the removed items are also excluded when the grid is rebuilt
+        self._assertPointHits(dict(SCALING, symbolSize=0.2))
+
+        for obj, _value in self.items[::2]:
+            self.index.remove(obj)
+        self.assertTrue(self.index.isFragmented)
+
+    def test_add(self):
+        self._assertPointHits()
+        grid = self.index._grid
+
+        # added items are entered in the cells they cover; the grid is not rebuilt
+        objects, values = _makeItems(self.rng, 20, start=ITEMCOUNT)
+        for obj, value in zip(objects, values):
+            self.index.add(obj, value)
+        self.items.extend(zip(objects, values))
+        self.assertEqual(len(self.index), ITEMCOUNT + 20)
+        self.assertGreater(len(self.index._addedCells), 0)
+        self.assertIs(self.index._grid, grid)
+
+        self._assertPointHits()
+        self._assertRegionHits()
+
+        # an item outside of the grid
+        obj = _Obj(-1, (20.0, 50.0))
+        value = (20.0, 50.0, np.nan, np.nan, 20.0, 12.0)
+        self.index.add(obj, value)
+        self.items.append((obj, value))
+        self.assertEqual(self.index.pointHits(20.0, 50.0, **SCALING), [obj])
+        self._assertPointHits()
+
+    def test_change(self):
+        """A changed item is removed and added at the end, as a label re-created for a changed object
+        """
+        self._assertPointHits()
+        for ii in range(0, 30, 3):
+            obj, (px, py, tx, ty, width, height) = self.items[ii]
+            value = (px + 0.5, py - 2.0, tx, ty, width, height)
+            self.index.add(obj, value)
+            self.items[ii] = None
+            self.items.append((obj, value))
+        self.items = [item for item in self.items if item is not None]
+
+        self._assertPointHits()
+        self._assertRegionHits()
+
+    def test_manyAdditions(self):
+        """The grid is rebuilt after many additions, and the capacity grows as required
+        """
+        self.index = GLHitIndex([], np.zeros((0, 6)), dims=(0, 1))
+        self.items = []
+        for start in range(0, ITEMCOUNT, 40):
+            objects, values = _makeItems(self.rng, 40, start=start)
+            for obj, value in zip(objects, values):
+                self.index.add(obj, value)
+            self.items.extend(zip(objects, values))
+            self._assertPointHits()
+        self.assertEqual(len(self.index), ITEMCOUNT)
+        self.assertGreaterEqual(len(self.index._values), ITEMCOUNT)
+
+    def test_fromStringList(self):
+        objects, _values = _makeItems(self.rng, 10)
+        stringList = [AttrDict(stringObject=obj, width=20.0, height=12.0) for obj in objects]
+        # an object without a valid position is skipped
+        stringList.append(AttrDict(stringObject=_Obj(99, None), width=20.0, height=12.0))
+
+        index = GLHitIndex.fromStringList(stringList, None, dims=(0, 1))
+        self.assertEqual(index.objects, objects)
+        np.testing.assert_array_equal(index._values[:10, :2], [obj.position for obj in objects])
+
+        self.assertTrue(index.addString(AttrDict(stringObject=_Obj(10, (1.0, 110.0)), width=20.0, height=12.0),
+                                        None))
+        self.assertFalse(index.addString(stringList[-1], None))
+        self.assertEqual(len(index), 11)
@@ -0,0 +1,350 @@
+"""
+Tests for the bulk build of the peak symbols (GLLabelling._insertSymbolItems) and the
+string-layout cache of GLString
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from unittest import mock
+import numpy as np
+
+from ccpn.util.AttrDict import AttrDict
+from ccpn.ui.gui.guiSettings import CCPNGLWIDGET_FOREGROUND
+from ccpn.ui.gui.lib.OpenGL import CcpnOpenGLLabelling, CcpnOpenGLFonts
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLLabelling import GLLabelling
+from ccpn.ui.gui.lib.OpenGL import CcpnOpenGLDefs as GLDefs
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLArrays import GLSymbolArray, REMOVEDITEM, _GrowableArray
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLFonts import GLString, GLGlyphTuple
+
+
+SYMBOLCOLOUR = '#1A334D'
+MERITCOLOUR = '#668099'
+RGBCOLOURS = {SYMBOLCOLOUR: (0.1, 0.2, 0.3), MERITCOLOUR: (0.4, 0.5, 0.6)}
+HIGHLIGHTCOLOUR = (0.9, 0.8, 0.7, 1.0)
+MERITTHRESHOLD = 0.5
+SYMBOLR, SYMBOLW = 0.3, 0.4
+PEAKCOUNT = 80
+
+
+class _Peak():
+    """Minimal peak with the attributes required to build its symbol
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.pointPositions = (10.0 + 3.5 * index, 200.0 - 1.25 * index, 4.0)
+        if index % 13 == 0:
+            # undefined position, drawn in red at the origin
+            self.pointPositions = (None, 1.0, 1.0)
+        self.aliasing = (1 if index % 3 == 1 else 0, -1 if index % 4 == 1 else 0, 0)
+        self.figureOfMerit = (index % 10) / 10.0
+        self.pointLineWidths = (1.0, 1.0, 1.0)
+
+
+class _SpectrumView():
+    strip = None
+    spectrum = AttrDict(spectrometerFrequencies=(600.0, 60.0, 60.0))
+
+
+class _PeakListView():
+    symbolColour = SYMBOLCOLOUR
+    meritColour = MERITCOLOUR
+    meritEnabled = True
+    meritThreshold = MERITTHRESHOLD
+    peakList = AttrDict(spectrum=None)
+
+
+class _Labelling(GLLabelling):
+    """GLLabelling with the object methods of the peak-labelling classes defined for the test peaks
+    """
+
+    def __init__(self, spectrumView, objs, symbolType):
+        self._objs = objs
+        self._symbolType = symbolType
+        self._spectrumSettings = {spectrumView: AttrDict(dimensionIndices=(0, 1))}
+        self._GLParent = AttrDict(highlightColour=HIGHLIGHTCOLOUR)
+        self._GLSymbols = {}
+        self.autoColour = None
+
+    def objects(self, objList):
+        return self._objs
+
+    def objectList(self, objListView):
+        return objListView.peakList
+
+    def objIsInVisiblePlanes(self, spectrumView, obj):
+        # hidden, in-plane and flanking-plane objects, the latter with both planeIndex values
+        if obj.index % 11 == 0:
+            return False, False, 0, 1.0
+        if obj.index % 5 == 0:
+            return False, True, 1 + obj.index % 2, 0.5
+        return True, False, 0, 1.0
+
+    def objIsInVisiblePlanesRemove(self, spectrumView, obj):
+        pass
+
+    def _isSelected(self, obj):
+        return obj.index % 7 == 0
+
+    def _getSymbolWidths(self, spectrumView):
+        return None, None, self._symbolType, 2.0 * SYMBOLR, SYMBOLR, SYMBOLW
+
+    def appendExtraIndices(self, drawList, index, obj):
+        return 0, 0
+
+    def appendExtraVertices(self, drawList, pIndex, obj, pxy, colour, fade, alias):
+        return 0
+
+
+class GLLabellingTest(unittest.TestCase):
+    """Test that the bulk build of the cross/plus symbols matches appending the symbols one at a time
+    """
+
+    def _compareSymbols(self, symbolType):
+        spectrumView = _SpectrumView()
+        objListView = _PeakListView()
+        objs = [_Peak(ii) for ii in range(PEAKCOUNT)]
+        labelling = _Labelling(spectrumView, objs, symbolType)
+
+        appendList = labelling._GLSymbols[objListView] = GLSymbolArray()
+        with mock.patch.object(CcpnOpenGLLabelling, 'getColours', return_value={CCPNGLWIDGET_FOREGROUND: None}), \
+                mock.patch.object(CcpnOpenGLLabelling, 'getAutoColourRgbRatio',
+                                  side_effect=lambda colour, *args: RGBCOLOURS[colour]):
+            for obj in objs:
+                labelling._appendSymbol(spectrumView, objListView, obj)
+
+        bulkList = GLSymbolArray()
+        labelling._insertSymbolItems(spectrumView, objListView, bulkList, symbolType, SYMBOLR, SYMBOLW,
+                                     RGBCOLOURS[SYMBOLCOLOUR], RGBCOLOURS[MERITCOLOUR], True, MERITTHRESHOLD)
+
+        self.assertGreater(appendList.numVertices, 0)
+        self.assertEqual(bulkList.numVertices, appendList.numVertices)
+        for name in ('vertices', 'indices', 'colors', 'attribs', 'offsets'):
+            np.testing.assert_array_equal(getattr(bulkList, name), getattr(appendList, name), err_msg=name)
+        self.assertEqual(list(bulkList.pids), list(appendList.pids))
+
+        # hidden objects are skipped
+        self.assertEqual([bulkList.getSlot(obj) is not None for obj in objs], [obj.index % 11 != 0 for obj in objs])
+
+    def test_crossSymbols(self):
+        self._compareSymbols(symbolType=0)
+
+    def test_plusSymbols(self):
+        self._compareSymbols(symbolType=3)
+
+
+class GLSymbolArrayTest(unittest.TestCase):
+    """Test the appending, removing and compacting of the items of GLSymbolArray
+    """
+
+    def _appendItem(self, drawList, obj, numPoints):
+        """Append an item of numPoints vertices; the vertices of the item hold obj, the primitives are lines
+        """
+        offset = drawList.numVertices
+        indexStart = len(drawList.indices)
+        drawList.appendIndices([offset + (ii + jj) % numPoints for ii in range(numPoints) for jj in (0, 1)])
+        drawList.appendVertices(np.full(4 * numPoints, obj, dtype=np.float32))
+        drawList.appendColors(np.full(4 * numPoints, obj / 10.0, dtype=np.float32))
+        drawList.appendAttribs(np.full(4 * numPoints, obj, dtype=np.float32))
+        drawList.appendOffsets(np.zeros(4 * numPoints, dtype=np.float32))
+        pids = [obj, offset, numPoints, 0, 0, 0, indexStart, len(drawList.indices)]
+        drawList.appendPids(pids + [0] * (GLDefs.LENPID - len(pids)))
+        drawList.numVertices += numPoints
+
+    def _makeList(self, count=10):
+        drawList = GLSymbolArray()
+        for obj in range(count):
+            self._appendItem(drawList, obj, numPoints=2 + obj % 3)
+        return drawList
+
+    def _itemVertices(self, drawList, obj):
+        """:return the vertex-values referenced by the primitives of the item of obj
+        """
+        pp = drawList.getSlot(obj)
+        indices = drawList.indices[drawList.pids[pp + 6]:drawList.pids[pp + 7]]
+        return drawList.vertices.reshape((-1, 4))[indices, 0]
+
+    def test_growableArray(self):
+        arr = _GrowableArray(np.float32)
+        expected = []
+        capacities = set()
+        for ii in range(1000):
+            values = np.arange(ii % 7, dtype=np.float32) + ii
+            arr.append(values)
+            expected.append(values)
+            capacities.add(arr.capacity)
+
+        np.testing.assert_array_equal(arr.array, np.concatenate(expected))
+        # the capacity is doubled, so the buffer is only reallocated a few times
+        self.assertLessEqual(len(capacities), 8)
+        self.assertLess(len(arr.array), arr.capacity + 1)
+
+        arr.set([1, 2, 3])
+        np.testing.assert_array_equal(arr.array, [1, 2, 3])
+        self.assertEqual(arr.array.dtype, np.float32)
+
+    def test_getSlot(self):
+        drawList = self._makeList()
+        self.assertEqual(len(drawList.pids), 10 * GLDefs.LENPID)
+        for obj in range(10):
+            pp = drawList.getSlot(obj)
+            self.assertEqual(pp, obj * GLDefs.LENPID)
+            self.assertTrue(np.all(self._itemVertices(drawList, obj) == obj))
+        self.assertIsNone(drawList.getSlot(10))
+
+        # appended items extend the slots that were already built
+        self._appendItem(drawList, 10, numPoints=4)
+        self.assertEqual(drawList.getSlot(10), 10 * GLDefs.LENPID)
+
+    def test_removeItem(self):
+        drawList = self._makeList()
+        pp = drawList.getSlot(3)
+        offset, indexStart, indexEnd = drawList.pids[pp + 1], drawList.pids[pp + 6], drawList.pids[pp + 7]
+        vertices = drawList.vertices.copy()
+
+        self.assertTrue(drawList.removeItem(3))
+        # the primitives are degenerate, the vertices are left in place and the slot is tombstoned
+        np.testing.assert_array_equal(drawList.indices[indexStart:indexEnd], offset)
+        np.testing.assert_array_equal(drawList.vertices, vertices)
+        self.assertIs(drawList.pids[pp], REMOVEDITEM)
+        self.assertIsNone(drawList.getSlot(3))
+        self.assertFalse(drawList.removeItem(3))
+
+        # the other items are unchanged
+        for obj in (0, 1, 2, 4, 9):
+            self.assertTrue(np.all(self._itemVertices(drawList, obj) == obj))
+
+    def test_reuseSlot(self):
+        drawList = self._makeList()
+        pp = drawList.getSlot(3)
+        drawList.removeItem(3)
+
+        # the new item is stored in the tombstoned slot, with its vertices at the end of the arrays
+        self._appendItem(drawList, 20, numPoints=5)
+        self.assertEqual(len(drawList.pids), 10 * GLDefs.LENPID)
+        self.assertEqual(drawList.getSlot(20), pp)
+        self.assertEqual(drawList.pids[pp + 1], drawList.numVertices - 5)
+        self.assertTrue(np.all(self._itemVertices(drawList, 20) == 20))
+
+        # no free slots left
+        self._appendItem(drawList, 21, numPoints=2)
+        self.assertEqual(drawList.getSlot(21), 10 * GLDefs.LENPID)
+
+        # the free slots are found again when the pids are replaced
+        drawList.removeItem(5)
+        drawList.pids = drawList.pids.copy()
+        self.assertEqual(drawList._freeSlots, [5 * GLDefs.LENPID])
+
+    def test_compact(self):
+        drawList = self._makeList()
+        removed = (0, 3, 4, 5)
+        for obj in removed:
+            drawList.removeItem(obj)
+        self._appendItem(drawList, 20, numPoints=3)
+        self.assertTrue(drawList.isFragmented)
+        numVertices = drawList.numVertices - sum(2 + obj % 3 for obj in removed)
+
+        drawList.compact()
+        self.assertFalse(drawList.isFragmented)
+        self.assertEqual(drawList.numVertices, numVertices)
+        self.assertEqual(len(drawList.vertices), 4 * numVertices)
+        self.assertEqual(len(drawList.pids), 7 * GLDefs.LENPID)
+        self.assertEqual(drawList._freeSlots, [])
+        self.assertNotIn(REMOVEDITEM, list(drawList.pids[0::GLDefs.LENPID]))
+
+        # the remaining items reference their own vertices; no degenerate primitives are left
+        for obj in (1, 2, 6, 7, 8, 9, 20):
+            self.assertTrue(np.all(self._itemVertices(drawList, obj) == obj))
+        self.assertEqual(len(drawList.indices), 2 * numVertices)
+        for obj in removed:
+            self.assertIsNone(drawList.getSlot(obj))
+
+        # appending after compacting
+        self._appendItem(drawList, 21, numPoints=2)
+        self.assertTrue(np.all(self._itemVertices(drawList, 21) == 21))
+
+
+def _makeFont(height):
+    """Make a minimal font with the same glyph for all visible characters
+    """
+    font = AttrDict()
+    font.glyphs = [None] * 256
+    for charCode in range(33, 127):
+        font.glyphs[charCode] = GLGlyphTuple(xPos=0, yPos=0, width=6, height=height, xOffset=0, yOffset=0,
+                                             origW=7, origH=height, kerns={},
+                                             TX0=0.0, TY0=0.0, TX1=0.1, TY1=0.1,
+                                             PX0=0, PY0=0, PX1=6, PY1=height)
+    font.height = height
+    font.spaceWidth = 4
+    font._layouts = {}
+    font._parent = AttrDict(get_kerning=lambda *args: 0)
+    return font
+
+
+@mock.patch.object(GLString, 'defineTextArrayVBO')
+class GLStringLayoutTest(unittest.TestCase):
+    """Test the cache of string-layouts of the fonts
+    """
+
+    def test_layoutCachePerFont(self, *args):
+        smallFont, largeFont = _makeFont(10), _makeFont(20)
+
+        small = GLString('H1', smallFont, x=1.0, y=2.0, pixelScale=1.0, alias=3)
+        large = GLString('H1', largeFont, x=1.0, y=2.0, pixelScale=1.0, alias=3)
+        self.assertEqual(list(smallFont._layouts), [('H1', 0.0, 1.0)])
+        self.assertEqual(list(largeFont._layouts), [('H1', 0.0, 1.0)])
+        self.assertEqual((small.height, large.height), (10, 20))
+        self.assertFalse(np.array_equal(small.vertices, large.vertices))
+
+        # the same text reuses the layout, and only sets its own alias
+        other = GLString('H1', smallFont, x=5.0, y=6.0, pixelScale=1.0, alias=0)
+        self.assertEqual(len(smallFont._layouts), 1)
+        np.testing.assert_array_equal(other.vertices[0::4], small.vertices[0::4])
+        np.testing.assert_array_equal(other.vertices[2::4], 0)
+        np.testing.assert_array_equal(small.vertices[2::4], 3)
+
+        # the layout matches a string built without the cache
+        vertices, indices, texcoords, width, height = GLString._layoutString('H1', _makeFont(10), 0.0, 1.0)
+        vertices[2::4] = 3
+        np.testing.assert_array_equal(small.vertices, vertices)
+        np.testing.assert_array_equal(small.indices, indices)
+        np.testing.assert_array_equal(small.texcoords, texcoords)
+
+    def test_layoutCacheSize(self, *args):
+        font = _makeFont(10)
+
+        with mock.patch.object(CcpnOpenGLFonts, 'MAXLAYOUTS', 4):
+            for ii in range(4):
+                GLString(f'label{ii}', font, pixelScale=1.0)
+            self.assertEqual(len(font._layouts), 4)
+
+            # the cache is cleared when full
+            GLString('label4', font, pixelScale=1.0)
+            self.assertEqual(list(font._layouts), [('label4', 0.0, 1.0)])
+            for ii in range(5, 20):
+                GLString(f'label{ii}', font, pixelScale=1.0)
+                self.assertLessEqual(len(font._layouts), 4)
@@ -0,0 +1,151 @@
+"""
+Tests for the coalescing of the full repaints of the GL widgets into frames (GLRenderScheduler)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from PyQt5 import QtCore
+
+from ccpn.util.decorators import singleton
+from ccpn.ui.gui.lib.OpenGL.CcpnOpenGLScheduler import GLRenderScheduler
+
+
+TIMEOUT = 10.0
+
+
+class _Widget():
+    """Minimal GL widget; a full repaint adds its build and paint times to the frame
+    """
+
+    def __init__(self, scheduler, deleted=False):
+        self.scheduler = scheduler
+        self.deleted = deleted
+        self.frames = 0
+
+    def _updateFrame(self):
+        if self.deleted:
+            raise RuntimeError('wrapped C/C++ object has been deleted')
+        self.frames += 1
+        self.scheduler.addTimings(0.002, 0.001)
+
+
+class GLRenderSchedulerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    def setUp(self):
+        # a new scheduler for every test
+        getattr(singleton, '_instances', {}).pop(GLRenderScheduler, None)
+        self.scheduler = GLRenderScheduler()
+        self.addCleanup(self.scheduler._timer.stop)
+        self.widgets = [_Widget(self.scheduler) for _ in range(3)]
+
+    def _runFrames(self):
+        """Run the event-loop until the pending requests have been released
+        """
+        loop = QtCore.QEventLoop()
+        self.scheduler._timer.timeout.connect(loop.quit)
+        QtCore.QTimer.singleShot(int(TIMEOUT * 1000.0), loop.quit)
+        loop.exec_()
+        self.scheduler._timer.timeout.disconnect(loop.quit)
+
+    def test_singleton(self):
+        self.assertIs(GLRenderScheduler(), self.scheduler)
+
+    def test_coalesce(self):
+        scheduler = self.scheduler
+        for _ in range(50):
+            for widget in self.widgets:
+                scheduler.requestUpdate(widget)
+        self.assertTrue(scheduler._timer.isActive())
+        self.assertEqual(list(scheduler._pending), self.widgets)
+
+        self._runFrames()
+        self.assertEqual([widget.frames for widget in self.widgets], [1, 1, 1])
+        self.assertEqual(scheduler._pending, {})
+
+        # the timings are stored when the next frame is released
+        scheduler.requestUpdate(self.widgets[0])
+        self._runFrames()
+        self.assertEqual(len(scheduler.frameTimings), 1)
+        frame = scheduler.frameTimings[0]
+        self.assertEqual(frame.widgetCount, 3)
+        self.assertAlmostEqual(frame.buildTime, 0.006)
+        self.assertAlmostEqual(frame.paintTime, 0.003)
+
+    def test_takeRequest(self):
+        scheduler = self.scheduler
+        widget, other = self.widgets[:2]
+        self.assertFalse(scheduler.takeRequest(widget))
+
+        scheduler.requestUpdate(widget)
+        scheduler.requestUpdate(other)
+        # rebuilt before the frame; only the other widget is released
+        self.assertTrue(scheduler.takeRequest(widget))
+        self.assertFalse(scheduler.takeRequest(widget))
+        self._runFrames()
+        self.assertEqual((widget.frames, other.frames), (0, 1))
+
+    def test_pendingUntilReleased(self):
+        """A request that is not taken, e.g. by a mouse-only paint, is released with the next frame
+        """
+        scheduler = self.scheduler
+        widget = self.widgets[0]
+        scheduler.requestUpdate(widget)
+        # painted outside of a frame
+        scheduler.addTimings(0.001, 0.001)
+        self.assertIn(widget, scheduler._pending)
+        self._runFrames()
+        self.assertEqual(widget.frames, 1)
+
+    def test_frameInterval(self):
+        scheduler = self.scheduler
+        scheduler.frameRate = 10.0
+        self.assertAlmostEqual(scheduler.frameInterval, 0.1)
+
+        # the next frame is delayed until the interval has passed
+        scheduler._releaseFrame()
+        scheduler.requestUpdate(self.widgets[0])
+        self.assertGreater(scheduler._timer.interval(), 50)
+        scheduler._timer.stop()
+        scheduler._pending.clear()
+
+        scheduler._lastFrame -= 1.0
+        scheduler.requestUpdate(self.widgets[0])
+        self.assertEqual(scheduler._timer.interval(), 0)
+
+    def test_deletedWidget(self):
+        scheduler = self.scheduler
+        deleted = _Widget(scheduler, deleted=True)
+        scheduler.requestUpdate(deleted)
+        scheduler.requestUpdate(self.widgets[0])
+        scheduler._timer.stop()
+        scheduler._releaseFrame()
+        self.assertEqual(self.widgets[0].frames, 1)
+        self.assertEqual(scheduler._pending, {})
@@ -0,0 +1,113 @@
+"""
+Tests for the min/max decimation of the slices of 1D spectra (SlicePyramid)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+import numpy as np
+
+from ccpn.ui.gui.lib.SlicePyramid import SlicePyramid, getIndexRange
+
+
+class SlicePyramidTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        # odd length; no power of 2 divides it, so the last block of every level is partial
+        self.data = rng.normal(size=3 * 4096 + 1001).astype(np.float32)
+        self.pyramid = SlicePyramid(self.data)
+
+    def _assertBlockExtrema(self, start, stop, factor):
+        """Every block of factor points overlapping [start, stop) is displayed by its own minimum and maximum
+        """
+        data = self.data
+        indices = self.pyramid.getIndices(start, stop, factor)
+        self.assertTrue(np.all(np.diff(indices) >= 0))
+
+        blocks = range(start // factor, -(-stop // factor))
+        self.assertEqual(len(indices), 2 * len(blocks))
+        for block, pair in zip(blocks, indices.reshape(-1, 2)):
+            first, last = block * factor, min((block + 1) * factor, len(data))
+            self.assertTrue(np.all((pair >= first) & (pair < last)))
+            values = data[pair]
+            self.assertEqual(values.max(), data[first:last].max())
+            self.assertEqual(values.min(), data[first:last].min())
+        return indices
+
+    def test_levels(self):
+        count = len(self.data)
+        for factor in (2, 4, 8, 16, 64, 1024):
+            maxIndices, minIndices = self.pyramid._getLevel(factor)
+            self.assertEqual(len(maxIndices), -(-count // factor))
+            self.assertEqual(len(minIndices), -(-count // factor))
+            self._assertBlockExtrema(0, count, factor)
+
+    def test_partialRange(self):
+        count = len(self.data)
+        for factor in (4, 32, 256):
+            # neither end on a block boundary; the last block of the slice is partial
+            self._assertBlockExtrema(factor + 3, count, factor)
+            self._assertBlockExtrema(5, 7 * factor - 1, factor)
+            self._assertBlockExtrema(count - 1, count, factor)
+
+    def test_smallSlice(self):
+        pyramid = SlicePyramid(self.data[:101])
+        self.assertEqual(pyramid.getRange(np.arange(101.0), (10.0, 20.0), 5), (1, 0, 101))
+        self.assertTrue(np.array_equal(pyramid.getIndices(0, 101, 1), np.arange(101)))
+
+    def test_pixelExtrema(self):
+        """Every pixel of the visible region shows the minimum and maximum of its points
+        """
+        data = self.data
+        count = len(data)
+        positions = np.linspace(10.0, -2.0, count)  # decreasing, as ppm
+        for visibleRange, pixelCount in (((8.0, 0.5), 317), ((10.0, -2.0), 1000), ((-1.0, -2.0), 33)):
+            factor, start, stop = self.pyramid.getRange(positions, visibleRange, pixelCount)
+            self.assertGreater(factor, 1)
+            visStart, visStop = getIndexRange(positions, visibleRange)
+            self.assertLessEqual(start, visStart)
+            self.assertGreaterEqual(stop, visStop)
+            # at least one block per pixel
+            self.assertGreaterEqual((visStop - visStart) / pixelCount, factor)
+
+            indices = self._assertBlockExtrema(start, stop, factor)
+            shown = np.zeros(count, dtype=bool)
+            shown[indices] = True
+            # the displayed points of the blocks overlapping a pixel span the extrema of the pixel
+            edges = np.linspace(visStart, visStop, pixelCount + 1).astype(int)
+            for first, last in zip(edges[:-1], edges[1:]):
+                if last <= first:
+                    continue
+                lo, hi = (first // factor) * factor, min(-(-last // factor) * factor, count)
+                values = data[lo:hi][shown[lo:hi]]
+                self.assertLessEqual(values.min(), data[first:last].min())
+                self.assertGreaterEqual(values.max(), data[first:last].max())
+
+        # unclipped; the complete slice at the same factor
+        factor, start, stop = self.pyramid.getRange(positions, (8.0, 0.5), 317, clip=False)
+        self.assertEqual((start, stop), (0, count))
+        self._assertBlockExtrema(start, stop, factor)
@@ -0,0 +1,202 @@
+"""
+Tests for the least-recently-used cache and the prefetching of the slices of spectra (TraceCache)
+"""
+#=========================================================================================
+# Licence, Reference and Credits
+#=========================================================================================
+__copyright__ = "Copyright (C) CCPN project (https://www.ccpn.ac.uk) 2014 - 2026"
+__credits__ = ("Ed Brooksbank, Morgan Hayward, Victoria A Higman, Luca Mureddu, Eliza Płoskoń",
+               "Timothy J Ragan, Brian O Smith, Daniel Thompson",
+               "Gary S Thompson & Geerten W Vuister")
+__licence__ = ("CCPN licence. See https://ccpn.ac.uk/software/licensing/")
+__reference__ = ("Skinner, S.P., Fogh, R.H., Boucher, W., Ragan, T.J., Mureddu, L.G., & Vuister, G.W.",
+                 "CcpNmr AnalysisAssign: a flexible platform for integrated NMR analysis",
+                 "J.Biomol.Nmr (2016), 66, 111-124, https://doi.org/10.1007/s10858-016-0060-y")
+#=========================================================================================
+# Last code modification
+#=========================================================================================
+__modifiedBy__ = "$modifiedBy: Geerten Vuister $"
+__dateModified__ = "$dateModified: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+__version__ = "$Revision: 3.2.7 $"
+#=========================================================================================
+# Created
+#=========================================================================================
+__author__ = "$Author: gvuister $"
+__date__ = "$Date: 2026-10-18 10:00:00 +0100 (Sun, October 18, 2026) $"
+#=========================================================================================
+# Start of code
+#=========================================================================================
+
+import unittest
+from threading import Event, RLock
+import numpy as np
+
+from ccpn.ui.gui.lib.TraceCache import TraceCache
+
+
+TIMEOUT = 10.0
+POINTCOUNTS = (16, 32)
+
+
+class _DataSource():
+    """Minimal data-source; the slice at position is filled with the position along the second dimension
+    """
+
+    def __init__(self):
+        self._readLock = RLock()
+        self._dataVersion = 0
+        self._isReadyForBackgroundReading = True
+        self.reads = []
+        self.block = None  # (position, started, release); blocks the read of position until released
+
+    @staticmethod
+    def checkForValidSlice(position, sliceDim):
+        return list(position)
+
+    def getSliceData(self, position, sliceDim):
+        # the lock is held by the reader
+        self.assertLocked()
+        if self.block is not None and tuple(position) == self.block[0]:
+            self.block[1].set()
+            self.block[2].wait(TIMEOUT)
+        self.reads.append(tuple(position))
+        return np.full(POINTCOUNTS[sliceDim - 1], float(position[1]), dtype=np.float32)
+
+    def assertLocked(self):
+        if not self._readLock._is_owned():
+            raise RuntimeError('data-source read without holding _readLock')
+
+
+class _Spectrum():
+    pid = 'SP:test'
+    pointCounts = POINTCOUNTS
+    scale = 2.0
+
+    def __init__(self):
+        self.dataSource = _DataSource()
+
+
+class TraceCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TraceCache()
+        self.addCleanup(self.cache.shutdown)
+        self.spectrum = _Spectrum()
+        self.dataSource = self.spectrum.dataSource
+
+    def _getSlice(self, y, prefetch=True):
+        return self.cache.getSlice(self.spectrum, (1, y), 1, prefetch=prefetch)
+
+    def _waitForPrefetches(self):
+        for future in list(self.cache._pending.values()):
+            if not future.cancelled():
+                future.result(TIMEOUT)
+
+    def _cachedPositions(self):
+        return [key[-1] for key in self.cache._items.get(self.spectrum.pid, {})]
+
+    def test_getSlice(self):
+        data = self._getSlice(5, prefetch=False)
+        self.assertTrue(np.array_equal(data, np.full(16, 10.0)))
+        self.assertEqual(self.dataSource.reads, [(1, 5)])
+
+        # cached; not read again
+        self.assertIs(self._getSlice(5, prefetch=False), data)
+        self.assertEqual(self.dataSource.reads, [(1, 5)])
+
+        # a new data-version is a new slice
+        self.dataSource._dataVersion += 1
+        self._getSlice(5, prefetch=False)
+        self.assertEqual(self.dataSource.reads, [(1, 5), (1, 5)])
+
+    def test_analyticSlice(self):
+        data, analytic = self.cache.getAnalyticSlice(self.spectrum, (1, 5), 1, prefetch=False)
+        self.assertTrue(np.iscomplexobj(analytic))
+        self.assertTrue(np.allclose(analytic.real, data))
+        self.assertIs(self.cache.getAnalyticSlice(self.spectrum, (1, 5), 1, prefetch=False)[1], analytic)
+
+    def test_lru(self):
+        self.cache.maxItems = 3
+        for y in range(1, 6):
+            self._getSlice(y, prefetch=False)
+        self.assertEqual(self._cachedPositions(), [(1, 3), (1, 4), (1, 5)])
+
+        # a request makes a slice the most-recently used
+        self._getSlice(3, prefetch=False)
+        self._getSlice(6, prefetch=False)
+        self.assertEqual(self._cachedPositions(), [(1, 5), (1, 3), (1, 6)])
+        self.assertEqual(len(self.cache), 3)
+
+        self.cache.clear(self.spectrum.pid)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_prefetch(self):
+        self._getSlice(5)
+        # no direction yet
+        self.assertEqual(self.cache._pending, {})
+
+        self._getSlice(6)
+        self._waitForPrefetches()
+        self.assertEqual(self.dataSource.reads, [(1, 5), (1, 6), (1, 7), (1, 8), (1, 9), (1, 10)])
+
+        # prefetched; not read again
+        for y in (7, 8):
+            self._getSlice(y, prefetch=False)
+        self.assertEqual(len(self.dataSource.reads), 6)
+
+        # the prefetch wraps at the end of the axis
+        self._getSlice(31)
+        self._getSlice(32)
+        self._waitForPrefetches()
+        self.assertEqual(self.dataSource.reads[-4:], [(1, 1), (1, 2), (1, 3), (1, 4)])
+
+    def test_cancel(self):
+        """Prefetches that are no longer ahead of the cursor are cancelled, or skipped when started
+        """
+        started, release = Event(), Event()
+        self.addCleanup(release.set)
+        self.dataSource.block = ((1, 7), started, release)
+        requestKey = (self.spectrum.pid, 1)
+
+        self._getSlice(5)
+        self._getSlice(6)
+        # the worker is reading (1, 7), while holding the lock; (1, 8) .. (1, 10) are queued
+        self.assertTrue(started.wait(TIMEOUT))
+        pending = dict(self.cache._pending)
+        self.assertEqual(sorted(key[-1] for key in pending), [(1, 7), (1, 8), (1, 9), (1, 10)])
+
+        # reverse; (1, 5) is cached, so this does not wait for the lock
+        self._getSlice(5)
+        self.assertEqual({key[-1] for key in self.cache._wanted[requestKey]}, {(1, 4), (1, 3), (1, 2), (1, 1)})
+        for sliceKey, future in pending.items():
+            if sliceKey[-1] == (1, 7):
+                self.assertTrue(future.running())
+            else:
+                self.assertTrue(future.cancelled())
+
+        release.set()
+        self._waitForPrefetches()
+        self.assertNotIn((1, 8), self.dataSource.reads)
+        self.assertEqual(self.dataSource.reads[-4:], [(1, 4), (1, 3), (1, 2), (1, 1)])
+
+    def test_wanted(self):
+        """A prefetch that is no longer wanted when it starts is skipped
+        """
+        requestKey = (self.spectrum.pid, 1)
+        self._getSlice(5)
+        self.cache._wanted[requestKey] = set()
+        self.cache._fetch(self.spectrum.pid, ('key',), requestKey, self.dataSource, 1.0, (1, 9), 1)
+        self.assertEqual(self.dataSource.reads, [(1, 5)])
+
+        self.cache.clear()
+        self.assertEqual(self.cache._wanted, {})
+        self.assertEqual(self.cache._lastPositions, {})
+
+    def test_notReady(self):
+        """A source that first has to fill its hdf5 buffer is not prefetched
+        """
+        self.dataSource._isReadyForBackgroundReading = False
+        self._getSlice(5)
+        self._getSlice(6)
+        self.assertEqual(self.cache._pending, {})
+        self.assertEqual(self.dataSource.reads, [(1, 5), (1, 6)])
@@ -60,20 +60,16 @@ class GuiNdWidget(CcpnGLWidget):
         """Find the peaks under the mouse.
         If firstOnly is true, return only the first item, else an empty list
         """
-        xPositions = [xPosition - self.symbolX, xPosition + self.symbolX]
-        yPositions = [yPosition - self.symbolY, yPosition + self.symbolY]
         if len(self._orderedAxes) > 2:
             zPositions = self._orderedAxes[2].region
         else:
             zPositions = None
 
         peaks = []
-        _data2Obj = self.strip.project._data2Obj
         pixX, pixY = self.strip._CcpnGLWidget.pixelX, self.strip._CcpnGLWidget.pixelY
-        sgnX, sgnY = np.sign(pixX), np.sign(pixY)
 
         for spectrumView in self.strip.spectrumViews:
-            dimX, dimY = spectrumView.dimensionIndices[:2]
+            dims = spectrumView.dimensionIndices[:2]
 
             for peakListView in spectrumView.peakListViews:
                 if not (spectrumView.isDisplayed and
@@ -81,48 +77,19 @@ class GuiNdWidget(CcpnGLWidget):
                         (labelling := self._GLPeaks._GLLabels.get(peakListView))):
                     continue
 
-                for drawList in labelling.stringList:
-                    try:
-                        peak = drawList.stringObject
-                        pView = peak.getPeakView(peakListView)
-                        _pos = peak.ppmPositions
-                        px, py = float(_pos[dimX]), float(_pos[dimY])
-                        tx, ty = pView.textOffset
-                        if not tx and not ty:
-                            # pixels
-                            tx, ty = self._symbolSize, self._symbolSize
-                            # ppm
-                            # tx, ty = self.symbolX, self.symbolY
-
-                        # find the bounds of the label
-                        # pixels
-                        # minX, maxX = min(_ll := px + tx * pixX, _rr := px + (tx + drawList.width) * pixX), max(_ll, _rr)
-                        # minY, maxY = min(_ll := py + ty * pixY, _rr := py + (ty + drawList.height) * pixY), max(_ll, _rr)
-                        # ppm
-                        minX, maxX = min(_ll := px + tx * sgnX,
-                                         _rr := px + tx * sgnX + drawList.width * pixX), max(_ll, _rr)
-                        minY, maxY = min(_ll := py + ty * sgnY,
-                                         _rr := py + ty * sgnY + drawList.height * pixY), max(_ll, _rr)
-
-                        if len(peak.axisCodes) > 2 and zPositions is not None:
-                            # zAxis = spectrumIndices[2]
-                            if (xPositions[0] < px < xPositions[1]
-                                and yPositions[0] < py < yPositions[1]) or \
-                                    (minX < xPosition < maxX and minY < yPosition < maxY):
-
-                                # within the XY bounds so check whether inPlane
-                                _isInPlane, _isInFlankingPlane, planeIndex, fade = \
-                                    self._GLPeaks.objIsInVisiblePlanes(spectrumView, peak)
-                                if _isInPlane or _isInFlankingPlane:
-                                    peaks.append(peak)
-
-                        elif (xPositions[0] < px < xPositions[1]
-                              and yPositions[0] < py < yPositions[1]) or \
-                                (minX < xPosition < maxX and minY < yPosition < maxY):
+                # query the spatial index of the symbols/labels
+                hitIndex = labelling.getHitIndex(dims)
+                for peak in hitIndex.pointHits(xPosition, yPosition, pixX, pixY,
+                                               self.symbolX, self.symbolY, self._symbolSize):
+                    if len(peak.axisCodes) > 2 and zPositions is not None:
+                        # within the XY bounds so check whether inPlane
+                        _isInPlane, _isInFlankingPlane, planeIndex, fade = \
+                            self._GLPeaks.objIsInVisiblePlanes(spectrumView, peak)
+                        if _isInPlane or _isInFlankingPlane:
                             peaks.append(peak)
 
-                    except Exception:
-                        continue
+                    else:
+                        peaks.append(peak)
 
         # put the selected peaks to the front of the list
         currentPeaks = set(self.current.peaks)
@@ -134,20 +101,16 @@ class GuiNdWidget(CcpnGLWidget):
         """Find the peaks under the mouse.
         If firstOnly is true, return only the first item, else an empty list
         """
-        # xPositions = [xPosition - self.symbolX, xPosition + self.symbolX]
-        # yPositions = [yPosition - self.symbolY, yPosition + self.symbolY]
         if len(self._orderedAxes) > 2:
             zPositions = self._orderedAxes[2].region
         else:
             zPositions = None
 
         peaks = []
-        _data2Obj = self.strip.project._data2Obj
         pixX, pixY = self.strip._CcpnGLWidget.pixelX, self.strip._CcpnGLWidget.pixelY
-        sgnX, sgnY = np.sign(pixX), np.sign(pixY)
 
         for spectrumView in self.strip.spectrumViews:
-            dimX, dimY = spectrumView.dimensionIndices[:2]
+            dims = spectrumView.dimensionIndices[:2]
 
             for peakListView in spectrumView.peakListViews:
                 if not (spectrumView.isDisplayed and
@@ -155,42 +118,19 @@ class GuiNdWidget(CcpnGLWidget):
                         (labelling := self._GLPeaks._GLLabels.get(peakListView))):
                     continue
 
-                for drawList in labelling.stringList:
-                    try:
-                        peak = drawList.stringObject
-                        pView = peak.getPeakView(peakListView)
-                        _pos = peak.position
-                        px, py = float(_pos[dimX]), float(_pos[dimY])
-                        tx, ty = pView.textOffset
-                        if not tx and not ty:
-                            # pixels
-                            tx, ty = self._symbolSize, self._symbolSize
-                            # ppm
-                            # tx, ty = self.symbolX, self.symbolY
-
-                        # find the bounds of the label
-                        # pixels
-                        # minX, maxX = min(_ll := px + tx * pixX, _rr := px + (tx + drawList.width) * pixX), max(_ll, _rr)
-                        # minY, maxY = min(_ll := py + ty * pixY, _rr := py + (ty + drawList.height) * pixY), max(_ll, _rr)
-                        # ppm
-                        minX, maxX = min(_ll := px + tx * sgnX,
-                                         _rr := px + tx * sgnX + drawList.width * pixX), max(_ll, _rr)
-                        minY, maxY = min(_ll := py + ty * sgnY,
-                                         _rr := py + ty * sgnY + drawList.height * pixY), max(_ll, _rr)
-
-                        if len(peak.axisCodes) > 2 and zPositions is not None:
-                            if (minX < xPosition < maxX and minY < yPosition < maxY):
-                                # within the XY bounds so check whether inPlane
-                                _isInPlane, _isInFlankingPlane, planeIndex, fade = \
-                                    self._GLPeaks.objIsInVisiblePlanes(spectrumView, peak)
-                                if _isInPlane or _isInFlankingPlane:
-                                    peaks.append(peak)
-
-                        elif (minX < xPosition < maxX and minY < yPosition < maxY):
+                # query the spatial index of the labels
+                hitIndex = labelling.getHitIndex(dims)
+                for peak in hitIndex.pointHits(xPosition, yPosition, pixX, pixY,
+                                               self.symbolX, self.symbolY, self._symbolSize, labelsOnly=True):
+                    if len(peak.axisCodes) > 2 and zPositions is not None:
+                        # within the XY bounds so check whether inPlane
+                        _isInPlane, _isInFlankingPlane, planeIndex, fade = \
+                            self._GLPeaks.objIsInVisiblePlanes(spectrumView, peak)
+                        if _isInPlane or _isInFlankingPlane:
                             peaks.append(peak)
 
-                    except Exception:
-                        continue
+                    else:
+                        peaks.append(peak)
 
         # put the selected peaks to the front of the list
         currentPeaks = set(self.current.peaks)
@@ -202,20 +142,16 @@ class GuiNdWidget(CcpnGLWidget):
         """Find the multiplets under the mouse.
         If firstOnly is true, return only the first item, else an empty list
         """
-        xPositions = [xPosition - self.symbolX, xPosition + self.symbolX]
-        yPositions = [yPosition - self.symbolY, yPosition + self.symbolY]
         if len(self._orderedAxes) > 2:
             zPositions = self._orderedAxes[2].region
         else:
             zPositions = None
 
         multiplets = []
-        _data2Obj = self.strip.project._data2Obj
         pixX, pixY = self.strip._CcpnGLWidget.pixelX, self.strip._CcpnGLWidget.pixelY
-        sgnX, sgnY = np.sign(pixX), np.sign(pixY)
 
         for spectrumView in self.strip.spectrumViews:
-            dimX, dimY = spectrumView.dimensionIndices[:2]
+            dims = spectrumView.dimensionIndices[:2]
 
             for multipletListView in spectrumView.multipletListViews:
                 if not (spectrumView.isDisplayed and
@@ -223,51 +159,23 @@ class GuiNdWidget(CcpnGLWidget):
                         (labelling := self._GLMultiplets._GLLabels.get(multipletListView))):
                     continue
 
-                for drawList in labelling.stringList:
-                    try:
-                        multiplet = drawList.stringObject
-                        # NOTE:ED - need to speed this up
-                        pView = multiplet.getMultipletView(multipletListView)
-                        _pos = multiplet.position
-                        px, py = float(_pos[dimX]), float(_pos[dimY])
-                        tx, ty = pView.textOffset
-                        if not tx and not ty:
-                            # pixels
-                            tx, ty = self._symbolSize, self._symbolSize
-                            # ppm
-                            # tx, ty = self.symbolX, self.symbolY
-
-                        # find the bounds of the label
-                        # pixels
-                        # minX, maxX = min(_ll := px + tx * pixX, _rr := px + (tx + drawList.width) * pixX), max(_ll, _rr)
-                        # minY, maxY = min(_ll := py + ty * pixY, _rr := py + (ty + drawList.height) * pixY), max(_ll, _rr)
-                        # ppm
-                        minX, maxX = min(_ll := px + tx * sgnX,
-                                         _rr := px + tx * sgnX + drawList.width * pixX), max(_ll, _rr)
-                        minY, maxY = min(_ll := py + ty * sgnY,
-                                         _rr := py + ty * sgnY + drawList.height * pixY), max(_ll, _rr)
-
-                        if len(multiplet.axisCodes) > 2 and zPositions is not None:
-                            if (xPositions[0] < px < xPositions[1]
-                                and yPositions[0] < py < yPositions[1]) or \
-                                    (minX < xPosition < maxX and minY < yPosition < maxY):
-                                # within the XY bounds so check whether inPlane
-                                _isInPlane, _isInFlankingPlane, planeIndex, fade = \
-                                    self._GLMultiplets.objIsInVisiblePlanes(spectrumView, multiplet)
-                                if _isInPlane or _isInFlankingPlane:
-                                    multiplets.append(multiplet)
-                                    if firstOnly:
-                                        return multiplets
-
-                        elif (xPositions[0] < px < xPositions[1]
-                              and yPositions[0] < py < yPositions[1]) or \
-                                (minX < xPosition < maxX and minY < yPosition < maxY):
+                # query the spatial index of the symbols/labels
+                hitIndex = labelling.getHitIndex(dims)
+                for multiplet in hitIndex.pointHits(xPosition, yPosition, pixX, pixY,
+                                                    self.symbolX, self.symbolY, self._symbolSize):
+                    if len(multiplet.axisCodes) > 2 and zPositions is not None:
+                        # within the XY bounds so check whether inPlane
+                        _isInPlane, _isInFlankingPlane, planeIndex, fade = \
+                            self._GLMultiplets.objIsInVisiblePlanes(spectrumView, multiplet)
+                        if _isInPlane or _isInFlankingPlane:
                             multiplets.append(multiplet)
                             if firstOnly:
-                                return multiplets if multiplet in self.current.multiplets else []
+                                return multiplets
 
-                    except Exception:
-                        continue
+                    else:
+                        multiplets.append(multiplet)
+                        if firstOnly:
+                            return multiplets if multiplet in self.current.multiplets else []
 
         return multiplets
 
@@ -275,20 +183,16 @@ class GuiNdWidget(CcpnGLWidget):
         """Find the multiplets under the mouse.
         If firstOnly is true, return only the first item, else an empty list
         """
-        # xPositions = [xPosition - self.symbolX, xPosition + self.symbolX]
-        # yPositions = [yPosition - self.symbolY, yPosition + self.symbolY]
         if len(self._orderedAxes) > 2:
             zPositions = self._orderedAxes[2].region
         else:
             zPositions = None
 
         multiplets = []
-        _data2Obj = self.strip.project._data2Obj
         pixX, pixY = self.strip._CcpnGLWidget.pixelX, self.strip._CcpnGLWidget.pixelY
-        sgnX, sgnY = np.sign(pixX), np.sign(pixY)
 
         for spectrumView in self.strip.spectrumViews:
-            dimX, dimY = spectrumView.dimensionIndices[:2]
+            dims = spectrumView.dimensionIndices[:2]
 
             for multipletListView in spectrumView.multipletListViews:
                 if not (spectrumView.isDisplayed and
@@ -296,47 +200,23 @@ class GuiNdWidget(CcpnGLWidget):
                         (labelling := self._GLMultiplets._GLLabels.get(multipletListView))):
                     continue
 
-                for drawList in labelling.stringList:
-
-                    try:
-                        multiplet = drawList.stringObject
-                        pView = multiplet.getMultipletView(multipletListView)
-                        _pos = multiplet.position
-                        px, py = float(_pos[dimX]), float(_pos[dimY])
-                        tx, ty = pView.textOffset
-                        if not tx and not ty:
-                            # pixels
-                            tx, ty = self._symbolSize, self._symbolSize
-                            # ppm
-                            # tx, ty = self.symbolX, self.symbolY
-
-                        # find the bounds of the label
-                        # pixels
-                        # minX, maxX = min(_ll := px + tx * pixX, _rr := px + (tx + drawList.width) * pixX), max(_ll, _rr)
-                        # minY, maxY = min(_ll := py + ty * pixY, _rr := py + (ty + drawList.height) * pixY), max(_ll, _rr)
-                        # ppm
-                        minX, maxX = min(_ll := px + tx * sgnX,
-                                         _rr := px + tx * sgnX + drawList.width * pixX), max(_ll, _rr)
-                        minY, maxY = min(_ll := py + ty * sgnY,
-                                         _rr := py + ty * sgnY + drawList.height * pixY), max(_ll, _rr)
-
-                        if len(multiplet.axisCodes) > 2 and zPositions is not None:
-                            if (minX < xPosition < maxX and minY < yPosition < maxY):
-                                # within the XY bounds so check whether inPlane
-                                _isInPlane, _isInFlankingPlane, planeIndex, fade = \
-                                    self._GLMultiplets.objIsInVisiblePlanes(spectrumView, multiplet)
-                                if _isInPlane or _isInFlankingPlane:
-                                    multiplets.append(multiplet)
-                                    if firstOnly:
-                                        return multiplets
-
-                        elif (minX < xPosition < maxX and minY < yPosition < maxY):
+                # query the spatial index of the labels
+                hitIndex = labelling.getHitIndex(dims)
+                for multiplet in hitIndex.pointHits(xPosition, yPosition, pixX, pixY,
+                                                    self.symbolX, self.symbolY, self._symbolSize, labelsOnly=True):
+                    if len(multiplet.axisCodes) > 2 and zPositions is not None:
+                        # within the XY bounds so check whether inPlane
+                        _isInPlane, _isInFlankingPlane, planeIndex, fade = \
+                            self._GLMultiplets.objIsInVisiblePlanes(spectrumView, multiplet)
+                        if _isInPlane or _isInFlankingPlane:
                             multiplets.append(multiplet)
                             if firstOnly:
-                                return multiplets if multiplet in self.current.multiplets else []
+                                return multiplets
 
-                    except Exception:
-                        continue
+                    else:
+                        multiplets.append(multiplet)
+                        if firstOnly:
+                            return multiplets if multiplet in self.current.multiplets else []
 
         return multiplets
 
@@ -1565,8 +1445,9 @@ class Gui1dWidget(CcpnGLWidget):
                     return
 
             data = spectrumView.spectrum.intensities
+            analytic = Phasing.analyticData(data)
             if ph0 is not None and ph1 is not None and pivot is not None:
-                preData = Phasing.phaseRealData(data, ph0, ph1, pivot)
+                preData = Phasing.phaseAnalyticData(analytic, ph0, ph1, pivot)
             else:
                 preData = data
 
@@ -1602,6 +1483,7 @@ class Gui1dWidget(CcpnGLWidget):
 
             # store the pre-phase data
             trace.data = data
+            trace.analytic = analytic
             trace.positionPixel = positionPixel
             trace.spectrumView = spectrumView
 
@@ -1646,6 +1528,7 @@ class Gui1dWidget(CcpnGLWidget):
             return
 
         stackCount = 0
+        visibleRange, pixelCount = self._getDecimationRange()
 
         # self._spectrumSettings = {}
         rebuildFlag = False
@@ -1653,6 +1536,10 @@ class Gui1dWidget(CcpnGLWidget):
             if spectrumView.isDeleted:
                 continue
 
+            # the visible region in the coordinates of the spectrum, i.e., without the stacking offset
+            stackOffset = stackCount * self._stackingValue[self.spectrumDisplay._flipped] if self._stackingMode else 0.0
+            specRange = (visibleRange[0] - stackOffset, visibleRange[1] - stackOffset) if visibleRange else None
+
             if spectrumView.buildContours or spectrumView.buildContoursOnly:
 
                 # flag the peaks for rebuilding
@@ -1680,7 +1567,8 @@ class Gui1dWidget(CcpnGLWidget):
                                                                     drawMode=GL.GL_LINE_STRIP,
                                                                     dimension=2,
                                                                     GLContext=self)
-                spectrumView._buildGLContours(self._contourList[spectrumView])
+                spectrumView._buildGLContours(self._contourList[spectrumView],
+                                              visibleRange=specRange, pixelCount=pixelCount)
 
                 self._buildSpectrumSetting(spectrumView=spectrumView, stackCount=stackCount)
                 # if self._stackingMode:
@@ -1690,10 +1578,31 @@ class Gui1dWidget(CcpnGLWidget):
                 # define the VBOs to pass to the graphics card
                 self._contourList[spectrumView].defineIndexVBO()
 
+            elif spectrumView in self._contourList and spectrumView._decimationChanged(specRange, pixelCount):
+                # zoomed, or panned beyond the margins of the decimated vertices; only the vertices need updating
+                spectrumView._buildGLDecimated(self._contourList[spectrumView],
+                                               spectrumView._getDecimation(specRange, pixelCount))
+                self._contourList[spectrumView].defineIndexVBO()
+
         # rebuild the traces as the spectrum/plane may have changed
         if rebuildFlag:
             self.rebuildTraces()
 
+    def _getDecimationRange(self):
+        """Get the visible region along the ppm-axis and its size in (device) pixels,
+        for the min/max decimation of the 1D spectra
+        :return a (visibleRange, pixelCount) tuple; visibleRange is None if undefined
+        """
+        if self.spectrumDisplay._flipped:
+            limits, pixel = (self.axisB, self.axisT), self.pixelY
+        else:
+            limits, pixel = (self.axisL, self.axisR), self.pixelX
+        if not pixel or limits[0] == limits[1]:
+            return None, None
+
+        pixelCount = abs((limits[1] - limits[0]) / pixel) * (self.viewports.devicePixelRatio if self.viewports else 1.0)
+        return limits, pixelCount
+
     def _updateVisibleSpectrumViews(self):
         """Update the list of visible spectrumViews when change occurs
         """
@@ -1996,10 +1905,10 @@ class Gui1dWidget(CcpnGLWidget):
                 # only draw the traces for the spectra that are visible
                 specTraces = [trace.spectrumView for trace in self._staticHTraces]
 
+                specSettings = self._spectrumSettings[spectrumView]
+
                 # set correct transform when drawing this contour
                 if spectrumView.spectrum.displayFoldedContours:
-                    specSettings = self._spectrumSettings[spectrumView]
-
                     fxMax, fyMax = specSettings.maxSpectrumFrequency
                     dxAF, dyAF = specSettings.spectralWidth
                     alias = specSettings.aliasingIndex
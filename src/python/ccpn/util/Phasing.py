@@ -36,12 +36,31 @@ def phaseRealData(data: Sequence[float], ph0: float = 0.0, ph1: float = 0.0,
     # data is the (1D) spectrum data (real)
     # ph0 and ph1 are in degrees
 
-    data = numpy.array(data)
-    data = signal.hilbert(data)  # convert real to complex data in best way possible
-    data = phaseComplexData(data, ph0, ph1, pivot)
-    data = data.real
+    return phaseAnalyticData(analyticData(data), ph0, ph1, pivot)
 
-    return data
+
+def analyticData(data: Sequence[float]) -> Sequence[complex]:
+    # data is the (1D) spectrum data (real)
+    # returns the complex (analytic) data; can be retained to phase the same data repeatedly
+
+    return signal.hilbert(numpy.array(data))  # convert real to complex data in best way possible
+
+
+def phaseAnalyticData(data: Sequence[complex], ph0: float = 0.0, ph1: float = 0.0,
+                      pivot: float = 1.0) -> Sequence[float]:
+    # data is the (1D) analytic data as returned by analyticData
+    # ph0 and ph1 are in degrees
+    # returns the real part of the phased data, without modifying data
+
+    ph0 *= numpy.pi / 180.0
+    ph1 *= numpy.pi / 180.0
+    pivot -= 1  # points start at 1 but code below assumes starts at 0
+
+    npts = len(data)
+    angles = ph0 + (numpy.arange(npts) - pivot) * ph1 / npts
+
+    # real part of data * exp(-1j * angles)
+    return data.real * numpy.cos(angles) + data.imag * numpy.sin(angles)
 
 
 def phaseComplexData(data: Sequence[complex], ph0: float = 0.0, ph1: float = 0.0,
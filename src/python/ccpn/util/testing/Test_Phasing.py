@@ -63,3 +63,14 @@ class PhasingTest(unittest.TestCase):
         delta = abs(z - x).max()
 
         assert delta < 1.0e-5, 'delta = %f' % delta
+
+    def test_phasing_analytic(self):
+        x = numpy.random.random(1000).astype('float32')
+        analytic = Phasing.analyticData(x)
+
+        y = Phasing.phaseAnalyticData(analytic, ph0=35, ph1=-120, pivot=400)
+        z = Phasing.phaseComplexData(analytic, ph0=35, ph1=-120, pivot=400).real
+
+        delta = abs(z - y).max()
+
+        assert delta < 1.0e-5, 'delta = %f' % delta